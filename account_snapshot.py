@@ -0,0 +1,95 @@
+"""
+계좌 스냅샷 (보유 종목 + 예수금 + 미체결 주문)
+
+매 주기 세 조회를 호출 제한 범위 안에서 동시에 요청하고, 하나의 불변 객체로 묶어
+단조 증가 버전을 붙여 발행합니다. 매도 로직(chk_n_sell), 물타기, 안전 감시, status.json 갱신이
+같은 버전의 데이터를 보게 되어 세 조회 간 시점 차이로 인한 불일치가 없습니다.
+"""
+import time
+import asyncio
+import itertools
+from dataclasses import dataclass
+from typing import Optional, Tuple, Dict
+from logger import logger
+from kiwoom_adapter import async_get_account_data, async_get_balance, async_get_outstanding_orders
+from kiwoom.records import Holding, HoldingList, OrderRecord, OrderList, as_holdings, as_orders
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    """
+    한 시점의 계좌 상태 (변경 불가)
+    - holdings / outstanding_orders는 튜플이며, 소비자가 값을 고쳐 쓸 때는 stocks() / orders() 복사본을 사용
+    - 각 항목은 파싱된 레코드(kiwoom.records)이고, 복사본 목록에는 종목코드 색인이 붙음
+    """
+    version: int
+    taken_at: float                          # time.monotonic() 기준 생성 시각
+    holdings: Tuple[Holding, ...]            # kt00004 보유 종목 (실시간가 반영 완료)
+    summary: Dict                            # kt00004 계좌 요약
+    balance: Tuple[int, int, int]            # kt00001 (주문가능금액, 총평가금액, 예수금)
+    outstanding_orders: Optional[Tuple[OrderRecord, ...]]  # 미체결 (조회 실패 시 None)
+
+    @property
+    def deposit(self) -> int:
+        return self.balance[2]
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.taken_at
+
+    def stocks(self) -> HoldingList:
+        """보유 종목 복사본 (chk_n_sell처럼 현재가를 덮어쓰는 소비자용)"""
+        return HoldingList(s.copy() for s in self.holdings)
+
+    def orders(self) -> Optional[OrderList]:
+        """미체결 주문 복사본"""
+        if self.outstanding_orders is None:
+            return None
+        return OrderList(o.copy() for o in self.outstanding_orders)
+
+    def balance_data(self) -> Dict:
+        """기존 balance_data 형식 {'balance', 'deposit', 'net_asset'}"""
+        return {
+            'balance': self.balance[0],
+            'deposit': self.balance[2],
+            'net_asset': self.balance[2] + self.balance[1]
+        }
+
+class AccountSnapshotService:
+    """
+    계좌 스냅샷 생성기
+    - refresh(): 세 조회를 asyncio.gather로 동시에 요청 (호출 간격은 kiwoom.rate_limiter, 중복 요청은 account_cache가 처리)
+    - latest: 마지막으로 발행된 스냅샷 (없으면 None)
+    """
+    def __init__(self):
+        self._versions = itertools.count(1)
+        self.latest: Optional[AccountSnapshot] = None
+
+    async def fetch(self, token):
+        """(보유 종목 HoldingList, 요약, 잔고, 미체결 OrderList) 동시 조회. 하나라도 예외면 그 예외를 그대로 전달"""
+        results = await asyncio.gather(
+            async_get_account_data(token),
+            async_get_balance(token),
+            async_get_outstanding_orders(token),
+            return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        acnt_data, balance, outstanding = results
+        holdings, summary = acnt_data if acnt_data else ([], {})
+        return as_holdings(holdings), summary, balance, as_orders(outstanding)
+
+    def publish(self, holdings, summary, balance, outstanding) -> AccountSnapshot:
+        """조회 결과를 불변 스냅샷으로 고정하고 버전 부여"""
+        snapshot = AccountSnapshot(
+            version=next(self._versions),
+            taken_at=time.monotonic(),
+            holdings=tuple(HoldingList(holdings or ())),
+            summary=dict(summary or {}),
+            balance=tuple(balance),
+            outstanding_orders=tuple(OrderList(outstanding)) if outstanding is not None else None,
+        )
+        self.latest = snapshot
+        logger.debug(f"[Snapshot] v{snapshot.version} 보유 {len(snapshot.holdings)} / 미체결 {len(snapshot.outstanding_orders or ())}")
+        return snapshot
+
+account_snapshot = AccountSnapshotService()
@@ -0,0 +1,94 @@
+"""
+매수 후보 대기열 벤치마크 (dict + 전체 정렬 vs CandidateQueue)
+- 조건검색이 CODES개 종목을 쏟아내는 상황: 틱 TICKS건 갱신, SELECT_EVERY건마다 상위 K개 선별
+- 기존 방식: dict 갱신 → 선별 시 전체 점수 계산 + 정렬 + 비우기 (선별되지 않은 후보는 버려짐)
+- dict 유지: 같은 방식이나 후보를 버리지 않음 (CandidateQueue와 같은 조건, 매번 전체 정렬)
+- CandidateQueue: push(O(log n), 정렬 키 변화가 CANDIDATE_REHEAP_EPS 이하면 힙 재삽입 생략) → pop_best(K)
+- 틱 모델 2가지: 연속 (종목별 등락률/체결강도가 틱마다 조금씩 변함, 실제 체결 틱에 가까움) / 무작위 (틱마다 독립 난수, 최악)
+- 마지막에 TTL / 점수 감쇠 동작 확인
+- CandidateQueue는 틱마다 push 비용이 있어 이 선별 빈도에서는 dict보다 느림 (속도가 아닌 후보 유지 / 감쇠 / TTL 동작 비교용)
+
+사용법: python bench_candidate_queue.py
+"""
+import time
+import random
+
+from candidate_queue import CandidateQueue
+
+CODES = [f"{i:06d}" for i in range(1, 501)]
+TICKS = 200000
+SELECT_EVERY = 200
+K = 5
+
+def make_ticks(seed=3, walk=True):
+    rng = random.Random(seed)
+    if not walk:
+        return [(rng.choice(CODES), rng.uniform(-5, 30), {'strength': rng.uniform(50, 300)}) for _ in range(TICKS)]
+    state = {code: [rng.uniform(-5, 30), rng.uniform(50, 300)] for code in CODES}
+    ticks = []
+    for _ in range(TICKS):
+        code = rng.choice(CODES)
+        rate_strength = state[code]
+        rate_strength[0] += rng.gauss(0, 0.02)
+        rate_strength[1] += rng.gauss(0, 1.0)
+        ticks.append((code, rate_strength[0], {'strength': rate_strength[1]}))
+    return ticks
+
+def run_dict(ticks, keep=False):
+    queue = {}
+    picked = 0
+    def get_score(item):
+        rate, data = item[1]
+        return rate + data.get('strength', 100.0) / 100.0
+    start = time.perf_counter()
+    for i, (code, rate, data) in enumerate(ticks, 1):
+        queue[code] = (rate, data)
+        if i % SELECT_EVERY == 0:
+            best = sorted(queue.items(), key=get_score, reverse=True)[:K]
+            picked += len(best)
+            if keep:
+                for code, _ in best:
+                    del queue[code]
+            else:
+                queue.clear()
+    return time.perf_counter() - start, picked
+
+def run_heap(ticks):
+    queue = CandidateQueue()
+    picked = 0
+    start = time.perf_counter()
+    for i, (code, rate, data) in enumerate(ticks, 1):
+        queue.push(code, rate, data)
+        if i % SELECT_EVERY == 0:
+            picked += len(queue.pop_best(K))
+    return time.perf_counter() - start, picked
+
+def check_ttl_decay():
+    now = [0.0]
+    queue = CandidateQueue(ttl=60, decay=0.1, clock=lambda: now[0])
+    queue.push('OLD', 10.0)          # 점수 11.0, t=0
+    now[0] = 30.0
+    queue.push('NEW', 8.5)           # 점수 9.5, t=30 → t=30에서 OLD는 8.0
+    best = queue.pop()[0]
+    queue.push('STALE', 20.0)        # t=30
+    now[0] = 100.0                   # TTL 60초 경과
+    return best, queue.pop()
+
+def main():
+    print(f"{'방식':<24} | {'연속 틱':<22} | {'무작위 틱':<22}")
+    print("-" * 76)
+    results = {}
+    for walk in (True, False):
+        ticks = make_ticks(walk=walk)
+        results[walk] = (run_dict(ticks), run_dict(ticks, keep=True), run_heap(ticks))
+    for i, name in enumerate(('dict + 전체 정렬', 'dict 유지 + 전체 정렬', 'CandidateQueue')):
+        cols = [f"{results[walk][i][0] * 1000:.0f}ms (선별 {results[walk][i][1]}건)" for walk in (True, False)]
+        print(f"{name:<24} | {cols[0]:<22} | {cols[1]:<22}")
+    print(f"{'':<24}   ({TICKS:,}틱, {len(CODES)}종목, {SELECT_EVERY}틱마다 상위 {K}개)")
+
+    best, stale = check_ttl_decay()
+    assert best == 'NEW' and stale is None, (best, stale)
+    print(f"{'감쇠 / TTL 확인':<24} | 30초 전 고득점 대신 최신 후보 선정, TTL 지난 후보 제외")
+
+if __name__ == "__main__":
+    main()
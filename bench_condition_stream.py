@@ -0,0 +1,93 @@
+"""
+조건검색 다중 구독 벤치마크
+- 1) 요청/수신 트래픽 모델: 조건식 CONDITIONS개, 조건식당 편입 MEMBERS종목, 조건식마다 CHURN_SEC초에 한 번 편입/이탈
+     기존 방식: 5초마다 CNSRREQ(search_type 1 + 0) 재요청, 응답마다 편입 종목 전체 수신 (조건식 수만큼 반복한다고 가정)
+     ConditionSet: 조건식당 실시간 등록 1회 + 편입/이탈 알림만 수신
+- 2) RealTimeSearch 동작 확인: 조건식 2개 초기조회 + 실시간 편입/이탈 + 체결 틱 → 대기열 순서 / 출처 태그 / 이탈 제거
+
+사용법: python bench_condition_stream.py
+"""
+import json
+import asyncio
+
+from rt_search import RealTimeSearch
+
+CONDITIONS = 3
+MEMBERS = 40
+CHURN_SEC = 30
+SESSION_SEC = 6 * 3600 + 1800
+POLL_SEC = 5
+
+def traffic_model():
+    polls = SESSION_SEC // POLL_SEC
+    legacy_sent = polls * 2 * CONDITIONS
+    legacy_items = polls * 2 * CONDITIONS * MEMBERS
+    events = SESSION_SEC // CHURN_SEC * CONDITIONS
+    new_sent = CONDITIONS
+    new_items = CONDITIONS * MEMBERS + events
+    return (legacy_sent, legacy_items), (new_sent, new_items)
+
+class RecordingSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+def tick(code, rate, strength=100.0):
+    return {'type': '0B', 'item': code, 'values': {'9001': code, '10': '+10000', '12': f'+{rate:.2f}', '13': '1000', '15': f'{strength:.2f}'}}
+
+def event(seq, code, kind):
+    return {'type': '02', 'item': code, 'values': {'841': seq, '9001': 'A' + code, '843': kind}}
+
+async def run_functional():
+    rts = RealTimeSearch()
+    rts.connected = True
+    rts.websocket = RecordingSocket()
+
+    async def no_buy(*args):  # 매수 프로세서 없이 대기열만 확인
+        pass
+    rts.process_candidates = no_buy
+    rts.conditions.configure({'0': 1.0, '3': 2.0})
+    rts.conditions.names.update({'0': '거래량급증', '3': '신고가'})
+
+    await rts._on_ticks({'trnm': 'CNSRREQ', 'seq': '0', 'data': [{'jmcode': 'A000100'}, {'jmcode': 'A000200'}]})
+    await rts._on_ticks({'trnm': 'CNSRREQ', 'seq': '3', 'data': [{'jmcode': 'A000300'}]})
+    await rts._on_ticks({'trnm': 'REAL', 'data': [
+        event('3', '000400', 'I'),       # 신고가 조건식 실시간 편입
+        event('0', '000200', 'D'),       # 거래량급증 조건식 이탈
+        tick('000100', 5.0),             # 점수 (5 + 1) x 1.0 = 6
+        tick('000300', 4.0),             # 점수 (4 + 1) x 2.0 = 10
+        tick('000400', 2.0),             # 점수 (2 + 1) x 2.0 = 6
+        tick('000900', 29.0),            # 어느 조건식에도 없는 종목 → 시세만 갱신
+    ]})
+    await rts.flush_ticks()
+    await asyncio.sleep(0)
+
+    order = []
+    while True:
+        picked = rts.candidate_queue.pop()
+        if picked is None:
+            break
+        order.append((picked[0], picked[2].get('condition')))
+    assert order[0] == ('000300', '3'), order
+    assert {c for c, _ in order} == {'000100', '000300', '000400'}, order
+    assert '000900' in rts.current_prices
+    regs = [m for m in rts.websocket.sent if m['trnm'] == 'REG']
+    return order, rts, regs
+
+def main():
+    (l_sent, l_items), (n_sent, n_items) = traffic_model()
+    print(f"조건식 {CONDITIONS}개 x {MEMBERS}종목, {SESSION_SEC // 3600}.{SESSION_SEC % 3600 // 360}시간, 조건식마다 {CHURN_SEC}초에 편입/이탈 1건")
+    print(f"{'방식':<24} | {'결과':<50}")
+    print("-" * 80)
+    print(f"{'5초 재요청':<24} | 요청 {l_sent:,}건 / 수신 항목 {l_items:,}건")
+    print(f"{'실시간 편입/이탈':<24} | 요청 {n_sent:,}건 / 수신 항목 {n_items:,}건")
+
+    order, rts, regs = asyncio.run(run_functional())
+    print(f"{'대기열 순서 (출처)':<24} | {order}")
+    print(f"{'조건식 상태':<24} | {rts.conditions.format_stats()}")
+    print(f"{'편입 종목 체결 구독':<24} | REG {len(regs)}건, {rts.subscriptions.format_stats()}")
+
+if __name__ == "__main__":
+    main()
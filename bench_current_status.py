@@ -0,0 +1,101 @@
+"""
+get_current_status 지연시간 벤치마크
+- 임시 DB에 보유 종목 5 ~ 100개를 만들고 MOCK / REAL 모드 상태 조회 시간을 측정
+- 보유 종목 수가 늘어도 실행 쿼리 수와 지연시간이 일정해야 함 (N+1 쿼리 없음)
+- REAL 모드의 키움 API 호출은 고정 응답으로 대체하여 DB 처리 시간만 측정
+
+사용법: python bench_current_status.py
+"""
+import os
+import sys
+import time
+import types
+import tempfile
+import datetime
+import statistics
+
+import database_helpers as dh
+
+HOLDING_COUNTS = (5, 10, 25, 50, 100)
+REPEAT = 50
+
+def setup_db(path, n_holdings):
+    dh.close_db_connection()
+    dh.DB_FILE = path
+    dh._settings_cache = dh.SettingsCache()
+    dh._position_ledger = dh.PositionLedger()
+
+    conn = dh.get_db_connection()
+    conn.executescript('''
+        CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at TEXT);
+        CREATE TABLE held_times (code TEXT PRIMARY KEY, held_since REAL NOT NULL, updated_at TEXT);
+        CREATE TABLE mock_account (id INTEGER PRIMARY KEY CHECK (id = 1), cash INTEGER NOT NULL, total_eval INTEGER NOT NULL, updated_at TEXT);
+        CREATE TABLE mock_holdings (code TEXT PRIMARY KEY, qty INTEGER NOT NULL, avg_price REAL NOT NULL, current_price REAL NOT NULL, updated_at TEXT, source TEXT);
+        CREATE TABLE mock_stocks (code TEXT PRIMARY KEY, name TEXT NOT NULL, base_price INTEGER NOT NULL);
+        CREATE TABLE mock_prices (code TEXT PRIMARY KEY, current INTEGER NOT NULL, open INTEGER, high INTEGER, low INTEGER, last_update TEXT);
+        CREATE TABLE trades (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, type TEXT NOT NULL, code TEXT NOT NULL,
+            name TEXT, qty INTEGER, price REAL, profit_rate REAL, memo TEXT, mode TEXT DEFAULT 'REAL',
+            reason TEXT, amt REAL, avg_price REAL, source TEXT
+        );
+    ''')
+    for index_sql in dh.TRADES_INDEXES:
+        conn.execute(index_sql)
+    conn.execute("INSERT INTO mock_account VALUES (1, 10000000, 0, '')")
+    conn.commit()
+    dh.ensure_positions_ledger()
+
+    now = time.time()
+    base = datetime.datetime.now().replace(hour=9, minute=0, second=0)
+    api_holdings = []
+    for i in range(n_holdings):
+        code = f"{100000 + i:06d}"
+        conn.execute("INSERT INTO mock_stocks VALUES (?, ?, 10000)", (code, f"종목{i}"))
+        conn.execute("INSERT INTO mock_prices VALUES (?, 10500, 10000, 10600, 9900, '')", (code,))
+        conn.execute("INSERT INTO mock_holdings VALUES (?, 30, 10000, 10500, '', '검색식')", (code,))
+        conn.execute("INSERT INTO held_times VALUES (?, ?, '')", (code, now - 600))
+        # 종목당 매도 1회 + 물타기 매수 3회
+        for j, trade_type in enumerate(('buy', 'sell', 'buy', 'buy', 'buy')):
+            ts = (base + datetime.timedelta(seconds=i * 10 + j)).strftime('%Y-%m-%d %H:%M:%S')
+            for mode in ('MOCK', 'REAL'):
+                conn.execute(
+                    "INSERT INTO trades (timestamp, type, code, qty, price, amt, mode, source) VALUES (?, ?, ?, 10, 10000, 100000, ?, '검색식')",
+                    (ts, trade_type, code, mode))
+        api_holdings.append({'stk_cd': f"A{code}", 'stk_nm': f"종목{i}", 'rmnd_qty': '30', 'avg_prc': '10000', 'cur_prc': '10500'})
+    conn.commit()
+    dh.invalidate_positions()
+
+    summary = {'dnca_tot_amt': '10000000', 'prsm_dpst_aset_amt': '13150000', 'tot_pur_amt': '3000000', 'tot_est_amt': '3150000', 'tdy_lspft_amt': '0'}
+    sys.modules['kiwoom_adapter'] = types.SimpleNamespace(get_account_data=lambda: (api_holdings, summary))
+
+def measure(mode):
+    conn = dh.get_db_connection()
+    queries = []
+    dh.get_current_status(mode) # 캐시 워밍업
+
+    conn.set_trace_callback(queries.append)
+    result = dh.get_current_status(mode)
+    conn.set_trace_callback(None)
+
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        dh.get_current_status(mode)
+        samples.append((time.perf_counter() - start) * 1000)
+    return len(result['holdings']), len(queries), statistics.median(samples)
+
+def main():
+    dh.logger.setLevel('WARNING')
+    print(f"{'보유수':>6} | {'MOCK 쿼리':>9} | {'MOCK ms':>8} | {'REAL 쿼리':>9} | {'REAL ms':>8}")
+    print("-" * 56)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in HOLDING_COUNTS:
+            setup_db(os.path.join(tmp, f"bench_{n}.db"), n)
+            mock_n, mock_q, mock_ms = measure('MOCK')
+            real_n, real_q, real_ms = measure('REAL')
+            assert mock_n == n and real_n == n, (mock_n, real_n)
+            print(f"{n:>6} | {mock_q:>9} | {mock_ms:>8.3f} | {real_q:>9} | {real_ms:>8.3f}")
+        dh.close_db_connection()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+실시간 주문체결 / 잔고 이벤트 벤치마크
+- 1) REST 호출 모델 (가상 시계): 메인 루프 LOOP_SEC 주기, REST 잔고 주기(보유 + 예수금 + 미체결 3건)는 REST_PASS_SEC 소요,
+     ORDER_EVERY초마다 매수 1건 (응답 후 FILL_AFTER초에 체결)
+     기존 방식: 매 주기 REST 3건, 체결은 체결 후 끝나는 첫 REST 주기에서 확인
+     LiveAccount: ACCOUNT_RECONCILE_SEC마다 REST 3건, 체결은 이벤트 수신 즉시 확인
+- 2) RealTimeSearch 동작 확인: 계좌 실시간 등록 → REST 기준 맞춤 → 주문체결(00) / 잔고(04) 이벤트
+     → 체결 확인 대기 해제 / 디스패처 체결 판정까지 걸린 시간, view() 보유 수량 / 예수금
+     주문체결 '취소' 이벤트 → 디스패처 체결 대기 해제 (같은 종목 매수를 다시 보낼 수 있음)
+- 3) 체결 이벤트가 오지 않는 서버: 응답 후 LIVE_ORDER_CONFIRM_SEC가 지나면 REST 조회로 되돌아가는지 확인
+
+사용법: python bench_execution_events.py
+"""
+import json
+import time
+import asyncio
+from types import SimpleNamespace
+
+import rt_search
+from rt_search import RealTimeSearch
+from live_account import LiveAccount, ACCOUNT_RECONCILE_SEC, LIVE_ORDER_CONFIRM_SEC
+from kiwoom.realtime import OrderExecution
+from order_dispatcher import OrderDispatcher
+
+SESSION_SEC = 6 * 3600 + 1800
+LOOP_SEC = 0.1
+REST_PASS_SEC = 0.35
+REST_CALLS_PER_PASS = 3
+ORDER_EVERY = 45.0
+FILL_AFTER = 0.05
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def holding(code, qty, avg, cur):
+    return {'stk_cd': 'A' + code, 'stk_nm': code, 'rmnd_qty': str(qty), 'pchs_avg_pric': str(avg), 'cur_prc': str(cur)}
+
+def simulate(live):
+    """(REST 호출 수, 체결 확인 지연 목록) - live=False면 기존 매 주기 REST"""
+    clock = FakeClock()
+    account = LiveAccount(clock=clock)
+    account.feed_up()
+    account.reconcile([], {'ok': 1}, (10_000_000, 0, 10_000_000), [])
+    calls, delays = 0, []
+    next_order = ORDER_EVERY
+    fills = []                       # (체결 시각, 티켓)
+    awaiting = []
+    seq = 0
+    while clock.now < SESSION_SEC:
+        if clock.now >= next_order:
+            seq += 1
+            ticket = SimpleNamespace(code=f'{seq:06d}', t_ack=clock.now)
+            awaiting.append(ticket)
+            fills.append((clock.now + FILL_AFTER, ticket))
+            next_order += ORDER_EVERY
+        # 체결 이벤트 도착
+        for at, ticket in list(fills):
+            if at <= clock.now:
+                fills.remove((at, ticket))
+                if live:
+                    account.on_execution(OrderExecution(str(ticket.code), ticket.code, '', 'buy', '체결', 1, 10000, 1, 0, 10000, ''))
+                    delays.append(0.0)
+                    awaiting.remove(ticket)
+                else:
+                    ticket.filled_at = at
+        if not live or account.needs_rest(ACCOUNT_RECONCILE_SEC, awaiting):
+            clock.now += REST_PASS_SEC
+            calls += REST_CALLS_PER_PASS
+            account.reconcile([], {'ok': 1}, (10_000_000, 0, 10_000_000), [])
+            if not live:
+                for ticket in list(awaiting):
+                    filled_at = getattr(ticket, 'filled_at', None)
+                    if filled_at is not None:
+                        delays.append(clock.now - filled_at)
+                        awaiting.remove(ticket)
+        clock.now += LOOP_SEC
+    return calls, delays
+
+class RecordingSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+def execution(order_no, code, side, order_qty, filled, price, status='체결'):
+    return {'type': '00', 'item': '', 'values': {
+        '9203': order_no, '9001': 'A' + code, '302': code, '913': status, '907': '2' if side == 'buy' else '1',
+        '900': str(order_qty), '901': str(price), '911': str(filled), '902': str(order_qty - filled), '910': str(price), '908': '093001'}}
+
+def balance(code, qty, avg, cur):
+    return {'type': '04', 'item': code, 'values': {'9001': 'A' + code, '302': code, '930': str(qty), '931': str(avg), '933': str(qty), '10': f'+{cur}'}}
+
+async def run_functional():
+    dispatcher = OrderDispatcher(workers=1, send_buy=lambda code, qty, price, token=None, source='': ('0', 'OK'))
+    dispatcher._fills_on_ack = lambda: False
+    rt_search.order_dispatcher = dispatcher
+
+    rts = RealTimeSearch()
+    rts.connected = True
+    rts.websocket = RecordingSocket()
+
+    await rts._on_login({'trnm': 'LOGIN', 'return_code': 0})
+    await rts._on_realreg({'trnm': 'REG', 'return_code': 0, 'grp_no': '9'})
+    account = rts.live_account
+    account.reconcile([holding('000100', 10, 5000, 5100)], {'ok': 1}, (1_000_000, 51_000, 1_000_000), [])
+    assert account.live
+
+    # 매수 주문 전송 (체결 확인 대기 등록)
+    ticket = dispatcher.submit_buy('000200', 5, 10000, held_before=0)
+    ticket.wait(5)
+    rts.pending_orders['000200'] = time.time()
+    need_before = account.needs_rest(ACCOUNT_RECONCILE_SEC, dispatcher.awaiting())
+
+    # 부분 체결 2주 → 전량 체결 5주 → 잔고
+    await rts._on_ticks({'trnm': 'REAL', 'data': [execution('0001', '000200', 'buy', 5, 2, 10000)]})
+    partial_done = ticket.filled
+    start = time.monotonic()
+    await rts._on_ticks({'trnm': 'REAL', 'data': [execution('0001', '000200', 'buy', 5, 5, 10000), balance('000200', 5, 10000, 10050)]})
+    reaction_ms = ((ticket.t_fill or time.monotonic()) - start) * 1000
+    await asyncio.sleep(0)
+
+    # 같은 체결 재전송 (중복 반영 안 함)
+    await rts._on_ticks({'trnm': 'REAL', 'data': [execution('0001', '000200', 'buy', 5, 5, 10000)]})
+    # 미체결 매수 취소 이벤트 → 체결 대기 해제 후 같은 매수 재전송 가능
+    cancelled = dispatcher.submit_buy('000300', 3, 20000, held_before=0)
+    cancelled.wait(5)
+    blocked = dispatcher.submit_buy('000300', 3, 20000, held_before=0, join=False)
+    await rts._on_ticks({'trnm': 'REAL', 'data': [execution('0002', '000300', 'buy', 3, 0, 20000, status='취소')]})
+    rebuy = dispatcher.submit_buy('000300', 3, 20000, held_before=0, join=False)
+    rebuy.wait(5)
+
+    stocks, _, bal, orders = account.view()
+    regs = [m for m in rts.websocket.sent if m['trnm'] == 'REG']
+    return {
+        'need_before': need_before,
+        'partial_filled': partial_done,
+        'filled': ticket.filled,
+        'reaction_ms': reaction_ms,
+        'pending_cleared': '000200' not in rts.pending_orders,
+        'purchased': '000200' in rts.purchased_stocks,
+        'holdings': {s.code: s.qty for s in stocks},
+        'balance': bal,
+        'orders': len(orders),
+        'account_reg': regs[0]['data'][0] if regs else None,
+        'stats': account.format_stats(),
+        'cancel_rebuy': blocked is None and rebuy is not None and rebuy is not cancelled,
+    }
+
+def silent_feed_check():
+    clock = FakeClock()
+    account = LiveAccount(clock=clock)
+    account.feed_up()
+    account.reconcile([], {'ok': 1}, (1, 0, 1), [])
+    clock.now = 1.0
+    awaiting = [SimpleNamespace(code='000300', t_ack=clock.now)]
+    clock.now += LIVE_ORDER_CONFIRM_SEC / 2
+    early = account.needs_rest(ACCOUNT_RECONCILE_SEC, awaiting)
+    clock.now += LIVE_ORDER_CONFIRM_SEC
+    late = account.needs_rest(ACCOUNT_RECONCILE_SEC, awaiting)
+    return early, late
+
+def main():
+    old_calls, old_delays = simulate(live=False)
+    new_calls, new_delays = simulate(live=True)
+    old_delays.sort()
+    print(f"세션 {SESSION_SEC / 3600:.1f}시간, 루프 {LOOP_SEC}s, REST 주기 {REST_PASS_SEC}s (호출 {REST_CALLS_PER_PASS}건), 매수 {ORDER_EVERY:.0f}초마다 1건")
+    print(f"{'방식':<24} | {'결과':<50}")
+    print("-" * 80)
+    print(f"{'매 주기 REST':<24} | REST {old_calls:,}건 / 체결 확인 p50 {old_delays[len(old_delays) // 2] * 1000:.0f}ms, "
+          f"최대 {old_delays[-1] * 1000:.0f}ms (n={len(old_delays)})")
+    print(f"{'실시간 체결 + REST 맞춤':<24} | REST {new_calls:,}건 ({new_calls / old_calls:.1%}) / 체결 확인 = 이벤트 수신 시점 (n={len(new_delays)})")
+
+    result = asyncio.run(run_functional())
+    assert not result['need_before'], result
+    assert not result['partial_filled'] and result['filled'], result
+    assert result['pending_cleared'] and result['purchased'], result
+    assert result['holdings'] == {'000100': 10, '000200': 5}, result
+    assert result['balance'][0] == 1_000_000 - 50_000 and result['orders'] == 0, result
+    assert result['cancel_rebuy'], result
+    early, late = silent_feed_check()
+    assert not early and late, (early, late)
+
+    print(f"{'계좌 실시간 등록':<24} | {result['account_reg']}")
+    print(f"{'이벤트 → 체결 판정':<24} | {result['reaction_ms']:.2f}ms (부분 체결 2/5주에서는 미체결 유지)")
+    print(f"{'메모리 잔고':<24} | 보유 {result['holdings']} / 주문가능 {result['balance'][0]:,}원 / 미체결 {result['orders']}건")
+    print(f"{'체결 이벤트 없는 서버':<24} | 응답 {LIVE_ORDER_CONFIRM_SEC / 2:.1f}s 후 REST {'조회' if early else '생략'} → "
+          f"{LIVE_ORDER_CONFIRM_SEC * 1.5:.1f}s 후 REST {'조회' if late else '생략'}")
+    print(f"{'매수 취소 이벤트':<24} | 취소 전 재매수 전송 안 함 → 취소 수신 후 재매수 전송")
+    print(f"{'상태':<24} | {result['stats']}")
+
+if __name__ == "__main__":
+    main()
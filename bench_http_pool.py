@@ -0,0 +1,91 @@
+"""
+HTTP 연결 풀링 벤치마크 (로컬 스텁 서버)
+- 키움 REST 형식의 JSON을 돌려주는 로컬 HTTP/1.1 서버를 띄우고
+  requests.post(매번 새 연결) vs kiwoom.http_session.post(keep-alive 재사용) 호출 지연을 비교
+- 서버가 keep-alive 연결을 주기적으로 끊어도 재시도로 모든 호출이 성공하는지 확인
+- 실제 키움 서버는 HTTPS라 연결당 TLS 핸드셰이크 비용이 추가되므로 차이는 더 커짐
+- 호출 제한기(rate_limiter)는 한도를 충분히 높이고 공유 상태 파일 없이 사용 (연결 재사용 비용만 측정)
+
+사용법: python bench_http_pool.py
+"""
+import json
+import time
+import threading
+import statistics
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from kiwoom import http_session
+from kiwoom.rate_limiter import rate_limiter
+
+CALLS = 300
+
+class StubKiwoomHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive 지원
+    disable_nagle_algorithm = True # 헤더/본문 분할 전송 시 지연 ACK(40ms) 방지
+    close_every = 0               # N번째 응답 후 예고 없이 연결 끊기 (0이면 유지)
+    served = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        body = json.dumps({'return_code': 0, 'return_msg': '정상처리', 'ord_no': '0000001'}).encode('utf-8')
+
+        with StubKiwoomHandler.lock:
+            StubKiwoomHandler.served += 1
+            should_close = self.close_every and StubKiwoomHandler.served % self.close_every == 0
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if should_close:
+            # Connection 헤더 없이 끊어 keep-alive 만료 상황 재현 (클라이언트는 다음 요청에서 끊김 감지)
+            self.close_connection = True
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubKiwoomHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def measure(post, url, headers):
+    samples = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        response = post(url, headers=headers, json={'stk_cd': '005930'})
+        assert response.json()['return_code'] == 0
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+def main():
+    rate_limiter.configure(global_limit=(100000.0, 1000), tr_limits={'kt10000': None}, state_file=None)
+    server = start_stub_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/dostk/ordr"
+    headers = {'Content-Type': 'application/json;charset=UTF-8', 'api-id': 'kt10000'}
+
+    measure(requests.post, url, headers) # 워밍업
+    no_pool = measure(requests.post, url, headers)
+    pooled = measure(http_session.post, url, headers)
+
+    print(f"{'방식':<24} | {'p50 ms':>8} | {'p99 ms':>8}")
+    print("-" * 46)
+    print(f"{'requests.post (새 연결)':<24} | {no_pool[0]:>8.3f} | {no_pool[1]:>8.3f}")
+    print(f"{'http_session.post (풀)':<24} | {pooled[0]:>8.3f} | {pooled[1]:>8.3f}")
+
+    # 서버가 10번째 응답마다 예고 없이 연결을 끊어도 모든 호출이 성공해야 함
+    # (끊긴 풀 연결은 전송 전에 걸러져 새 연결로 보냄, 전송 후 끊김은 주문 TR이면 재시도하지 않고 호출자에게 전달)
+    StubKiwoomHandler.close_every = 10
+    reset_case = measure(http_session.post, url, headers)
+    print(f"{'풀 + 주기적 연결 끊김':<24} | {reset_case[0]:>8.3f} | {reset_case[1]:>8.3f}")
+
+    http_session.close_session()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
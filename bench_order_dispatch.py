@@ -0,0 +1,104 @@
+"""
+주문 디스패처 벤치마크 (키움 대역 서버 사용)
+- 1) 주문 20건 직접 호출(판단 스레드가 응답 대기) vs 디스패처 등록 → 판단 스레드 점유 시간 / 전체 응답 완료 시간
+- 2) 같은 종목·방향 중복 의도 → 실제 전송 건수 (전송 후 더 큰 수량 의도는 INFLIGHT 거절)
+     응답 후 체결 확인 전 같은 매도 의도 → 전송 안 함, 체결 확인 후 → 새로 전송
+     미체결 매수 취소(release) 후 같은 매수 의도 → 체결 대기 해제, 새로 전송
+- 3) 구간별 지연 백분위 (의도→전송, 전송→응답)
+
+사용법: python bench_order_dispatch.py
+"""
+import time
+
+from kiwoom_standin_server import KiwoomStandin
+from kiwoom.real_api import RealKiwoomAPI
+from kiwoom.rate_limiter import rate_limiter
+from kiwoom import http_session
+from kiwoom.records import as_holdings
+from order_dispatcher import OrderDispatcher, INFLIGHT_CODE
+
+ORDERS = 20
+CODES = [f"{i:06d}" for i in range(1, ORDERS + 1)]
+
+def main():
+    standin = KiwoomStandin(port=0, latency_ms=30, jitter_ms=5, seed=1).start()
+    api = RealKiwoomAPI()
+    api.host_url = standin.url
+    rate_limiter.configure(global_limit=(200.0, 20), tr_limits={'kt10000': None, 'kt10001': None})
+    token = api.get_token()
+
+    def send_buy(code, qty, price, token=None, source=''):
+        return api.buy_stock(code, qty, price, token, source=source)
+
+    def send_sell(code, qty, token=None):
+        return api.sell_stock(code, qty, token)
+
+    print(f"{'시나리오':<30} | {'결과':<40}")
+    print("-" * 75)
+
+    # 1) 직접 호출
+    start = time.perf_counter()
+    for code in CODES:
+        api.buy_stock(code, '1', '10000', token)
+    inline = (time.perf_counter() - start) * 1000
+    print(f"{'직접 호출 x' + str(ORDERS):<30} | 판단 스레드 점유 {inline:.0f}ms")
+
+    # 디스패처 (워커 2개)
+    dispatcher = OrderDispatcher(workers=2, send_buy=send_buy, send_sell=send_sell)
+    dispatcher._fills_on_ack = lambda: True  # 대역 서버 주문은 응답 = 체결로 간주
+    start = time.perf_counter()
+    tickets = [dispatcher.submit_buy(code, 1, 10000, token=token) for code in CODES]
+    submitted = (time.perf_counter() - start) * 1000
+    for ticket in tickets:
+        ticket.wait()
+    drained = (time.perf_counter() - start) * 1000
+    assert all(t.ok for t in tickets), [t.return_code for t in tickets if not t.ok]
+    print(f"{'디스패처 x' + str(ORDERS) + ' (워커 2)':<30} | 판단 스레드 점유 {submitted:.1f}ms / 전체 응답 {drained:.0f}ms")
+
+    # 2) 중복 의도 (같은 종목 매도 5회 + 다른 종목 1회)
+    before = standin.stats['by_api'].get('kt10001', {}).get('requests', 0)
+    dup = [dispatcher.submit_sell('005930', q, token=token) for q in (1, 3, 2, 5, 4)]
+    other = dispatcher.submit_sell('000660', 1, token=token)
+    for ticket in dup + [other]:
+        ticket.wait()
+    sent = standin.stats['by_api']['kt10001']['requests'] - before
+    inflight = [t.qty for t in dup if t.return_code == INFLIGHT_CODE]
+    assert all(t is dup[0] or t.return_code == INFLIGHT_CODE for t in dup), dup
+    assert all(q > dup[0].qty for q in inflight), (dup[0], inflight)
+    print(f"{'중복 매도 의도 5+1건':<30} | 전송 {sent}건, 005930 수량 {dup[0].qty}주 (합침 {dup[0].merged}회, 수량 증가 불가 {inflight})")
+
+    # 응답 후 체결 확인 전에는 같은 매도를 다시 보내지 않음
+    tracking = OrderDispatcher(workers=1, send_buy=send_buy, send_sell=send_sell)
+    tracking._fills_on_ack = lambda: False
+    first = tracking.submit_sell('035720', 2, token=token, held_before=2)
+    first.wait()
+    again = tracking.submit_sell('035720', 2, token=token, held_before=2, join=False)
+    tracking.observe_holdings(as_holdings([]))
+    after_fill = tracking.submit_sell('035720', 2, token=token, held_before=2, join=False)
+    after_fill.wait()
+    assert again is None and first.filled and after_fill is not None and after_fill.ok
+    print(f"{'응답 후 체결 전 재매도':<30} | 체결 전 재요청 전송 안 함 / 체결 확인 후 재요청 전송 ({tracking.counters['sent']}건)")
+
+    # 미체결 매수가 취소되면 체결 대기를 풀고 같은 매수를 다시 보냄 (자동 취소 / 실시간 '취소')
+    buy = tracking.submit_buy('000660', 3, 100000, token=token, held_before=0)
+    buy.wait()
+    blocked = tracking.submit_buy('000660', 3, 100000, token=token, held_before=0, join=False)
+    released = tracking.release('A000660', 'buy', '자동 취소')
+    rebuy = tracking.submit_buy('000660', 3, 100000, token=token, held_before=0, join=False)
+    rebuy.wait()
+    assert blocked is None and released and not buy.filled and rebuy is not None and rebuy is not buy and rebuy.ok
+    assert not tracking.release('000660', 'sell') and tracking.counters['released'] == 1
+    print(f"{'매수 취소 후 재매수':<30} | 취소 전 재요청 전송 안 함 / 취소 해제 후 재요청 전송 (대기 {len(tracking.awaiting())}건)")
+
+    # 3) 지연 백분위
+    stats = dispatcher.stats()
+    for name, label in (('queue', '의도→전송'), ('ack', '전송→응답'), ('total', '의도→체결')):
+        s = stats[name]
+        print(f"{label:<30} | p50 {s['p50']:.1f}ms / p95 {s['p95']:.1f}ms / p99 {s['p99']:.1f}ms (n={s['count']})")
+    print(f"\n카운터: {stats['counters']}")
+
+    http_session.close_session()
+    standin.stop()
+
+if __name__ == "__main__":
+    main()
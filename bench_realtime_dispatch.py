@@ -0,0 +1,103 @@
+"""
+실시간 메시지 수신 루프 처리량 벤치마크
+- RealTimeSearch.receive_messages에 녹화된(또는 생성한) 원본 메시지를 흘려 초당 처리 메시지 수 측정
+- 네트워크 없이 recv()만 흉내 내는 가짜 웹소켓 사용, 매수 프로세서(process_candidates)는 호출하지 않음
+- 1) 수신 루프 전체 (json 파싱 + trnm 분기 + REAL 해석 + current_prices / candidate_queue 갱신)
+- 2) REAL 항목 해석만 (kiwoom.realtime.decode_items)
+
+사용법: python bench_realtime_dispatch.py [녹화파일(한 줄에 메시지 하나)]
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+
+from rt_search import RealTimeSearch
+from kiwoom.realtime import decode_items
+
+MESSAGES = 50000
+CODES = [f"{i:06d}" for i in range(1, 301)]
+
+def make_payloads(count, seed=7):
+    """REAL 1~5건 묶음 메시지 위주 + PING 일부 (키움 실시간 응답 형식)"""
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(count):
+        if i % 50 == 0:
+            payloads.append(json.dumps({'trnm': 'PING'}))
+            continue
+        data = []
+        for _ in range(rng.randint(1, 5)):
+            code = rng.choice(CODES)
+            price = rng.randint(1000, 200000)
+            data.append({
+                'type': '0B', 'name': '주식체결', 'item': code,
+                'values': {
+                    '9001': 'A' + code,
+                    '10': f"{rng.choice('+-')}{price}",
+                    '11': f"{rng.choice('+-')}{rng.randint(0, 5000)}",
+                    '12': f"{rng.choice('+-')}{rng.uniform(0, 30):.2f}",
+                    '13': str(rng.randint(1000, 10000000)),
+                    '15': f"{rng.uniform(50, 300):.2f}",
+                    '20': '093015',
+                },
+            })
+        payloads.append(json.dumps({'trnm': 'REAL', 'data': data}, ensure_ascii=False))
+    return payloads
+
+class ReplaySocket:
+    """recv()마다 녹화된 메시지를 하나씩 반환, 다 쓰면 수신 루프 종료"""
+    def __init__(self, rts, payloads):
+        self.rts = rts
+        self.payloads = iter(payloads)
+
+    async def recv(self):
+        try:
+            return next(self.payloads)
+        except StopIteration:
+            self.rts.keep_running = False
+            return None
+
+    async def send(self, message):
+        pass
+
+async def run_loop(payloads):
+    rts = RealTimeSearch()
+    rts.connected = True
+    rts.websocket = ReplaySocket(rts, payloads)
+
+    async def no_buy(*args):
+        pass
+    rts.process_candidates = no_buy
+
+    start = time.perf_counter()
+    await rts.receive_messages()
+    return time.perf_counter() - start, rts
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r', encoding='utf-8') as f:
+            payloads = [line.strip() for line in f if line.strip()]
+        source = sys.argv[1]
+    else:
+        payloads = make_payloads(MESSAGES)
+        source = '생성 메시지'
+
+    elapsed, rts = asyncio.run(run_loop(payloads))
+    items = sum(len(json.loads(p).get('data') or ()) for p in payloads)
+    print(f"{'시나리오':<28} | {'결과':<40}")
+    print("-" * 72)
+    print(f"{'수신 루프 (' + source + ')':<28} | {len(payloads) / elapsed:,.0f} msg/s ({len(payloads):,}건 / {elapsed:.2f}s)")
+    print(f"{'  └ REAL 항목':<28} | {items / elapsed:,.0f} item/s, 현재가 {len(rts.current_prices)}종목 / 대기열 {len(rts.candidate_queue)}종목")
+
+    reals = [json.loads(p) for p in payloads]
+    reals = [m['data'] for m in reals if m.get('trnm') == 'REAL' and m.get('data')]
+    start = time.perf_counter()
+    for data in reals:
+        decode_items('REAL', data)
+    elapsed = time.perf_counter() - start
+    print(f"{'REAL 해석만 (decode_items)':<28} | {items / elapsed:,.0f} item/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+실시간 시세 구독 벤치마크 (전체 목록 재등록 vs SubscriptionManager 차분 전송)
+- 보유 HOLDINGS종목에서 매 단계 1종목 매도 + 1종목 매수가 STEPS번 반복되는 상황
+- 기존 방식: 바뀔 때마다 전체 코드 목록을 세미콜론으로 이어 재등록, 매도 종목 해지 없음
+- SubscriptionManager: 추가분 REG / 매도분 REMOVE만 전송
+- 한도(max_codes) 초과 시 우선순위 낮은 종목 제외, 재접속 후 같은 집합 재등록 확인
+
+사용법: python bench_realtime_subscriptions.py
+"""
+import json
+import random
+import asyncio
+
+from kiwoom.subscriptions import SubscriptionManager, PRIORITY_CANDIDATE
+
+HOLDINGS = 30
+STEPS = 200
+UNIVERSE = [f"{i:06d}" for i in range(1, 2001)]
+
+class Recorder:
+    """send_message 대신 보낸 메시지와 바이트 수 기록"""
+    def __init__(self):
+        self.messages = []
+        self.bytes = 0
+
+    async def send(self, message):
+        text = json.dumps(message)
+        self.messages.append(message)
+        self.bytes += len(text)
+
+def make_steps(seed=5):
+    rng = random.Random(seed)
+    held = rng.sample(UNIVERSE, HOLDINGS)
+    steps = []
+    for _ in range(STEPS):
+        held = list(held)
+        held.remove(rng.choice(held))
+        held.append(rng.choice([c for c in UNIVERSE if c not in held]))
+        steps.append(held)
+    return steps
+
+async def run_legacy(steps):
+    rec = Recorder()
+    subscribed = set()
+    for held in steps:
+        await rec.send({'trnm': 'REALREG', 'codes': ";".join(held)})
+        subscribed.update(held)  # 해지하지 않으므로 계속 늘어남
+    return rec, len(subscribed)
+
+async def run_manager(steps):
+    rec = Recorder()
+    manager = SubscriptionManager(rec.send)
+    for held in steps:
+        manager.set_group('holdings', held)
+        await manager.sync()
+    assert manager.registered == set(steps[-1])
+    return rec, len(manager.registered)
+
+async def check_limit_and_reconnect():
+    rec = Recorder()
+    manager = SubscriptionManager(rec.send, max_codes=5)
+    manager.set_group('holdings', ['000001', '000002', '000003'])
+    manager.set_group('candidates', ['000010', '000011', '000012', '000013'], PRIORITY_CANDIDATE)
+    await manager.sync()
+    kept = set(manager.registered)
+    assert {'000001', '000002', '000003'} <= kept and len(kept) == 5, kept
+
+    # 보유 종목이 늘면 후보 종목이 밀려남
+    manager.set_group('holdings', ['000001', '000002', '000003', '000004'])
+    await manager.sync()
+    kept = set(manager.registered)
+    assert '000004' in kept and len(kept) == 5 and manager.counters['evicted'] == 1, kept
+
+    rec.messages.clear()
+    await manager.resubscribe()
+    reg = [m for m in rec.messages if m['trnm'] == 'REG']
+    assert set(c for m in reg for c in m['data'][0]['item']) == kept
+    return manager
+
+def main():
+    steps = make_steps()
+    legacy, legacy_subs = asyncio.run(run_legacy(steps))
+    managed, managed_subs = asyncio.run(run_manager(steps))
+    print(f"{'방식':<20} | {'결과':<50}")
+    print("-" * 75)
+    print(f"{'전체 재등록':<20} | 메시지 {len(legacy.messages)}건 / {legacy.bytes:,} bytes, 마지막 구독 {legacy_subs}종목")
+    print(f"{'SubscriptionManager':<20} | 메시지 {len(managed.messages)}건 / {managed.bytes:,} bytes, 마지막 구독 {managed_subs}종목")
+    manager = asyncio.run(check_limit_and_reconnect())
+    print(f"{'한도 / 재접속 확인':<20} | {manager.format_stats()}")
+
+if __name__ == "__main__":
+    main()
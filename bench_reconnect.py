@@ -0,0 +1,160 @@
+"""
+웹소켓 재접속 벤치마크 (로컬 키움 실시간 흉내 서버)
+- 서버: LOGIN / CNSRLST / CNSRREQ / REG 응답, 등록 종목 체결 틱(0B)을 TICK_SEC마다 전송
+- DROP_AT초에 서버를 내리고 DOWN_SEC초 뒤 같은 포트로 다시 올림
+- 확인: 끊김 구간(GapMeter), 재접속 후 REG / CNSRREQ / 계좌 실시간 재등록, 끊김 중 fresh_prices()에서 오래된 가격 제외
+
+사용법: python bench_reconnect.py
+"""
+import json
+import time
+import random
+import asyncio
+
+import websockets
+
+import rt_search
+from rt_search import RealTimeSearch
+from kiwoom.reconnect import Backoff
+from kiwoom.subscriptions import ACCOUNT_GRP_NO
+
+HOLDINGS = ['000100', '000200']
+TICK_SEC = 0.02
+DROP_AT = 1.0
+DOWN_SEC = 1.5
+PRICE_MAX_AGE = 0.5
+
+class FakeRealtimeServer:
+    def __init__(self):
+        self.connections = 0
+        self.registered = []       # 연결별 REG 종목 집합
+        self.cnsrreq = []          # 연결별 CNSRREQ 실시간 등록 조건식
+        self.account = []          # 연결별 계좌 실시간(00 / 04) 등록 여부
+        self.server = None
+        self.port = None
+
+    async def handler(self, ws):
+        self.connections += 1
+        reg, cond = set(), set()
+        self.registered.append(reg)
+        self.cnsrreq.append(cond)
+        self.account.append(False)
+        index = len(self.account) - 1
+
+        async def ticker():
+            price = 10000
+            while True:
+                await asyncio.sleep(TICK_SEC)
+                price += 10
+                if reg:
+                    data = [{'type': '0B', 'item': c, 'values': {'9001': c, '10': f'+{price}', '12': '+1.00'}} for c in sorted(reg)]
+                    await ws.send(json.dumps({'trnm': 'REAL', 'data': data}))
+
+        task = asyncio.create_task(ticker())
+        try:
+            async for raw in ws:
+                msg = json.loads(raw)
+                trnm = msg.get('trnm')
+                if trnm == 'LOGIN':
+                    await ws.send(json.dumps({'trnm': 'LOGIN', 'return_code': 0}))
+                elif trnm == 'CNSRLST':
+                    await ws.send(json.dumps({'trnm': 'CNSRLST', 'return_code': 0, 'data': [['0', '테스트조건']]}))
+                elif trnm == 'CNSRREQ':
+                    if msg.get('search_type') == '1':
+                        cond.add(msg['seq'])
+                    await ws.send(json.dumps({'trnm': 'CNSRREQ', 'seq': msg['seq'], 'return_code': 0, 'data': [{'jmcode': 'A000300'}]}))
+                elif trnm == 'REG' and msg.get('grp_no') == ACCOUNT_GRP_NO:
+                    self.account[index] = True
+                    await ws.send(json.dumps({'trnm': trnm, 'grp_no': ACCOUNT_GRP_NO, 'return_code': 0}))
+                elif trnm in ('REG', 'REMOVE'):
+                    items = msg['data'][0]['item']
+                    if trnm == 'REG':
+                        reg.update(items)
+                    else:
+                        reg.difference_update(items)
+                    await ws.send(json.dumps({'trnm': trnm, 'return_code': 0}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            task.cancel()
+
+    async def up(self, port=0):
+        self.server = await websockets.serve(self.handler, '127.0.0.1', port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def down(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+async def run():
+    server = FakeRealtimeServer()
+    await server.up()
+
+    # REST 호출(잔고 / 토큰) 없이 소켓 동작만 확인
+    rt_search.get_my_stocks = lambda token=None: []
+    rt_search.get_token = lambda: 'TOKEN'
+
+    rts = RealTimeSearch()
+    rts.socket_url = f'ws://127.0.0.1:{server.port}'
+    rts.backoff = Backoff(base=0.2, cap=1.0, rng=random.Random(1))
+
+    async def no_buy(*args):
+        pass
+    rts.process_candidates = no_buy
+
+    rts.keep_running = True
+    await rts.connect('TOKEN')
+    rts.receive_task = asyncio.create_task(rts.receive_messages())
+    await asyncio.wait_for(rts.logged_in.wait(), 5)
+    rts.purchased_stocks.update(HOLDINGS)
+    await rts.register_stocks_realtime(list(rts.purchased_stocks))
+    rts.refresh_task = asyncio.create_task(rts._auto_refresh_loop())
+
+    await asyncio.sleep(DROP_AT)
+    before = set(server.registered[-1])
+    await server.down()
+    dropped_at = time.time()
+
+    # 끊김 중 가격 신선도
+    await asyncio.sleep(PRICE_MAX_AGE + 0.2)
+    stale_raw = len(rts.current_prices)
+    stale_fresh = len(rts.current_prices.fresh(PRICE_MAX_AGE, rts.subscriptions.registered, last_msg=rts.last_msg_time))
+
+    await asyncio.sleep(max(0, DOWN_SEC - (time.time() - dropped_at)))
+    await server.up(server.port)
+    start = time.time()
+    while not (rts.logged_in.is_set() and rts.connected) or server.connections < 2:
+        await asyncio.sleep(0.01)
+        if time.time() - start > 10:
+            raise RuntimeError('재접속 실패')
+    await asyncio.sleep(0.3)
+    after = set(server.registered[-1])
+    fresh_after = len(rts.current_prices.fresh(PRICE_MAX_AGE, rts.subscriptions.registered, last_msg=rts.last_msg_time))
+    account_feed = rts.live_account.feed_since is not None
+
+    rts.keep_running = False
+    rts.refresh_task.cancel()
+    for task in (rts.refresh_task, rts.receive_task, rts.consume_task):
+        if task:
+            task.cancel()
+    await rts._close_socket()
+    await server.down()
+    return rts, server, before, after, (stale_raw, stale_fresh, fresh_after), account_feed
+
+def main():
+    rts, server, before, after, (stale_raw, stale_fresh, fresh_after), account_feed = asyncio.run(run())
+    assert before <= after, (before, after)
+    assert server.account == [True, True] and account_feed, server.account
+    assert stale_fresh == 0 and fresh_after >= len(HOLDINGS), (stale_fresh, fresh_after)
+    print(f"{'항목':<24} | {'결과':<50}")
+    print("-" * 80)
+    print(f"{'서버 다운 구간':<24} | {DOWN_SEC:.1f}s (백오프 base 0.2s, cap 1.0s)")
+    print(f"{'측정된 끊김':<24} | {rts.gaps.format_stats()}")
+    print(f"{'재등록 (REG)':<24} | 끊기기 전 {sorted(before)} → 재접속 후 {sorted(after)}")
+    print(f"{'재등록 (CNSRREQ)':<24} | 연결별 실시간 조건식 {[sorted(c) for c in server.cnsrreq]}")
+    print(f"{'재등록 (계좌 00/04)':<24} | 연결별 {server.account}")
+    print(f"{'끊김 중 가격':<24} | current_prices {stale_raw}종목 / fresh {stale_fresh}종목 (max_age {PRICE_MAX_AGE}s)")
+    print(f"{'재접속 후 가격':<24} | fresh {fresh_after}종목")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+RealKiwoomAPI 오프라인 부하/지연 벤치마크 (키움 대역 서버 사용)
+- kiwoom_standin_server를 같은 프로세스에서 띄우고 RealKiwoomAPI의 실제 HTTP 경로(공용 세션, 재시도,
+  호출 제한기, 계좌 조회 캐시, 연속조회)를 그대로 호출
+- 1) 순차 호출 지연 (서버 지연 20±5ms)
+- 2) 스레드 동시 잔고 조회 → 서버 도달 요청 수 (account_cache 합치기 확인)
+- 3) 서버 초당 한도 초과 시 1700 응답 → penalize 후 재시도로 최종 성공률 확인
+- 4) 1분봉 연속조회 (cont-yn / next-key 3페이지)
+
+사용법: python bench_standin_load.py
+"""
+import time
+import statistics
+import threading
+
+from kiwoom_standin_server import KiwoomStandin, PAGE_ROWS
+from kiwoom.real_api import RealKiwoomAPI
+from kiwoom.paginator import iter_rows
+from kiwoom.rate_limiter import rate_limiter
+from kiwoom.account_cache import account_cache
+from kiwoom import http_session
+
+CALLS = 50
+THREADS = 8
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[max(0, int(len(samples) * 0.99) - 1)]
+
+def main():
+    standin = KiwoomStandin(port=0, latency_ms=20, jitter_ms=5, seed=1).start()
+    api = RealKiwoomAPI()
+    api.host_url = standin.url
+    # 벤치마크는 서버 한도를 직접 시험하므로 클라이언트 한도를 넉넉하게
+    rate_limiter.configure(global_limit=(200.0, 20), tr_limits={'kt00001': None, 'kt00004': None, 'ka10075': None})
+
+    token = api.get_token()
+    assert token and token.startswith('STANDIN'), token
+
+    # 1) 순차 호출 지연 (ka10004 호가, 캐시 없음)
+    samples = []
+    for _ in range(CALLS):
+        start = time.perf_counter()
+        price = api.get_current_price('005930', token)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert price == 71300, price
+    p50, p99 = percentiles(samples)
+    print(f"{'시나리오':<28} | {'결과':<40}")
+    print("-" * 72)
+    print(f"{'순차 ka10004 x' + str(CALLS):<28} | p50 {p50:.1f}ms / p99 {p99:.1f}ms (서버 지연 20±5ms)")
+
+    # 2) 동시 잔고 조회 합치기
+    account_cache.invalidate()
+    before = standin.stats['by_api'].get('kt00001', {}).get('requests', 0)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(api.get_balance(token))) for _ in range(THREADS)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    served = standin.stats['by_api']['kt00001']['requests'] - before
+    assert len(set(results)) == 1 and results[0][0] > 0, results
+    print(f"{'동시 kt00001 x' + str(THREADS) + ' 스레드':<28} | 서버 도달 {served}건")
+
+    # 3) 서버 초당 한도 3건 → 1700 응답 후 penalize / 재시도
+    standin.configure(latency_ms=2, jitter_ms=0, max_rps=3)
+    ok = 0
+    start = time.perf_counter()
+    for _ in range(12):
+        account_cache.invalidate()
+        if api.get_balance(token)[0] > 0:
+            ok += 1
+    elapsed = time.perf_counter() - start
+    throttled = standin.stats['by_api']['kt00001']['throttled']
+    print(f"{'kt00001 x12 (서버 3rps 한도)':<28} | 성공 {ok}/12, 1700 응답 {throttled}건, {elapsed:.1f}s")
+
+    # 4) 연속조회 3페이지
+    standin.configure(max_rps=0)
+    headers = {'Content-Type': 'application/json;charset=UTF-8', 'authorization': f'Bearer {token}', 'api-id': 'ka10080'}
+    start = time.perf_counter()
+    rows = list(iter_rows(standin.url + '/api/dostk/chart', headers, {'stk_cd': '005930', 'tic_scope': '1'}, ('stk_min_pole_chart_qry',)))
+    assert len(rows) == PAGE_ROWS * 3, len(rows)
+    print(f"{'ka10080 연속조회':<28} | {len(rows)}행 / {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    print(f"\n서버 통계: 총 {standin.stats['requests']}건, 1700 {standin.stats['throttled']}건")
+    http_session.close_session()
+    standin.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+실시간 틱 버퍼 벤치마크 (폭주 구간에서 수신 루프 직접 처리 vs TickBuffer)
+- 초당 ARRIVAL_RATE틱이 CODES개 종목에 고르게 도착, 틱 1건 반영 비용 APPLY_COST_US(μs) → 처리 능력보다 빠른 유입
+- 직접 처리: 수신 루프가 틱마다 바로 반영 → 밀린 만큼 지연 누적
+- TickBuffer: 수신 루프는 put만, 소비 태스크가 종목별 최신 틱만 반영 → 지난 틱은 합쳐 버리고 지연 유지
+- 지연 = 도착 예정 시각 → 반영 시각
+
+사용법: python bench_tick_buffer.py
+"""
+import time
+import random
+import asyncio
+
+from kiwoom.realtime import RealTick
+from tick_buffer import TickBuffer
+from utils import percentile
+
+CODES = [f"{i:06d}" for i in range(1, 301)]
+TICKS = 60000
+ARRIVAL_RATE = 40000      # 초당 도착 틱 수
+APPLY_COST_US = 50        # 틱 1건 반영 비용 (처리 능력 초당 20,000틱)
+PER_MESSAGE = 5
+
+def make_ticks(seed=11):
+    rng = random.Random(seed)
+    return [RealTick(rng.choice(CODES), rng.randint(1000, 200000), rng.uniform(-5, 30), None, None) for _ in range(TICKS)]
+
+def apply(tick):
+    end = time.perf_counter() + APPLY_COST_US / 1e6
+    while time.perf_counter() < end:
+        pass
+
+async def arrivals(ticks, on_message):
+    """
+    PER_MESSAGE틱 묶음을 도착 예정 시각에 맞춰 전달
+    처리가 밀려 예정 시각이 지난 메시지는 소켓 수신 버퍼에 쌓인 것처럼 한꺼번에 전달한 뒤 양보
+    """
+    start = time.perf_counter()
+    interval = PER_MESSAGE / ARRIVAL_RATE
+    messages = [(start + n * interval, ticks[i:i + PER_MESSAGE]) for n, i in enumerate(range(0, len(ticks), PER_MESSAGE))]
+    pos = 0
+    while pos < len(messages):
+        now = time.perf_counter()
+        while pos < len(messages) and messages[pos][0] <= now:
+            due, batch = messages[pos]
+            on_message(batch, due)
+            pos += 1
+        wait = messages[pos][0] - time.perf_counter() if pos < len(messages) else 0
+        await asyncio.sleep(max(0, wait))
+
+async def run_inline(ticks):
+    lags = []
+    def on_message(batch, due):
+        for tick in batch:
+            apply(tick)
+        lags.append(time.perf_counter() - due)
+    start = time.perf_counter()
+    await arrivals(ticks, on_message)
+    return time.perf_counter() - start, sorted(lags), len(ticks)
+
+async def run_buffer(ticks):
+    buffer = TickBuffer(clock=time.perf_counter)
+    applied = [0]
+    done = asyncio.Event()
+
+    async def consume():
+        while not (done.is_set() and not len(buffer)):
+            await buffer.wait()
+            for tick in buffer.drain():
+                apply(tick)
+                applied[0] += 1
+            await asyncio.sleep(0)
+
+    def on_message(batch, due):
+        for tick in batch:
+            buffer.put(tick, now=due)
+
+    consumer = asyncio.create_task(consume())
+    start = time.perf_counter()
+    await arrivals(ticks, on_message)
+    done.set()
+    buffer._event.set()
+    await consumer
+    elapsed = time.perf_counter() - start
+    return elapsed, sorted(buffer._lags), applied[0], buffer
+
+def fmt(lags):
+    return f"지연 p50 {percentile(lags, 50) * 1000:.0f}ms / p95 {percentile(lags, 95) * 1000:.0f}ms / max {lags[-1] * 1000:.0f}ms"
+
+def main():
+    ticks = make_ticks()
+    t_inline, lags_inline, n_inline = asyncio.run(run_inline(ticks))
+    t_buf, lags_buf, n_buf, buffer = asyncio.run(run_buffer(ticks))
+    print(f"유입 {ARRIVAL_RATE:,}틱/s x {TICKS:,}틱, 반영 비용 {APPLY_COST_US}μs/틱 (처리 능력 {1e6 / APPLY_COST_US:,.0f}틱/s)")
+    print(f"{'방식':<16} | {'결과':<60}")
+    print("-" * 80)
+    print(f"{'직접 처리':<16} | {t_inline:.2f}s, 반영 {n_inline:,}틱, {fmt(lags_inline)}")
+    print(f"{'TickBuffer':<16} | {t_buf:.2f}s, 반영 {n_buf:,}틱, {fmt(lags_buf)}")
+    print(f"{'  └ 버퍼 통계':<16} | {buffer.format_stats()}")
+
+if __name__ == "__main__":
+    main()
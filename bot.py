@@ -27,14 +27,20 @@ from database import init_db, log_asset_history, log_price_history, get_watering
 from database_helpers import save_system_status, get_pending_web_command, mark_web_command_completed, save_setting, get_bot_running
 # from dashboard import run_dashboard_server # Subprocess로 실행됨
 # [Mock Server Integration] Use kiwoom_adapter for automatic Real/Mock API switching
-from kiwoom_adapter import fn_kt00004 as get_my_stocks, get_account_data, get_total_eval_amt, get_current_api_mode
-from kiwoom_adapter import fn_kt00001 as get_balance
+from kiwoom_adapter import fn_kt00004 as get_my_stocks, get_total_eval_amt, get_current_api_mode
+from account_snapshot import account_snapshot
+from live_account import ACCOUNT_RECONCILE_SEC
+from order_dispatcher import order_dispatcher
+from kiwoom.records import as_holdings
 from check_n_buy import chk_n_buy, reset_accumulation_global
 from candle_manager import candle_manager
 from response_manager import response_manager
 from voice_generator import speak
 from analyze_tools import get_rsi_for_timeframe
 
+# [Web Command] 푸시 알림 유실 대비 DB 확인 주기(초)
+WEB_COMMAND_POLL_INTERVAL = 5.0
+
 class MainApp:
 	def __init__(self):
 		self.chat_command = ChatCommand()
@@ -94,6 +100,11 @@ class MainApp:
 		# [Heartbeat]
 		self._init_heartbeat()
 		
+		# [Web Command] 푸시 알림 수신 상태 (run()에서 리스너 시작)
+		self.web_cmd_event = None
+		self.web_cmd_transport = None
+		self.last_web_cmd_poll = 0
+		
 		# [AI Recommender] - New
 		from ai_recommender import AIRecommender
 		self.ai_recommender = AIRecommender(self._on_ai_recommendation)
@@ -137,6 +148,36 @@ class MainApp:
 		self.hb_addr = ('127.0.0.1', 5005)
 		self.last_hb_time = 0
 
+	# [Web Command] 웹 명령 도착 알림 수신 (UDP, web_server의 add_web_command가 전송)
+	async def _init_web_command_listener(self):
+		from database_helpers import WEB_COMMAND_NOTIFY_ADDR
+		self.web_cmd_event = asyncio.Event()
+		self.web_cmd_event.set() # 시작 시 1회 조회 (재시작 전에 쌓인 pending 명령 재처리)
+		event = self.web_cmd_event
+
+		class _WebCommandProtocol(asyncio.DatagramProtocol):
+			def datagram_received(self, data, addr):
+				event.set()
+
+		try:
+			self.web_cmd_transport, _ = await self.loop.create_datagram_endpoint(
+				_WebCommandProtocol, local_addr=WEB_COMMAND_NOTIFY_ADDR)
+			logger.info(f"[Web Command] 명령 알림 수신 대기: {WEB_COMMAND_NOTIFY_ADDR[0]}:{WEB_COMMAND_NOTIFY_ADDR[1]}")
+		except OSError as e:
+			# 포트 사용 중 등 → 기존처럼 매 루프 DB 폴링
+			self.web_cmd_transport = None
+			logger.warning(f"[Web Command] 알림 포트 바인드 실패, DB 폴링으로 동작: {e}")
+
+	async def _wait_web_command(self, timeout):
+		"""일시정지 대기 중에도 웹 명령이 도착하면 즉시 깨어남"""
+		if self.web_cmd_event is None or self.web_cmd_transport is None:
+			await asyncio.sleep(timeout)
+			return
+		try:
+			await asyncio.wait_for(self.web_cmd_event.wait(), timeout)
+		except asyncio.TimeoutError:
+			pass
+
 	def _send_heartbeat(self):
 		"""도그에게 생존 신고 (UDP 패킷 전송)"""
 		try:
@@ -468,8 +509,21 @@ class MainApp:
 			# [Fix] 함수 시작 부분에서 미리 import하여 Scope 문제 방지
 			from database_helpers import mark_web_command_completed, save_setting, set_bot_running
 
+			# [Push] 알림이 없으면 DB 조회 생략 (알림 유실 대비 WEB_COMMAND_POLL_INTERVAL마다 1회 확인)
+			now = time.time()
+			if self.web_cmd_transport is not None and not self.web_cmd_event.is_set() \
+					and now - self.last_web_cmd_poll < WEB_COMMAND_POLL_INTERVAL:
+				return
+			self.last_web_cmd_poll = now
+
+			# 조회 전에 알림 해제 (조회 도중 도착한 알림은 다음 루프에서 처리)
+			if self.web_cmd_event is not None:
+				self.web_cmd_event.clear()
 			cmd_info = get_pending_web_command()
 			if cmd_info:
+				# 여러 명령이 쌓인 경우를 위해 다음 루프에서 한 번 더 조회
+				if self.web_cmd_event is not None:
+					self.web_cmd_event.set()
 				command = cmd_info.get('command')
 				cmd_id = cmd_info.get('id')
 				
@@ -504,10 +558,9 @@ class MainApp:
 					
 					# [Immediate Refresh] 즉시 데이터 갱신하여 UI 반영
 					logger.info("🔄 [System] 데이터 즉시 갱신 중...")
-					loop = asyncio.get_running_loop()
-					stocks, bal, bal_data = await self._update_market_data(loop)
-					if stocks is not None:
-						await self._update_status_json(stocks, bal_data, bal)
+					snapshot = await self._update_market_data()
+					if snapshot is not None:
+						await self._update_status_json(snapshot.stocks(), snapshot.balance_data(), snapshot.balance)
 					
 					logger.info("✅ [System] 재초기화 및 데이터 동기화 완료.")
 					
@@ -540,29 +593,33 @@ class MainApp:
 		except Exception as e:
 			logger.error(f"❌ 웹 명령 처리 중 오류: {e}")
 
-	async def _update_market_data(self, loop):
-		"""API에서 계좌/잔고 정보를 가져오고 실시간 현재가를 패치합니다 (Refactoring Helper)"""
-		# [Fix] Sequential API calls to avoid Error 1700 (Rate Limit)
+	async def _update_market_data(self):
+		"""
+		API에서 계좌/잔고/미체결 정보를 가져오고 실시간 현재가를 패치하여 AccountSnapshot으로 발행합니다 (Refactoring Helper)
+		[Live Fill] 주문체결 / 잔고 실시간이 연결돼 있으면 REST 조회는 account_reconcile_sec마다만 하고,
+		그 사이에는 마지막 REST 결과에 실시간 체결을 반영한 메모리 잔고(rt_search.live_account)로 발행
+		실패 시 None 반환
+		"""
+		live_account = self.chat_command.rt_search.live_account
+		try:
+			reconcile_sec = float(get_setting('account_reconcile_sec', ACCOUNT_RECONCILE_SEC))
+		except Exception:
+			reconcile_sec = ACCOUNT_RECONCILE_SEC
+		if not live_account.needs_rest(reconcile_sec, order_dispatcher.awaiting()):
+			current_stocks, acnt_summary, current_balance, out_orders = live_account.view()
+			return self._publish_snapshot(current_stocks, acnt_summary, current_balance, out_orders)
+
+		# [Fix] 보유 종목/예수금/미체결 조회를 동시에 요청 (Error 1700은 kiwoom.rate_limiter가 호출 간격으로 방지)
 		try:
 			self.total_api_calls += 1
 			
-			# 1. 보유 종목 조회
-			# logger.debug("API 요청: get_account_data")
-			acnt_data = await loop.run_in_executor(None, get_account_data, 'N', '', self.chat_command.token)
-			if acnt_data and acnt_data[1]: # 요약 데이터(summary)가 있어야 정상 응답
-				current_stocks, acnt_summary = acnt_data
-			else:
+			# 1. 보유 종목 + 예수금/잔고 + 미체결 동시 조회 (비동기 API, 스레드 풀 미사용)
+			current_stocks, acnt_summary, current_balance, out_orders = await account_snapshot.fetch(self.chat_command.token)
+			if not acnt_summary: # 요약 데이터(summary)가 있어야 정상 응답
 				# [Fix] 요약 데이터가 없으면 API 실패로 간주하여 빈 리스트로 덮어쓰지 않음
 				# (단, RealKiwoomAPI가 실패 시 ([], {})를 반환하므로 이를 감지)
 				logger.warning("[API Warning] 보유 종목 조회 실패 (Empty Summary) -> 기존 상태 유지")
 				current_stocks, acnt_summary = None, None
-				
-			# 2. 짧은 대기 (호출 집중 방지)
-			await asyncio.sleep(0.5)
-			
-			# 3. 예수금/잔고 조회
-			# logger.debug("API 요청: get_balance")
-			current_balance = await loop.run_in_executor(None, get_balance, 'N', '', self.chat_command.token)
 			
 			# [센스: 데이터 검증] 데이터가 정상적으로 왔는지 체크
 			if current_balance is None or (current_balance[0] == 0 and current_balance[2] == 0 and not current_stocks):
@@ -583,27 +640,32 @@ class MainApp:
 				from tel_send import tel_send
 				tel_send(f"⚠️ [긴급] 키움 API 통신이 5회 연속 실패 중입니다. 조치가 필요할 수 있습니다. (장애 여부 확인 요망)")
 			
-			return None, None, None # 실패 시 빈 값 반환
+			return None # 실패 시 빈 값 반환
 		
-		# Balance Data 구조화
-		balance_data = None
-		if current_balance:
-			# current_balance: (ord_alow, tot_evlu_amt, deposit)
-			balance_data = {
-				'balance': current_balance[0],
-				'deposit': current_balance[2],
-				'net_asset': current_balance[2] + current_balance[1] 
-			}
+		if current_stocks is None:
+			return None
 
-		# 2. 실시간 가격 패치 (Real-time Price Patching)
-		if current_stocks and self.chat_command.rt_search.current_prices:
+		# [Live Fill] REST 결과를 실시간 잔고의 기준으로 맞추고, 방금 받은 실시간 체결은 REST 반영 지연으로 보고 유지
+		mismatched = live_account.reconcile(current_stocks, acnt_summary, current_balance, out_orders)
+		if mismatched:
+			logger.warning(f"[Live Fill] REST 잔고와 실시간 잔고 불일치 {mismatched} -> REST 기준으로 맞춤")
+		if live_account.live:
+			current_stocks, acnt_summary, current_balance, out_orders = live_account.view()
+		return self._publish_snapshot(current_stocks, acnt_summary, current_balance, out_orders)
+
+	def _publish_snapshot(self, current_stocks, acnt_summary, current_balance, out_orders):
+		"""실시간 현재가 패치 후 AccountSnapshot 발행 + 주문 체결 판정"""
+		# 2. 실시간 가격 패치 (Real-time Price Patching) - 오래된 가격(소켓 끊김 등)은 제외
+		realtime_prices = self.chat_command.rt_search.fresh_prices() if current_stocks else None
+		if current_stocks and realtime_prices:
 			for stock in current_stocks:
-				code = normalize_stock_code(stock.get('stk_cd', ''))
-				if code in self.chat_command.rt_search.current_prices:
-					new_price = self.chat_command.rt_search.current_prices[code]
+				code = stock.code
+				if code in realtime_prices:
+					new_price = realtime_prices[code]
 					try:
-						curr_qty = int(stock.get('rmnd_qty', '0'))
-						avg_price = float(stock.get('avg_prc', stock.get('pchs_avg_pric', '0')))
+						# [Fix] 수량/평단은 API 계층에서 파싱된 값 사용 (kiwoom.records.Holding)
+						curr_qty = stock.qty
+						avg_price = stock.avg_price
 						
 						# 값 갱신
 						stock['cur_prc'] = str(new_price)
@@ -617,12 +679,15 @@ class MainApp:
 							stock['evlu_amt'] = str(new_eval)
 							stock['pl_amt'] = str(int(new_pl))
 							stock['pl_rt'] = f"{new_rate:.2f}"
-						
-						# [Candle] 틱 데이터 추가
-						candle_manager.add_tick(code, new_price)
+						# [Candle] 틱 데이터는 실시간 틱 소비 루프(rt_search._apply_ticks)에서 추가
 					except: pass
-					
-		return current_stocks, current_balance, balance_data
+		
+		# 3. 한 시점의 불변 스냅샷으로 발행 (current_balance: (ord_alow, tot_evlu_amt, deposit))
+		snapshot = account_snapshot.publish(current_stocks, acnt_summary, current_balance, out_orders)
+
+		# [Order Dispatcher] 보유 수량 변화로 전송한 주문의 체결 시각 기록 (주문 지연 통계용)
+		order_dispatcher.observe_holdings(snapshot.holdings)
+		return snapshot
 
 	async def _sync_holdings(self, current_stocks, balance_data):
 		"""API 데이터와 내부 보유 목록 동기화 (Refactoring Helper)"""
@@ -656,7 +721,7 @@ class MainApp:
 		# 3. [추가] 부분 누락 탐지 (목표 종목이 여럿인데 일부만 온 경우)
 		elif api_count > 0 and api_count < (internal_count - 1):
 			# 리스트의 평가금 합산
-			list_eval_sum = sum(int(float(str(s.get('evlu_amt', 0)).replace(',',''))) for s in current_stocks)
+			list_eval_sum = sum(int(s.api_eval_amt) for s in as_holdings(current_stocks))
 			# 요약 자산(eval_amt)과 리스트 합산의 차이가 큼 (예: 30% 이상)
 			if eval_amt > 0 and list_eval_sum < (eval_amt * 0.7):
 				logger.warning(f"[Sync 스킵] API 목록({api_count}개, 합 {list_eval_sum:,.0f}원) vs 요약 평가금({eval_amt:,.0f}원) 괴리 - 부분 누락 의심")
@@ -745,29 +810,13 @@ class MainApp:
 			cumulative_ratios.append(curr_s / total_weight)
 			
 		# [Stable Basis] 원금 기준 자산 추정 (UI 단계 고정용)
+		# [Fix] 숫자 필드는 API 계층에서 한 번만 파싱 (kiwoom.records.Holding)
+		current_stocks = as_holdings(current_stocks)
 		temp_pur_sum = 0
 		temp_eval_sum = 0
 		if current_stocks:
-			for s in current_stocks:
-				try:
-					# 매입금액 합계
-					p_val = 0
-					p_raw = str(s.get('pchs_amt', s.get('pur_amt', '0'))).replace(',', '')
-					if p_raw != '0': p_val = int(float(p_raw))
-					else:
-						qty = int(float(str(s.get('rmnd_qty', '0')).replace(',','')))
-						avg = float(str(s.get('pchs_avg_pric', s.get('avg_prc','0'))).replace(',',''))
-						p_val = int(qty * avg)
-					temp_pur_sum += p_val
-
-					# 평가금액 합계
-					val = int(float(str(s.get('evlu_amt', '0')).replace(',','')))
-					if val == 0: 
-						prc = int(float(str(s.get('cur_prc', '0')).replace(',','')))
-						qty = int(float(str(s.get('rmnd_qty', '0')).replace(',','')))
-						val = prc * qty
-					temp_eval_sum += val
-				except: pass
+			temp_pur_sum = sum(int(s.pur_amt) for s in current_stocks)
+			temp_eval_sum = sum(int(s.eval_amt) for s in current_stocks)
 		
 		# 유저 요청: 원금 기준(Principal Basis)으로 단계 계산 고정
 		total_asset_basis = deposit + temp_pur_sum
@@ -789,56 +838,24 @@ class MainApp:
 		if current_stocks:
 			for s in current_stocks:
 				try:
-					# 1. 평가금/손익 계산
-					evlu = 0
-					val_raw = str(s.get('evlu_amt', '0')).replace(',', '')
-					if val_raw != '0': evlu = int(float(val_raw))
-					else:
-						prc = int(float(str(s.get('cur_prc', '0')).replace(',', '')))
-						qty = int(float(str(s.get('rmnd_qty', '0')).replace(',', '')))
-						evlu = prc * qty
-					
-					pl = 0
-					pl_raw = str(s.get('pl_amt', s.get('evlu_pfls_amt', '0'))).replace(',', '')
-					if pl_raw != '0': pl = int(float(pl_raw))
-					else:
-						prc = int(float(str(s.get('cur_prc', '0')).replace(',', '')))
-						avg = float(str(s.get('pchs_avg_pric', s.get('avg_prc','0'))).replace(',', ''))
-						qty = int(float(str(s.get('rmnd_qty', '0')).replace(',', '')))
-						if avg > 0: pl = int((prc - avg) * qty)
-
-
-					# 2. 매입금 누적 (아래 Clean Data 처리 구문에서 통합 처리됨)
-					# 3. GUI 아이템 생성 (Clean Data)
-					# API 원본 데이터에서 필요한 값만 추출하여 깨끗한 정수/실수형으로 변환
+					# 1. GUI 아이템 생성 (Clean Data)
+					# API 계층에서 파싱된 정수/실수 값만 추출
 					item = {}
-					code = normalize_stock_code(s.get('stk_cd', ''))
+					code = s.code
 					item['stk_cd'] = code
 					item['stk_nm'] = s.get('stk_nm', '')
 					
 					# 수량 (rmnd_qty or hold_qty)
-					qty = 0
-					try:
-						q_str = str(s.get('rmnd_qty', s.get('hold_qty', '0'))).replace(',', '')
-						qty = int(float(q_str))
-					except: pass
+					qty = s.qty
 					item['qty'] = qty
 					item['rmnd_qty'] = qty # 호환성 유지
 					
 					# 평균단가 (pchs_avg_pric or avg_prc)
-					avg_prc = 0.0
-					try:
-						ap_str = str(s.get('pchs_avg_pric', s.get('avg_prc', '0'))).replace(',', '')
-						avg_prc = float(ap_str)
-					except: pass
+					avg_prc = s.avg_price
 					item['avg_prc'] = avg_prc
 					
 					# 현재가 (cur_prc) - 0인 경우 방어
-					cur_prc = 0
-					try:
-						cp_str = str(s.get('cur_prc', '0')).replace(',', '')
-						cur_prc = int(float(cp_str))
-					except: pass
+					cur_prc = int(s.cur_price)
 					
 					if cur_prc == 0 and avg_prc > 0:
 						# [Fix] 현재가가 0이면(오류) 평단가로 대체하여 수익률 -100% 방지
@@ -847,23 +864,12 @@ class MainApp:
 					
 					item['cur_prc'] = cur_prc
 					
-					# 매입금액 (pur_amt or pchs_amt)
-					pur_amt = 0
-					try:
-						pa_str = str(s.get('pchs_amt', s.get('pur_amt', '0'))).replace(',', '')
-						pur_amt = int(float(pa_str)) # float -> int
-					except:
-						# 없을 경우 역산
-						if qty > 0 and avg_prc > 0:
-							pur_amt = int(avg_prc * qty)
+					# 매입금액 (pur_amt or pchs_amt, 없으면 평단 × 수량)
+					pur_amt = int(s.pur_amt)
 					item['pur_amt'] = pur_amt
 					
 					# 평가금액 (evlt_amt or evlu_amt)
-					evlt_amt = 0
-					try:
-						ea_str = str(s.get('evlu_amt', s.get('evlt_amt', '0'))).replace(',', '')
-						evlt_amt = int(float(ea_str))
-					except: pass
+					evlt_amt = int(s.eval_amt)
 					
 					# [재계산] 현재가가 보정(0->평단가)되었거나, 평가금액이 0이면 직접 계산
 					if evlt_amt == 0 or (cur_prc > 0 and abs(evlt_amt - (cur_prc * qty)) > evlt_amt * 0.1):
@@ -872,13 +878,8 @@ class MainApp:
 					
 					item['evlt_amt'] = evlt_amt
 					
-					# [Fix] 2. 평가손익 (pl_amt) - API 원본 우선 사용
-					pl_amt = 0
-					try:
-						# API 필드: pl_amt 또는 evlu_pfls_amt
-						pl_str = str(s.get('pl_amt', s.get('evlu_pfls_amt', '0'))).replace(',', '')
-						pl_amt = int(float(pl_str))
-					except: pass
+					# [Fix] 2. 평가손익 (pl_amt) - API 원본(pl_amt 또는 evlu_pfls_amt) 우선 사용
+					pl_amt = int(s.pl_amt)
 					
 					# UI 전달용 평균가
 					item['pchs_avg_pric'] = int(avg_prc)
@@ -897,12 +898,7 @@ class MainApp:
 					total_buy_sum += pur_amt
 					
 					# 3. 수익률 (pl_rt) - API 원본 우선 사용
-					pl_rt = 0.0
-					try:
-						# API 필드: pl_rt 또는 pfit_rt
-						rt_str = str(s.get('pl_rt', s.get('pfit_rt', '0'))).replace(',', '')
-						pl_rt = float(rt_str)
-					except: pass
+					pl_rt = s.pl_rate
 
 					# API 수익률이 0이거나 사용자가 강제 재계산을 원할 경우 (현재가/평단가 기준)
 					if (pl_rt == 0.0 or True) and avg_prc > 0 and cur_prc > 0:
@@ -1097,6 +1093,7 @@ class MainApp:
 	async def run(self):
 		"""메인 실행 루프"""
 		self.loop = asyncio.get_running_loop()
+		await self._init_web_command_listener()
 		logger.info("="*50)
 		logger.info("키움 자동매매 봇 시작")
 		logger.info("="*50)
@@ -1120,6 +1117,14 @@ class MainApp:
 
 		# [System] 초기화
 		reset_accumulation_global()
+
+		# [Stock Master] 종목 마스터 적재 (거래일이 바뀌었으면 전 종목 재조회, 이후 조회는 메모리)
+		try:
+			from stock_master import load_stock_master
+			count = await asyncio.get_event_loop().run_in_executor(None, load_stock_master, self.chat_command.token)
+			logger.info(f"[Startup] 종목 마스터 {count}종목")
+		except Exception as e:
+			logger.error(f"종목 마스터 적재 실패: {e}")
 			
 		# [자동 시작] 프로그램 실행 시 즉시 시작 (User requirement)
 		logger.info("[Startup] 시스템 자동 시작...")
@@ -1260,18 +1265,18 @@ class MainApp:
 				# [Pause Check] 일시정지 상태 확인 (manual_stop 플래그 우선)
 				if self.manual_stop:
 					self._send_heartbeat()
-					await asyncio.sleep(1)
+					await self._wait_web_command(1)
 					continue
 				
 				from database_helpers import get_bot_running
 				if not get_bot_running():
 					self._send_heartbeat()
-					await asyncio.sleep(1)
+					await self._wait_web_command(1)
 					continue
 
 				# [Math] 분봉 캔들 및 대응 데이터(Response) 업데이트
 				await candle_manager.process_minute_candles()
-				await response_manager.update_metrics(self.chat_command.rt_search.current_prices)
+				await response_manager.update_metrics(self.chat_command.rt_search.fresh_prices())
 
 				
 				# [추가] 보유 종목 물타기/관리 및 모니터링 루프 (Dynamic Rate Limit)
@@ -1287,30 +1292,28 @@ class MainApp:
 						# [Seq 1] 매도 로직 (순차 실행)
 						# 매도 체크를 가장 먼저 수행하여 현금 확보 및 포트폴리오 정리
 						# [Refactoring] Helper Methods 호출
-						loop = asyncio.get_running_loop()
-						
 						# 1. 데이터 업데이트 (최우선 실행)
 						self._send_heartbeat() # 긴 작업 시작 전 신호
-						current_stocks, current_balance, balance_data = await self._update_market_data(loop)
+						snapshot = await self._update_market_data()
 						self._send_heartbeat() # 작업 직후 신호
 						
 						# [Fix] 데이터가 정상적으로 전달되지 않았을 경우 이번 루프 즉시 패스 (지연 방지)
-						if current_stocks is None or balance_data is None:
+						if snapshot is None:
 							await asyncio.sleep(0.1)
 							continue
-							
-						deposit_amt = balance_data.get('deposit', 0)
 						
-						# [New] 미체결 데이터 조회 (chk_n_buy/chk_n_sell 중복 호출 방지)
-						from kiwoom_adapter import get_api
-						api = get_api()
-						out_orders = await loop.run_in_executor(None, api.get_outstanding_orders, self.chat_command.token)
+						# [Snapshot] 이번 주기의 모든 로직은 같은 버전의 보유/예수금/미체결 데이터를 사용
+						# (stocks()/orders()는 복사본이므로 chk_n_sell 등의 현재가 갱신이 다른 로직에 번지지 않음)
+						current_stocks = snapshot.stocks()
+						current_balance = snapshot.balance
+						balance_data = snapshot.balance_data()
+						deposit_amt = snapshot.deposit
 
 						# 2. 매도 로직 실행 (상태 데이터 주입)
-						await self.chat_command.run_sell_logic(current_stocks, deposit_amt, out_orders)
+						await self.chat_command.run_sell_logic(snapshot.stocks(), deposit_amt, snapshot.orders())
 						
 						# 3. 안전 감시 (상태 데이터 주입)
-						await self.chat_command.monitor_safety(deposit_amt, current_stocks)
+						await self.chat_command.monitor_safety(deposit_amt, snapshot.stocks())
 
 						# 4. 로직 실행 (유효 데이터 존재 시)
 						if current_stocks is not None:
@@ -1328,13 +1331,10 @@ class MainApp:
 							self.chat_command.rt_search.update_held_stocks(current_stocks)
 							await self._sync_holdings(current_stocks, balance_data)
 							
-							# [Fix] 위(Line 696)에서 이미 조회했으므로 기존 out_orders 재사용 (호출 제한 방지)
-							# out_orders = await loop.run_in_executor(None, api.get_outstanding_orders, self.chat_command.token)
-							
-							# 물타기 (장중 매수 시간)
+							# 물타기 (장중 매수 시간, 미체결은 스냅샷 값 재사용)
 							if MarketHour.is_market_buy_time():
 								self._send_heartbeat() # 매수 로직 진입 전
-								await self._process_watering_logic(current_stocks, balance_data, out_orders)
+								await self._process_watering_logic(snapshot.stocks(), balance_data, snapshot.orders())
 								self._send_heartbeat() # 매수 로직 완료 후
 								
 							# GUI 상태 업데이트
@@ -1411,6 +1411,8 @@ class MainApp:
 												
 												if str(cancel_code) in ['0', 'SUCCESS']:
 													logger.info(f"[AutoCancel] ✅ 매수 취소 성공: {stk_cd}")
+													# 취소된 매수의 체결 대기 해제 (다음 매수 / 물타기가 중복 주문으로 막히지 않도록)
+													order_dispatcher.release(stk_cd, 'buy', '자동 취소')
 												else:
 													logger.warning(f"[AutoCancel] ❌ 매수 취소 실패: {cancel_msg}")
 										except Exception as e:
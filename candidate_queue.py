@@ -0,0 +1,199 @@
+"""
+매수 후보 우선순위 큐 (종목코드 키 + 시간 감쇠 점수 + TTL)
+
+조건검색 REAL이 수백 종목을 쏟아낼 때 후보 dict 전체를 매번 점수 계산 → 정렬 → 비우던 것을
+힙 기반 큐로 바꿉니다. 목적은 동작 (선별되지 않은 후보 유지, 오래된 신호 감쇠/만료)이며 속도가 아님
+- 틱마다 push 비용이 들어 dict 대입보다 느림 (bench_candidate_queue: 선별 빈도가 낮으면 dict + 정렬이 더 빠름)
+- push(): 같은 종목은 점수/데이터/시각만 갱신 (O(log n), 이전 힙 항목은 조회 시 건너뜀)
+  정렬 키가 CANDIDATE_REHEAP_EPS 이하로 바뀌면 힙에 다시 넣지 않음 (틱마다 조금씩 바뀌는 등락률로 힙이 불어나지 않도록)
+- 점수 = (등락률 + 체결강도/100) × 가중치(조건식별, 양수 점수에만 적용), 받은 뒤 초당 decay만큼 선형 감소
+  → 정렬 키 (점수 + decay × 수신시각)가 시간이 지나도 변하지 않아 힙 재구성 없이 감쇠 반영
+- TTL이 지난 후보는 꺼내지 않고 버림 (오래된 신호가 최신 신호를 이기지 않도록)
+- 최대 개수를 일정 여유분 넘으면 낮은 후보부터 한꺼번에 잘라냄 (분할 상환 O(log n))
+- pop_best(k): 전체 정렬 없이 상위 k개만 꺼냄
+"""
+import heapq
+import itertools
+import time
+from typing import Dict, List, Optional, Tuple
+
+# 후보 유효 시간(초) - 이 시간 동안 새 신호가 없으면 만료
+CANDIDATE_TTL_SEC = 60.0
+
+# 초당 점수 감소량 (점수 = 등락률(%) + 체결강도/100)
+CANDIDATE_SCORE_DECAY = 0.05
+
+# 힙에 다시 넣을 최소 정렬 키 변화 (점수 단위, 이하 변화는 힙 순서에 반영하지 않음 - 순서 오차는 이 값 이내)
+CANDIDATE_REHEAP_EPS = 0.05
+
+# 큐 최대 종목 수
+CANDIDATE_QUEUE_MAX = 300
+
+# 체결강도가 없을 때 기본값 (기존 정렬 기준과 동일)
+DEFAULT_STRENGTH = 100.0
+
+def candidate_score(rate, data=None) -> float:
+    """등락률 + 체결강도/100 (가장 '쎈' 종목 우선)"""
+    strength = (data or {}).get('strength', DEFAULT_STRENGTH)
+    return float(rate) + float(strength) / 100.0
+
+def weighted_score(score, weight=1.0) -> float:
+    """
+    조건식 가중치 반영 - 양수 점수만 곱함
+    (음수 점수에 1보다 작은 가중치를 곱하면 오히려 점수가 올라가 낮은 가중치 출처가 앞서는 것을 방지)
+    """
+    return score * weight if score > 0 else score
+
+class _Entry:
+    __slots__ = ('code', 'rate', 'data', 'score', 'received', 'key', 'heap_key', 'seq')
+
+class CandidateQueue:
+    """
+    종목코드별 후보 1건을 유지하는 우선순위 큐 (asyncio 단일 스레드 사용 전제)
+    - _entries: code → _Entry (최신 값)
+    - _heap: (-heap_key, seq, code) - seq가 현재 항목과 다르면 지난 항목으로 보고 건너뜀
+    - entry.key는 항상 최신 정렬 키, entry.heap_key는 힙에 들어 있는 키 (차이는 reheap_eps 이내)
+    """
+    def __init__(self, ttl=CANDIDATE_TTL_SEC, decay=CANDIDATE_SCORE_DECAY, maxsize=CANDIDATE_QUEUE_MAX, clock=time.monotonic,
+                 reheap_eps=CANDIDATE_REHEAP_EPS):
+        self.ttl = ttl
+        self.decay = decay
+        self.maxsize = maxsize
+        self.reheap_eps = reheap_eps
+        self._clock = clock
+        self._entries: Dict[str, _Entry] = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self.version = 0       # push 횟수 (처리 중 새 신호 유입 여부 판단용)
+        self.expired = 0       # TTL 만료로 버린 건수
+        self.evicted = 0       # 최대 개수 초과로 버린 건수
+
+    def configure(self, ttl=None, decay=None, maxsize=None):
+        """설정 변경 (감쇠율이 바뀌면 정렬 키를 다시 계산)"""
+        if ttl is not None:
+            self.ttl = float(ttl)
+        if maxsize is not None:
+            self.maxsize = max(1, int(maxsize))
+        if decay is not None and float(decay) != self.decay:
+            self.decay = float(decay)
+            for entry in self._entries.values():
+                entry.key = entry.score + self.decay * entry.received
+            self._rebuild()
+        if len(self._entries) > self.maxsize:
+            self._trim()
+
+    # ==================== dict 호환 ====================
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __contains__(self, code):
+        return code in self._entries
+
+    def __setitem__(self, code, value):
+        """queue[code] = rate 또는 (rate, data) - 기존 dict 사용처 호환"""
+        if isinstance(value, tuple):
+            self.push(code, value[0], value[1])
+        else:
+            self.push(code, value)
+
+    def clear(self):
+        self._entries.clear()
+        self._heap.clear()
+
+    def discard(self, code):
+        # 힙 항목은 seq 불일치로 나중에 건너뜀
+        self._entries.pop(code, None)
+
+    # ==================== 등록 / 조회 ====================
+
+    def push(self, code, rate, data=None, now=None, weight=1.0):
+        """후보 등록 또는 갱신 (weight: 출처 조건식 가중치)"""
+        now = self._clock() if now is None else now
+        data = data or {}
+        score = weighted_score(candidate_score(rate, data), weight)
+        key = score + self.decay * now
+        self.version += 1
+        entry = self._entries.get(code)
+        if entry is not None and abs(key - entry.heap_key) <= self.reheap_eps:
+            # 힙 순서는 그대로 두고 값만 갱신 (pop_best / TTL은 최신 값 기준)
+            entry.rate, entry.data, entry.score, entry.received, entry.key = rate, data, score, now, key
+            return
+        if entry is None:
+            entry = _Entry()
+            entry.code = code
+            self._entries[code] = entry
+        entry.rate, entry.data, entry.score, entry.received, entry.key = rate, data, score, now, key
+        entry.heap_key = key
+        entry.seq = next(self._seq)
+        heapq.heappush(self._heap, (-key, entry.seq, code))
+
+        entries = len(self._entries)
+        if entries > self.maxsize + max(16, self.maxsize // 4):
+            self._trim()
+        # 갱신이 잦아 지난 힙 항목이 쌓이면 압축
+        elif len(self._heap) > 4 * entries + 64:
+            self._rebuild()
+
+    def score_of(self, code, now=None) -> Optional[float]:
+        """현재 시점의 감쇠된 점수 (없으면 None)"""
+        entry = self._entries.get(code)
+        if entry is None:
+            return None
+        now = self._clock() if now is None else now
+        return entry.key - self.decay * now
+
+    def pop_best(self, k=1, now=None) -> List[Tuple[str, float, Dict]]:
+        """감쇠 점수 상위 k개를 (code, rate, data)로 꺼냄 (만료 후보는 버림)"""
+        now = self._clock() if now is None else now
+        result = []
+        heap, entries = self._heap, self._entries
+        while heap and len(result) < k:
+            _, seq, code = heapq.heappop(heap)
+            entry = entries.get(code)
+            if entry is None or entry.seq != seq:
+                continue
+            del entries[code]
+            if now - entry.received > self.ttl:
+                self.expired += 1
+                continue
+            result.append((code, entry.rate, entry.data))
+        return result
+
+    def pop(self, now=None) -> Optional[Tuple[str, float, Dict]]:
+        best = self.pop_best(1, now)
+        return best[0] if best else None
+
+    def expire(self, now=None) -> int:
+        """TTL이 지난 후보 제거, 제거 건수 반환"""
+        now = self._clock() if now is None else now
+        stale = [code for code, entry in self._entries.items() if now - entry.received > self.ttl]
+        for code in stale:
+            del self._entries[code]
+        self.expired += len(stale)
+        return len(stale)
+
+    def snapshot(self, now=None) -> List[Tuple[str, float, float]]:
+        """(code, 등락률, 감쇠 점수) 점수 내림차순 - 로그/화면 표시용 (큐 변경 없음)"""
+        now = self._clock() if now is None else now
+        items = [(e.code, e.rate, e.key - self.decay * now) for e in self._entries.values() if now - e.received <= self.ttl]
+        items.sort(key=lambda x: x[2], reverse=True)
+        return items
+
+    # ==================== 내부 ====================
+
+    def _trim(self):
+        """정렬 키 상위 maxsize개만 남김"""
+        keep = heapq.nlargest(self.maxsize, self._entries.values(), key=lambda e: e.key)
+        self.evicted += len(self._entries) - len(keep)
+        self._entries = {e.code: e for e in keep}
+        self._rebuild()
+
+    def _rebuild(self):
+        for e in self._entries.values():
+            e.heap_key = e.key
+        self._heap = [(-e.key, e.seq, e.code) for e in self._entries.values()]
+        heapq.heapify(self._heap)
@@ -11,6 +11,7 @@ from check_n_buy import reset_accumulation
 from kiwoom_adapter import fn_kt00004, get_total_eval_amt
 from kiwoom_adapter import fn_kt00001 as get_balance
 from kiwoom_adapter import fn_au10001
+from kiwoom.records import as_holdings
 from market_hour import MarketHour
 from get_seq import get_condition_list
 from logger import logger
@@ -391,22 +392,14 @@ class ChatCommand:
 				total_profit_loss = 0
 				total_pl_amt = 0
 				
-				for stock in account_data:
+				for stock in as_holdings(account_data):
 					stock_code = stock.get('stk_cd', 'N/A')
 					stock_name = stock.get('stk_nm', 'N/A')
 					
-					# 안전한 숫자 변환
-					try:
-						profit_loss_rate = float(str(stock.get('pl_rt', 0)).replace(',', ''))
-					except: profit_loss_rate = 0.0
-					
-					try:
-						pl_amt = int(float(str(stock.get('pl_amt', 0)).replace(',', '')))
-					except: pl_amt = 0
-					
-					try:
-						remaining_qty = int(float(str(stock.get('rmnd_qty', 0)).replace(',', '')))
-					except: remaining_qty = 0
+					# 숫자 필드는 API 계층에서 파싱됨 (kiwoom.records.Holding)
+					profit_loss_rate = stock.pl_rate
+					pl_amt = int(stock.pl_amt)
+					remaining_qty = stock.qty
 					
 					# 수익률에 따른 이모지 설정
 					if profit_loss_rate > 0:
@@ -645,6 +638,23 @@ class ChatCommand:
 				msg += ", ".join(buying) + "\n"
 			else:
 				msg += "(없음)\n"
+
+			# [Backpressure] 실시간 틱 버퍼 상태 (대기 깊이 / 합침 / 지연)
+			tick_buffer = getattr(self.rt_search, 'tick_buffer', None)
+			if tick_buffer is not None:
+				msg += f"\n⚡ 실시간 틱 버퍼: {tick_buffer.format_stats()}\n"
+			subscriptions = getattr(self.rt_search, 'subscriptions', None)
+			if subscriptions is not None:
+				msg += f"📡 실시간 구독: {subscriptions.format_stats()}\n"
+			conditions = getattr(self.rt_search, 'conditions', None)
+			if conditions is not None:
+				msg += f"🎯 조건식: {conditions.format_stats()}\n"
+			gaps = getattr(self.rt_search, 'gaps', None)
+			if gaps is not None:
+				msg += f"🔌 실시간 연결: {gaps.format_stats()}\n"
+			live_account = getattr(self.rt_search, 'live_account', None)
+			if live_account is not None:
+				msg += f"🧾 실시간 체결: {live_account.format_stats()}\n"
 				
 			# [New] 최근 매도 이력 (5개) - DB에서 조회
 			try:
@@ -861,7 +871,8 @@ class ChatCommand:
 		try:
 			# [Fix] Sequential/Injected data to avoid redundant API calls
 			# [Realtime] Pass real-time prices for instant update
-			current_prices = getattr(self.rt_search, 'current_prices', {})
+			# [Stale Guard] 소켓 끊김 등으로 오래된 가격은 제외 (해당 종목은 잔고 API 가격으로 판단)
+			current_prices = self.rt_search.fresh_prices() if hasattr(self.rt_search, 'fresh_prices') else {}
 			
 			loop = asyncio.get_running_loop()
 			success, sold_stocks, holdings_codes, sell_reasons = await loop.run_in_executor(
@@ -947,16 +958,8 @@ class ChatCommand:
 				
 				# API 호출 최적화: 외부 데이터 사용
 				if deposit_amt is not None and current_stocks is not None:
-					stock_eval = 0
-					for stock in current_stocks:
-						try:
-							if 'evlu_amt' in stock and stock['evlu_amt']:
-								stock_eval += int(float(str(stock['evlu_amt']).replace(',','')))
-							elif 'cur_prc' in stock and 'rmnd_qty' in stock:
-								prc = int(float(str(stock.get('cur_prc', 0)).replace(',','')))
-								qty = int(float(str(stock.get('rmnd_qty', 0)).replace(',','')))
-								stock_eval += prc * qty
-						except: pass
+					# 평가금액 합계 (숫자 필드는 API 계층에서 파싱됨, kiwoom.records)
+					stock_eval = sum(int(stock.eval_amt) for stock in as_holdings(current_stocks))
 					current_asset = deposit_amt + stock_eval
 				else:
 					# Fallback
@@ -8,12 +8,14 @@ from tel_send import tel_send
 from get_setting import get_setting
 from logger import logger
 from analyze_tools import calculate_rsi, get_rsi_for_timeframe
-from database import get_price_history_sync, log_signal_snapshot_sync, get_watering_step_count_sync
+from database import get_price_history_sync, submit_signal_snapshot, get_watering_step_count_sync
 
 from technical_judge import technical_judge
-from utils import normalize_stock_code
+from kiwoom.records import Holding, as_holdings, as_orders
 from candle_manager import candle_manager
 from stock_info import fn_ka10001 as stock_info
+from stock_master import get_stock_name, normalize_order_price
+from order_dispatcher import order_dispatcher
 
 # Aliases for compatibility
 get_balance = fn_kt00001
@@ -52,15 +54,10 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 	# [쿨타임 체크] 같은 종목을 너무 자주 매수하는 것을 방지
 	# [안정성 개선] 5초 -> 60초로 증가 (과도한 매수 방지)
 	# [수정] 이미 보유 중인 종목(물타기)은 쿨타임 무시 (긴급 대응)
-	is_held = False
-	if current_holdings:
-		for s in current_holdings:
-			c = s.get('stk_cd', '').replace('A', '')
-			if c == stk_cd:
-				qty = int(float(str(s.get('rmnd_qty', s.get('hold_qty', '0'))).replace(',', '')))
-				if qty > 0:
-					is_held = True
-					break
+	# [Fix] 보유/미체결 목록은 파싱된 레코드 + 종목코드 색인으로 조회 (kiwoom.records)
+	current_holdings = as_holdings(current_holdings)
+	outstanding_orders = as_orders(outstanding_orders)
+	is_held = bool(current_holdings) and current_holdings.has(stk_cd)
 	
 	buy_cooldown = 60 # 60초 (재진입 방지)
 	last_time = last_buy_times.get(stk_cd, 0)
@@ -98,7 +95,7 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 	if True:  # 매번 정리
 		try:
 			if outstanding_orders is not None:
-				selling_codes = {normalize_stock_code(o.get('stk_cd', '')) for o in outstanding_orders if o.get('type') == 'sell' or o.get('ord_tp') == '02'}
+				selling_codes = outstanding_orders.sell_codes()
 				stuck_codes = config.stocks_being_sold - selling_codes
 				for sc in stuck_codes:
 					config.stocks_being_sold.discard(sc)
@@ -112,23 +109,18 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 			try:
 				from kiwoom_adapter import get_api
 				api = get_api()
-				outstanding_orders = api.get_outstanding_orders(token)
+				outstanding_orders = as_orders(api.get_outstanding_orders(token))
 			except: pass
 		
 		# 1. 미체결 주문 확인
 		if outstanding_orders:
-			for order in outstanding_orders:
-				order_code = normalize_stock_code(order.get('stk_cd', order.get('code', '')))
-				order_type = order.get('type', order.get('ord_tp', ''))
+			for order in outstanding_orders.for_code(stk_cd):
+				if order.is_sell:
+					logger.warning(f"🚫 [매수 실패] {stk_cd}: 미체결 매도 주문 존재 -> 매수 차단")
+					return False
 				
-				if order_code == stk_cd:
-					if order_type == 'sell' or order_type == '02':
-						logger.warning(f"🚫 [매수 실패] {stk_cd}: 미체결 매도 주문 존재 -> 매수 차단")
-						return False
-					
-					if order_type == 'buy' or order_type == '01':
-						pending_qty = order.get('qty', 0)
-						logger.info(f"ℹ️ [물타기 누적] {stk_cd}: 미체결 매수 {pending_qty}주 존재 -> 추가 매수 진행")
+				if order.is_buy:
+					logger.info(f"ℹ️ [물타기 누적] {stk_cd}: 미체결 매수 {order.qty}주 존재 -> 추가 매수 진행")
 
 		# 2. 쿨타임 체크
 		buy_cooldown = 60
@@ -148,31 +140,25 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 	try:
 		# 인자로 전달받지 않은 경우에만 API 호출
 		if current_holdings is None:
-			current_holdings = get_my_stocks(token=token)
+			current_holdings = as_holdings(get_my_stocks(token=token))
 			
 		if current_holdings:
 			my_stocks_count = len(current_holdings)
-			for stock in current_holdings:
-				# 보유 종목 코드 'A' 제거 후 비교 (안전한 정규화)
-				if normalize_stock_code(stock['stk_cd']) == stk_cd:
-					current_holding = stock
-					logger.info(f"보유 종목 상세: {stock.get('stk_nm')} / 평단: {stock.get('pchs_avg_pric')} / 현재가: {stock.get('cur_prc')} / 수량: {stock.get('rmnd_qty')} / 수익률: {stock.get('pl_rt')}")
-					break
+			current_holding = current_holdings.get(stk_cd)
+			if current_holding is not None:
+				stock = current_holding
+				logger.info(f"보유 종목 상세: {stock.get('stk_nm')} / 평단: {stock.get('pchs_avg_pric')} / 현재가: {stock.get('cur_prc')} / 수량: {stock.get('rmnd_qty')} / 수익률: {stock.get('pl_rt')}")
 	except Exception as e:
 		logger.error(f"[매수 체크] 보유종목 조회 오류: {e}")
 		return False
 	
 	# [API 오류 방어] API 잔고 외에 DB상 오늘 매수 후 보유 중인 종목도 합산하여 카운트 (Double Buy 방지)
 	# current_holdings(API) + DB(Today Net Buy > 0)
-	api_held_codes = set()
-	if current_holdings:
-		for stock in current_holdings:
-			api_held_codes.add(normalize_stock_code(stock['stk_cd']))
+	api_held_codes = set(current_holdings.codes()) if current_holdings else set()
 	
 	try:
-		from database_helpers import get_db_connection
-		import datetime
-		today_str = datetime.date.today().strftime('%Y-%m-%d')
+		from database_helpers import get_db_connection, get_day_range
+		day_start, day_end = get_day_range()
 		
 		# [Mode Fix] 현재 API 모드에 맞는 기록만 조회
 		current_mode = get_current_api_mode().upper()
@@ -181,8 +167,8 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 		# (단, API 잔고에 이미 있는 건 제외)
 		with get_db_connection() as conn:
 			rows = conn.execute(
-				"SELECT code, type, qty FROM trades WHERE mode = ? AND timestamp LIKE ?", 
-				(current_mode, f"{today_str}%",)
+				"SELECT code, type, qty FROM trades WHERE mode = ? AND type IN ('buy', 'sell') AND timestamp >= ? AND timestamp < ?", 
+				(current_mode, day_start, day_end)
 			).fetchall()
 			
 			db_calc_holdings = {}
@@ -200,7 +186,7 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 					
 					# 만약 현재 매수하려는 종목이 여기에 해당하면 current_holding 복구
 					if c == stk_cd and current_holding is None:
-						current_holding = {
+						current_holding = Holding({
 							'stk_cd': stk_cd,
 							'stk_nm': stk_cd,
 							'rmnd_qty': qty,
@@ -208,7 +194,7 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 							'cur_prc': 0,
 							'pchs_avg_pric': 0,
 							'evlu_amt': 0
-						}
+						})
 						logger.info(f"[Deep Count] {stk_cd}: DB 데이터로 보유 상태 복구 완료")
 
 	except Exception as e:
@@ -234,9 +220,7 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 			alloc_per_stock = (total_eval_amt_est * cap_ratio) / target_cnt
 			
 			if alloc_per_stock > 0:
-				pchs_amt = float(current_holding.get('pchs_amt', current_holding.get('pur_amt', 0)))
-				if pchs_amt == 0:
-					pchs_amt = float(current_holding.get('pchs_avg_pric', 0)) * int(current_holding.get('rmnd_qty', 0))
+				pchs_amt = current_holding.pur_amt
 				
 				if pchs_amt >= alloc_per_stock * 0.98:
 					logger.info(f"[매수 금지] {stk_cd}: 이미 종목별 최대 한도(MAX) 도달 - 추가 매수 절대 금지")
@@ -275,10 +259,7 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 			# current_balance_data에 'total_pur_amt'가 있으면 사용, 없으면 net_asset에서 평가손익 제외 시도
 			total_pur_amt = int(current_balance_data.get('total_pur_amt', 0))
 			if total_pur_amt == 0 and current_holdings:
-				for s in current_holdings:
-					try:
-						total_pur_amt += float(s.get('pchs_avg_pric', 0)) * int(s.get('rmnd_qty', 0))
-					except: pass
+				total_pur_amt = sum(s.avg_price * s.qty for s in current_holdings)
 			
 			stock_val = net_asset - balance
 		else:
@@ -289,10 +270,7 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 			# API에서 상세 평가 현황 가져오기 (매입원금 합산용)
 			total_pur_amt = 0
 			if current_holdings:
-				for s in current_holdings:
-					try:
-						total_pur_amt += float(s.get('pchs_avg_pric', 0)) * int(s.get('rmnd_qty', 0))
-					except: pass
+				total_pur_amt = sum(s.avg_price * s.qty for s in current_holdings)
 
 		# [Stable Basis] 유저 요청: 손익률에 따라 단계가 변하지 않도록 '원금' 기준 자산 정의
 		# basis_asset: 실제 투자된 원금 + 남은 예수금 (미실현 손익 제외)
@@ -468,8 +446,9 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 		factors.update(realtime_data)
 	
 	# 시그널 스냅샷 저장 (수학적 학습의 기초 데이터)
-	signal_id = log_signal_snapshot_sync(stk_cd, 'BUY_SIGNAL', factors)
-	logger.info(f"💾 [Math Context] 시그널 스냅샷 저장 완료 (ID: {signal_id})")
+	# 매수 경로를 막지 않도록 커밋을 기다리지 않음 (signal_id는 Future, response_manager가 저장 시점에 확정)
+	signal_id = submit_signal_snapshot(stk_cd, 'BUY_SIGNAL', factors)
+	logger.info("💾 [Math Context] 시그널 스냅샷 저장 요청 (쓰기 큐)")
 	
 	# [Response Manager] 추적 등록
 	if response_manager and signal_id and current_price > 0:
@@ -529,23 +508,17 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 	cur_eval = 0
 	cur_pchs_amt_api = 0
 	if current_holding:
-		if 'evlu_amt' in current_holding and current_holding['evlu_amt']:
-			cur_eval = int(current_holding['evlu_amt'])
+		cur_eval = int(current_holding.api_eval_amt)
 		
-		# 매입금액 추정
-		if 'pchs_avg_pric' in current_holding and 'rmnd_qty' in current_holding:
-			try:
-				pchs_avg = float(current_holding['pchs_avg_pric'])
-				qty = int(current_holding['rmnd_qty'])
-				cur_pchs_amt_api = pchs_avg * qty
-			except:
-				cur_pchs_amt_api = cur_eval
+		# 매입금액 추정 (매입단가 × 보유수량, 매입단가가 없으면 평가금액)
+		if current_holding.avg_price > 0:
+			cur_pchs_amt_api = current_holding.avg_price * current_holding.qty
 		else:
 			cur_pchs_amt_api = cur_eval
             
 	# 내부 추적값과 API 값 중 큰 것을 현재 매입금액으로 사용 (방어적)
 	cur_pchs_amt = max(cur_pchs_amt_api, accum_amt)
-	cur_pchs_qty = int(current_holding.get('rmnd_qty', 0)) if current_holding else 0
+	cur_pchs_qty = current_holding.qty if current_holding else 0
 	
 	if cur_pchs_amt > cur_pchs_amt_api:
 
@@ -660,7 +633,7 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 			# 매도 직후 급하게 다시 사는 '뇌동매매' 방지
 			with get_db_connection() as conn:
 				last_sell = conn.execute(
-					"SELECT timestamp FROM trades WHERE code = ? AND (type='SELL' OR type='sell') ORDER BY id DESC LIMIT 1",
+					"SELECT timestamp FROM trades WHERE code = ? AND type = 'sell' ORDER BY id DESC LIMIT 1",
 					(stk_cd,)
 				).fetchone()
 				
@@ -699,16 +672,10 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 			
 	# [추가 매수 - 불타기/물타기/분할]
 		# 현재 평가금액 확인
-		cur_eval = 0
-		cur_pchs_amt = 0 # 매입금액 (원금)
-		if 'evlu_amt' in current_holding and current_holding['evlu_amt']:
-			cur_eval = int(current_holding['evlu_amt'])
-			
+		cur_eval = int(current_holding.api_eval_amt)
+		
 		# [중요 수정] 매입금액 정보가 없으면(0원이면) 추가 매수 계산 불가 -> 스킵 (DB방어/메모리방어 시 발생)
-		if 'pchs_amt' in current_holding and current_holding['pchs_amt']:
-			cur_pchs_amt = float(current_holding['pchs_amt'])
-		elif 'pur_amt' in current_holding and current_holding['pur_amt']:
-			cur_pchs_amt = float(current_holding['pur_amt'])
+		cur_pchs_amt = current_holding.api_pur_amt # 매입금액 (원금)
 			
 		if cur_pchs_amt <= 0:
 			logger.warning(f"[물타기 스킵] {stk_cd}: 매입금액 정보 없음(0원) - 데이터 불충분하여 추가 매수 중단")
@@ -716,26 +683,18 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 			
 		# 매입금액 추정 (수익률 역산 또는 API 필드 사용)
 		# pchs_avg_pric(매입가) * rmnd_qty(보유수량) 사용이 가장 정확
-		if 'pchs_avg_pric' in current_holding and 'rmnd_qty' in current_holding:
-			try:
-				pchs_avg = float(current_holding['pchs_avg_pric'])
-				qty = int(current_holding['rmnd_qty'])
-				cur_pchs_amt = pchs_avg * qty
-			except:
-				cur_pchs_amt = cur_eval # fallback
+		if current_holding.avg_price > 0:
+			cur_pchs_amt = current_holding.avg_price * current_holding.qty
 		else:
 			cur_pchs_amt = cur_eval # fallback
 		
 		# 수익률 확인
-		pl_rt = float(current_holding.get('pl_rt', 0))
+		pl_rt = current_holding.pl_rate
 		
 		# [Safety] 현재가가 0원이면 수익률도 믿을 수 없음 -> 0으로 강제 초기화 (매수 방지)
-		try:
-			cur_prc_chk = float(str(current_holding.get('cur_prc', '0')).replace(',', ''))
-			if cur_prc_chk <= 0:
-				pl_rt = 0.0
-				logger.warning(f"⚠️ [Data Warning] {stk_cd}: 현재가 0원 -> 수익률 0% 처리 (매수 보류)")
-		except: pass
+		if current_holding.cur_price <= 0:
+			pl_rt = 0.0
+			logger.warning(f"⚠️ [Data Warning] {stk_cd}: 현재가 0원 -> 수익률 0% 처리 (매수 보류)")
 		
 		# 현재 매입 비율
 		filled_ratio = cur_pchs_amt / alloc_per_stock
@@ -989,6 +948,11 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 	except Exception as e:
 		logger.error(f"호가 조회 중 오류 발생: {e}")
 		return False # return -> return
+	# [Stock Master] 호가단위 내림 + 상하한가 범위 제한 (호가단위가 안 맞는 가격은 주문 거부됨)
+	tick_bid = normalize_order_price(stk_cd, bid)
+	if tick_bid != bid:
+		logger.info(f"[호가 보정] {stk_cd}: {bid:,}원 -> {tick_bid:,}원")
+		bid = tick_bid
 	# time.sleep(0.3)
 
 	if bid > 0:
@@ -1015,7 +979,13 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 
 	# 5. 매수 진행
 	try:
-		return_code, return_msg = buy_stock(stk_cd, ord_qty, bid, token=token, source=source)
+		# [Order Dispatcher] 주문 큐로 전송 (같은 종목 매수가 이미 전송 중이면 합쳐지고 여기서는 종료)
+		held_before = current_holding.qty if current_holding is not None else 0
+		ticket = order_dispatcher.submit_buy(stk_cd, ord_qty, bid, token=token, source=source, held_before=held_before, join=False)
+		if ticket is None:
+			logger.warning(f"[중복 주문 방지] {stk_cd}: 같은 종목 매수 주문이 이미 전송 중")
+			return False
+		return_code, return_msg = ticket.wait()
 		
 		# [중요 수정] return_code가 "0" (Real API) 또는 "SUCCESS" (Mock API) 모두 처리
 		if str(return_code) not in ['0', 'SUCCESS']:
@@ -1036,16 +1006,8 @@ def _chk_n_buy_core(stk_cd, token, current_holdings=None, current_balance_data=N
 
 	# 주문 성공 시점
 	
-	# 종목명 조회 (DB에서 직접 조회하여 안정성 향상)
-	try:
-		from database_helpers import get_db_connection
-		with get_db_connection() as conn:
-			cursor = conn.execute('SELECT name FROM mock_stocks WHERE code = ?', (stk_cd,))
-			row = cursor.fetchone()
-			stock_name = row['name'] if row else stk_cd
-	except Exception as e:
-		logger.error(f"종목명 DB 조회 중 오류: {e}")
-		stock_name = stk_cd  # 조회 실패 시 코드로 대체
+	# 종목명 조회 (종목 마스터 메모리 조회, 없으면 코드)
+	stock_name = get_stock_name(stk_cd)
 
 	message = f'[{msg_reason}] {stock_name} {ord_qty}주 매수 주문 전송 완료'
 	logger.info(message)
@@ -8,7 +8,8 @@ from get_setting import get_setting as cached_setting
 from logger import logger
 from database import log_trade_sync, update_high_price_sync, get_high_price_sync, clear_stock_status_sync, get_watering_step_count_sync
 from math_analyzer import evaluate_exit_strength, evaluate_risk_strength
-from utils import normalize_stock_code
+from kiwoom.records import as_holdings, as_orders
+from order_dispatcher import order_dispatcher
 import check_n_buy
 from voice_generator import speak
 from analyze_tools import calculate_rsi, get_rsi_for_timeframe
@@ -29,6 +30,89 @@ ai_partial_sold_history = {}
 # {code: float_high_price}
 HIGH_PRICE_MEM_CACHE = {}
 
+def _finish_sell(stock, stock_code, stock_name, pl_rt, sell_reason, ticket, sold_stocks, sell_reasons, partially_sold_codes):
+	"""전량 매도 주문 1건의 응답 확인 후 기록/정리 (실패 시 매도 중 표시 해제, Ghost Stock 처리)"""
+	import config
+	return_code, return_msg = ticket.wait()
+
+	# 성공 확인 (Real=0, Mock=SUCCESS)
+	if str(return_code) not in ['0', 'SUCCESS']:
+		logger.error(f"[매도 실패] {stock['stk_nm']} ({stock_code}): {return_msg}")
+		if stock_code in config.stocks_being_sold:
+			config.stocks_being_sold.remove(stock_code)
+		
+		# Ghost Stock 처리
+		if '800033' in str(return_msg): # 매도수량 부족 -> 잔고 없음
+			logger.warning(f"[Ghost Stock 감지] {stock_name}: 강제 삭제 처리")
+			# [Turbo TS] 고스트 종목도 캐시 삭제
+			if stock_code in HIGH_PRICE_MEM_CACHE:
+				del HIGH_PRICE_MEM_CACHE[stock_code]
+			sold_stocks.append(stock_code)
+		return
+	
+	# [Turbo TS] 매도 성공 시 메모리 캐시 삭제 (다음 매매를 위해 리셋)
+	if stock_code in HIGH_PRICE_MEM_CACHE:
+		del HIGH_PRICE_MEM_CACHE[stock_code]
+		logger.info(f"[Turbo TS] {stock_name} 고점 기록 리셋 완료")
+
+	# [Source Fix] 가공하지 말고 실제 필드값 사용
+	trade_source = stock.get('trade_type', '-')
+	final_reason_text = sell_reason
+	sell_reasons[stock_code] = final_reason_text
+
+	# [DB 기록]
+	try:
+		from database_trading_log import log_sell_to_db
+		from kiwoom_adapter import get_current_api_mode
+		mode = get_current_api_mode().upper() 
+		# [Fix] 가공하지 않은 사유와 소스 사용
+		log_sell_to_db(stock_code, stock['stk_nm'], stock.qty, int(stock.cur_price), pl_rt, final_reason_text, mode, trade_source)
+	except Exception as e:
+		logger.error(f"매도 로그 DB 저장 실패: {e}")
+	
+	# 정리
+	clear_stock_status_sync(stock_code)
+	try: 
+		check_n_buy.reset_accumulation(stock_code)
+		# [Fix] 매도 시 보유 시간 기록 삭제 (재매수 시 0분부터 시작)
+		from database_helpers import delete_held_time
+		delete_held_time(stock_code)
+	except: pass
+	
+	# 매도 완료 상태 해제 (지연)
+	import threading
+	def remove_from_being_sold(stock_code=stock_code, stock_name=stock_name):
+		time.sleep(5)
+		if stock_code in config.stocks_being_sold:
+			config.stocks_being_sold.remove(stock_code)
+		if stock_code in partially_sold_codes:
+			partially_sold_codes.discard(stock_code)
+		
+		# [AI] 전량 매도 완료 시 리스크 관리 이력도 완전 초기화
+		if stock_code in ai_partial_sold_history:
+			del ai_partial_sold_history[stock_code]
+			
+		logger.info(f"[매도 완료] {stock_name}: 매도 상태 및 AI 리스크 기록 해제")
+	threading.Thread(target=remove_from_being_sold, daemon=True).start()
+
+	# 텔레그램 전송
+	# 텔레그램 전송
+	result_emoji = "🔴" if pl_rt > 0 else "🔵"
+	# [LASTTRADE] 시스템 명칭 포함 및 포맷 통일
+	message = f'[{mode}] {result_emoji} LASTTRADE 매도 완료: {stock["stk_nm"]} {stock.qty}주 ({sell_reason}) [수익률: {pl_rt}%]'
+	tel_send(message)
+	logger.info(message)
+	
+	sold_stocks.append(stock_code)
+	
+	# 재매수 쿨다운 (전량 매도일 때만 적용하여, 분할 매도 후 AI가 다시 사는 것 허용)
+	is_partial_sell = "축소" in sell_reason or "분할" in sell_reason or "PARTIAL" in sell_reason
+	
+	if not is_partial_sell:
+		check_n_buy.last_sold_times[stock_code] = time.time()
+	else:
+		logger.info(f"⚖️ [AI Trading] {stock_code}: 분할 매도이므로 재매수 쿨다운 미적용 (즉시 재진입 가능)")
+
 def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, outstanding_orders=None, realtime_prices=None):
 	global ai_partial_sold_history, HIGH_PRICE_MEM_CACHE
 	partially_sold_codes = set() # 한 루프 내 중복 방지용 로컬 세트
@@ -62,11 +146,22 @@ def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, ou
 
 	sold_stocks = []
 	sell_reasons = {}
+	pending_sells = [] # (stock, code, name, 수익률, 사유, OrderTicket) 전량 매도 응답 대기
 	holdings_codes = []
 
+	def finish_pending_sells():
+		# 이미 보낸 전량 매도는 판단 루프가 예외로 끝나도 빠짐없이 기록/정리 (티켓별 오류는 다음 티켓에 영향 없음)
+		while pending_sells:
+			try:
+				_finish_sell(*pending_sells.pop(0), sold_stocks, sell_reasons, partially_sold_codes)
+			except Exception as e:
+				logger.error(f"매도 후처리 오류: {e}")
+
 	try:
 		if my_stocks is None:
 			my_stocks = get_my_stocks(token=token)
+		# [Fix] 숫자 필드는 API 계층에서 한 번만 파싱된 레코드 사용 (kiwoom.records.Holding)
+		my_stocks = as_holdings(my_stocks)
 		
 		# 보유 종목이 없는 경우
 		if not my_stocks:
@@ -76,36 +171,17 @@ def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, ou
 		# [Realtime Price Injection] 실시간 시세로 보유종목 정보 갱신
 		if realtime_prices:
 			for stock in my_stocks:
-				code = normalize_stock_code(stock['stk_cd']).replace('A', '')
+				code = stock.code
 				if code in realtime_prices and realtime_prices[code] > 0:
-					old_prc = int(stock.get('cur_prc', 0))
+					old_prc = int(stock.cur_price)
 					new_prc = realtime_prices[code]
 					
-					# 평균단가 (없으면 현재가로 가정하여 0% 처리)
-					avg_prc = int(stock.get('pchs_avg_pric', stock.get('avg_prc', 0)))
-					if avg_prc > 0:
-						# 수익률 재계산: ((현재가 - 평단) / 평단) * 100
-						new_pl_rt = ((new_prc - avg_prc) / avg_prc) * 100
-						
-						# 기존 데이터 업데이트
-						stock['cur_prc'] = new_prc
-						stock['pl_rt'] = f"{new_pl_rt:.2f}"
-						
-						# 평가금액도 갱신 (보유수량 * 현재가)
-						qty = int(stock.get('rmnd_qty', 0))
-						stock['evlu_amt'] = new_prc * qty
-						
-						logger.info(f"⚡ [Fast Update] {code}: {old_prc} -> {new_prc}원 (수익률 {new_pl_rt:.2f}%) - 실시간 반영")
+					# 현재가/수익률/평가금액 갱신 (평균단가가 없으면 반영하지 않음)
+					if stock.apply_price(new_prc):
+						logger.info(f"⚡ [Fast Update] {code}: {old_prc} -> {new_prc}원 (수익률 {stock.pl_rate:.2f}%) - 실시간 반영")
 
 		# [자산 및 할당금액 계산]
-		total_stock_eval = 0
-		for stock in my_stocks:
-			if 'evlu_amt' in stock and stock['evlu_amt']:
-				total_stock_eval += int(stock['evlu_amt'])
-			else:
-				price = int(stock.get('cur_prc', 0))
-				qty = int(stock.get('rmnd_qty', 0))
-				total_stock_eval += price * qty
+		total_stock_eval = int(my_stocks.total_eval_amt())
 		
 		try:
 			if deposit_amt is None:
@@ -119,21 +195,12 @@ def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, ou
 		# [안전장치] 자산 0원 오류 방지
 		if net_asset <= 0:
 			logger.warning("[안전장치 발동] 총 자산이 0원으로 조회되어 매도 로직을 건너뜜")
-			return True, [], [normalize_stock_code(s['stk_cd']) for s in my_stocks], {}
+			return True, [], [s.code for s in my_stocks], {}
 		
 		# 할당금액 계산 (안정성을 위해 원금 기반 할당액 사용)
 		# 유저 요청: 평가금 변동에 따른 단계 출렁임 방지
 		# [Fix] total_buy_principal pre-calculation logic
-		total_buy_principal = 0
-		for s in my_stocks:
-			try:
-				p_amt = float(s.get('pchs_amt', s.get('pur_amt', 0)))
-				if p_amt == 0:
-					_q = int(float(str(s.get('rmnd_qty', s.get('hold_qty', s.get('qty', 0)))).replace(',', '')))
-					_a = float(str(s.get('pchs_avg_pric', s.get('avg_prc', 0))).replace(',', ''))
-					p_amt = _q * _a
-				total_buy_principal += p_amt
-			except: pass
+		total_buy_principal = my_stocks.total_pur_amt()
 
 
 		principal_basis = deposit_amt + total_buy_principal
@@ -143,32 +210,25 @@ def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, ou
 
 		
 		for stock in my_stocks:
-			stock_code = normalize_stock_code(stock['stk_cd'])
+			stock_code = stock.code
 			stock_name = stock['stk_nm']
 			holdings_codes.append(stock_code) 
 			rsi_1m = None # Initialize to avoid UnboundLocalError
 
-			pl_rt = float(stock['pl_rt']) if stock['pl_rt'] else 0.0
+			pl_rt = stock.pl_rate
 			
 			# [Realtime Price Injection] 실시간 시세를 사용하여 수익률 및 현재가 정밀화
-			cur_prc_val = float(stock.get('cur_prc', 0))
+			cur_prc_val = stock.cur_price
 			if realtime_prices and stock_code in realtime_prices:
 				rt_prc = float(realtime_prices[stock_code])
 				if rt_prc > 0:
 					cur_prc_val = rt_prc
 					# 실시간 가격 기준 수익률 재계산 (Account API 지연 극복)
-					try:
-						avg_prc = float(str(stock.get('pchs_avg_pric', stock.get('avg_prc', 0))).replace(',', ''))
-						if avg_prc > 0:
-							pl_rt = ((cur_prc_val - avg_prc) / avg_prc) * 100
-					except: pass
+					if stock.avg_price > 0:
+						pl_rt = ((cur_prc_val - stock.avg_price) / stock.avg_price) * 100
 
 			# [Robust Qty Extractor] 1주인데 이전 루프 변수가 남지 않도록 매 루프마다 새로 추출
-			try:
-				qty_raw = stock.get('rmnd_qty', stock.get('hold_qty', stock.get('qty', 0)))
-				qty = int(float(str(qty_raw).replace(',', '')))
-			except:
-				qty = 0
+			qty = stock.qty
 
 
 			
@@ -179,12 +239,7 @@ def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, ou
 
 			# [단계 판독 - 금액 비중(Filled Ratio) 기반으로 완전 교체]
 			# (수량 기반 log2 방식은 저가주에서 오류를 일으키므로 폐기)
-			pchs_amt = 0
-			if 'pur_amt' in stock and stock['pur_amt']: pchs_amt = int(stock['pur_amt'])
-			elif 'pchs_amt' in stock and stock['pchs_amt']: pchs_amt = int(stock['pchs_amt'])
-			else:
-				try: pchs_amt = float(stock.get('pchs_avg_pric', 0)) * int(stock.get('rmnd_qty', 0))
-				except: pchs_amt = 0
+			pchs_amt = stock.pur_amt
 				
 			# [Filled Ratio] 현재 보유 비중 계산 (배정 금액 대비)
 			filled_ratio = pchs_amt / alloc_per_stock if alloc_per_stock > 0 else 0
@@ -339,7 +394,8 @@ def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, ou
 						if sell_qty > 0:
 							logger.info(f"⚖️ [AI 리스크 관리] {stock_name}: {risk_reason} -> {sell_qty}주(50%) 리스크 조절 매도")
 							final_code = stock_code.replace('A', '')
-							res_code, res_msg = sell_stock(final_code, sell_qty, token=token)
+							ticket = order_dispatcher.submit_sell(final_code, sell_qty, token=token, source='분할매도', held_before=qty, join=False)
+							res_code, res_msg = ticket.wait() if ticket else ('DUPLICATE', '같은 종목 매도 주문이 이미 전송 중')
 							
 							if str(res_code) in ['0', 'SUCCESS']:
 								partially_sold_codes.add(stock_code)
@@ -376,7 +432,8 @@ def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, ou
 						if sell_qty > 0:
 							logger.info(f"⚖️ [AI판단 분할매도] {stock_name}: {reason} -> {sell_qty}주(50%) 부분 익절 진행")
 							final_code = stock_code.replace('A', '')
-							res_code, res_msg = sell_stock(final_code, sell_qty, token=token)
+							ticket = order_dispatcher.submit_sell(final_code, sell_qty, token=token, source='분할매도', held_before=qty, join=False)
+							res_code, res_msg = ticket.wait() if ticket else ('DUPLICATE', '같은 종목 매도 주문이 이미 전송 중')
 							
 							if str(res_code) in ['0', 'SUCCESS']:
 								partially_sold_codes.add(stock_code)
@@ -419,19 +476,19 @@ def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, ou
 						current_orders = api.get_outstanding_orders(token)
 					
 					if current_orders:
-						for order in current_orders:
-							order_code = normalize_stock_code(order.get('stk_cd', order.get('code', '')))
-							order_type = order.get('type', order.get('ord_tp', ''))
+						for order in as_orders(current_orders).for_code(stock_code):
 							# 매수 주문이면 취소
-							if order_code == stock_code and (order_type == 'buy' or order_type == '01'):
+							if order.is_buy:
 								logger.warning(f"[미체결 취소] {stock_name}: 매도 전 미체결 매수 주문 취소")
 								try:
 									from kiwoom_adapter import get_api
 									api = get_api()
-									ord_no = order.get('ord_no', order.get('org_ord_no', ''))
-									qty = order.get('qty', 0)
-									if ord_no and qty > 0:
-										api.cancel_stock(stock_code, str(qty), ord_no, token)
+									ord_no = order.ord_no or order.get('org_ord_no', '')
+									if ord_no and order.qty > 0:
+										cancel_code, _ = api.cancel_stock(stock_code, str(order.qty), ord_no, token)
+										if str(cancel_code) in ['0', 'SUCCESS']:
+											# 취소된 매수의 체결 대기 해제 (다음 매수가 중복 주문으로 막히지 않도록)
+											order_dispatcher.release(stock_code, 'buy', '매도 전 취소')
 										time.sleep(0.5) 
 								except: pass
 				except: pass
@@ -447,93 +504,22 @@ def chk_n_sell(token=None, held_since=None, my_stocks=None, deposit_amt=None, ou
 				# [매도 API 호출]
 				# [Fix] 종목코드 A 제거 재확인 (API 호환성)
 				final_code = stock_code.replace('A', '')
-				return_code, return_msg = sell_stock(final_code, stock['rmnd_qty'], token=token)
-				
-				# 성공 확인 (Real=0, Mock=SUCCESS)
-				if str(return_code) not in ['0', 'SUCCESS']:
-					logger.error(f"[매도 실패] {stock['stk_nm']} ({stock_code}): {return_msg}")
-					if stock_code in config.stocks_being_sold:
-						config.stocks_being_sold.remove(stock_code)
-					
-					# Ghost Stock 처리
-					if '800033' in str(return_msg): # 매도수량 부족 -> 잔고 없음
-						logger.warning(f"[Ghost Stock 감지] {stock_name}: 강제 삭제 처리")
-						# [Turbo TS] 고스트 종목도 캐시 삭제
-						if stock_code in HIGH_PRICE_MEM_CACHE:
-							del HIGH_PRICE_MEM_CACHE[stock_code]
-						sold_stocks.append(stock_code)
+				# [Order Dispatcher] 주문 큐에 넣고 다음 종목 판단 계속 (응답 처리는 루프 종료 후)
+				ticket = order_dispatcher.submit_sell(final_code, stock.qty, token=token, source=sell_reason, held_before=stock.qty, join=False)
+				if ticket is None:
+					# 다른 경로의 매도가 아직 진행 중이므로 stocks_being_sold 표시는 그대로 둠 (해제는 그 경로가 담당)
+					logger.warning(f"[중복 주문 방지] {stock_name}: 같은 종목 매도 주문이 이미 전송 중")
 					continue
-				
-				# [Turbo TS] 매도 성공 시 메모리 캐시 삭제 (다음 매매를 위해 리셋)
-				if stock_code in HIGH_PRICE_MEM_CACHE:
-					del HIGH_PRICE_MEM_CACHE[stock_code]
-					logger.info(f"[Turbo TS] {stock_name} 고점 기록 리셋 완료")
-
-				# [Source Fix] 가공하지 말고 실제 필드값 사용
-				trade_source = stock.get('trade_type', '-')
-				final_reason_text = sell_reason
-				sell_reasons[stock_code] = final_reason_text
-
-				# [DB 기록]
-				try:
-					from database_trading_log import log_sell_to_db
-					from kiwoom_adapter import get_current_api_mode
-					mode = get_current_api_mode().upper() 
-					# [Fix] 가공하지 않은 사유와 소스 사용
-					log_sell_to_db(stock_code, stock['stk_nm'], int(stock['rmnd_qty']), int(stock.get('cur_prc', 0)), pl_rt, final_reason_text, mode, trade_source)
-				except Exception as e:
-					logger.error(f"매도 로그 DB 저장 실패: {e}")
-				
-				# 정리
-				clear_stock_status_sync(stock_code)
-				try: 
-					check_n_buy.reset_accumulation(stock_code)
-					# [Fix] 매도 시 보유 시간 기록 삭제 (재매수 시 0분부터 시작)
-					from database_helpers import delete_held_time
-					delete_held_time(stock_code)
-				except: pass
-				
-				# 매도 완료 상태 해제 (지연)
-				import threading
-				def remove_from_being_sold():
-					time.sleep(5)
-					if stock_code in config.stocks_being_sold:
-						config.stocks_being_sold.remove(stock_code)
-					if stock_code in partially_sold_codes:
-						partially_sold_codes.discard(stock_code)
-					
-					# [AI] 전량 매도 완료 시 리스크 관리 이력도 완전 초기화
-					if stock_code in ai_partial_sold_history:
-						del ai_partial_sold_history[stock_code]
-						
-					logger.info(f"[매도 완료] {stock_name}: 매도 상태 및 AI 리스크 기록 해제")
-				threading.Thread(target=remove_from_being_sold, daemon=True).start()
-
-				# 텔레그램 전송
-				# 텔레그램 전송
-				result_emoji = "🔴" if pl_rt > 0 else "🔵"
-				# [LASTTRADE] 시스템 명칭 포함 및 포맷 통일
-				message = f'[{mode}] {result_emoji} LASTTRADE 매도 완료: {stock["stk_nm"]} {int(stock["rmnd_qty"])}주 ({sell_reason}) [수익률: {pl_rt}%]'
-				tel_send(message)
-				logger.info(message)
-				
-				sold_stocks.append(stock_code)
-				
-				# 재매수 쿨다운 (전량 매도일 때만 적용하여, 분할 매도 후 AI가 다시 사는 것 허용)
-				is_partial_sell = "축소" in sell_reason or "분할" in sell_reason or "PARTIAL" in sell_reason
-				
-				if not is_partial_sell:
-					check_n_buy.last_sold_times[stock_code] = time.time()
-				else:
-					logger.info(f"⚖️ [AI Trading] {stock_code}: 분할 매도이므로 재매수 쿨다운 미적용 (즉시 재진입 가능)")
+				pending_sells.append((stock, stock_code, stock_name, pl_rt, sell_reason, ticket))
 
-				# [Cleanup] 장중 중복 학습 트리거 제거 (장 마감 후 bot.py에서 1회만 수행 권장)
-				pass
+		# [매도 응답 처리] 전량 매도 주문 결과 확인 후 기록/정리
+		finish_pending_sells()
 
 		return True, sold_stocks, holdings_codes, sell_reasons
 
 	except Exception as e:
 		print(f"오류 발생(chk_n_sell): {e}")
+		finish_pending_sells()
 		return False, [], [], {}
 
 if __name__ == "__main__":
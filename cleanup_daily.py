@@ -27,7 +27,7 @@ def cleanup_daily_data():
         logger.info(f"🧹 일일 데이터 정리 시작 (기준일: {today})")
         
         # 1. 전일 거래 내역 삭제 (당일만 유지)
-        cursor.execute("DELETE FROM trades WHERE DATE(timestamp) < ?", (today,))
+        cursor.execute("DELETE FROM trades WHERE timestamp < ?", (today,))
         deleted_trades = cursor.rowcount
         logger.info(f"  ✓ trades: {deleted_trades:,}개 삭제")
         
@@ -0,0 +1,130 @@
+"""
+조건검색식 여러 개 동시 구독 상태 (조건식별 가중치 + 편입 종목 집합)
+
+설정 search_seqs 예: "0:1.0, 3:0.5" (조건식 번호:가중치, 가중치 생략 시 1.0)
+비어 있으면 기존 search_seq 한 개를 가중치 1.0으로 사용합니다.
+- 초기조회(CNSRREQ 응답) → on_snapshot(): 조건식 편입 종목 집합 교체 (추가/이탈 종목 반환)
+- 실시간 편입/이탈(REAL type '02') → on_event(): 한 종목씩 반영
+- best(code): 종목이 편입된 조건식 중 가중치가 가장 큰 (조건식 번호, 가중치) → 매수 대기열 점수/태그에 사용
+- 실시간 편입/이탈 알림을 못 받는 서버면 needs_refresh()가 일정 간격으로 초기조회 재요청 시점을 알려줌
+"""
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# 실시간 편입/이탈 알림이 없을 때 초기조회로 다시 맞추는 간격(초)
+CONDITION_REFRESH_FALLBACK_SEC = 60.0
+
+def parse_condition_weights(text, default_seq='0') -> Dict[str, float]:
+    """"0:1.0, 3:0.5" → {'0': 1.0, '3': 0.5} (형식이 틀린 항목은 건너뜀)"""
+    weights = {}
+    for part in str(text or '').replace(';', ',').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        seq, _, weight = part.partition(':')
+        seq = seq.strip()
+        if not seq:
+            continue
+        try:
+            weights[seq] = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            continue
+    if not weights:
+        weights[str(default_seq).strip() or '0'] = 1.0
+    return weights
+
+class ConditionSet:
+    """
+    조건식 번호 → 가중치 / 이름 / 편입 종목 (asyncio 단일 스레드 사용 전제)
+    - subscribed: 현재 연결에서 실시간 등록(CNSRREQ search_type 1)을 보낸 조건식
+    """
+    def __init__(self, weights: Optional[Dict[str, float]] = None, clock=time.time):
+        self._clock = clock
+        self.weights: Dict[str, float] = dict(weights or {'0': 1.0})
+        self.names: Dict[str, str] = {}
+        self.members: Dict[str, Set[str]] = {}
+        self.subscribed: Set[str] = set()
+        self.last_event_time = 0.0      # 마지막 실시간 편입/이탈 수신 시각
+        self.last_snapshot_time = {}    # 조건식별 마지막 초기조회 반영 시각
+        self.counters = {'inserted': 0, 'deleted': 0, 'snapshots': 0}
+
+    def configure(self, weights: Dict[str, float]):
+        """조건식 구성 변경 (빠진 조건식의 편입 종목은 버림), 새로 추가된 조건식 번호 반환"""
+        added = [seq for seq in weights if seq not in self.weights]
+        for seq in list(self.weights):
+            if seq not in weights:
+                self.members.pop(seq, None)
+                self.subscribed.discard(seq)
+        self.weights = dict(weights)
+        return added
+
+    def reset_connection(self):
+        """새 연결에는 조건식 실시간 등록이 없음"""
+        self.subscribed = set()
+
+    # ==================== 편입 / 이탈 ====================
+
+    def on_snapshot(self, seq, codes: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """초기조회 결과로 편입 종목 교체, (새로 편입, 이탈) 반환"""
+        seq = str(seq).strip()
+        new = set(codes)
+        old = self.members.get(seq, set())
+        self.members[seq] = new
+        self.last_snapshot_time[seq] = self._clock()
+        self.counters['snapshots'] += 1
+        return new - old, old - new
+
+    def on_event(self, seq, code, inserted) -> bool:
+        """실시간 편입/이탈 1건 반영, 집합이 바뀌었으면 True"""
+        self.last_event_time = self._clock()
+        members = self.members.setdefault(str(seq).strip(), set())
+        if inserted:
+            if code in members:
+                return False
+            members.add(code)
+            self.counters['inserted'] += 1
+            return True
+        if code not in members:
+            return False
+        members.discard(code)
+        self.counters['deleted'] += 1
+        return True
+
+    # ==================== 조회 ====================
+
+    @property
+    def tracking(self) -> bool:
+        """편입 종목을 하나라도 알고 있으면 True (모르면 모든 실시간 종목을 후보로 취급)"""
+        return any(self.members.values())
+
+    def best(self, code) -> Optional[Tuple[str, float]]:
+        """종목이 편입된 조건식 중 가중치 최대 (조건식 번호, 가중치), 없으면 None"""
+        best = None
+        for seq, members in self.members.items():
+            if code in members:
+                weight = self.weights.get(seq, 1.0)
+                if best is None or weight > best[1]:
+                    best = (seq, weight)
+        return best
+
+    def all_members(self) -> Set[str]:
+        result = set()
+        for members in self.members.values():
+            result |= members
+        return result
+
+    def needs_refresh(self, seq, interval=CONDITION_REFRESH_FALLBACK_SEC) -> bool:
+        """실시간 편입/이탈 알림이 interval 동안 없고 초기조회도 interval이 지났으면 True"""
+        now = self._clock()
+        if now - self.last_event_time < interval:
+            return False
+        return now - self.last_snapshot_time.get(seq, 0.0) >= interval
+
+    def label(self, seq) -> str:
+        name = self.names.get(seq)
+        return f"[{seq}] {name}" if name else f"[{seq}]"
+
+    def format_stats(self) -> str:
+        parts = [f"{self.label(seq)} x{weight:g} {len(self.members.get(seq, ()))}종목" for seq, weight in self.weights.items()]
+        c = self.counters
+        return ', '.join(parts) + f" (편입 {c['inserted']} / 이탈 {c['deleted']} / 초기조회 {c['snapshots']})"
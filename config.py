@@ -70,8 +70,16 @@ class BotConfig:
     def app_secret(self):
         return self.paper_app_secret if self.is_paper_trading else self.real_app_secret
 
+    @property
+    def api_host_override(self):
+        # 로컬 대역 서버(kiwoom_standin_server.py) 등으로 REST 호출을 보낼 때 사용 (비어 있으면 키움 서버)
+        val = get_setting('api_host_override', '')
+        return val.strip().rstrip('/') if val else ''
+
     @property
     def host_url(self):
+        if self.api_host_override:
+            return self.api_host_override
         return "https://mockapi.kiwoom.com" if self.is_paper_trading else "https://api.kiwoom.com"
 
     @property
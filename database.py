@@ -4,6 +4,8 @@ import datetime
 import os
 from logger import logger
 import config
+from database_helpers import TRADES_INDEXES, ensure_positions_ledger, invalidate_positions, get_position_step
+from db_writer import db_writer, DB_WRITE_ACK_TIMEOUT
 
 DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trading.db')
 
@@ -251,8 +253,15 @@ async def init_db():
 			)
 		''')
 
+		# 4. trades 조회 인덱스 (당일 범위 조회 / 종목별 단계 조회용)
+		for index_sql in TRADES_INDEXES:
+			await db.execute(index_sql)
+
 		await db.commit()
-		logger.info(f"데이터베이스 초기화 완료: {DB_FILE}")
+
+	# 5. 포지션 원장 (trades 트리거로 단계/평균가 증분 관리)
+	ensure_positions_ledger()
+	logger.info(f"데이터베이스 초기화 완료: {DB_FILE}")
 
 async def log_trade(trade_type, code, name, qty, price, profit_rate=0.0, memo="", mode="REAL", reason="", amt=0):
 	"""매매 기록 저장 (Enhanced)"""
@@ -265,12 +274,12 @@ async def log_trade(trade_type, code, name, qty, price, profit_rate=0.0, memo=""
 	except: pass
 
 	try:
-		async with aiosqlite.connect(DB_FILE) as db:
-			await db.execute('''
-				INSERT INTO trades (timestamp, type, code, name, qty, price, profit_rate, memo, mode, reason, amt, avg_price)
-				VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-			''', (timestamp, trade_type, code, name, qty, price, profit_rate, memo, mode, reason, amt, price))
-			await db.commit()
+		# [Write-Behind] 쓰기 큐를 거쳐 앞선 기록 뒤에 순서대로 즉시 커밋, 커밋 완료(ack)까지 대기
+		await asyncio.wrap_future(db_writer.submit('''
+			INSERT INTO trades (timestamp, type, code, name, qty, price, profit_rate, memo, mode, reason, amt, avg_price)
+			VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+		''', (timestamp, trade_type, code, name, qty, price, profit_rate, memo, mode, reason, amt, price), urgent=True))
+		invalidate_positions()
 	except Exception as e:
 		logger.error(f"DB 매매 기록 저장 실패: {e}")
 
@@ -338,12 +347,11 @@ async def log_asset_history(total_asset, profit_loss):
 	"""자산 변동 내역 저장"""
 	timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M') # 분 단위 저장
 	try:
-		async with aiosqlite.connect(DB_FILE) as db:
-			await db.execute('''
-				INSERT OR REPLACE INTO asset_history (timestamp, total_asset, profit_loss)
-				VALUES (?, ?, ?)
-			''', (timestamp, total_asset, profit_loss))
-			await db.commit()
+		# [Write-Behind] 메인 루프는 대기하지 않고 쓰기 큐에 넣기만 함
+		db_writer.submit('''
+			INSERT OR REPLACE INTO asset_history (timestamp, total_asset, profit_loss)
+			VALUES (?, ?, ?)
+		''', (timestamp, total_asset, profit_loss))
 	except Exception as e:
 		logger.error(f"DB 자산 기록 저장 실패: {e}")
 
@@ -351,12 +359,11 @@ async def log_price_history(code, price):
 	"""종목별 가격(분봉) 저장"""
 	timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M') # 분 단위
 	try:
-		async with aiosqlite.connect(DB_FILE) as db:
-			await db.execute('''
-				INSERT OR REPLACE INTO price_history (code, timestamp, price)
-				VALUES (?, ?, ?)
-			''', (code, timestamp, price))
-			await db.commit()
+		# [Write-Behind] 쓰기 큐에서 배치 저장
+		db_writer.submit('''
+			INSERT OR REPLACE INTO price_history (code, timestamp, price)
+			VALUES (?, ?, ?)
+		''', (code, timestamp, price))
 	except Exception as e:
 		logger.error(f"DB 가격 기록 저장 실패: {e}")
 
@@ -376,12 +383,10 @@ async def get_price_history(code, limit=30):
 		logger.error(f"DB 가격 기록 조회 실패: {e}")
 		return []
 
-import sqlite3
-
 def get_db_connection():
-	conn = sqlite3.connect(DB_FILE)
-	conn.row_factory = sqlite3.Row
-	return conn
+	"""DB 연결 반환 (database_helpers의 스레드별 풀링 연결 공유)"""
+	from database_helpers import get_db_connection as pooled_connection
+	return pooled_connection()
 
 def log_trade_sync(trade_type, code, name, qty, price, profit_rate=0.0, memo=""):
 	"""매매 기록 저장 (Sync)"""
@@ -394,12 +399,12 @@ def log_trade_sync(trade_type, code, name, qty, price, profit_rate=0.0, memo="")
 	except: pass
 
 	try:
-		with get_db_connection() as conn:
-			conn.execute('''
-				INSERT INTO trades (timestamp, type, code, name, qty, price, profit_rate, memo, mode)
-				VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-			''', (timestamp, trade_type, code, name, qty, price, profit_rate, memo, mode))
-			conn.commit()
+		# [Write-Behind] 즉시 커밋 후 ack까지 대기
+		db_writer.write('''
+			INSERT INTO trades (timestamp, type, code, name, qty, price, profit_rate, memo, mode)
+			VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+		''', (timestamp, trade_type, code, name, qty, price, profit_rate, memo, mode))
+		invalidate_positions()
 	except Exception as e:
 		logger.error(f"DB 매매 기록 저장 실패(Sync): {e}")
 
@@ -451,10 +456,15 @@ def clear_stock_status_sync(code):
 		logger.error(f"DB 종목 상태 삭제 실패(Sync): {e}")
 
 def get_watering_step_count_sync(code, mode='REAL'):
-	"""현재 보유중인 종목의 매수 횟수(단계) 조회 (Sync)"""
+	"""현재 보유중인 종목의 매수 횟수(단계) 조회 (Sync, 포지션 원장 O(1) 조회)"""
+	# 종목 코드가 A로 시작하면 제거
+	clean_code = str(code).replace('A', '')
+	try:
+		return get_position_step(clean_code, mode)
+	except Exception as e:
+		logger.warning(f"포지션 원장 조회 실패, trades 직접 집계: {e}")
+
 	try:
-		# 종목 코드가 A로 시작하면 제거
-		clean_code = str(code).replace('A', '')
 		with get_db_connection() as conn:
 			cursor = conn.execute('''
 				SELECT COUNT(*) FROM trades 
@@ -491,12 +501,11 @@ async def log_candle(code, timeframe, open_p, high_p, low_p, close_p, volume=0):
 	"""캔들(OHLC) 데이터 저장"""
 	timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M')
 	try:
-		async with aiosqlite.connect(DB_FILE) as db:
-			await db.execute('''
-				INSERT OR REPLACE INTO candle_history (code, timeframe, timestamp, open, high, low, close, volume)
-				VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-			''', (code, timeframe, timestamp, open_p, high_p, low_p, close_p, volume))
-			await db.commit()
+		# [Write-Behind] 캔들마다 연결을 열지 않고 쓰기 큐에서 executemany로 배치 저장
+		db_writer.submit('''
+			INSERT OR REPLACE INTO candle_history (code, timeframe, timestamp, open, high, low, close, volume)
+			VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+		''', (code, timeframe, timestamp, open_p, high_p, low_p, close_p, volume))
 	except Exception as e:
 		logger.error(f"DB 캔들 기록 저장 실패: {e}")
 
@@ -532,36 +541,30 @@ def get_candle_history_sync(code, timeframe='1m', limit=30):
 		logger.error(f"DB 캔들 조회 실패(Sync): {e}")
 		return []
 
-async def log_signal_snapshot(code, signal_type, factors: dict, market_context: dict = None):
-	"""시그널 발생 시점의 팩터 데이터를 스냅샷으로 저장 (Async)"""
+def submit_signal_snapshot(code, signal_type, factors: dict, market_context: dict = None):
+	"""
+	시그널 스냅샷을 쓰기 큐에 넣고 Future 반환 (커밋 후 signal_id로 완료)
+	매수 경로처럼 저장을 기다리면 안 되는 호출자용 (response_manager가 저장 시점에 ID 확정)
+	"""
 	import json
 	timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+	return db_writer.submit('''
+		INSERT INTO signal_snapshots (timestamp, code, signal_type, factors_json, market_context_json)
+		VALUES (?, ?, ?, ?, ?)
+	''', (timestamp, code, signal_type, json.dumps(factors), json.dumps(market_context or {})), want_rowid=True)
+
+async def log_signal_snapshot(code, signal_type, factors: dict, market_context: dict = None):
+	"""시그널 발생 시점의 팩터 데이터를 스냅샷으로 저장 (Async)"""
 	try:
-		async with aiosqlite.connect(DB_FILE) as db:
-			cursor = await db.execute('''
-				INSERT INTO signal_snapshots (timestamp, code, signal_type, factors_json, market_context_json)
-				VALUES (?, ?, ?, ?, ?)
-			''', (timestamp, code, signal_type, json.dumps(factors), json.dumps(market_context or {})))
-			signal_id = cursor.lastrowid
-			await db.commit()
-			return signal_id
+		return await asyncio.wrap_future(submit_signal_snapshot(code, signal_type, factors, market_context))
 	except Exception as e:
 		logger.error(f"DB 시그널 스냅샷 저장 실패: {e}")
 		return None
 
 def log_signal_snapshot_sync(code, signal_type, factors: dict, market_context: dict = None):
-	"""시그널 발생 시점의 팩터 데이터를 스냅샷으로 저장 (Sync)"""
-	import json
-	timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+	"""시그널 발생 시점의 팩터 데이터를 스냅샷으로 저장 (Sync, 커밋 후 signal_id 반환)"""
 	try:
-		with get_db_connection() as conn:
-			cursor = conn.execute('''
-				INSERT INTO signal_snapshots (timestamp, code, signal_type, factors_json, market_context_json)
-				VALUES (?, ?, ?, ?, ?)
-			''', (timestamp, code, signal_type, json.dumps(factors), json.dumps(market_context or {})))
-			signal_id = cursor.lastrowid
-			conn.commit()
-			return signal_id
+		return submit_signal_snapshot(code, signal_type, factors, market_context).result(DB_WRITE_ACK_TIMEOUT)
 	except Exception as e:
 		logger.error(f"DB 시그널 스냅샷 저장 실패(Sync): {e}")
 		return None
@@ -2,7 +2,6 @@
 일일 자산 기록 DB 헬퍼
 daily_asset_*.json 파일을 DB로 대체
 """
-import sqlite3
 import datetime
 import json
 import os
@@ -11,11 +10,9 @@ from logger import logger
 DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trading.db')
 
 def get_db_connection():
-	"""DB 연결 생성"""
-	conn = sqlite3.connect(DB_FILE, timeout=30)
-	conn.execute('PRAGMA journal_mode=WAL')
-	conn.row_factory = sqlite3.Row
-	return conn
+	"""DB 연결 반환 (database_helpers의 스레드별 풀링 연결 공유)"""
+	from database_helpers import get_db_connection as pooled_connection
+	return pooled_connection()
 
 def save_daily_asset(asset, mode='MOCK'):
 	"""일일 자산 저장"""
@@ -7,27 +7,188 @@ import datetime
 import json
 import time
 import math
+import copy
+import weakref
+import itertools
+import threading
+import contextlib
 from logger import logger
 from pathlib import Path
 import os
 
 DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trading.db')
 
-def get_db_connection():
-	"""DB 연결 생성"""
+# [Connection Pool] 스레드(및 프로세스)당 1개의 장기 연결을 재사용
+# 매 호출마다 connect + PRAGMA를 반복하던 비용이 작은 쿼리 비용보다 커서 풀링으로 전환
+DB_PRAGMAS = (
+	"PRAGMA journal_mode=WAL",          # [Critical] 읽기/쓰기 충돌 방지
+	"PRAGMA busy_timeout = 30000",      # Lock 발생 시 최대 30초 대기
+	"PRAGMA synchronous = NORMAL",      # WAL 모드에서는 NORMAL로도 손상 없음 (fsync 감소)
+	"PRAGMA cache_size = -16384",       # 페이지 캐시 16MB
+	"PRAGMA mmap_size = 268435456",     # 256MB 메모리 매핑 읽기
+)
+
+_pool_local = threading.local()
+
+class _ThreadConnection:
+	"""스레드당 1개의 실제 sqlite3 연결 + 열린 with 블록 깊이 + 현재 트랜잭션을 시작한 최상위 핸들"""
+	def __init__(self, conn):
+		self.conn = conn
+		self.depth = 0
+		self.owner_id = None
+		self.owner_ref = None
+		self.savepoints = itertools.count(1)
+
+	def owner(self):
+		owner = self.owner_ref() if self.owner_ref is not None else None
+		return owner if owner is not None and not owner._closed else None
+
+class PooledConnection:
+	"""
+	풀링된 sqlite3 연결 핸들 (get_db_connection() 호출마다 새 핸들, 실제 연결은 스레드당 1개)
+	- 기존 `with get_db_connection() as conn:` / conn.commit() / conn.close() 사용법을 그대로 지원
+	- 최상위 핸들 (with 블록 밖이고 다른 핸들의 트랜잭션이 진행 중이 아닐 때 받은 핸들): commit / rollback / close가 실제 트랜잭션에 적용
+	  트랜잭션을 시작한 핸들이 commit / close 없이 버려지면 (예외로 빠져나간 호출자 등) 핸들 소멸 시 또는
+	  다음 핸들을 넘겨주기 전에 rollback → 쓰기 잠금 해제
+	- 중첩 핸들 (with 블록 안 또는 다른 핸들의 트랜잭션 진행 중에 받은 핸들): SAVEPOINT 범위
+	  commit은 RELEASE, rollback / 예외 / 커밋 안 한 close는 ROLLBACK TO
+	  → 안쪽 블록이 바깥 트랜잭션을 커밋하지 않고, 안쪽 예외를 잡은 바깥 블록도 안쪽의 반쯤 쓴 내용을 커밋하지 않음
+	"""
+	def __init__(self, state):
+		init = object.__setattr__
+		init(self, '_state', state)
+		init(self, '_conn', state.conn)
+		init(self, '_entered', 0)
+		init(self, '_savepoint', None)
+		init(self, '_closed', False)
+		in_transaction = state.conn.in_transaction
+		nested = state.depth > 0 or (in_transaction and state.owner() is not None)
+		init(self, '_nested', nested)
+		if nested:
+			self._open_savepoint()
+		elif in_transaction:
+			logger.warning("[DB] commit/close 없이 남은 트랜잭션 rollback (쓰기 잠금 해제)")
+			state.conn.rollback()
+
+	def __getattr__(self, name):
+		return getattr(self._conn, name)
+
+	def __setattr__(self, name, value):
+		# row_factory, isolation_level 등은 실제 연결에 설정
+		setattr(self._conn, name, value)
+
+	# ==================== 트랜잭션 소유 ====================
+
+	def _claim(self):
+		"""트랜잭션 밖에서 쓰기를 시작할 수 있는 호출 직전: 이어서 열리는 트랜잭션의 소유자로 기록"""
+		if not self._nested and not self._conn.in_transaction:
+			state = self._state
+			state.owner_id = id(self)
+			state.owner_ref = weakref.ref(self)
+
+	def _owns_transaction(self):
+		return self._state.owner_id == id(self) and self._conn.in_transaction
+
+	def execute(self, *args, **kwargs):
+		self._claim()
+		return self._conn.execute(*args, **kwargs)
+
+	def executemany(self, *args, **kwargs):
+		self._claim()
+		return self._conn.executemany(*args, **kwargs)
+
+	def executescript(self, *args, **kwargs):
+		self._claim()
+		return self._conn.executescript(*args, **kwargs)
+
+	def cursor(self, *args, **kwargs):
+		self._claim()
+		return self._conn.cursor(*args, **kwargs)
+
+	# ==================== SAVEPOINT (중첩 핸들) ====================
+
+	def _open_savepoint(self):
+		conn = self._conn
+		if not conn.in_transaction:
+			conn.execute("BEGIN")  # 트랜잭션 밖의 SAVEPOINT는 RELEASE 시 바로 커밋되므로 먼저 시작
+		name = f"sp_{next(self._state.savepoints)}"
+		conn.execute(f"SAVEPOINT {name}")
+		object.__setattr__(self, '_savepoint', name)
+
+	def _end_savepoint(self, keep_changes):
+		name = self._savepoint
+		if name is None:
+			return
+		object.__setattr__(self, '_savepoint', None)
+		try:
+			if not keep_changes:
+				self._conn.execute(f"ROLLBACK TO {name}")
+			self._conn.execute(f"RELEASE {name}")
+		except sqlite3.OperationalError:
+			pass  # 바깥 트랜잭션이 이미 끝나 SAVEPOINT가 없음
+
+	# ==================== commit / rollback / with / close ====================
+
+	def commit(self):
+		if self._nested:
+			self._end_savepoint(True)
+			self._open_savepoint()
+		else:
+			self._conn.commit()
+
+	def rollback(self):
+		if self._nested:
+			self._end_savepoint(False)
+			self._open_savepoint()
+		else:
+			self._conn.rollback()
+
+	def __enter__(self):
+		object.__setattr__(self, '_entered', self._entered + 1)
+		self._state.depth += 1
+		return self
+
+	def __exit__(self, exc_type, exc_val, exc_tb):
+		object.__setattr__(self, '_entered', max(0, self._entered - 1))
+		self._state.depth = max(0, self._state.depth - 1)
+		if self._entered == 0:
+			if self._nested:
+				self._end_savepoint(exc_type is None)
+			elif exc_type is None:
+				self._conn.commit()
+			else:
+				self._conn.rollback()
+		return False
+
+	def close(self):
+		"""연결은 닫지 않고 커밋하지 않은 작업만 되돌림 (기존 close 동작과 같은 결과)"""
+		if self._closed or self._entered:
+			return
+		if self._nested:
+			self._end_savepoint(False)
+		elif self._owns_transaction():
+			self._conn.rollback()
+		object.__setattr__(self, '_closed', True)
+
+	def __del__(self):
+		# 트랜잭션을 시작하고 commit / close 없이 버려진 최상위 핸들의 쓰기 잠금 해제
+		try:
+			if not self._nested and not self._closed and self._state.depth == 0 and self._owns_transaction():
+				self._conn.rollback()
+		except Exception:
+			pass
+
+def _open_db_connection():
+	"""새 연결 생성 및 PRAGMA 1회 설정"""
 	conn = None
-	# [안정성 강화] DB Lock 발생 시 즉시 포기하지 않고 대기 (Busy Timeout 설정)
-	# 최대 30초(30000ms) 동안 Lock이 풀리기를 기다리도록 설정
-	# 또한, 연결 실패 시 5회까지 재시도
+	# [안정성 강화] 연결 실패(Lock) 시 5회까지 재시도
 	max_retries = 5
 	for attempt in range(max_retries):
 		try:
 			conn = sqlite3.connect(DB_FILE)
 			conn.row_factory = sqlite3.Row
-			# [Critical] WAL 모드 활성화 (읽기/쓰기 충돌 방지)
-			conn.execute("PRAGMA journal_mode=WAL")
-			# Busy Timeout 설정 (30초 대기)
-			conn.execute("PRAGMA busy_timeout = 30000")
+			for pragma in DB_PRAGMAS:
+				conn.execute(pragma)
 			return conn
 		except sqlite3.OperationalError as e:
 			if "locked" in str(e) and attempt < max_retries - 1:
@@ -36,6 +197,317 @@ def get_db_connection():
 			raise e
 	return conn
 
+def get_db_connection():
+	"""DB 연결 핸들 반환 (현재 스레드의 풀링된 연결)"""
+	state = getattr(_pool_local, 'state', None)
+	if state is not None and _pool_local.pid == os.getpid():
+		try:
+			state.conn.total_changes # 닫힌 연결 감지 (외부에서 raw 연결을 닫은 경우)
+			return PooledConnection(state)
+		except sqlite3.ProgrammingError:
+			pass
+
+	state = _ThreadConnection(_open_db_connection())
+	_pool_local.state = state
+	_pool_local.pid = os.getpid() # fork된 자식 프로세스는 부모 연결을 재사용하지 않음
+	return PooledConnection(state)
+
+@contextlib.contextmanager
+def get_db_cursor():
+	"""풀링된 연결의 커서 반환 (블록 종료 시 commit, 예외 시 rollback)"""
+	with get_db_connection() as conn:
+		cursor = conn.cursor()
+		try:
+			yield cursor
+		finally:
+			cursor.close()
+
+def close_db_connection():
+	"""현재 스레드의 풀링된 연결 종료 (스레드/프로세스 종료 시 정리용)"""
+	state = getattr(_pool_local, 'state', None)
+	_pool_local.state = None
+	if state is not None:
+		try:
+			state.conn.close()
+		except Exception:
+			pass
+
+# ==================== Trades Query Helpers ====================
+
+# trades 조회 인덱스 (init_db에서 생성)
+# - (mode, code, type, timestamp): 종목별 단계/출처/최근 매도 조회를 인덱스만으로 처리
+# - (mode, type, timestamp): 모드별 매수/매도 내역 및 당일 통계 조회
+TRADES_INDEXES = (
+	'CREATE INDEX IF NOT EXISTS idx_trades_mode_code_type_ts ON trades (mode, code, type, timestamp)',
+	'CREATE INDEX IF NOT EXISTS idx_trades_mode_type_ts ON trades (mode, type, timestamp)',
+)
+
+def get_day_range(date=None):
+	"""
+	하루를 반개구간 [시작, 다음날) 문자열로 반환
+	`timestamp LIKE 'YYYY-MM-DD%'` / `DATE(timestamp) = ?` 대신
+	`timestamp >= ? AND timestamp < ?`로 조회해야 timestamp 인덱스를 탈 수 있음
+
+	Args:
+		date: 'YYYY-MM-DD' 문자열 또는 date 객체 (None이면 오늘)
+	"""
+	if date is None:
+		day = datetime.date.today()
+	elif isinstance(date, str):
+		day = datetime.datetime.strptime(date[:10], '%Y-%m-%d').date()
+	else:
+		day = date
+	return day.strftime('%Y-%m-%d'), (day + datetime.timedelta(days=1)).strftime('%Y-%m-%d')
+
+# ==================== Positions Ledger ====================
+
+# (mode, code)별 현재 포지션 원장
+# - trades INSERT 트리거가 단계/평균가/최초매수/최근매도/출처를 증분 갱신 (O(1))
+# - trades DELETE/UPDATE(정리 스크립트, 수동 초기화 등)는 해당 종목을 dirty로 표시 → 조회 시 trades 재생으로 재계산
+# - 단계 규칙은 기존 COUNT 쿼리와 동일: 마지막 매도 이후의 매수 횟수 (매도 시 0으로 초기화)
+POSITIONS_VERSION_CHECK_INTERVAL = 1.0
+
+_POSITION_FIELDS = ('step', 'qty', 'avg_price', 'first_buy_time', 'last_buy_time', 'last_sell_time', 'source')
+
+def _ensure_positions_ledger(conn):
+	"""
+	positions 테이블/트리거 생성 및 기존 trades 백필 표시
+	trades 테이블이 아직 없으면 False 반환 (init_db 이후 재시도)
+	"""
+	if not conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='trades'").fetchone():
+		return False
+
+	# [Fix] log_buy_to_db/log_sell_to_db가 쓰는 source 컬럼이 없는 DB 보정 (트리거가 NEW.source 참조)
+	columns = [row['name'] for row in conn.execute('PRAGMA table_info(trades)').fetchall()]
+	if 'source' not in columns:
+		conn.execute('ALTER TABLE trades ADD COLUMN source TEXT')
+
+	conn.execute('''
+		CREATE TABLE IF NOT EXISTS positions (
+			mode TEXT NOT NULL,
+			code TEXT NOT NULL,
+			step INTEGER NOT NULL DEFAULT 0,
+			qty INTEGER NOT NULL DEFAULT 0,
+			avg_price REAL NOT NULL DEFAULT 0,
+			first_buy_time TEXT,
+			last_buy_time TEXT,
+			last_sell_time TEXT,
+			source TEXT,
+			dirty INTEGER NOT NULL DEFAULT 0,
+			PRIMARY KEY (mode, code)
+		)
+	''')
+	conn.execute('''
+		CREATE TABLE IF NOT EXISTS positions_version (
+			id INTEGER PRIMARY KEY CHECK (id = 1),
+			version INTEGER NOT NULL
+		)
+	''')
+	conn.execute('INSERT OR IGNORE INTO positions_version (id, version) VALUES (1, 0)')
+
+	conn.execute('''
+		CREATE TRIGGER IF NOT EXISTS positions_on_trade_buy
+		AFTER INSERT ON trades
+		WHEN lower(NEW.type) = 'buy' AND NEW.mode IS NOT NULL
+		BEGIN
+			INSERT OR IGNORE INTO positions (mode, code) VALUES (NEW.mode, NEW.code);
+			UPDATE positions SET
+				step = step + 1,
+				avg_price = CASE WHEN qty + COALESCE(NEW.qty, 0) > 0
+					THEN (qty * avg_price + COALESCE(NEW.qty, 0) * COALESCE(NEW.price, 0) * 1.0) / (qty + COALESCE(NEW.qty, 0))
+					ELSE avg_price END,
+				qty = qty + COALESCE(NEW.qty, 0),
+				first_buy_time = COALESCE(first_buy_time, NEW.timestamp),
+				last_buy_time = NEW.timestamp,
+				source = NEW.source
+			WHERE mode = NEW.mode AND code = NEW.code;
+			UPDATE positions_version SET version = version + 1 WHERE id = 1;
+		END
+	''')
+	conn.execute('''
+		CREATE TRIGGER IF NOT EXISTS positions_on_trade_sell
+		AFTER INSERT ON trades
+		WHEN lower(NEW.type) = 'sell' AND NEW.mode IS NOT NULL
+		BEGIN
+			INSERT OR IGNORE INTO positions (mode, code) VALUES (NEW.mode, NEW.code);
+			UPDATE positions SET
+				step = 0,
+				avg_price = CASE WHEN qty - COALESCE(NEW.qty, 0) > 0 THEN avg_price ELSE 0 END,
+				first_buy_time = CASE WHEN qty - COALESCE(NEW.qty, 0) > 0 THEN first_buy_time ELSE NULL END,
+				qty = MAX(0, qty - COALESCE(NEW.qty, 0)),
+				last_sell_time = NEW.timestamp
+			WHERE mode = NEW.mode AND code = NEW.code;
+			UPDATE positions_version SET version = version + 1 WHERE id = 1;
+		END
+	''')
+	conn.execute('''
+		CREATE TRIGGER IF NOT EXISTS positions_on_trade_delete
+		AFTER DELETE ON trades
+		WHEN OLD.mode IS NOT NULL
+		BEGIN
+			INSERT OR IGNORE INTO positions (mode, code) VALUES (OLD.mode, OLD.code);
+			UPDATE positions SET dirty = 1 WHERE mode = OLD.mode AND code = OLD.code;
+			UPDATE positions_version SET version = version + 1 WHERE id = 1;
+		END
+	''')
+	conn.execute('''
+		CREATE TRIGGER IF NOT EXISTS positions_on_trade_update
+		AFTER UPDATE OF timestamp, type, code, qty, price, mode, source ON trades
+		BEGIN
+			INSERT OR IGNORE INTO positions (mode, code) SELECT OLD.mode, OLD.code WHERE OLD.mode IS NOT NULL;
+			INSERT OR IGNORE INTO positions (mode, code) SELECT NEW.mode, NEW.code WHERE NEW.mode IS NOT NULL;
+			UPDATE positions SET dirty = 1
+			WHERE (mode = OLD.mode AND code = OLD.code) OR (mode = NEW.mode AND code = NEW.code);
+			UPDATE positions_version SET version = version + 1 WHERE id = 1;
+		END
+	''')
+
+	# 트리거 생성 이전에 쌓인 trades는 원장에 없으므로 재계산 대상으로 표시 (이미 있는 종목은 무시)
+	conn.execute('''
+		INSERT OR IGNORE INTO positions (mode, code, dirty)
+		SELECT DISTINCT mode, code, 1 FROM trades WHERE mode IS NOT NULL
+	''')
+	conn.commit()
+	return True
+
+def _replay_position(trades):
+	"""trades 행(id 순)을 재생하여 포지션 계산 (INSERT 트리거와 동일한 규칙)"""
+	pos = {'step': 0, 'qty': 0, 'avg_price': 0.0, 'first_buy_time': None,
+		   'last_buy_time': None, 'last_sell_time': None, 'source': None}
+	for t in trades:
+		trade_type = str(t['type'] or '').lower()
+		qty = t['qty'] or 0
+		if trade_type == 'buy':
+			if pos['qty'] + qty > 0:
+				pos['avg_price'] = (pos['qty'] * pos['avg_price'] + qty * (t['price'] or 0)) / (pos['qty'] + qty)
+			pos['step'] += 1
+			pos['qty'] += qty
+			if pos['first_buy_time'] is None:
+				pos['first_buy_time'] = t['timestamp']
+			pos['last_buy_time'] = t['timestamp']
+			pos['source'] = t['source']
+		elif trade_type == 'sell':
+			remain = pos['qty'] - qty
+			pos['step'] = 0
+			if remain <= 0:
+				pos['avg_price'] = 0.0
+				pos['first_buy_time'] = None
+			pos['qty'] = max(0, remain)
+			pos['last_sell_time'] = t['timestamp']
+	return pos
+
+def _rebuild_dirty_positions(conn):
+	"""dirty 표시된 종목만 trades 재생으로 재계산 (남은 거래가 없으면 원장에서 삭제)"""
+	dirty = conn.execute('SELECT mode, code FROM positions WHERE dirty = 1').fetchall()
+	if not dirty:
+		return 0
+
+	with conn:
+		for row in dirty:
+			mode, code = row['mode'], row['code']
+			trades = conn.execute('''
+				SELECT type, qty, price, timestamp, source FROM trades
+				WHERE mode = ? AND code = ? ORDER BY id
+			''', (mode, code)).fetchall()
+			if not trades:
+				conn.execute('DELETE FROM positions WHERE mode = ? AND code = ?', (mode, code))
+				continue
+			pos = _replay_position(trades)
+			conn.execute(f'''
+				UPDATE positions SET {', '.join(f'{field} = ?' for field in _POSITION_FIELDS)}, dirty = 0
+				WHERE mode = ? AND code = ?
+			''', tuple(pos[field] for field in _POSITION_FIELDS) + (mode, code))
+		# 다른 프로세스의 메모리 원장도 재계산 결과를 다시 읽도록 버전 증가
+		conn.execute('UPDATE positions_version SET version = version + 1 WHERE id = 1')
+	return len(dirty)
+
+class PositionLedger:
+	"""
+	positions 테이블의 프로세스 메모리 사본
+	- positions_version 값이 바뀐 경우에만 전체 원장을 쿼리 1회로 다시 읽음
+	- 조회는 (mode, code) dict 조회
+	"""
+	def __init__(self, check_interval=POSITIONS_VERSION_CHECK_INTERVAL):
+		self.check_interval = check_interval
+		self.version = None
+		self._positions = {}
+		self._last_check = 0.0
+		self._schema_ready = False
+		self._lock = threading.Lock()
+
+	def invalidate(self):
+		"""다음 조회 시 버전 재확인 (같은 프로세스에서 매매 기록 직후 호출)"""
+		self._last_check = 0.0
+
+	def _is_fresh(self):
+		return self.version is not None and (time.monotonic() - self._last_check) < self.check_interval
+
+	def ensure_schema(self, conn):
+		if not self._schema_ready:
+			self._schema_ready = _ensure_positions_ledger(conn)
+		return self._schema_ready
+
+	def refresh(self):
+		"""버전이 바뀌었으면 dirty 종목 재계산 후 전체 원장 재로드"""
+		if self._is_fresh():
+			return
+		with self._lock:
+			if self._is_fresh():
+				return
+			with get_db_connection() as conn:
+				if not self.ensure_schema(conn):
+					return
+				row = conn.execute('SELECT version FROM positions_version WHERE id = 1').fetchone()
+				version = row['version'] if row else 0
+				if version != self.version:
+					if _rebuild_dirty_positions(conn):
+						version = conn.execute('SELECT version FROM positions_version WHERE id = 1').fetchone()['version']
+					rows = conn.execute('SELECT * FROM positions').fetchall()
+					self._positions = {(r['mode'], r['code']): {field: r[field] for field in _POSITION_FIELDS} for r in rows}
+					self.version = version
+			self._last_check = time.monotonic()
+
+	def get(self, code, mode='REAL'):
+		self.refresh()
+		pos = self._positions.get((mode, str(code).replace('A', '')))
+		return dict(pos) if pos else None
+
+	def get_all(self, mode='REAL'):
+		self.refresh()
+		return {code: dict(pos) for (m, code), pos in self._positions.items() if m == mode}
+
+_position_ledger = PositionLedger()
+
+def ensure_positions_ledger():
+	"""positions 원장 스키마/트리거 준비 (init_db에서 호출, 이후 INSERT되는 trades부터 증분 반영)"""
+	try:
+		with get_db_connection() as conn:
+			_position_ledger.ensure_schema(conn)
+	except Exception as e:
+		logger.error(f"포지션 원장 초기화 실패: {e}")
+
+def invalidate_positions():
+	"""같은 프로세스에서 trades를 기록/삭제한 직후 호출 (메모리 원장 즉시 재확인)"""
+	_position_ledger.invalidate()
+
+def get_position(code, mode='REAL'):
+	"""
+	종목 포지션 조회 (메모리 원장)
+
+	Returns:
+		dict(step, qty, avg_price, first_buy_time, last_buy_time, last_sell_time, source) 또는 None
+	"""
+	return _position_ledger.get(code, mode)
+
+def get_all_positions(mode='REAL'):
+	"""모드별 전체 포지션 조회 ({code: position dict})"""
+	return _position_ledger.get_all(mode)
+
+def get_position_step(code, mode='REAL'):
+	"""마지막 매도 이후 매수 횟수(물타기 단계) 조회"""
+	pos = _position_ledger.get(code, mode)
+	return int(pos['step']) if pos else 0
+
 # ==================== Held Times ====================
 
 def save_held_time(code, held_since=None):
@@ -99,6 +571,130 @@ def clear_all_held_times():
 
 # ==================== Settings ====================
 
+# 문자열로 유지해야 하는 설정 키 (인증키, 계좌번호 등)
+STRING_SETTING_KEYS = ('real_app_key', 'real_app_secret', 'paper_app_key', 'paper_app_secret',
+					   'telegram_token', 'telegram_chat_id', 'my_account')
+
+# 설정 버전 확인 주기(초)
+# 같은 프로세스의 저장은 즉시 반영되고, 다른 프로세스(web_server 등)의 저장은 이 주기 안에 반영됨
+SETTINGS_VERSION_CHECK_INTERVAL = 1.0
+
+def _parse_setting_value(key, value_str):
+	"""설정 문자열 타입 복원 (bool → JSON → 숫자 → 문자열 순)"""
+	val_lower = value_str.strip().lower()
+	if val_lower == 'true': return True
+	if val_lower == 'false': return False
+
+	# JSON 파싱 시도
+	try:
+		return json.loads(value_str)
+	except:
+		# 특정 키(인증키, 계좌번호 등)는 숫자 변환을 건너뛰고 문자열로 유지
+		if key in STRING_SETTING_KEYS:
+			return value_str
+
+		# 숫자 변환 시도
+		try:
+			if '.' in value_str:
+				return float(value_str)
+			return int(value_str)
+		except:
+			return value_str
+
+def _ensure_settings_version(conn):
+	"""
+	settings_version 테이블 및 트리거 생성
+	settings 테이블의 INSERT/UPDATE/DELETE마다 버전이 1씩 증가하므로
+	save_setting/save_all_settings 외에 다른 스크립트가 직접 수정한 경우도 감지됨
+	"""
+	conn.execute('''
+		CREATE TABLE IF NOT EXISTS settings_version (
+			id INTEGER PRIMARY KEY CHECK (id = 1),
+			version INTEGER NOT NULL
+		)
+	''')
+	conn.execute('INSERT OR IGNORE INTO settings_version (id, version) VALUES (1, 0)')
+	for event in ('INSERT', 'UPDATE', 'DELETE'):
+		conn.execute(f'''
+			CREATE TRIGGER IF NOT EXISTS settings_version_on_{event.lower()}
+			AFTER {event} ON settings
+			BEGIN
+				UPDATE settings_version SET version = version + 1 WHERE id = 1;
+			END
+		''')
+	conn.commit()
+
+class SettingsCache:
+	"""
+	프로세스 전역 설정 캐시
+	- settings_version 값이 바뀐 경우에만 전체 설정을 쿼리 1회로 다시 읽음
+	- 버전 확인은 check_interval 주기로만 수행 (그 사이의 조회는 dict 조회)
+	"""
+	def __init__(self, check_interval=SETTINGS_VERSION_CHECK_INTERVAL):
+		self.check_interval = check_interval
+		self.version = None
+		self._values = {}
+		self._last_check = 0.0
+		self._schema_ready = False
+		self._lock = threading.Lock()
+
+	def invalidate(self):
+		"""다음 조회 시 버전 재확인 (같은 프로세스에서 저장한 직후 호출)"""
+		self._last_check = 0.0
+
+	def _is_fresh(self):
+		return self.version is not None and (time.monotonic() - self._last_check) < self.check_interval
+
+	def refresh(self):
+		"""버전이 바뀌었으면 전체 설정 재로드"""
+		if self._is_fresh():
+			return
+		with self._lock:
+			if self._is_fresh():
+				return
+			with get_db_connection() as conn:
+				if not self._schema_ready:
+					_ensure_settings_version(conn)
+					self._schema_ready = True
+				row = conn.execute('SELECT version FROM settings_version WHERE id = 1').fetchone()
+				version = row['version'] if row else 0
+				if version != self.version:
+					rows = conn.execute('SELECT key, value FROM settings').fetchall()
+					self._values = {r['key']: _parse_setting_value(r['key'], r['value']) for r in rows}
+					self.version = version
+			self._last_check = time.monotonic()
+
+	def get(self, key, default=None):
+		self.refresh()
+		value = self._values.get(key, default)
+		# dict/list는 호출자가 수정해도 캐시가 오염되지 않도록 복사본 반환
+		if isinstance(value, (dict, list)):
+			return copy.deepcopy(value)
+		return value
+
+_settings_cache = SettingsCache()
+
+# 같은 프로세스에서 설정을 저장했을 때 호출할 콜백 (kiwoom_adapter의 API 재확인 등)
+_settings_listeners = []
+
+def add_settings_listener(callback):
+	"""설정 저장 시 호출될 콜백 등록 (다른 프로세스의 변경은 get_settings_version으로 감지)"""
+	if callback not in _settings_listeners:
+		_settings_listeners.append(callback)
+
+def _notify_settings_changed():
+	_settings_cache.invalidate()
+	for callback in list(_settings_listeners):
+		try:
+			callback()
+		except Exception as e:
+			logger.error(f"설정 변경 콜백 실패: {e}")
+
+def get_settings_version():
+	"""설정 버전 조회 (설정 캐시 기준, 바뀌었으면 설정이 변경된 것)"""
+	_settings_cache.refresh()
+	return _settings_cache.version
+
 def save_setting(key, value):
 	"""설정 저장 (settings.json 대체)"""
 	timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -118,43 +714,26 @@ def save_setting(key, value):
 				VALUES (?, ?, ?)
 			''', (key, value_str, timestamp))
 			conn.commit()
+		# 트리거가 settings_version을 올렸으므로 캐시 즉시 재확인
+		_notify_settings_changed()
 		return True
 		
 	except Exception as e:
 		logger.error(f"설정 저장 실패 ({key}): {e}")
 
 def get_setting(key, default=None):
-	"""설정 조회"""
+	"""설정 조회 (프로세스 캐시, 버전 변경 시에만 DB 재조회)"""
+	try:
+		return _settings_cache.get(key, default)
+	except Exception as e:
+		logger.warning(f"설정 캐시 갱신 실패, DB 직접 조회 ({key}): {e}")
+
 	try:
 		with get_db_connection() as conn:
 			cursor = conn.execute('SELECT value FROM settings WHERE key = ?', (key,))
 			row = cursor.fetchone()
 			if row:
-				value_str = row['value']
-				
-				# 타입 복원
-				val_lower = value_str.strip().lower()
-				if val_lower == 'true': return True
-				if val_lower == 'false': return False
-				
-				# JSON 파싱 시도
-				try:
-					return json.loads(value_str)
-				except:
-					# 특정 키(인증키, 계좌번호 등)는 숫자 변환을 건너뛰고 문자열로 유지
-					string_keys = ['real_app_key', 'real_app_secret', 'paper_app_key', 'paper_app_secret', 
-								  'telegram_token', 'telegram_chat_id', 'my_account']
-					if key in string_keys:
-						return value_str
-						
-					# 숫자 변환 시도
-					try:
-						if '.' in value_str:
-							return float(value_str)
-						return int(value_str)
-					except:
-						return value_str
-			
+				return _parse_setting_value(key, row['value'])
 			return default
 	except Exception as e:
 		logger.error(f"설정 조회 실패 ({key}): {e}")
@@ -227,6 +806,7 @@ def save_all_settings(settings_dict):
 					VALUES (?, ?, ?)
 				''', (key, value_str, timestamp))
 			conn.commit()
+		_notify_settings_changed()
 			
 		logger.info(f"설정 {len(settings_dict)}개 일괄 저장 완료 (트랜잭션)")
 		return True
@@ -275,29 +855,28 @@ def get_current_status(mode='MOCK'):
 				acc_row = conn.execute('SELECT cash FROM mock_account WHERE id=1').fetchone()
 				deposit = int(acc_row['cash']) if acc_row else 0
 				
-				# 보유 주식 총 평가액 먼저 계산
-				eval_cursor = conn.execute('SELECT SUM(h.qty * p.current) as total_eval FROM mock_holdings h JOIN mock_prices p ON h.code = p.code WHERE h.qty > 0')
-				eval_row = eval_cursor.fetchone()
-				total_eval = int(eval_row['total_eval']) if eval_row and eval_row['total_eval'] else 0
+				# 포지션 원장 (종목별 물타기 단계, 메모리 조회)
+				positions = get_all_positions(mode)
+				s_cnt = int(get_setting('split_buy_cnt', 5))
+				now_ts = time.time()
 				
-				total_asset = deposit + total_eval
-				
-				# [추가] 단계 계산을 위한 총 매입원금(Principal) 선행 계산
-				pur_cursor = conn.execute('SELECT SUM(qty * avg_price) as total_pur FROM mock_holdings WHERE qty > 0')
-				pur_row = pur_cursor.fetchone()
-				total_buy_principal = int(pur_row['total_pur']) if pur_row and pur_row['total_pur'] else 0
-				
-				# 1. Mock 모드: mock_holdings와 mock_prices에서 세부 종목 조회
-				cursor = conn.execute('''
+				# 1. Mock 모드: 보유종목/종목명/현재가/보유시간을 쿼리 1회로 조회 (보유 종목 수와 무관)
+				rows = conn.execute('''
 					SELECT 
-						h.code, s.name, h.qty, h.avg_price, p.current as current_price, h.source
+						h.code, s.name, h.qty, h.avg_price, p.current as current_price, h.source,
+						ht.held_since
 					FROM mock_holdings h
 					LEFT JOIN mock_stocks s ON h.code = s.code
 					LEFT JOIN mock_prices p ON h.code = p.code
+					LEFT JOIN held_times ht ON h.code = ht.code
 					WHERE h.qty > 0
-				''')
+				''').fetchall()
+				
+				# 보유 주식 총 평가액 (현재가 있는 종목만, 기존 JOIN 합계와 동일)
+				total_eval = int(sum(row['qty'] * row['current_price'] for row in rows if row['current_price'] is not None))
+				total_asset = deposit + total_eval
 				
-				for row in cursor.fetchall():
+				for row in rows:
 					code = row['code']
 					name = row['name'] or code
 					qty = int(row['qty'])
@@ -308,7 +887,7 @@ def get_current_status(mode='MOCK'):
 					source = row_dict.get('source', '-') # DB 필드값 그대로 (없으면 하이픈)
 					
 					# [DEBUG] 실제 DB 데이터 확인
-					logger.info(f"🔍 [Dashboard Sync] {name}({code}) -> 구분(DB): {source}")
+					logger.debug(f"🔍 [Dashboard Sync] {name}({code}) -> 구분(DB): {source}")
 					
 					pur_amt = int(avg_price * qty)
 					evlt_amt = int(cur_price * qty)
@@ -318,44 +897,17 @@ def get_current_status(mode='MOCK'):
 					total_buy += pur_amt
 					
 					# 보유 시간
-					held_since = get_held_time(code)
+					held_since = row['held_since']
 					hold_time = "0분"
 					if held_since:
-						minutes = int((time.time() - held_since) / 60)
+						minutes = int((now_ts - held_since) / 60)
 						hold_time = f"{minutes}분"
 					
-					# [Sync] 1:1:2:4:8 가중치 기반 단계 계산
-					st_mode = get_setting('single_stock_strategy', 'WATER').upper()
-					s_cnt = int(get_setting('split_buy_cnt', 5))
-					
-					weights = []
-					for i in range(s_cnt):
-						if i == 0: weights.append(1)
-						else: weights.append(2**(i - 1))
-					tw = sum(weights)
-					
-					cumulative_ratios = []
-					curr_s = 0
-					for w in weights:
-						curr_s += w
-						cumulative_ratios.append(curr_s / tw)
-					
 					# [Step Calc] Transaction Count Method (매수 명령 횟수 = 단계)
-					# 마지막 매도 이후 매수 횟수를 세어 단계 결정 (1번=1차, 2번=2차...)
-					try:
-						cursor_step = conn.execute('''
-							SELECT COUNT(*) FROM trades 
-							WHERE mode = ? AND code = ? AND type = 'buy'
-							AND timestamp > (
-								SELECT COALESCE(MAX(timestamp), '2000-01-01') 
-								FROM trades 
-								WHERE mode = ? AND code = ? AND type = 'sell'
-							)
-						''', (mode, code, mode, code))
-						actual_step = int(cursor_step.fetchone()[0])
-						if actual_step < 1:
-							actual_step = 1
-					except:
+					# 마지막 매도 이후 매수 횟수 (포지션 원장에서 조회, 1번=1차, 2번=2차...)
+					pos = positions.get(code)
+					actual_step = int(pos['step']) if pos else 0
+					if actual_step < 1:
 						actual_step = 1
 
 					# [CRITICAL Fix] 1주 보유 시 무조건 1단계로 고정
@@ -383,10 +935,11 @@ def get_current_status(mode='MOCK'):
 				# Real 모드: API에서 실시간 데이터 가져오기
 				try:
 					from kiwoom_adapter import get_account_data
-					import datetime
+					from kiwoom.records import as_holdings
 					
 					# 계좌 전체 정보 조회 (보유종목 + 요약정보)
 					api_holdings, account_summary = get_account_data()
+					api_holdings = as_holdings(api_holdings)
 					
 					# 계좌 요약 데이터 파싱 (HTS와 일치 유도)
 					if account_summary:
@@ -419,12 +972,12 @@ def get_current_status(mode='MOCK'):
 							total_pl = api_total_pl
 						else:
 							# API가 0이면 trades 테이블에서 오늘 완료된 매매 손익 합산
-							today = datetime.date.today().strftime('%Y-%m-%d')
+							day_start, day_end = get_day_range()
 							cursor = conn.execute('''
 								SELECT SUM(CASE WHEN type='sell' THEN amt * (profit_rate / 100.0) ELSE 0 END) as realized_profit
 								FROM trades
-								WHERE mode = ? AND type='sell' AND timestamp LIKE ?
-							''', (mode, f'{today}%'))
+								WHERE mode = ? AND type='sell' AND timestamp >= ? AND timestamp < ?
+							''', (mode, day_start, day_end))
 							row = cursor.fetchone()
 							total_pl = int(row['realized_profit']) if row and row['realized_profit'] else 0
 							
@@ -442,22 +995,41 @@ def get_current_status(mode='MOCK'):
 
 					# 보유종목 상세 정보 구성
 					if api_holdings:
+						# 포지션 원장 (종목별 물타기 단계 / 매수 출처)
+						positions = get_all_positions(mode)
+						
+						# 보유 종목 코드 목록 (IN 배치 조회용)
+						held_codes = list({stock.code for stock in api_holdings if stock.qty > 0})
+						placeholders = ','.join('?' * len(held_codes))
+						
 						# trades 테이블에서 평균가 미리 계산 (API 보정용)
 						avg_prices_from_db = {}
-						cursor = conn.execute('SELECT code, SUM(amt)/SUM(qty) FROM trades WHERE mode = ? AND type = "buy" GROUP BY code', (mode,))
-						for row in cursor.fetchall():
-							if row[0] and row[1]:
-								avg_prices_from_db[row[0]] = float(row[1])
+						held_times = {}
+						if held_codes:
+							cursor = conn.execute(f'''
+								SELECT code, SUM(amt)/SUM(qty) FROM trades
+								WHERE mode = ? AND type = 'buy' AND code IN ({placeholders})
+								GROUP BY code
+							''', (mode, *held_codes))
+							for row in cursor.fetchall():
+								if row[0] and row[1]:
+									avg_prices_from_db[row[0]] = float(row[1])
+							
+							# 보유 시간 (종목별 get_held_time 대신 1회 조회)
+							cursor = conn.execute(f'SELECT code, held_since FROM held_times WHERE code IN ({placeholders})', held_codes)
+							held_times = {row['code']: row['held_since'] for row in cursor.fetchall()}
+						now_ts = time.time()
 
 						for stock in api_holdings:
-							code = stock.get('stk_cd', '').replace('A', '')
+							# 숫자 필드는 API 계층에서 파싱됨 (kiwoom.records.Holding)
+							code = stock.code
 							name = stock.get('stk_nm', code)
-							qty = int(stock.get('rmnd_qty', 0))
+							qty = stock.qty
 							if qty <= 0: continue
 							
-							api_avg = float(stock.get('avg_prc', 0))
+							api_avg = stock.avg_price
 							avg_price = api_avg if api_avg > 0 else avg_prices_from_db.get(code, 0)
-							cur_price = float(stock.get('cur_prc', avg_price))
+							cur_price = stock.cur_price or avg_price
 							
 							pur_amt = int(avg_price * qty)
 							evlt_amt = int(cur_price * qty)
@@ -465,25 +1037,18 @@ def get_current_status(mode='MOCK'):
 							pl_rt = f"{(pl_amt / pur_amt * 100):.2f}" if pur_amt > 0 else "0.00"
 							
 							# [Fix] watering_step 및 hold_time 로직 보강
-							held_since = get_held_time(code)
+							held_since = held_times.get(code)
 							hold_time = "조회중"
 							if held_since:
-								minutes = int((time.time() - held_since) / 60)
+								minutes = int((now_ts - held_since) / 60)
 								hold_time = f"{minutes}분"
 							
+							pos = positions.get(code)
+
 							# [Step Calc] Transaction Count Method (매수 명령 횟수 = 단계)
-							# 마지막 매도 이후 매수 횟수를 세어 단계 결정 (1번=1차, 2번=2차...)
+							# 마지막 매도 이후 매수 횟수 (포지션 원장에서 조회, 1번=1차, 2번=2차...)
 							try:
-								cursor = conn.execute('''
-									SELECT COUNT(*) FROM trades 
-									WHERE mode = ? AND code = ? AND type = 'buy'
-									AND timestamp > (
-										SELECT COALESCE(MAX(timestamp), '2000-01-01') 
-										FROM trades 
-										WHERE mode = ? AND code = ? AND type = 'sell'
-									)
-								''', (mode, code, mode, code))
-								step_idx = int(cursor.fetchone()[0])
+								step_idx = int(pos['step']) if pos else 0
 								if step_idx < 1:
 									step_idx = 1
 								
@@ -501,13 +1066,8 @@ def get_current_status(mode='MOCK'):
 
 
 
-							# [New] Real/Paper 모드에서도 DB trades 테이블 기준으로 소스(검색식/모델) 확인
-							try:
-								source_cursor = conn.execute("SELECT source FROM trades WHERE mode=? AND code=? AND type='buy' ORDER BY timestamp DESC LIMIT 1", (mode, code))
-								source_row = source_cursor.fetchone()
-								real_source = source_row['source'] if source_row and source_row['source'] else '외부매수'
-							except:
-								real_source = '조회불가'
+							# [New] Real/Paper 모드에서도 DB trades 기준(포지션 원장의 최근 매수 출처)으로 소스(검색식/모델) 확인
+							real_source = pos['source'] if pos and pos['source'] else '외부매수'
 
 							holdings.append({
 								'stk_cd': code, 'stk_nm': name, 'qty': qty, 'rmnd_qty': qty,
@@ -692,17 +1252,34 @@ def get_bot_running():
 		logger.error(f"봇 실행 상태 조회 실패: {e}")
 		return False
 
+# [Push] 웹 명령 도착 알림 (봇은 이 신호를 받을 때만 web_commands 조회)
+# web_commands 테이블은 재시작 후 재처리를 위한 영구 기록으로 유지
+WEB_COMMAND_NOTIFY_ADDR = ('127.0.0.1', 5006)
+
+def notify_web_command(command_id=None, command=None):
+	"""봇 프로세스에 새 명령 도착 알림 (UDP, 봇이 꺼져 있으면 무시됨)"""
+	import socket
+	try:
+		msg = json.dumps({"id": command_id, "command": command}).encode('utf-8')
+		with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+			sock.sendto(msg, WEB_COMMAND_NOTIFY_ADDR)
+	except Exception as e:
+		logger.debug(f"웹 명령 알림 전송 실패 (봇 폴링으로 처리됨): {e}")
+
 def add_web_command(command, params=None):
 	"""웹 명령 추가 (web_command.json 대체)"""
 	timestamp = datetime.now().isoformat() if hasattr(datetime, 'now') else datetime.datetime.now().isoformat()
 	params_json = json.dumps(params, ensure_ascii=False) if params else None
 	try:
 		with get_db_connection() as conn:
-			conn.execute('''
+			cursor = conn.execute('''
 				INSERT INTO web_commands (command, params, status, timestamp)
 				VALUES (?, ?, 'pending', ?)
 			''', (command, params_json, timestamp))
+			command_id = cursor.lastrowid
 			conn.commit()
+		# 커밋 이후에 알림 (봇이 깨어났을 때 반드시 조회되도록)
+		notify_web_command(command_id, command)
 		return True
 	except Exception as e:
 		logger.error(f"웹 명령 DB 저장 실패: {e}")
@@ -2,20 +2,18 @@
 매매 로그 DB 관리 모듈
 JSON 파일 대신 SQLite DB를 사용하여 안정성 향상
 """
-import sqlite3
 import datetime
 import os
 from logger import logger
 from get_setting import get_setting
+from database_helpers import get_day_range, invalidate_positions
 
 DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trading.db')
 
 def get_db_connection():
-	"""DB 연결 생성"""
-	conn = sqlite3.connect(DB_FILE, timeout=30)
-	conn.execute('PRAGMA journal_mode=WAL')
-	conn.row_factory = sqlite3.Row
-	return conn
+	"""DB 연결 반환 (database_helpers의 스레드별 풀링 연결 공유)"""
+	from database_helpers import get_db_connection as pooled_connection
+	return pooled_connection()
 
 def log_buy_to_db(code, name, qty, price, mode=None, reason="", source=""):
 	"""매수 로그 저장"""
@@ -50,6 +48,7 @@ def log_buy_to_db(code, name, qty, price, mode=None, reason="", source=""):
 			''', (timestamp, 'buy', code, name, qty, price, amt, price, mode, reason, source,
 				 f"SIM_CONFIG:{config_id}, SIM_SCENARIO:{scenario_id}" if config_id or scenario_id else ""))
 			conn.commit()
+			invalidate_positions() # 포지션 원장은 trades 트리거로 갱신됨 → 메모리 사본 즉시 재확인
 			logger.info(f"✅ 매수 로그 DB 저장: {name} {qty}주 @ {price:,}원 [{mode}] - {reason}")
 	except Exception as e:
 		logger.error(f"❌ 매수 로그 DB 저장 실패 ({name} @ {mode}): {e}")
@@ -87,6 +86,7 @@ def log_sell_to_db(code, name, qty, price, profit_rate, reason, mode=None, sourc
 			''', (timestamp, 'sell', code, name, qty, price, amt, profit_rate, reason, mode, source,
 				 f"SIM_CONFIG:{config_id}, SIM_SCENARIO:{scenario_id}" if config_id or scenario_id else ""))
 			conn.commit()
+			invalidate_positions()
 			logger.info(f"✅ 매도 로그 DB 저장: {name} {qty}주 @ {price:,}원 ({profit_rate:+.2f}%) [{mode}]" +
 						(f" (SIM:{config_id}/{scenario_id})" if config_id or scenario_id else ""))
 	except Exception as e:
@@ -108,15 +108,15 @@ def get_trading_logs_from_db(mode=None, limit=10000, since_id=0, date=None):
 			conditions = []
 			params_buy = []
 			
-			conditions.append("type = 'buy' COLLATE NOCASE")
+			conditions.append("type = 'buy'")
 			
 			if mode:
 				conditions.append("mode = ?")
 				params_buy.append(mode)
 				
 			if date:
-				conditions.append("timestamp LIKE ?")
-				params_buy.append(f"{date}%")
+				conditions.append("timestamp >= ? AND timestamp < ?")
+				params_buy.extend(get_day_range(date))
 				
 			if since_id > 0:
 				conditions.append("id > ?")
@@ -156,15 +156,15 @@ def get_trading_logs_from_db(mode=None, limit=10000, since_id=0, date=None):
 			conditions_sell = []
 			params_sell = []
 			
-			conditions_sell.append("type = 'sell' COLLATE NOCASE")
+			conditions_sell.append("type = 'sell'")
 			
 			if mode:
 				conditions_sell.append("mode = ?")
 				params_sell.append(mode)
 
 			if date:
-				conditions_sell.append("timestamp LIKE ?")
-				params_sell.append(f"{date}%")
+				conditions_sell.append("timestamp >= ? AND timestamp < ?")
+				params_sell.extend(get_day_range(date))
 				
 			if since_id > 0:
 				conditions_sell.append("id > ?")
@@ -213,16 +213,16 @@ def get_today_trading_stats(mode=None):
 	Returns:
 		{'total_trades': int, 'win_count': int, 'total_profit': float}
 	"""
-	today = datetime.datetime.now().strftime('%Y-%m-%d')
+	day_start, day_end = get_day_range()
 	
 	try:
 		with get_db_connection() as conn:
 			if mode:
-				where_clause = "WHERE type = 'sell' COLLATE NOCASE AND mode = ? AND timestamp LIKE ?"
-				params = (mode, f"{today}%")
+				where_clause = "WHERE mode = ? AND type = 'sell' AND timestamp >= ? AND timestamp < ?"
+				params = (mode, day_start, day_end)
 			else:
-				where_clause = "WHERE type = 'sell' COLLATE NOCASE AND timestamp LIKE ?"
-				params = (f"{today}%",)
+				where_clause = "WHERE type = 'sell' AND timestamp >= ? AND timestamp < ?"
+				params = (day_start, day_end)
 			
 			cursor = conn.execute(f'''
 				SELECT COUNT(*) as total,
@@ -255,6 +255,7 @@ def clear_old_trades(days=30):
 			''', (cutoff_date,))
 			deleted = cursor.rowcount
 			conn.commit()
+			invalidate_positions()
 			logger.info(f"✅ {days}일 이전 매매 로그 {deleted}건 삭제")
 			return deleted
 	except Exception as e:
@@ -263,12 +264,12 @@ def clear_old_trades(days=30):
 
 def delete_stock_trades(code, mode=None):
 	"""특정 종목의 오늘 매매 기록 삭제 (초기화용)"""
-	today = datetime.datetime.now().strftime('%Y-%m-%d')
+	day_start, day_end = get_day_range()
 	try:
 		with get_db_connection() as conn:
 			# [중요] 매도 기록(sell)은 남기고, 매수 기록(buy)만 삭제하여 초기화
-			query = "DELETE FROM trades WHERE code = ? AND timestamp LIKE ? AND type = 'buy'"
-			params = [code, f"{today}%"]
+			query = "DELETE FROM trades WHERE code = ? AND type = 'buy' AND timestamp >= ? AND timestamp < ?"
+			params = [code, day_start, day_end]
 			
 			if mode:
 				query += " AND mode = ?"
@@ -276,6 +277,7 @@ def delete_stock_trades(code, mode=None):
 				
 			cursor = conn.execute(query, tuple(params))
 			conn.commit()
+			invalidate_positions()
 			if cursor.rowcount > 0:
 				logger.info(f"✅ {code} 매수 기록 초기화 완료 (재진입 준비, {cursor.rowcount}건 삭제)")
 	except Exception as e:
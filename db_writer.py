@@ -0,0 +1,180 @@
+"""
+DB 쓰기 전용 백그라운드 큐 (Write-Behind)
+- 캔들/시그널/대응 데이터/자산 기록 등 비핵심 INSERT를 전용 스레드 1개가 모아서 저장
+- flush_interval(ms) 또는 max_batch(행) 단위로 같은 SQL은 executemany로 묶어 한 트랜잭션에 커밋
+- 매매 기록처럼 순서/내구성이 중요한 쓰기는 write()/submit(urgent=True)로 즉시 커밋 후 완료 응답(ack)
+"""
+import os
+import time
+import queue
+import atexit
+import threading
+from concurrent.futures import Future
+from logger import logger
+
+DB_WRITE_FLUSH_INTERVAL = 0.05  # 배치 대기 최대 시간(초)
+DB_WRITE_MAX_BATCH = 200        # 한 트랜잭션에 담을 최대 행 수
+DB_WRITE_QUEUE_SIZE = 10000     # 대기열 최대 길이 (가득 차면 enqueue_timeout 동안 대기 후 버림)
+DB_WRITE_ENQUEUE_TIMEOUT = 1.0
+DB_WRITE_ACK_TIMEOUT = 30.0     # write() 완료 대기 최대 시간 (busy_timeout과 동일)
+
+class _WriteRequest:
+	__slots__ = ('sql', 'params', 'want_rowid', 'urgent', 'future')
+
+	def __init__(self, sql, params, want_rowid, urgent):
+		self.sql = sql
+		self.params = params
+		self.want_rowid = want_rowid
+		self.urgent = urgent
+		self.future = Future()
+
+class WriteBehindQueue:
+	"""
+	전용 쓰기 스레드 + 제한 크기 대기열
+	- submit(): 대기열에 넣고 즉시 Future 반환 (커밋 후 lastrowid 또는 None으로 완료)
+	- write(): submit 후 커밋될 때까지 대기 (내구성 보장)
+	- flush(): 지금까지 넣은 쓰기가 모두 커밋될 때까지 대기
+	"""
+	def __init__(self, flush_interval=DB_WRITE_FLUSH_INTERVAL, max_batch=DB_WRITE_MAX_BATCH, max_queue=DB_WRITE_QUEUE_SIZE):
+		self.flush_interval = flush_interval
+		self.max_batch = max_batch
+		self._queue = queue.Queue(maxsize=max_queue)
+		self._thread = None
+		self._pid = None
+		self._start_lock = threading.Lock()
+		self._stopping = False
+		self.stats = {'batches': 0, 'rows': 0, 'dropped': 0, 'errors': 0}
+
+	def _ensure_started(self):
+		if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+			return
+		with self._start_lock:
+			if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+				return
+			# fork된 자식 프로세스는 부모의 대기열/스레드를 물려받지 않음
+			if self._pid is not None and self._pid != os.getpid():
+				self._queue = queue.Queue(maxsize=self._queue.maxsize)
+			self._stopping = False
+			self._pid = os.getpid()
+			self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+			self._thread.start()
+
+	def submit(self, sql, params=(), want_rowid=False, urgent=False):
+		"""쓰기 예약 (호출 스레드는 기다리지 않음)"""
+		self._ensure_started()
+		req = _WriteRequest(sql, tuple(params), want_rowid, urgent)
+		try:
+			self._queue.put(req, timeout=DB_WRITE_ENQUEUE_TIMEOUT)
+		except queue.Full:
+			self.stats['dropped'] += 1
+			logger.error(f"DB 쓰기 대기열 초과로 기록 누락: {str(sql).split('(')[0].strip()}")
+			req.future.set_exception(queue.Full())
+		return req.future
+
+	def write(self, sql, params=(), want_rowid=False, timeout=DB_WRITE_ACK_TIMEOUT):
+		"""즉시 커밋 요청 후 완료까지 대기 (매매 기록 등 순서/내구성이 중요한 쓰기)"""
+		return self.submit(sql, params, want_rowid=want_rowid, urgent=True).result(timeout)
+
+	def flush(self, timeout=DB_WRITE_ACK_TIMEOUT):
+		"""앞서 예약된 쓰기가 모두 커밋될 때까지 대기"""
+		if self._thread is None or not self._thread.is_alive():
+			return
+		self.submit(None, urgent=True).result(timeout)
+
+	def stop(self, timeout=5.0):
+		"""남은 쓰기를 모두 저장하고 스레드 종료 (프로세스 종료 시 atexit로 호출)"""
+		if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+			return
+		try:
+			self.flush(timeout)
+		except Exception as e:
+			logger.error(f"DB 쓰기 대기열 종료 중 저장 실패: {e}")
+		self._stopping = True
+		self._thread.join(timeout)
+
+	def _collect(self):
+		"""첫 요청을 기다린 뒤 flush_interval 또는 max_batch까지 모음 (urgent 요청은 즉시 처리)"""
+		try:
+			first = self._queue.get(timeout=0.5)
+		except queue.Empty:
+			return []
+		batch = [first]
+		deadline = time.monotonic() + self.flush_interval
+		while not batch[-1].urgent and len(batch) < self.max_batch:
+			remaining = deadline - time.monotonic()
+			if remaining <= 0:
+				break
+			try:
+				batch.append(self._queue.get(timeout=remaining))
+			except queue.Empty:
+				break
+		# 이미 쌓여 있는 요청은 기다리지 않고 함께 처리
+		while len(batch) < self.max_batch:
+			try:
+				batch.append(self._queue.get_nowait())
+			except queue.Empty:
+				break
+		return batch
+
+	def _execute(self, conn, batch):
+		"""같은 SQL이 연속된 구간은 executemany, rowid가 필요한 요청은 개별 execute"""
+		results = []
+		i = 0
+		while i < len(batch):
+			req = batch[i]
+			if req.sql is None:
+				results.append((req, None))
+				i += 1
+				continue
+			if req.want_rowid:
+				cursor = conn.execute(req.sql, req.params)
+				results.append((req, cursor.lastrowid))
+				i += 1
+				continue
+			j = i
+			while j < len(batch) and batch[j].sql == req.sql and not batch[j].want_rowid:
+				j += 1
+			conn.executemany(req.sql, [r.params for r in batch[i:j]])
+			results.extend((r, None) for r in batch[i:j])
+			i = j
+		return results
+
+	def _commit_batch(self, batch):
+		from database_helpers import get_db_connection
+		conn = get_db_connection()
+		try:
+			with conn:
+				results = self._execute(conn, batch)
+		except Exception as e:
+			if len(batch) == 1:
+				self.stats['errors'] += 1
+				batch[0].future.set_exception(e)
+				return
+			# 한 행의 오류로 전체가 유실되지 않도록 개별 트랜잭션으로 재시도
+			logger.warning(f"DB 배치 쓰기 실패, 개별 재시도 ({len(batch)}건): {e}")
+			for req in batch:
+				self._commit_batch([req])
+			return
+
+		self.stats['batches'] += 1
+		self.stats['rows'] += len(batch)
+		for req, rowid in results:
+			req.future.set_result(rowid)
+
+	def _run(self):
+		while True:
+			batch = self._collect()
+			if not batch:
+				if self._stopping:
+					break
+				continue
+			try:
+				self._commit_batch(batch)
+			except Exception as e:
+				logger.error(f"DB 쓰기 스레드 오류: {e}")
+				for req in batch:
+					if not req.future.done():
+						req.future.set_exception(e)
+
+db_writer = WriteBehindQueue()
+atexit.register(db_writer.stop)
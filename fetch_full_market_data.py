@@ -6,10 +6,14 @@ import json
 import sys
 import os
 import config
+from kiwoom.paginator import iter_pages
 
 # [설정] DB 파일 경로
 DB_FILE = "c:/lasttrade/deep_learning.db"
 
+# 종목당 최대 연속조회 페이지 수 (이미 저장된 구간에 도달하면 그 전에 중단)
+FETCH_MAX_PAGES = 10
+
 def get_connection():
     return sqlite3.connect(DB_FILE)
 
@@ -61,7 +65,34 @@ def get_all_stocks():
         print(f"⚠️ 타겟 추출 실패: {e}")
     return stocks
 
-def fetch_vi_kiwoom(code, token):
+def get_latest_timestamp(code):
+    conn = get_connection()
+    try:
+        row = conn.execute("SELECT MAX(timestamp) FROM ohlcv_1m WHERE code = ?", (code,)).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+def parse_chart_rows(code, raw_data):
+    rows = []
+    for item in raw_data:
+        ts = item.get('cntr_tm', '')[:12]
+        if not ts: continue
+        o = abs(int(float(item.get('open_pric', 0))))
+        h = abs(int(float(item.get('high_pric', 0))))
+        l = abs(int(float(item.get('low_pric', 0))))
+        c = abs(int(float(item.get('cur_prc', 0))))
+        v = abs(int(float(item.get('trde_qty', 0))))
+        if o > 0:
+            rows.append((code, ts, o, h, l, c, v))
+    return rows
+
+def fetch_vi_kiwoom(code, token, max_pages=FETCH_MAX_PAGES):
+    """
+    1분봉 연속조회 (최신 → 과거 순 페이지)
+    페이지마다 바로 저장하고, 이미 저장된 시각에 도달하면 다음 페이지를 요청하지 않음
+    Returns: (수신 행 수, 신규 저장 수)
+    """
     url = f"{config.host_url}/api/dostk/chart"
     headers = {
         'Content-Type': 'application/json;charset=UTF-8',
@@ -74,26 +105,20 @@ def fetch_vi_kiwoom(code, token):
         'upd_stkpc_tp': '1',
     }
 
+    latest = get_latest_timestamp(code)
+    received = saved = 0
     try:
-        res = requests.post(url, headers=headers, json=params, timeout=10)
-        if res.status_code != 200: return []
-        data = res.json()
-        raw_data = data.get('stk_min_pole_chart_qry', [])
-        if not raw_data: raw_data = data.get('output', [])
-        rows = []
-        for item in raw_data:
-            ts = item.get('cntr_tm', '')[:12]
-            if not ts: continue
-            o = abs(int(float(item.get('open_pric', 0))))
-            h = abs(int(float(item.get('high_pric', 0))))
-            l = abs(int(float(item.get('low_pric', 0))))
-            c = abs(int(float(item.get('cur_prc', 0))))
-            v = abs(int(float(item.get('trde_qty', 0))))
-            if o > 0:
-                rows.append((code, ts, o, h, l, c, v))
-        return rows
-    except:
-        return []
+        for data, _ in iter_pages(url, headers, params, max_pages=max_pages):
+            raw_data = data.get('stk_min_pole_chart_qry', [])
+            if not raw_data: raw_data = data.get('output', [])
+            rows = parse_chart_rows(code, raw_data)
+            received += len(rows)
+            saved += save_to_db(rows)
+            if not rows or (latest and min(r[1] for r in rows) <= latest):
+                break
+    except Exception as e:
+        print(f"⚠️ {code} 차트 조회 중단: {e}")
+    return received, saved
 
 def save_to_db(rows):
     if not rows: return 0
@@ -124,16 +149,14 @@ def main():
         code = s['code']
         name = s['name']
         
-        rows = fetch_vi_kiwoom(code, token)
-        saved = save_to_db(rows)
+        received, saved = fetch_vi_kiwoom(code, token)
         total_saved += saved
         
         if (idx + 1) % 10 == 0 or idx == len(stocks) - 1:
             elapsed = time.time() - start_time
-            print(f"   [{idx+1}/{len(stocks)}] {name}({code}): {len(rows)}개 수신 (누적 신규저장: {total_saved}) | 시간: {elapsed:.1f}s")
+            print(f"   [{idx+1}/{len(stocks)}] {name}({code}): {received}개 수신 (누적 신규저장: {total_saved}) | 시간: {elapsed:.1f}s")
         
-        # API 호흡 조절
-        time.sleep(0.05)
+        # API 호출 간격은 kiwoom.rate_limiter가 조절
         
         # 토큰 갱신 (1시간마다)
         if int(time.time() - start_time) % 3600 == 0 and idx > 0:
@@ -4,9 +4,11 @@
 실제 키움 API와 가상 Mock API를 동일한 인터페이스로 사용할 수 있게 합니다.
 """
 
-from .base_api import KiwoomAPI
+from .base_api import KiwoomAPI, AsyncKiwoomAPI
 from .real_api import RealKiwoomAPI
 from .mock_api import MockKiwoomAPI
 from .factory import create_kiwoom_api
+from .records import Holding, HoldingList, OrderRecord, OrderList, as_holdings, as_orders
 
-__all__ = ['KiwoomAPI', 'RealKiwoomAPI', 'MockKiwoomAPI', 'create_kiwoom_api']
+__all__ = ['KiwoomAPI', 'AsyncKiwoomAPI', 'RealKiwoomAPI', 'MockKiwoomAPI', 'create_kiwoom_api',
+           'Holding', 'HoldingList', 'OrderRecord', 'OrderList', 'as_holdings', 'as_orders']
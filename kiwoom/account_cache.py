@@ -0,0 +1,156 @@
+"""
+계좌 조회 TR 단일 요청(single-flight) + 짧은 TTL 캐시
+
+bot / rt_search / chat_command / web_server(get_current_status)가 같은 1초 안에
+계좌평가(kt00004) / 예수금(kt00001) / 미체결(ka10075)을 각각 호출하던 것을 하나로 합칩니다.
+- 같은 TR을 동시에 요청하면 먼저 보낸 요청 1건의 결과를 함께 받음 (스레드/코루틴 공통)
+- 성공한 결과는 ACCOUNT_CACHE_TTL초 동안 재사용
+- 주문(매수/매도/취소) 전송 시 invalidate()로 즉시 무효화
+"""
+
+import copy
+import time
+import asyncio
+import inspect
+import functools
+import threading
+from concurrent.futures import Future
+
+# 결과 재사용 시간(초), 0이면 동시 요청 합치기만 수행
+ACCOUNT_CACHE_TTL = 1.0
+
+
+class _Flight:
+    __slots__ = ('future', 'generation', 'thread_id')
+
+    def __init__(self, generation):
+        self.future = Future()
+        self.generation = generation
+        self.thread_id = threading.get_ident()
+
+
+class CoalescingCache:
+    """
+    키별 진행 중 요청 + 최근 결과 캐시
+    - call(): 동기 호출 (다른 스레드의 진행 중 요청이면 완료까지 대기)
+    - acall(): 비동기 호출 (진행 중 요청을 await, 이벤트 루프 차단 없음)
+    - invalidate(): 캐시 비움 + 진행 중 요청 결과도 저장하지 않음 (주문 직후 호출)
+    - 호출자가 결과(보유 종목 dict 등)를 수정해도 다른 호출자에게 번지지 않도록 복사본을 전달
+    """
+
+    def __init__(self, ttl=ACCOUNT_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._values = {}      # key -> (저장 시각, 결과)
+        self._inflight = {}    # key -> _Flight
+        self._generation = 0
+        self.stats = {'hits': 0, 'joins': 0, 'misses': 0, 'invalidations': 0}
+
+    def configure(self, ttl=None):
+        if ttl is not None:
+            self.ttl = float(ttl)
+
+    def invalidate(self):
+        with self._lock:
+            self._values.clear()
+            self._inflight.clear()
+            self._generation += 1
+            self.stats['invalidations'] += 1
+
+    def _lookup(self, key):
+        """(캐시 값 존재 여부, 값, 합류할 Flight, 새로 시작할 Flight) 반환 (self._lock 보유 상태)"""
+        entry = self._values.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl:
+            self.stats['hits'] += 1
+            return True, copy.deepcopy(entry[1]), None, None
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.stats['joins'] += 1
+            return False, None, flight, None
+        self.stats['misses'] += 1
+        flight = _Flight(self._generation)
+        self._inflight[key] = flight
+        return False, None, None, flight
+
+    def _finish(self, key, flight, result=None, error=None, cacheable=None):
+        with self._lock:
+            if self._inflight.get(key) is flight:
+                del self._inflight[key]
+            if error is None and flight.generation == self._generation and (cacheable is None or cacheable(result)):
+                self._values[key] = (time.monotonic(), copy.deepcopy(result))
+        if error is not None:
+            flight.future.set_exception(error)
+        else:
+            flight.future.set_result(copy.deepcopy(result))
+
+    def call(self, key, fn, cacheable=None):
+        with self._lock:
+            hit, value, joined, flight = self._lookup(key)
+        if hit:
+            return value
+        if joined is not None:
+            # 같은 스레드(이벤트 루프)에서 시작된 비동기 요청을 동기로 기다리면 교착되므로 직접 호출
+            if joined.thread_id != threading.get_ident():
+                return copy.deepcopy(joined.future.result())
+            return fn()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, flight, error=e)
+            raise
+        self._finish(key, flight, result=result, cacheable=cacheable)
+        return result
+
+    async def acall(self, key, coro_fn, cacheable=None):
+        with self._lock:
+            hit, value, joined, flight = self._lookup(key)
+        if hit:
+            return value
+        if joined is not None:
+            return copy.deepcopy(await asyncio.wrap_future(joined.future))
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            self._finish(key, flight, error=e)
+            raise
+        self._finish(key, flight, result=result, cacheable=cacheable)
+        return result
+
+
+account_cache = CoalescingCache()
+
+
+def coalesced(api_id, cacheable=None):
+    """
+    계좌 조회 메서드 데코레이터 (동기/비동기 메서드 모두 지원)
+    키는 (host_url, 계좌번호, TR)이므로 토큰/인스턴스가 달라도 같은 계좌 조회는 합쳐짐
+
+    Args:
+        cacheable: 결과를 캐시할지 판단하는 함수 (실패 형태의 결과는 저장하지 않음)
+    """
+    def decorator(method):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                key = (self.host_url, str(self.my_account), api_id)
+                return await account_cache.acall(key, lambda: method(self, *args, **kwargs), cacheable)
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (self.host_url, str(self.my_account), api_id)
+            return account_cache.call(key, lambda: method(self, *args, **kwargs), cacheable)
+        return wrapper
+    return decorator
+
+
+def balance_ok(result):
+    return bool(result) and any(result)
+
+
+def account_data_ok(result):
+    return bool(result) and bool(result[1])
+
+
+def outstanding_ok(result):
+    return result is not None
@@ -0,0 +1,104 @@
+"""
+키움 REST 비동기 HTTP 클라이언트 (aiohttp)
+
+http_session.post와 같은 정책(연결 풀, 엔드포인트별 타임아웃, 주문 TR 중복 방지 재시도,
+호출 제한기)을 이벤트 루프 안에서 스레드 전환 없이 적용합니다.
+aiohttp.ClientSession은 생성한 이벤트 루프에서만 쓸 수 있으므로 루프별로 1개씩 유지합니다.
+"""
+
+import asyncio
+import weakref
+from urllib.parse import urlsplit
+
+import aiohttp
+from logger import logger
+from .http_session import HTTP_POOL_SIZE, HTTP_MAX_RETRIES, NON_IDEMPOTENT_API_IDS, get_timeout
+from .rate_limiter import rate_limiter
+
+# 이벤트 루프별 공용 세션
+_sessions = weakref.WeakKeyDictionary()
+
+
+class AsyncResponse:
+    """requests.Response 대신 쓰는 최소 응답 객체 (본문은 이미 읽은 상태)"""
+    __slots__ = ('status_code', 'headers', 'text', '_data')
+
+    def __init__(self, status_code, headers, text, data):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+        self._data = data
+
+    def json(self):
+        if self._data is None:
+            raise ValueError(f"JSON 응답 아님 (HTTP {self.status_code}): {self.text[:200]}")
+        return self._data
+
+
+def get_async_session() -> aiohttp.ClientSession:
+    """현재 이벤트 루프의 공용 세션 반환 (없거나 닫혔으면 생성)"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=30)
+        session = aiohttp.ClientSession(connector=connector)
+        _sessions[loop] = session
+    return session
+
+
+async def close_async_session():
+    """현재 이벤트 루프의 공용 세션 종료"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def _client_timeout(url, timeout):
+    connect, read = timeout if timeout is not None else get_timeout(url)
+    return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+
+def _is_retryable(exc, idempotent):
+    """
+    http_session._is_retryable과 같은 기준
+    - 연결 수립 실패(ClientConnectorError): 요청이 전송되지 않았으므로 항상 재시도
+    - 서버 끊김 / 파이프 끊김 / 리셋: 조회 TR만 재시도 (주문은 서버가 접수했을 수 있으므로 호출자에게 전달)
+    - 응답 타임아웃: 재시도하지 않음
+    """
+    if isinstance(exc, aiohttp.ClientConnectorError):
+        return True
+    if isinstance(exc, asyncio.TimeoutError):
+        return False
+    if isinstance(exc, (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError)):
+        return idempotent
+    return False
+
+
+async def async_post(url, headers=None, json=None, data=None, timeout=None, max_retries=HTTP_MAX_RETRIES):
+    """
+    공용 세션으로 POST (본문을 모두 읽은 AsyncResponse 반환 / 예외 전파)
+
+    Args:
+        timeout: (연결, 응답) 초. None이면 엔드포인트별 기본값 사용
+    """
+    client_timeout = _client_timeout(url, timeout)
+    api_id = (headers or {}).get('api-id', '')
+    idempotent = api_id not in NON_IDEMPOTENT_API_IDS
+
+    attempt = 0
+    while True:
+        if api_id:
+            await rate_limiter.acquire_async(api_id)
+        try:
+            async with get_async_session().post(url, headers=headers, json=json, data=data, timeout=client_timeout) as response:
+                text = await response.text()
+                try:
+                    payload = await response.json(content_type=None)
+                except ValueError:
+                    payload = None
+                return AsyncResponse(response.status, response.headers, text, payload)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt >= max_retries or not _is_retryable(e, idempotent):
+                raise
+            attempt += 1
+            logger.warning(f"[HTTP] 연결 끊김, 새 연결로 재시도 ({attempt}/{max_retries}) {api_id or urlsplit(url).path}: {e!r}")
@@ -0,0 +1,234 @@
+"""
+실제 키움 API 비동기 구현체
+
+RealKiwoomAPI와 같은 TR/파라미터/응답 해석을 aiohttp 기반 async_post로 수행합니다.
+호출 제한, 연결 재시도 정책, 계좌 조회 캐시는 동기 구현과 공유합니다 (rate_limiter, http_session 상수, account_cache).
+"""
+
+import time
+import asyncio
+from typing import List, Dict, Tuple, Optional
+from .base_api import AsyncKiwoomAPI
+from .async_http import async_post, close_async_session
+from .paginator import aiter_pages
+from .rate_limiter import rate_limiter, is_rate_limited
+from .account_cache import account_cache, coalesced, balance_ok, account_data_ok, outstanding_ok
+from .records import HoldingList
+from .real_api import parse_balance, parse_fallback_balance, parse_outstanding_orders
+from logger import logger
+import config
+
+
+class AsyncRealKiwoomAPI(AsyncKiwoomAPI):
+    """실제 키움 REST API 비동기 구현"""
+
+    def __init__(self):
+        self.app_key = config.app_key
+        self.app_secret = config.app_secret
+        self.host_url = config.host_url
+        self.my_account = getattr(config, 'my_account', '')
+
+    def _headers(self, api_id: str, token: str, with_account: bool = False) -> Dict:
+        headers = {
+            'Content-Type': 'application/json;charset=UTF-8',
+            'authorization': f'Bearer {token}',
+            'cont-yn': 'N',
+            'next-key': '',
+            'api-id': api_id,
+        }
+        if with_account and self.my_account:
+            headers['cano'] = str(self.my_account)
+        return headers
+
+    async def close(self):
+        await close_async_session()
+
+    async def get_token(self) -> Optional[str]:
+        """접근토큰 발급"""
+        url = self.host_url + '/oauth2/token'
+        data = {
+            'grant_type': 'client_credentials',
+            'appkey': self.app_key,
+            'secretkey': self.app_secret,
+        }
+        try:
+            response = await async_post(url, headers={'Content-Type': 'application/json;charset=UTF-8'}, json=data)
+            if response.status_code != 200:
+                logger.warning(f'Token request failed - Response: {response.text[:200]}')
+                return None
+            result = response.json()
+            return result.get('token') or result.get('access_token')
+        except Exception as e:
+            logger.warning(f"⚠️ 토큰 발급 중 오류: {e}")
+            return None
+
+    @coalesced('kt00001', cacheable=balance_ok)
+    async def get_balance(self, token: str) -> Tuple[int, int, int]:
+        """예수금 상세 현황 조회 (kt00001)"""
+        if not token:
+            logger.error("토큰이 None입니다. API 호출을 건너뜁니다.")
+            return 0, 0, 0
+
+        url = self.host_url + '/api/dostk/acnt'
+        headers = self._headers('kt00001', token, with_account=True)
+        params = {'qry_tp': '3'}  # 조회구분 3:추정조회
+
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                data = (await async_post(url, headers=headers, json=params)).json()
+
+                if is_rate_limited(data):
+                    logger.warning(f"[API 호출 제한] {data.get('return_msg', '')} (시도 {attempt + 1}/{max_retries}). 호출 제한기 대기 후 재시도...")
+                    if attempt < max_retries - 1:
+                        rate_limiter.penalize('kt00001')
+                        continue
+                    logger.error("❌ 호출 제한으로 인해 잔고 조회에 최종 실패했습니다.")
+                    return 0, 0, 0
+
+                cutoff_amt, total_amt, deposit_amt = parse_balance(data)
+                if cutoff_amt == 0 and deposit_amt == 0 and total_amt == 0:
+                    logger.warning("[API 검증 실패] 모든 잔고 값이 0으로 조회됨")
+                    if attempt < max_retries - 1:
+                        await asyncio.sleep(1.0)
+                        continue
+                    fallback_amt = parse_fallback_balance(data)
+                    if fallback_amt > 0:
+                        logger.info(f"[Fallback 적용] n_cash_amt({fallback_amt})를 예수금으로 사용")
+                        return fallback_amt, fallback_amt, fallback_amt
+                    return 0, 0, 0
+
+                return cutoff_amt, total_amt, deposit_amt
+
+            except asyncio.TimeoutError:
+                logger.error(f"API 요청 시간 초과 (attempt {attempt + 1}/{max_retries})")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1.0)
+            except Exception as e:
+                logger.error(f"잔고 데이터 파싱 오류: {e}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(0.2)
+
+        return 0, 0, 0
+
+    @coalesced('kt00004', cacheable=account_data_ok)
+    async def get_account_data(self, token: str) -> Tuple[List[Dict], Dict]:
+        """계좌 평가 현황 조회 (kt00004, 연속조회 포함)"""
+        if not token:
+            logger.error("토큰이 None입니다. API 호출을 건너뜁니다.")
+            return [], {}
+
+        url = self.host_url + '/api/dostk/acnt'
+        headers = self._headers('kt00004', token, with_account=True)
+        params = {
+            'qry_tp': '0',
+            'dmst_stex_tp': 'KRX',
+        }
+
+        max_retries = 2
+        for retry_count in range(max_retries + 1):
+            all_stocks = HoldingList()
+            summary_data = {}
+            try:
+                page_no = 0
+                async for page, _ in aiter_pages(url, headers, params):
+                    if page_no == 0:
+                        summary_data = page
+                    all_stocks.extend(page.get('stk_acnt_evlt_prst') or [])
+                    page_no += 1
+                return all_stocks, summary_data
+
+            except Exception as e:
+                logger.error(f"계좌 데이터 조회 오류: {e!r} (retry {retry_count}/{max_retries})")
+            if retry_count < max_retries:
+                await asyncio.sleep(0.2)
+
+        return [], {}
+
+    @coalesced('ka10075', cacheable=outstanding_ok)
+    async def get_outstanding_orders(self, token: str) -> List[Dict]:
+        """미체결 주문 조회 (ka10075)"""
+        url = self.host_url + '/api/dostk/acnt'
+        headers = self._headers('ka10075', token, with_account=True)
+        params = {
+            'dmst_stex_tp': '0',        # 0: 전체
+            'qry_tp': '0',              # 0: 조회구분
+            'trde_tp': '0',             # 0: 전체 (필수)
+            'all_stk_tp': '0',          # 0: 전체 (필수)
+            'stex_tp': '0',             # 0: 전체 (필수)
+            'stk_cd': ''
+        }
+
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                result = (await async_post(url, headers=headers, json=params)).json()
+
+                if is_rate_limited(result):
+                    logger.warning(f"[미체결 호출 제한] {result.get('return_msg', '')} (시도 {attempt + 1}/{max_retries}). 호출 제한기 대기 후 재시도...")
+                    if attempt < max_retries - 1:
+                        rate_limiter.penalize('ka10075')
+                        continue
+                    logger.error("❌ 호출 제한으로 인해 미체결 조회에 최종 실패했습니다.")
+                    return None
+
+                ret_code = result.get('return_code')
+                if str(ret_code) != '0':
+                    logger.error(f"[미체결 조회 실패] 에러코드 {ret_code}: {result.get('return_msg', '알 수 없는 에러')}")
+                    return None
+
+                normalized_orders = parse_outstanding_orders(result)
+                if normalized_orders:
+                    logger.info(f"[미체결 조회] {len(normalized_orders)}개 주문 확인")
+                return normalized_orders
+
+            except Exception as e:
+                logger.error(f"미체결 주문 조회 오류: {e!r}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1.0)
+                    continue
+                return []
+
+        return []
+
+    async def _order(self, api_id: str, order_type: str, params: Dict, token: str) -> Tuple[str, str]:
+        url = self.host_url + '/api/dostk/ordr'
+        label = '매수' if order_type == 'buy' else '매도'
+        try:
+            response = await async_post(url, headers=self._headers(api_id, token), json=params)
+            # 주문이 전송되었으므로 계좌/예수금/미체결 캐시 무효화
+            account_cache.invalidate()
+            result = response.json()
+            logger.info(f"{label} 주문 결과(주문번호 등): {result}")
+            # [AutoCancel] 주문 추적 등록
+            try:
+                config.outstanding_orders[time.time()] = {'type': order_type, 'code': params['stk_cd'], 'qty': params['ord_qty'], 'result': result}
+            except: pass
+            return result.get('return_code', ''), result.get('return_msg', '')
+        except Exception as e:
+            logger.error(f"{label} 주문 오류: {e!r}")
+            return 'ERROR', str(e)
+
+    async def buy_stock(self, stk_cd: str, ord_qty: str, ord_uv: str, token: str, source: str = '검색식') -> Tuple[str, str]:
+        """주식 매수 주문 (kt10000, 보통)"""
+        params = {
+            'dmst_stex_tp': getattr(config, 'market_code', 'KRX'),
+            'stk_cd': stk_cd,
+            'ord_qty': f'{ord_qty}',
+            'ord_uv': f'{ord_uv}',
+            'trde_tp': '0',  # 보통 주문
+            'cond_uv': '',
+        }
+        return await self._order('kt10000', 'buy', params, token)
+
+    async def sell_stock(self, stk_cd: str, ord_qty: str, token: str) -> Tuple[str, str]:
+        """주식 매도 주문 (kt10001, 시장가)"""
+        params = {
+            'dmst_stex_tp': getattr(config, 'market_code', 'KRX'),
+            'stk_cd': stk_cd,
+            'ord_qty': ord_qty,
+            'ord_uv': '',
+            'trde_tp': '3',  # 시장가
+            'cond_uv': '',
+        }
+        return await self._order('kt10001', 'sell', params, token)
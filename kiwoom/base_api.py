@@ -4,6 +4,8 @@
 모든 키움 API 구현체가 따라야 하는 인터페이스를 정의합니다.
 """
 
+import asyncio
+import functools
 from abc import ABC, abstractmethod
 from typing import List, Dict, Tuple, Optional
 
@@ -118,3 +120,79 @@ class KiwoomAPI(ABC):
             int: 현재가 (조회 실패 시 None)
         """
         pass
+
+
+class AsyncKiwoomAPI(ABC):
+    """
+    키움 API 비동기 인터페이스
+
+    이벤트 루프에서 run_in_executor 없이 await로 호출하며,
+    서로 독립적인 조회는 asyncio.gather로 동시에 보낼 수 있습니다.
+    반환 형식은 KiwoomAPI의 같은 이름 메서드와 동일합니다.
+    """
+
+    @abstractmethod
+    async def get_token(self) -> Optional[str]:
+        """인증 토큰 발급"""
+        pass
+
+    @abstractmethod
+    async def get_balance(self, token: str) -> Tuple[int, int, int]:
+        """예수금 상세 현황 조회 → (주문가능금액, 총평가금액, 예수금)"""
+        pass
+
+    @abstractmethod
+    async def get_account_data(self, token: str) -> Tuple[List[Dict], Dict]:
+        """계좌 평가 현황 조회 → (종목 리스트, 계좌 요약 데이터)"""
+        pass
+
+    @abstractmethod
+    async def get_outstanding_orders(self, token: str) -> List[Dict]:
+        """미체결 주문 조회"""
+        pass
+
+    @abstractmethod
+    async def buy_stock(self, stk_cd: str, ord_qty: str, ord_uv: str, token: str) -> Tuple[str, str]:
+        """주식 매수 주문 → (return_code, return_msg)"""
+        pass
+
+    @abstractmethod
+    async def sell_stock(self, stk_cd: str, ord_qty: str, token: str) -> Tuple[str, str]:
+        """주식 매도 주문 (시장가) → (return_code, return_msg)"""
+        pass
+
+    async def close(self):
+        """연결 자원 정리 (필요한 구현체만 재정의)"""
+        pass
+
+
+class ExecutorAsyncKiwoomAPI(AsyncKiwoomAPI):
+    """
+    동기 KiwoomAPI 구현체를 AsyncKiwoomAPI로 감싸는 어댑터
+    (네트워크를 쓰지 않는 Mock API처럼 비동기 구현이 따로 없는 경우, 기본 스레드 풀에서 실행)
+    """
+
+    def __init__(self, api: KiwoomAPI):
+        self.api = api
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+    async def get_token(self) -> Optional[str]:
+        return await self._run(self.api.get_token)
+
+    async def get_balance(self, token: str) -> Tuple[int, int, int]:
+        return await self._run(self.api.get_balance, token)
+
+    async def get_account_data(self, token: str) -> Tuple[List[Dict], Dict]:
+        return await self._run(self.api.get_account_data, token)
+
+    async def get_outstanding_orders(self, token: str) -> List[Dict]:
+        return await self._run(self.api.get_outstanding_orders, token)
+
+    async def buy_stock(self, stk_cd: str, ord_qty: str, ord_uv: str, token: str, **kwargs) -> Tuple[str, str]:
+        return await self._run(self.api.buy_stock, stk_cd, ord_qty, ord_uv, token, **kwargs)
+
+    async def sell_stock(self, stk_cd: str, ord_qty: str, token: str) -> Tuple[str, str]:
+        return await self._run(self.api.sell_stock, stk_cd, ord_qty, token)
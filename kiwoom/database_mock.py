@@ -2,7 +2,6 @@
 Mock 서버 데이터를 JSON에서 DB로 완전히 전환
 모든 Mock 데이터를 DB에서 관리
 """
-import sqlite3
 import json
 import os
 import datetime
@@ -11,9 +10,9 @@ from logger import logger
 DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'trading.db')
 
 def get_db_connection():
-	conn = sqlite3.connect(DB_FILE)
-	conn.row_factory = sqlite3.Row
-	return conn
+	"""DB 연결 반환 (database_helpers의 스레드별 풀링 연결 공유)"""
+	from database_helpers import get_db_connection as pooled_connection
+	return pooled_connection()
 
 # ==================== Mock 계좌 ====================
 
@@ -4,7 +4,8 @@
 설정에 따라 실제 API 또는 Mock API를 생성합니다.
 """
 
-from .base_api import KiwoomAPI
+from typing import Union
+from .base_api import KiwoomAPI, AsyncKiwoomAPI, ExecutorAsyncKiwoomAPI
 from .real_api import RealKiwoomAPI
 from .mock_api import MockKiwoomAPI
 from logger import logger
@@ -12,15 +13,17 @@ import json
 import os
 
 
-def create_kiwoom_api(use_mock: bool = None) -> KiwoomAPI:
+def create_kiwoom_api(use_mock: bool = None, use_async: bool = False) -> Union[KiwoomAPI, AsyncKiwoomAPI]:
     """
     키움 API 인스턴스 생성
     
     Args:
         use_mock: True면 Mock API, False면 Real API, None이면 DB에서 읽음
+        use_async: True면 await로 호출하는 AsyncKiwoomAPI 반환
+            (Real은 aiohttp 기반 구현, Mock은 동기 구현을 스레드 풀에서 실행)
         
     Returns:
-        KiwoomAPI: 키움 API 인스턴스
+        KiwoomAPI 또는 AsyncKiwoomAPI: 키움 API 인스턴스
     """
     if use_mock is None:
         try:
@@ -32,9 +35,14 @@ def create_kiwoom_api(use_mock: bool = None) -> KiwoomAPI:
     
     if use_mock:
         logger.info("🎮 내부 Mock 시뮬레이터 사용 (Internal Simulation Mode)")
-        return MockKiwoomAPI()
+        api = MockKiwoomAPI()
+        return ExecutorAsyncKiwoomAPI(api) if use_async else api
     else:
         logger.info("📡 키움 서버 접속 모드 (Real/Paper Trading Mode)")
+        if use_async:
+            # aiohttp는 비동기 클라이언트를 쓰는 경우에만 필요
+            from .async_real_api import AsyncRealKiwoomAPI
+            return AsyncRealKiwoomAPI()
         return RealKiwoomAPI()
 
 
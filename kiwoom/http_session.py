@@ -0,0 +1,152 @@
+"""
+키움 REST / 텔레그램 공용 HTTP 세션
+
+매 호출마다 requests.post를 쓰면 TCP/TLS 연결을 새로 맺으므로,
+프로세스 전역 requests.Session 1개를 공유하여 keep-alive 연결을 재사용합니다.
+- 연결 풀 크기 조절 (configure_session)
+- 엔드포인트별 (연결, 응답) 타임아웃
+- 연결 끊김(keep-alive 만료 등) 시 새 연결로 투명하게 재시도
+  (주문 TR은 요청이 서버에 전달되지 않은 것이 확실한 경우에만 재시도하여 중복 주문 방지)
+- api-id 헤더가 있는 키움 TR 호출은 전송 전에 호출 제한기(rate_limiter)에서 토큰 확보
+"""
+
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from logger import logger
+from .rate_limiter import rate_limiter
+
+# 연결 풀 크기 (호스트별 유지할 keep-alive 연결 수, 동시 호출 스레드 수 이상 권장)
+HTTP_POOL_SIZE = 10
+
+# 엔드포인트별 (연결, 응답) 타임아웃(초)
+DEFAULT_TIMEOUT = (3, 10)
+ENDPOINT_TIMEOUTS = {
+    '/oauth2/token': (3, 10),
+    '/api/dostk/ordr': (3, 10),     # 주문/정정/취소/체결확인
+    '/api/dostk/acnt': (3, 10),     # 예수금/계좌평가/미체결/체결내역
+    '/api/dostk/mrkcond': (3, 5),   # 호가/현재가
+    '/api/dostk/stkinfo': (3, 5),   # 종목 기본정보
+    '/sendMessage': (3, 3),         # 텔레그램 (빠른 실패)
+}
+
+# 연결 끊김 시 재시도 횟수
+HTTP_MAX_RETRIES = 2
+
+# 재전송하면 중복 체결될 수 있는 TR (매수/매도/정정/취소)
+NON_IDEMPOTENT_API_IDS = {'kt10000', 'kt10001', 'kt10002', 'kt10003'}
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+_pool_size = HTTP_POOL_SIZE
+
+
+def configure_session(pool_size=None, timeouts=None):
+    """연결 풀 크기 / 엔드포인트 타임아웃 변경 (다음 호출부터 새 세션 적용)"""
+    global _pool_size, _session
+    with _session_lock:
+        if pool_size is not None:
+            _pool_size = int(pool_size)
+        if timeouts:
+            ENDPOINT_TIMEOUTS.update(timeouts)
+        old, _session = _session, None
+    if old is not None:
+        old.close()
+
+
+def get_session() -> requests.Session:
+    """프로세스 공용 세션 반환 (fork된 자식 프로세스는 새로 생성)"""
+    global _session, _session_pid
+    session = _session
+    if session is not None and _session_pid == os.getpid():
+        return session
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            # 재시도는 post()에서 직접 판단 (urllib3 자동 재시도는 주문 중복 위험)
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_pool_size, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+            _session_pid = os.getpid()
+        return _session
+
+
+def close_session():
+    """공용 세션 종료 (keep-alive 연결 정리)"""
+    global _session
+    with _session_lock:
+        old, _session = _session, None
+    if old is not None:
+        old.close()
+
+
+def get_timeout(url):
+    """URL 경로에 맞는 (연결, 응답) 타임아웃"""
+    path = urlsplit(url).path
+    for endpoint, timeout in ENDPOINT_TIMEOUTS.items():
+        if path.endswith(endpoint):
+            return timeout
+    return DEFAULT_TIMEOUT
+
+
+def _iter_causes(exc):
+    seen = set()
+    stack = [exc]
+    while stack:
+        e = stack.pop()
+        if e is None or id(e) in seen:
+            continue
+        seen.add(id(e))
+        yield e
+        stack.append(e.__cause__)
+        stack.append(e.__context__)
+        stack.extend(arg for arg in getattr(e, 'args', ()) if isinstance(arg, BaseException))
+
+
+def _is_retryable(exc, idempotent):
+    """
+    재시도 가능 여부
+    - 연결 수립 실패(연결 타임아웃 / 연결 거부 / 이름 해석 실패): 요청이 전송되지 않았으므로 항상 재시도
+    - 그 밖의 끊김(keep-alive 만료, 전송 중 파이프 끊김, 응답 대기 중 리셋 / 타임아웃): 조회 TR만 재시도
+      (주문은 서버가 이미 접수했을 수 있으므로 호출자에게 전달 → 미체결 조회로 확인)
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ReadTimeout):
+        return False
+    if not isinstance(exc, requests.exceptions.ConnectionError):
+        return False
+    for cause in _iter_causes(exc):
+        if type(cause).__name__ in ('NewConnectionError', 'NameResolutionError', 'ConnectTimeoutError'):
+            return True
+    return idempotent
+
+
+def post(url, headers=None, json=None, data=None, timeout=None, max_retries=HTTP_MAX_RETRIES):
+    """
+    공용 세션으로 POST (requests.post와 동일한 Response 반환 / 예외 전파)
+
+    Args:
+        timeout: None이면 엔드포인트별 기본값 사용
+    """
+    if timeout is None:
+        timeout = get_timeout(url)
+    api_id = (headers or {}).get('api-id', '')
+    idempotent = api_id not in NON_IDEMPOTENT_API_IDS
+
+    attempt = 0
+    while True:
+        if api_id:
+            rate_limiter.acquire(api_id)
+        try:
+            return get_session().post(url, headers=headers, json=json, data=data, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            if attempt >= max_retries or not _is_retryable(e, idempotent):
+                raise
+            attempt += 1
+            logger.warning(f"[HTTP] 연결 끊김, 새 연결로 재시도 ({attempt}/{max_retries}) {api_id or urlsplit(url).path}: {e}")
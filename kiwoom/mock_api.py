@@ -5,6 +5,7 @@ import os
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 from .base_api import KiwoomAPI
+from .records import HoldingList, OrderList
 from logger import logger
 from database_helpers import DB_FILE, get_db_connection, get_setting
 
@@ -185,7 +186,7 @@ class MockKiwoomAPI(KiwoomAPI):
 
     def get_account_data(self, token: str) -> Tuple[List[Dict], Dict]:
         self._update_prices()
-        stock_list = []
+        stock_list = HoldingList()
         total_eval = 0
         total_pl = 0
         
@@ -449,7 +450,7 @@ class MockKiwoomAPI(KiwoomAPI):
         if self.outstanding_orders:
             logger.info(f"🎮 Mock 미체결 조회: {len(self.outstanding_orders)}개 주문")
         
-        return self.outstanding_orders.copy()  # 복사본 반환
+        return OrderList(self.outstanding_orders)  # 복사본 반환 (OrderRecord로 감쌈)
 
     def cancel_stock(self, stk_cd: str, qty: str, org_ord_no: str, token: str) -> Tuple[str, str]:
         """주문 취소 (Mock)"""
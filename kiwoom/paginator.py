@@ -0,0 +1,143 @@
+"""
+키움 연속조회(cont-yn / next-key) 페이지 반복자
+
+응답 헤더의 cont-yn이 'Y'이고 next-key가 있으면 같은 요청을 cont-yn='Y', next-key=<값>으로 다시 보내
+다음 페이지를 받습니다. 페이지 단위로 yield하므로 호출자는 필요한 만큼만 읽고 멈출 수 있고
+(break 시 더 이상 요청하지 않음), 전체 결과를 메모리에 모을 필요가 없습니다.
+- 모든 요청은 http_session.post / async_http.async_post를 거치므로 호출 제한기(rate_limiter)가 적용됨
+- 호출 제한(1700) 응답은 제한기에 반영한 뒤 같은 페이지를 다시 요청
+  재요청해도 계속 제한이면 PageRateLimitError (오류 응답을 정상 페이지로 넘기지 않음 → 호출자의 기존 실패 처리로)
+"""
+
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from logger import logger
+from .http_session import post as http_post
+from .rate_limiter import rate_limiter, is_rate_limited
+
+# 연속조회 최대 페이지 수 (서버 이상 시 무한 반복 방지)
+MAX_PAGES = 100
+
+# 한 페이지에서 호출 제한 응답 시 재요청 횟수
+PAGE_RATE_LIMIT_RETRIES = 2
+
+
+class PageRateLimitError(RuntimeError):
+    """PAGE_RATE_LIMIT_RETRIES번 재요청해도 호출 제한 응답이 계속된 경우"""
+
+
+def _next_headers(headers, response_headers):
+    """다음 페이지 요청 헤더 (연속조회 끝이면 None)"""
+    cont_yn = response_headers.get('cont-yn', 'N')
+    next_key = response_headers.get('next-key', '')
+    if cont_yn != 'Y' or not next_key:
+        return None
+    headers = dict(headers)
+    headers['cont-yn'] = 'Y'
+    headers['next-key'] = next_key
+    return headers
+
+
+def _page_rows(data, list_keys):
+    for key in list_keys:
+        rows = data.get(key)
+        if rows:
+            return rows if isinstance(rows, list) else []
+    return []
+
+
+def _check_rate_limit(data, api_id, retries, page):
+    """호출 제한 응답이면 True (다시 요청), 재요청 횟수를 다 썼으면 PageRateLimitError"""
+    if not is_rate_limited(data):
+        return False
+    if retries >= PAGE_RATE_LIMIT_RETRIES:
+        raise PageRateLimitError(f"[연속조회] {api_id} {page + 1}페이지 호출 제한 지속: {data.get('return_msg', '')}")
+    rate_limiter.penalize(api_id)
+    return True
+
+
+def _first_headers(headers):
+    headers = dict(headers)
+    headers['cont-yn'] = 'N'
+    headers['next-key'] = ''
+    return headers
+
+
+def iter_pages(url: str, headers: Dict, body: Dict, max_pages: int = MAX_PAGES) -> Iterator[Tuple[Dict, Dict]]:
+    """
+    연속조회 페이지 반복 (동기)
+
+    Yields:
+        (응답 JSON dict, 응답 헤더)
+    Raises:
+        PageRateLimitError: 호출 제한 응답이 재요청 후에도 계속될 때
+    """
+    api_id = headers.get('api-id', '')
+    headers = _first_headers(headers)
+    page = 0
+    retries = 0
+    while headers is not None and page < max_pages:
+        response = http_post(url, headers=headers, json=body)
+        data = response.json()
+        if _check_rate_limit(data, api_id, retries, page):
+            retries += 1
+            continue
+        retries = 0
+        page += 1
+        yield data, response.headers
+        headers = _next_headers(headers, response.headers)
+    if headers is not None:
+        logger.warning(f"[연속조회] {api_id} 최대 {max_pages}페이지에서 중단 (남은 데이터 있음)")
+
+
+def iter_rows(url: str, headers: Dict, body: Dict, list_keys: Sequence[str],
+              max_pages: int = MAX_PAGES, max_rows: Optional[int] = None) -> Iterator[Dict]:
+    """
+    연속조회 행 반복 (동기)
+
+    Args:
+        list_keys: 페이지 JSON에서 행 목록을 찾을 키 (앞에서부터 처음 있는 키 사용)
+        max_rows: 이만큼 읽으면 다음 페이지를 요청하지 않고 종료
+    """
+    count = 0
+    for data, _ in iter_pages(url, headers, body, max_pages):
+        for row in _page_rows(data, list_keys):
+            yield row
+            count += 1
+            if max_rows is not None and count >= max_rows:
+                return
+
+
+async def aiter_pages(url: str, headers: Dict, body: Dict, max_pages: int = MAX_PAGES):
+    """연속조회 페이지 반복 (비동기, async for로 사용)"""
+    # aiohttp는 비동기 호출자에서만 필요
+    from .async_http import async_post
+
+    api_id = headers.get('api-id', '')
+    headers = _first_headers(headers)
+    page = 0
+    retries = 0
+    while headers is not None and page < max_pages:
+        response = await async_post(url, headers=headers, json=body)
+        data = response.json()
+        if _check_rate_limit(data, api_id, retries, page):
+            retries += 1
+            continue
+        retries = 0
+        page += 1
+        yield data, response.headers
+        headers = _next_headers(headers, response.headers)
+    if headers is not None:
+        logger.warning(f"[연속조회] {api_id} 최대 {max_pages}페이지에서 중단 (남은 데이터 있음)")
+
+
+async def aiter_rows(url: str, headers: Dict, body: Dict, list_keys: Sequence[str],
+                     max_pages: int = MAX_PAGES, max_rows: Optional[int] = None):
+    """연속조회 행 반복 (비동기)"""
+    count = 0
+    async for data, _ in aiter_pages(url, headers, body, max_pages):
+        for row in _page_rows(data, list_keys):
+            yield row
+            count += 1
+            if max_rows is not None and count >= max_rows:
+                return
@@ -0,0 +1,210 @@
+"""
+키움 REST 호출 제한기 (토큰 버킷)
+
+서버 호출 제한(Error 1700) 이후 고정 sleep으로 재시도하는 대신,
+호출 전에 TR(api-id)별 버킷과 전역 버킷에서 토큰을 예약하고 필요한 만큼만 대기합니다.
+- 전역 버킷: 모든 TR 합산 초당 호출 수
+- TR 버킷: 특정 TR의 초당 호출 수 (TR_RATE_LIMITS에 있는 TR만)
+- 버킷 상태는 파일 잠금으로 공유하여 bot / web_server 등 여러 프로세스가 같은 한도를 나눠 씀
+  (상태 파일을 열 수 없으면 프로세스 내부 버킷으로 동작)
+- 호출 제한 응답을 받으면 penalize()로 모든 호출자를 일정 시간 정지
+"""
+
+import os
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from logger import logger
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+# 전역 한도 (초당 토큰 수, 최대 연속 호출 수) - 서버 한도보다 약간 낮게 유지
+GLOBAL_RATE_LIMIT = (4.0, 4)
+
+# TR별 한도 (여러 루프가 반복 호출하는 계좌 조회 TR)
+TR_RATE_LIMITS = {
+    'kt00001': (2.0, 2),   # 예수금 상세
+    'kt00004': (2.0, 2),   # 계좌 평가 현황
+    'ka10075': (2.0, 2),   # 미체결
+}
+
+# 호출 제한 응답 수신 시 전체 호출 정지 시간(초)
+RATE_LIMIT_PENALTY = 1.0
+
+# 프로세스 간 공유 상태 파일 (None이면 프로세스 내부 버킷만 사용)
+RATE_LIMIT_STATE_FILE = os.path.join(tempfile.gettempdir(), 'kiwoom_rate_limit.json')
+
+_GLOBAL_KEY = '*'
+_KEEP = object()
+
+
+def is_rate_limited(result):
+    """서버 호출 제한(Error 1700) 응답 여부"""
+    ret_msg = str(result.get('return_msg', ''))
+    ret_code = str(result.get('return_code', ''))
+    return '1700' in ret_msg or '허용된 요청 개수를 초과' in ret_msg or ret_code == '5'
+
+
+def _take(state, limits, now):
+    """
+    버킷들에서 토큰 1개씩 예약하고 대기 시간 반환
+    토큰은 음수까지 내려갈 수 있으며(예약), 대기 시간은 가장 늦게 채워지는 버킷 기준
+    """
+    wait = 0.0
+    current = {}
+    for key, (rate, burst) in limits:
+        tokens, updated = state.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        current[key] = tokens
+        if tokens < 1:
+            wait = max(wait, (1 - tokens) / rate)
+    for key, (rate, burst) in limits:
+        state[key] = [min(burst, current[key] + wait * rate) - 1, now + wait]
+    return wait
+
+
+def _block(state, limits, now, seconds):
+    """모든 버킷의 다음 토큰을 seconds 뒤로 미룸"""
+    for key, (rate, burst) in limits:
+        tokens, updated = state.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        state[key] = [min(tokens, 1 - seconds * rate), now]
+
+
+class _FileState:
+    """잠금 파일에 저장된 버킷 상태 (fork/spawn된 프로세스는 파일을 다시 엶)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        self._pid = None
+
+    def _open(self):
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+    def _lock(self, fd):
+        if os.name == 'nt':
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock(self, fd):
+        if os.name == 'nt':
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def update(self, fn):
+        """잠금 상태에서 상태 dict를 읽고 fn(state) 적용 후 저장"""
+        fd = self._open()
+        self._lock(fd)
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            raw = os.read(fd, 65536)
+            try:
+                state = json.loads(raw) if raw else {}
+            except ValueError:
+                state = {}
+            result = fn(state)
+            data = json.dumps(state, separators=(',', ':')).encode('utf-8')
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, data)
+            os.ftruncate(fd, len(data))
+            return result
+        finally:
+            self._unlock(fd)
+
+
+class RateLimiter:
+    """
+    TR별 + 전역 토큰 버킷
+    - reserve(): 토큰 예약 후 대기해야 할 시간 반환 (대기하지 않음)
+    - acquire() / acquire_async(): 예약 후 필요한 시간만큼 대기
+    - penalize(): 서버 호출 제한 응답 시 전체 호출 일시 정지
+    """
+
+    def __init__(self, global_limit=GLOBAL_RATE_LIMIT, tr_limits=None, state_file=RATE_LIMIT_STATE_FILE):
+        self.global_limit = global_limit
+        self.tr_limits = dict(TR_RATE_LIMITS if tr_limits is None else tr_limits)
+        self._lock = threading.Lock()
+        self._local_state = {}
+        self._file_state = _FileState(state_file) if state_file else None
+        self.stats = {'calls': 0, 'waited': 0, 'wait_time': 0.0, 'penalties': 0}
+
+    def configure(self, global_limit=None, tr_limits=None, state_file=_KEEP):
+        """
+        한도 변경 (tr_limits는 기존 값에 병합, 값이 None이면 해당 TR 한도 제거)
+        state_file: 공유 상태 파일 경로 변경 (None이면 프로세스 내부 버킷만 사용, 생략 시 유지)
+        """
+        with self._lock:
+            if global_limit is not None:
+                self.global_limit = global_limit
+            if state_file is not _KEEP:
+                self._file_state = _FileState(state_file) if state_file else None
+                self._local_state = {}
+            for api_id, limit in (tr_limits or {}).items():
+                if limit is None:
+                    self.tr_limits.pop(api_id, None)
+                else:
+                    self.tr_limits[api_id] = limit
+
+    def _limits(self, api_id):
+        limits = [(_GLOBAL_KEY, self.global_limit)]
+        if api_id in self.tr_limits:
+            limits.append((api_id, self.tr_limits[api_id]))
+        return limits
+
+    def _update(self, fn):
+        # flock은 같은 프로세스의 스레드끼리는 배타적이지 않으므로 스레드 잠금을 함께 사용
+        with self._lock:
+            if self._file_state is not None:
+                try:
+                    return self._file_state.update(fn)
+                except OSError as e:
+                    logger.warning(f"[RateLimit] 공유 상태 파일 사용 불가, 프로세스 내부 버킷으로 전환: {e}")
+                    self._file_state = None
+            return fn(self._local_state)
+
+    def reserve(self, api_id=''):
+        """토큰 1개 예약 후 대기 시간(초) 반환"""
+        limits = self._limits(api_id)
+        wait = self._update(lambda state: _take(state, limits, time.time()))
+        self.stats['calls'] += 1
+        if wait > 0:
+            self.stats['waited'] += 1
+            self.stats['wait_time'] += wait
+        return wait
+
+    def acquire(self, api_id=''):
+        """호출 가능 시점까지 대기 (동기)"""
+        wait = self.reserve(api_id)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, api_id=''):
+        """호출 가능 시점까지 대기 (비동기)"""
+        wait = self.reserve(api_id)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def penalize(self, api_id='', seconds=RATE_LIMIT_PENALTY):
+        """서버 호출 제한(1700) 수신 시 seconds 동안 모든 프로세스의 호출 정지"""
+        limits = self._limits(api_id)
+        self._update(lambda state: _block(state, limits, time.time(), seconds))
+        self.stats['penalties'] += 1
+        logger.warning(f"[RateLimit] 호출 제한 응답 ({api_id or '전체'}) → {seconds:.1f}초간 호출 정지")
+
+
+rate_limiter = RateLimiter()
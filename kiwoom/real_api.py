@@ -10,10 +10,92 @@ import time
 import pandas as pd
 from typing import List, Dict, Tuple, Optional
 from .base_api import KiwoomAPI
+from .http_session import post as http_post
+from .rate_limiter import rate_limiter, is_rate_limited
+from .paginator import iter_pages, iter_rows
+from .account_cache import account_cache, coalesced, balance_ok, account_data_ok, outstanding_ok
+from .records import HoldingList, OrderList
 from logger import logger
 import config
 
 
+# ========== 응답 파싱 (동기/비동기 구현 공용) ==========
+
+def parse_balance(data: Dict) -> Tuple[int, int, int]:
+    """kt00001 응답 → (주문가능금액, 총평가금액, 예수금)"""
+    # [Fix] 절대값(abs) 적용: 모의투자 등에서 음수로 반환되는 경우 대응
+    cutoff_amt = abs(int(str(data.get('ord_alow_amt', '0')).replace(',', '')))
+    deposit_amt = abs(int(str(data.get('dnca_tot_amt', '0')).replace(',', '')))
+    total_amt = abs(int(str(data.get('tot_evlu_amt', '0')).replace(',', '')))
+
+    # [Fix] 만약 여전히 0이라면 다른 필드(d2_entra, entr 등) 시도
+    if deposit_amt == 0:
+        deposit_amt = abs(int(str(data.get('d2_entra', '0')).replace(',', '')))
+    if total_amt == 0:
+        total_amt = abs(int(str(data.get('entr', '0')).replace(',', '')))
+
+    # [Fix] API 버그 대응: ord_alow_amt가 비정상적으로 작을 경우 출금가능금액(pymn_alow_amt) 사용
+    if cutoff_amt < 1000000:
+        alt_amt = int(str(data.get('pymn_alow_amt', '0')).replace(',', ''))
+        if alt_amt > cutoff_amt:
+            logger.warning(f"[API 보정] 주문가능금액({cutoff_amt})이 너무 작아 출금가능금액({alt_amt})으로 대체합니다.")
+            cutoff_amt = alt_amt
+
+    # deposit_amt = int(str(data.get('dnca_tot_amt', '0')).replace(',', ''))
+    # total_amt = int(str(data.get('tot_evlu_amt', '0')).replace(',', ''))
+
+    if deposit_amt == 0:
+        deposit_amt = cutoff_amt
+    if total_amt == 0:
+        total_amt = deposit_amt
+
+    return cutoff_amt, total_amt, deposit_amt
+
+
+def parse_fallback_balance(data: Dict) -> int:
+    """모든 잔고 값이 0일 때 대체 필드(n_cash_amt) 금액"""
+    return int(str(data.get('n_cash_amt', '0')).replace(',', ''))
+
+
+def parse_outstanding_orders(result: Dict) -> OrderList:
+    """ka10075 응답 → 미체결 주문 목록 (체결 완료 건 제외, 필드 정규화, 종목코드 색인)"""
+    # 미체결 주문 목록 추출 및 데이터 정규화 (ka10075 전용)
+    # [Fix] 다양한 응답 필드 지원 (output, oso, ordr_list 등)
+    raw_orders = result.get('output')
+    if raw_orders is None: raw_orders = result.get('oso')
+    if raw_orders is None: raw_orders = result.get('ordr_list')
+    if raw_orders is None: raw_orders = []
+
+    normalized_orders = OrderList()
+    for o in raw_orders:
+        # [Fix] 키움 ka10075의 실제 필드명 매핑 (oso_qty, ord_pric, io_tp_nm 등)
+        # unex_qty 대신 oso_qty 가 미체결 수량임
+        unfilled_qty_str = str(o.get('oso_qty', o.get('unex_qty', '0'))).replace(',', '')
+        unfilled_qty = int(float(unfilled_qty_str)) if unfilled_qty_str else 0
+
+        if unfilled_qty <= 0: 
+            continue # 체결 완료된 건 제외
+
+        # io_tp_nm: 매수/매도 구분 (예: "매수", "매도", "+매수", "-매도")
+        io_tp = o.get('io_tp_nm', '')
+        # ord_tp가 있는 경우도 대비
+        ord_tp_val = str(o.get('ord_tp', ''))
+        is_buy = '매수' in io_tp or ord_tp_val == '01'
+
+        normalized_orders.append({
+            'code': o.get('stk_cd', ''),
+            'stk_cd': o.get('stk_cd', ''),
+            'name': o.get('stk_nm', ''),
+            'qty': unfilled_qty,
+            'price': int(float(str(o.get('ord_pric', o.get('ord_unpr', 0))).replace(',',''))),
+            'ord_tp': '01' if is_buy else '02',
+            'type': 'buy' if is_buy else 'sell',
+            'ord_no': o.get('ord_no', ''),
+            'org_ord_no': o.get('orig_ord_no', o.get('org_ord_no', ''))
+        })
+    return normalized_orders
+
+
 class RealKiwoomAPI(KiwoomAPI):
     """실제 키움 REST API 구현"""
     
@@ -45,7 +127,7 @@ class RealKiwoomAPI(KiwoomAPI):
             logger.info(f'Token request - URL: {url}')
             
             # json=data 파라미터로 전송
-            response = requests.post(url, headers=headers, json=data, timeout=10)
+            response = http_post(url, headers=headers, json=data)
             logger.info(f'Token request - Code: {response.status_code}')
             
             if response.status_code != 200:
@@ -71,8 +153,9 @@ class RealKiwoomAPI(KiwoomAPI):
                 logger.warning(f"⚠️ 토큰 발급 중 오류: {e}")
             return None
     
+    @coalesced('kt00001', cacheable=balance_ok)
     def get_balance(self, token: str) -> Tuple[int, int, int]:
-        """예수금 상세 현황 조회"""
+        """예수금 상세 현황 조회 (동시 요청 합치기 + 짧은 캐시, kiwoom.account_cache)"""
         if not token:
             logger.error("토큰이 None입니다. API 호출을 건너뜁니다.")
             return 0, 0, 0
@@ -98,17 +181,15 @@ class RealKiwoomAPI(KiwoomAPI):
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = requests.post(url, headers=headers, json=params, timeout=10)
+                response = http_post(url, headers=headers, json=params)
                 data = response.json()
                 
                 # [Fix] 호출 제한(Error 1700) 감지 및 대응
-                ret_msg = str(data.get('return_msg', ''))
-                ret_code = str(data.get('return_code', ''))
-                
-                if '1700' in ret_msg or '허용된 요청 개수를 초과' in ret_msg or ret_code == '5':
-                    logger.warning(f"[API 호출 제한] {ret_msg} (시도 {attempt + 1}/{max_retries}). 2초 대기 후 재시도...")
+                if is_rate_limited(data):
+                    logger.warning(f"[API 호출 제한] {data.get('return_msg', '')} (시도 {attempt + 1}/{max_retries}). 호출 제한기 대기 후 재시도...")
                     if attempt < max_retries - 1:
-                        time.sleep(2.0)
+                        # [Fix] 고정 sleep 대신 공유 호출 제한기에 반영 (다음 호출이 필요한 만큼만 대기)
+                        rate_limiter.penalize('kt00001')
                         continue
                     else:
                         logger.error("❌ 호출 제한으로 인해 잔고 조회에 최종 실패했습니다.")
@@ -118,31 +199,7 @@ class RealKiwoomAPI(KiwoomAPI):
                 # logger.info(f"[Balance Debug] Account: {self.my_account}, Data Key-Values: {list(data.keys())}")
                 # logger.info(f"[Balance Debug] Full Data: {data}")
                 
-                # [Fix] 절대값(abs) 적용: 모의투자 등에서 음수로 반환되는 경우 대응
-                cutoff_amt = abs(int(str(data.get('ord_alow_amt', '0')).replace(',', '')))
-                deposit_amt = abs(int(str(data.get('dnca_tot_amt', '0')).replace(',', '')))
-                total_amt = abs(int(str(data.get('tot_evlu_amt', '0')).replace(',', '')))
-                
-                # [Fix] 만약 여전히 0이라면 다른 필드(d2_entra, entr 등) 시도
-                if deposit_amt == 0:
-                    deposit_amt = abs(int(str(data.get('d2_entra', '0')).replace(',', '')))
-                if total_amt == 0:
-                    total_amt = abs(int(str(data.get('entr', '0')).replace(',', '')))
-                
-                # [Fix] API 버그 대응: ord_alow_amt가 비정상적으로 작을 경우 출금가능금액(pymn_alow_amt) 사용
-                if cutoff_amt < 1000000:
-                    alt_amt = int(str(data.get('pymn_alow_amt', '0')).replace(',', ''))
-                    if alt_amt > cutoff_amt:
-                        logger.warning(f"[API 보정] 주문가능금액({cutoff_amt})이 너무 작아 출금가능금액({alt_amt})으로 대체합니다.")
-                        cutoff_amt = alt_amt
-
-                # deposit_amt = int(str(data.get('dnca_tot_amt', '0')).replace(',', ''))
-                # total_amt = int(str(data.get('tot_evlu_amt', '0')).replace(',', ''))
-                
-                if deposit_amt == 0:
-                    deposit_amt = cutoff_amt
-                if total_amt == 0:
-                    total_amt = deposit_amt
+                cutoff_amt, total_amt, deposit_amt = parse_balance(data)
                 
                 if cutoff_amt == 0 and deposit_amt == 0 and total_amt == 0:
                     logger.warning(f"[API 검증 실패] 모든 잔고 값이 0으로 조회됨")
@@ -153,7 +210,7 @@ class RealKiwoomAPI(KiwoomAPI):
                     else:
                         # [Final Fallback] 만약 모든 값이 0이면, 다른 필드라도 있는지 확인
                         # 일부 계좌에서는 'n_cash_amt' 등을 사용할 수 있음
-                        fallback_amt = int(str(data.get('n_cash_amt', '0')).replace(',', ''))
+                        fallback_amt = parse_fallback_balance(data)
                         if fallback_amt > 0:
                             logger.info(f"[Fallback 적용] n_cash_amt({fallback_amt})를 예수금으로 사용")
                             return fallback_amt, fallback_amt, fallback_amt
@@ -175,8 +232,9 @@ class RealKiwoomAPI(KiwoomAPI):
         
         return 0, 0, 0
     
+    @coalesced('kt00004', cacheable=account_data_ok)
     def get_account_data(self, token: str) -> Tuple[List[Dict], Dict]:
-        """계좌 평가 현황 조회"""
+        """계좌 평가 현황 조회 (동시 요청 합치기 + 짧은 캐시, kiwoom.account_cache)"""
         if not token:
             logger.error("토큰이 None입니다. API 호출을 건너뜁니다.")
             return [], {}
@@ -200,73 +258,35 @@ class RealKiwoomAPI(KiwoomAPI):
             'dmst_stex_tp': 'KRX',
         }
         
-        all_stocks = []
-        summary_data = {}
-        first_call = True
         max_retries = 2
-        retry_count = 0
-        cont_yn = 'N'
-        next_key = ''
-        
-        while True:
-            headers['cont-yn'] = cont_yn
-            headers['next-key'] = next_key
-            
+        for retry_count in range(max_retries + 1):
+            all_stocks = HoldingList()
+            summary_data = {}
             try:
-                response = requests.post(url, headers=headers, json=params, timeout=10)
-                response_data = response.json()
-                
-                if first_call:
-                    summary_data = response_data
-                    first_call = False
-                
-                stocks = response_data.get('stk_acnt_evlt_prst', [])
-                if stocks:
-                    all_stocks.extend(stocks)
-                
-                res_headers = response.headers
-                cont_yn_res = res_headers.get('cont-yn', 'N')
-                next_key_res = res_headers.get('next-key', '')
-                
-                if cont_yn_res == 'Y' and next_key_res:
-                    cont_yn = 'Y'
-                    next_key = next_key_res
-                    time.sleep(0.1)
-                else:
-                    break
+                # 연속조회(cont-yn/next-key)는 paginator가 처리, 요약은 첫 페이지 기준
+                for page_no, (page, _) in enumerate(iter_pages(url, headers, params)):
+                    if page_no == 0:
+                        summary_data = page
+                    all_stocks.extend(page.get('stk_acnt_evlt_prst') or [])
+                return all_stocks, summary_data
                     
             except requests.exceptions.Timeout:
                 logger.error(f"API 요청 시간 초과 (retry {retry_count}/{max_retries})")
-                if retry_count < max_retries:
-                    retry_count += 1
-                    time.sleep(0.2)
-                    continue
-                return [], {}
             except Exception as e:
                 logger.error(f"계좌 데이터 조회 오류: {e}")
-                if retry_count < max_retries:
-                    retry_count += 1
-                    time.sleep(0.2)
-                    continue
-                return [], {}
+            if retry_count < max_retries:
+                time.sleep(0.2)
         
-        return all_stocks, summary_data
+        return [], {}
     
     def get_my_stocks(self, token: str, print_df: bool = False) -> List[Dict]:
         """보유 종목 조회"""
         raw_stocks, _ = self.get_account_data(token)
         
         if not raw_stocks:
-            return []
+            return HoldingList()
         
-        stocks = []
-        for s in raw_stocks:
-            try:
-                qty = int(s.get('rmnd_qty', '0'))
-                if qty > 0:
-                    stocks.append(s)
-            except:
-                pass
+        stocks = raw_stocks.held()
         
         if print_df and stocks:
             try:
@@ -286,22 +306,10 @@ class RealKiwoomAPI(KiwoomAPI):
         """보유 주식의 총 평가금액 계산"""
         try:
             stocks = self.get_my_stocks(token)
-            total_eval = 0
-            
             if not stocks:
                 return 0
             
-            for stock in stocks:
-                if 'evlu_amt' in stock and stock['evlu_amt']:
-                    amt = int(stock['evlu_amt'])
-                    total_eval += amt
-                elif 'cur_prc' in stock and 'rmnd_qty' in stock:
-                    price = int(stock.get('cur_prc', 0))
-                    qty = int(stock.get('rmnd_qty', 0))
-                    amt = price * qty
-                    total_eval += amt
-            
-            return total_eval
+            return int(stocks.total_eval_amt())
         except Exception as e:
             logger.error(f"총 평가금액 계산 중 오류: {e}")
             return 0
@@ -329,7 +337,9 @@ class RealKiwoomAPI(KiwoomAPI):
         }
         
         try:
-            response = requests.post(url, headers=headers, json=params)
+            response = http_post(url, headers=headers, json=params)
+            # 주문이 전송되었으므로 계좌/예수금/미체결 캐시 무효화
+            account_cache.invalidate()
             result = response.json()
             logger.info(f"매수 주문 결과(주문번호 등): {result}")
             # [AutoCancel] 주문 추적 등록
@@ -364,7 +374,8 @@ class RealKiwoomAPI(KiwoomAPI):
         }
         
         try:
-            response = requests.post(url, headers=headers, json=params)
+            response = http_post(url, headers=headers, json=params)
+            account_cache.invalidate()
             result = response.json()
             logger.info(f"매도 주문 결과(주문번호 등): {result}")
             try:
@@ -376,8 +387,9 @@ class RealKiwoomAPI(KiwoomAPI):
             return 'ERROR', str(e)
     
     
+    @coalesced('ka10075', cacheable=outstanding_ok)
     def get_outstanding_orders(self, token: str) -> List[Dict]:
-        """미체결 주문 조회 (ka10075)"""
+        """미체결 주문 조회 (ka10075, 동시 요청 합치기 + 짧은 캐시)"""
         endpoint = '/api/dostk/acnt'
         url = self.host_url + endpoint
         
@@ -406,17 +418,17 @@ class RealKiwoomAPI(KiwoomAPI):
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                response = requests.post(url, headers=headers, json=params, timeout=10)
+                response = http_post(url, headers=headers, json=params)
                 result = response.json()
                 
                 # [Fix] 호출 제한(Error 1700) 감지 및 대응 (Retry logic)
                 ret_code = result.get('return_code')
                 ret_msg = str(result.get('return_msg', ''))
                 
-                if ret_code is not None and str(ret_code) == '5' or '1700' in ret_msg:
-                    logger.warning(f"[미체결 호출 제한] {ret_msg} (시도 {attempt + 1}/{max_retries}). 1초 대기 후 재시도...")
+                if is_rate_limited(result):
+                    logger.warning(f"[미체결 호출 제한] {ret_msg} (시도 {attempt + 1}/{max_retries}). 호출 제한기 대기 후 재시도...")
                     if attempt < max_retries - 1:
-                        time.sleep(1.0)
+                        rate_limiter.penalize('ka10075')
                         continue
                     else:
                         logger.error("❌ 호출 제한으로 인해 미체결 조회에 최종 실패했습니다.")
@@ -427,40 +439,7 @@ class RealKiwoomAPI(KiwoomAPI):
                     logger.error(f"[미체결 조회 실패] 에러코드 {ret_code}: {msg}")
                     return None
                 
-                # 미체결 주문 목록 추출 및 데이터 정규화 (ka10075 전용)
-                # [Fix] 다양한 응답 필드 지원 (output, oso, ordr_list 등)
-                raw_orders = result.get('output')
-                if raw_orders is None: raw_orders = result.get('oso')
-                if raw_orders is None: raw_orders = result.get('ordr_list')
-                if raw_orders is None: raw_orders = []
-
-                normalized_orders = []
-                for o in raw_orders:
-                    # [Fix] 키움 ka10075의 실제 필드명 매핑 (oso_qty, ord_pric, io_tp_nm 등)
-                    # unex_qty 대신 oso_qty 가 미체결 수량임
-                    unfilled_qty_str = str(o.get('oso_qty', o.get('unex_qty', '0'))).replace(',', '')
-                    unfilled_qty = int(float(unfilled_qty_str)) if unfilled_qty_str else 0
-                    
-                    if unfilled_qty <= 0: 
-                        continue # 체결 완료된 건 제외
-                    
-                    # io_tp_nm: 매수/매도 구분 (예: "매수", "매도", "+매수", "-매도")
-                    io_tp = o.get('io_tp_nm', '')
-                    # ord_tp가 있는 경우도 대비
-                    ord_tp_val = str(o.get('ord_tp', ''))
-                    is_buy = '매수' in io_tp or ord_tp_val == '01'
-                    
-                    normalized_orders.append({
-                        'code': o.get('stk_cd', ''),
-                        'stk_cd': o.get('stk_cd', ''),
-                        'name': o.get('stk_nm', ''),
-                        'qty': unfilled_qty,
-                        'price': int(float(str(o.get('ord_pric', o.get('ord_unpr', 0))).replace(',',''))),
-                        'ord_tp': '01' if is_buy else '02',
-                        'type': 'buy' if is_buy else 'sell',
-                        'ord_no': o.get('ord_no', ''),
-                        'org_ord_no': o.get('orig_ord_no', o.get('org_ord_no', ''))
-                    })
+                normalized_orders = parse_outstanding_orders(result)
                 
                 if normalized_orders:
                     logger.info(f"[미체결 조회] {len(normalized_orders)}개 주문 확인")
@@ -517,7 +496,7 @@ class RealKiwoomAPI(KiwoomAPI):
         }
         
         try:
-            response = requests.post(url, headers=headers, json=params, timeout=10)
+            response = http_post(url, headers=headers, json=params)
             result = response.json()
             
             # 주문 상태 파싱
@@ -589,7 +568,8 @@ class RealKiwoomAPI(KiwoomAPI):
         }
         
         try:
-            response = requests.post(url, headers=headers, json=params)
+            response = http_post(url, headers=headers, json=params)
+            account_cache.invalidate()
             result = response.json()
             logger.info(f"주문 취소 결과: {result}")
             return result.get('return_code', ''), result.get('return_msg', '')
@@ -615,7 +595,7 @@ class RealKiwoomAPI(KiwoomAPI):
         }
         
         try:
-            response = requests.post(url, headers=headers, json=params, timeout=10)
+            response = http_post(url, headers=headers, json=params)
             data = response.json()
             # sel_fpr_bid: 매도최우선호가
             price_raw = data.get('sel_fpr_bid', data.get('stk_prpr', '0'))
@@ -659,16 +639,10 @@ class RealKiwoomAPI(KiwoomAPI):
         
         try:
             logger.info(f"[실전 데이터 연결] 키움 체결 내역 조회 시도 ({today})")
-            response = requests.post(url, headers=headers, json=params, timeout=10)
-            result = response.json()
             
-            # 응답 필드 파싱 (출력 데이터는 output 또는 oso_history 등)
-            raw_history = result.get('output', result.get('output1', []))
-            if not isinstance(raw_history, list):
-                raw_history = []
-                
+            # 응답 필드 파싱 (출력 데이터는 output 또는 output1), 연속조회로 전체 페이지 순회
             history = []
-            for item in raw_history:
+            for item in iter_rows(url, headers, params, ('output', 'output1')):
                 # 데이터 정규화 (로컬 DB 형식과 최대한 맞춤)
                 stk_cd = item.get('stk_cd', '')
                 qty_str = str(item.get('ctrct_qty', item.get('qty', '0'))).replace(',', '')
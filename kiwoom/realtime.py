@@ -0,0 +1,190 @@
+"""
+실시간(WebSocket) 메시지 해석
+
+REAL / CNSRREQ 항목을 한 번 순회로 고정 튜플 RealTick(code, price, rate, volume, strength)으로 바꿉니다.
+수신 루프가 항목마다 dict.get 체인과 str.replace / float 변환을 반복하던 것을 FID별 한 번 변환으로 줄입니다.
+- REAL: item['values']의 FID (9001 종목코드, 10 현재가, 12 등락율(없으면 11), 13 누적거래량, 15 체결강도)
+- CNSRREQ(조건검색 초기조회): 항목 자체에 같은 FID 또는 stk_cd / jmcode / pl_rt 키
+- REAL type '02'(조건검색 편입/이탈): ConditionEvent(seq, code, inserted) - FID 841 조건식 번호, 843 I/D
+- REAL type '00'(주문체결): OrderExecution - FID 9203 주문번호, 913 주문상태, 907 매도수구분(1 매도 / 2 매수),
+  900 주문수량, 911 누적 체결량, 902 미체결수량, 910 체결가, 901 주문가격, 908 체결시간
+- REAL type '04'(잔고): BalanceUpdate - FID 930 보유수량, 931 매입단가, 933 주문가능수량, 10 현재가
+- 값이 없거나 해석할 수 없는 필드는 None (현재가는 부호 제거한 절대값)
+"""
+
+from collections import namedtuple
+from typing import Optional
+
+RealTick = namedtuple('RealTick', ('code', 'price', 'rate', 'volume', 'strength'))
+ConditionEvent = namedtuple('ConditionEvent', ('seq', 'code', 'inserted'))
+OrderExecution = namedtuple('OrderExecution', ('order_no', 'code', 'name', 'side', 'status', 'order_qty', 'order_price',
+                                               'filled_qty', 'unfilled_qty', 'fill_price', 'time'))
+BalanceUpdate = namedtuple('BalanceUpdate', ('code', 'name', 'qty', 'avg_price', 'orderable_qty', 'cur_price'))
+
+# 조건검색 실시간 편입/이탈 항목 type
+CONDITION_REAL_TYPE = '02'
+
+# 계좌 실시간 항목 type (00: 주문체결, 04: 잔고)
+ORDER_EXEC_REAL_TYPE = '00'
+BALANCE_REAL_TYPE = '04'
+
+
+def _number(value, convert):
+    """'+71,300' / '-1.23' / '' → 숫자 (해석 불가 시 None)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return convert(value)
+    try:
+        return convert(value)
+    except ValueError:
+        try:
+            return convert(float(value.replace(',', '')))
+        except (AttributeError, ValueError):
+            return None
+
+
+def _code(value) -> Optional[str]:
+    if not value:
+        return None
+    code = str(value)
+    return code[1:] if code.startswith('A') else code
+
+
+def _rate(fields):
+    rate = _number(fields.get('12'), float)
+    if rate is None:
+        rate = _number(fields.get('11'), float)
+    if rate is None:
+        rate = _number(fields.get('pl_rt'), float)
+    return 0.0 if rate is None else rate
+
+
+def decode_real_item(item) -> Optional[RealTick]:
+    """REAL 항목 1건 → RealTick (종목코드가 없으면 None)"""
+    values = item.get('values')
+    if not values:
+        return None
+    code = _code(values.get('9001') or values.get('stk_cd') or item.get('item'))
+    if code is None:
+        return None
+    price = _number(values.get('10'), int)
+    return RealTick(code, abs(price) if price else None, _rate(values),
+                    _number(values.get('13'), int), _number(values.get('15'), float))
+
+
+def decode_condition_item(item) -> Optional[RealTick]:
+    """CNSRREQ 초기조회 항목 1건 → RealTick (종목코드가 없으면 None)"""
+    code = _code(item.get('stk_cd') or item.get('jmcode') or item.get('9001'))
+    if code is None:
+        return None
+    price = _number(item.get('10'), int)
+    return RealTick(code, abs(price) if price else None, _rate(item),
+                    _number(item.get('13'), int), _number(item.get('15'), float))
+
+
+def decode_condition_event(item) -> Optional[ConditionEvent]:
+    """REAL type '02' 항목 1건 → ConditionEvent (종목코드가 없으면 None)"""
+    values = item.get('values') or {}
+    code = _code(values.get('9001') or item.get('item'))
+    if code is None:
+        return None
+    seq = str(values.get('841', '')).strip()
+    return ConditionEvent(seq, code, str(values.get('843', 'I')).strip().upper() != 'D')
+
+
+def _side(values) -> str:
+    """FID 907 매도수구분(1 매도 / 2 매수), 없으면 905 주문구분 문자열('+매수' / '-매도')"""
+    flag = str(values.get('907', '')).strip()
+    if flag == '1':
+        return 'sell'
+    if flag == '2':
+        return 'buy'
+    text = str(values.get('905', ''))
+    if '매도' in text:
+        return 'sell'
+    if '매수' in text:
+        return 'buy'
+    return ''
+
+
+def _abs_int(value) -> int:
+    number = _number(value, int)
+    return abs(number) if number else 0
+
+
+def decode_order_execution(item) -> Optional[OrderExecution]:
+    """REAL type '00' 항목 1건 → OrderExecution (종목코드 / 주문번호가 없으면 None)"""
+    values = item.get('values') or {}
+    code = _code(values.get('9001') or item.get('item'))
+    order_no = str(values.get('9203', '')).strip()
+    if code is None or not order_no:
+        return None
+    return OrderExecution(order_no, code, str(values.get('302', '')).strip(), _side(values),
+                          str(values.get('913', '')).strip(), _abs_int(values.get('900')), _abs_int(values.get('901')),
+                          _abs_int(values.get('911')), _abs_int(values.get('902')), _abs_int(values.get('910')),
+                          str(values.get('908', '')).strip())
+
+
+def decode_balance_update(item) -> Optional[BalanceUpdate]:
+    """REAL type '04' 항목 1건 → BalanceUpdate (종목코드가 없으면 None)"""
+    values = item.get('values') or {}
+    code = _code(values.get('9001') or item.get('item'))
+    if code is None:
+        return None
+    return BalanceUpdate(code, str(values.get('302', '')).strip(), _abs_int(values.get('930')),
+                         _abs_int(values.get('931')), _abs_int(values.get('933')), _abs_int(values.get('10')))
+
+
+ACCOUNT_DECODERS = {
+    ORDER_EXEC_REAL_TYPE: decode_order_execution,
+    BALANCE_REAL_TYPE: decode_balance_update,
+}
+
+
+DECODERS = {
+    'REAL': decode_real_item,
+    'CNSRREQ': decode_condition_item,
+}
+
+
+def decode_items(trnm, items):
+    """메시지 data 목록 → RealTick 목록 (해석 불가 항목은 건너뜀)"""
+    decode = DECODERS[trnm]
+    ticks = []
+    for item in items:
+        try:
+            tick = decode(item)
+        except (AttributeError, TypeError):
+            continue
+        if tick is not None:
+            ticks.append(tick)
+    return ticks
+
+
+def split_real_items(items):
+    """
+    REAL data 목록 → (RealTick 목록, ConditionEvent 목록, 계좌 이벤트 목록) (해석 불가 항목은 건너뜀)
+    계좌 이벤트(OrderExecution / BalanceUpdate)는 받은 순서 그대로 (체결 → 잔고 순서 유지)
+    """
+    ticks, events, account = [], [], []
+    for item in items:
+        try:
+            kind = item.get('type')
+            if kind == CONDITION_REAL_TYPE:
+                event = decode_condition_event(item)
+                if event is not None:
+                    events.append(event)
+                continue
+            decode = ACCOUNT_DECODERS.get(kind)
+            if decode is not None:
+                record = decode(item)
+                if record is not None:
+                    account.append(record)
+                continue
+            tick = decode_real_item(item)
+        except (AttributeError, TypeError):
+            continue
+        if tick is not None:
+            ticks.append(tick)
+    return ticks, events, account
@@ -0,0 +1,104 @@
+"""
+웹소켓 재접속 도우미 (지터 지수 백오프 + 끊김 구간 측정)
+
+- Backoff: 재시도 간격 base × 2^(시도-1) (최대 cap), 매번 ±jitter 비율만큼 무작위로 흔들어
+  여러 클라이언트가 같은 순간에 몰려 재접속하지 않게 함
+- GapMeter: 끊김 시작 ~ 재접속 후 첫 로그인 성공까지의 시간을 기록하고 통계 제공
+"""
+
+import random
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from utils import percentile
+
+# 재접속 대기 (초)
+RECONNECT_BASE_SEC = 1.0
+RECONNECT_MAX_SEC = 60.0
+RECONNECT_JITTER = 0.5
+
+# 보관할 최근 끊김 구간 수
+GAP_HISTORY = 200
+
+
+class Backoff:
+    def __init__(self, base=RECONNECT_BASE_SEC, cap=RECONNECT_MAX_SEC, jitter=RECONNECT_JITTER, rng=None):
+        self.base = base
+        self.cap = cap
+        self.jitter = jitter
+        self.attempts = 0
+        self._rng = rng or random.Random()
+
+    def next(self) -> float:
+        """다음 재시도까지 대기 시간(초)"""
+        self.attempts += 1
+        delay = min(self.cap, self.base * (2 ** (self.attempts - 1)))
+        return delay * self._rng.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    def reset(self):
+        self.attempts = 0
+
+
+class GapMeter:
+    """
+    끊김 구간 기록 (time.time 기준)
+    - start(): 끊김 시작 (이미 끊김 중이면 무시 - 첫 시점 유지)
+    - end(): 복구, 구간 길이(초) 반환 (끊김 중이 아니면 None)
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self.down_since: Optional[float] = None
+        self.reason = None
+        self._gaps = deque(maxlen=GAP_HISTORY)
+        self.count = 0
+        self.total = 0.0
+        self.longest = 0.0
+
+    @property
+    def is_down(self) -> bool:
+        return self.down_since is not None
+
+    def start(self, reason='', at=None):
+        if self.down_since is None:
+            self.down_since = self._clock() if at is None else at
+            self.reason = reason
+
+    def end(self, at=None) -> Optional[float]:
+        if self.down_since is None:
+            return None
+        gap = max(0.0, (self._clock() if at is None else at) - self.down_since)
+        self.down_since = None
+        self._gaps.append((self.reason, gap))
+        self.count += 1
+        self.total += gap
+        self.longest = max(self.longest, gap)
+        return gap
+
+    def current(self) -> float:
+        """진행 중인 끊김 길이(초), 연결 중이면 0"""
+        return 0.0 if self.down_since is None else self._clock() - self.down_since
+
+    def stats(self) -> Dict:
+        gaps = sorted(g for _, g in self._gaps)
+        return {
+            'count': self.count,
+            'total': self.total,
+            'longest': self.longest,
+            'last': self._gaps[-1][1] if self._gaps else None,
+            'p50': percentile(gaps, 50) if gaps else None,
+            'p95': percentile(gaps, 95) if gaps else None,
+            'down_for': self.current(),
+        }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        if not s['count'] and not self.is_down:
+            return "끊김 없음"
+        text = f"끊김 {s['count']}회 / 합계 {s['total']:.1f}s / 최장 {s['longest']:.1f}s"
+        if s['count']:
+            text += f" / p50 {s['p50']:.1f}s, p95 {s['p95']:.1f}s"
+        if self.is_down:
+            text += f" / 현재 {s['down_for']:.1f}s째 끊김 ({self.reason})"
+        return text
@@ -0,0 +1,329 @@
+"""
+보유 종목 / 미체결 주문 레코드
+
+키움 REST 응답의 숫자 필드는 '0001,234', '+12300', '' 같은 문자열이라 소비자마다
+int(float(str(x).replace(',', '')))로 다시 파싱하고, 종목 하나를 찾으려고 목록 전체를 순회했습니다.
+API 계층에서 한 번만 파싱해 속성으로 붙이고 종목코드 색인을 함께 넘깁니다.
+- Holding / OrderRecord는 dict 하위 클래스라 기존 stock['rmnd_qty'] 접근은 그대로 동작
+- 알려진 키를 대입하면(stock['cur_prc'] = ...) 해당 속성도 다시 계산
+- HoldingList / OrderList는 list 하위 클래스 + 종목코드 색인 (get / has / codes)
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+
+def to_float(value, default: float = 0.0) -> float:
+    """키움 숫자 문자열 → float (콤마/부호/공백/빈 값 허용, 해석 불가 시 default)"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).replace(',', '').replace('%', '').strip()
+    if not text:
+        return default
+    try:
+        return float(text)
+    except ValueError:
+        return default
+
+
+def to_int(value, default: int = 0) -> int:
+    """키움 숫자 문자열 → int (소수점 이하 버림)"""
+    if isinstance(value, int):
+        return value
+    return int(to_float(value, default))
+
+
+def _code(value) -> str:
+    code = str(value or '')
+    return code[1:] if code.startswith('A') else code
+
+
+def _first(row, keys):
+    """keys 중 값이 비어 있지 않은 첫 필드 값"""
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+class _Record(dict):
+    """
+    파싱된 속성을 가진 dict 공통 구현
+    _FIELDS: 속성명 → (원본 키 목록, 변환 함수)
+    """
+    __slots__ = ()
+    _FIELDS = {}
+    _KEY_TO_ATTRS = {}
+
+    def __init__(self, *args, **kwargs):
+        dict.__init__(self, *args, **kwargs)
+        self._parse_all()
+
+    def _parse(self, attr):
+        keys, convert = self._FIELDS[attr]
+        object.__setattr__(self, attr, convert(_first(self, keys)))
+
+    def _parse_all(self):
+        for attr in self._FIELDS:
+            self._parse(attr)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        for attr in self._KEY_TO_ATTRS.get(key, ()):
+            self._parse(attr)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        for attr in self._KEY_TO_ATTRS.get(key, ()):
+            self._parse(attr)
+
+    def update(self, *args, **kwargs):
+        dict.update(self, *args, **kwargs)
+        self._parse_all()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, key, *default):
+        value = dict.pop(self, key, *default)
+        for attr in self._KEY_TO_ATTRS.get(key, ()):
+            self._parse(attr)
+        return value
+
+    def copy(self):
+        """같은 타입의 얕은 복사 (값이 문자열/숫자뿐이라 다시 파싱하지 않고 속성 복사)"""
+        clone = dict.__new__(type(self))
+        dict.update(clone, self)
+        for attr in self._FIELDS:
+            object.__setattr__(clone, attr, getattr(self, attr))
+        return clone
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+
+def _index_keys(fields):
+    key_to_attrs = {}
+    for attr, (keys, _) in fields.items():
+        for key in keys:
+            key_to_attrs.setdefault(key, []).append(attr)
+    return {key: tuple(attrs) for key, attrs in key_to_attrs.items()}
+
+
+class Holding(_Record):
+    """
+    kt00004 보유 종목 1건
+    - code: 'A' 제거된 종목코드, qty: 보유수량, cur_price / avg_price: 현재가 / 매입단가
+    - api_pur_amt / api_eval_amt: 응답의 매입금액 / 평가금액 (필드가 없으면 0)
+    - pur_amt / eval_amt: 위 값이 0이면 매입단가 × 수량 / 현재가 × 수량으로 대체
+    """
+    __slots__ = ('code', 'name', 'qty', 'cur_price', 'avg_price', 'api_pur_amt', 'api_eval_amt', 'pl_amt', 'pl_rate')
+    _FIELDS = {
+        'code': (('stk_cd', 'code'), _code),
+        'name': (('stk_nm', 'name'), lambda v: str(v or '')),
+        'qty': (('rmnd_qty', 'hold_qty', 'qty'), to_int),
+        'cur_price': (('cur_prc',), lambda v: abs(to_float(v))),
+        'avg_price': (('pchs_avg_pric', 'avg_prc'), lambda v: abs(to_float(v))),
+        'api_pur_amt': (('pchs_amt', 'pur_amt'), to_float),
+        'api_eval_amt': (('evlu_amt', 'evlt_amt'), to_float),
+        'pl_amt': (('pl_amt', 'evlu_pfls_amt'), to_float),
+        'pl_rate': (('pl_rt', 'prft_rt', 'pfit_rt'), to_float),
+    }
+    _KEY_TO_ATTRS = _index_keys(_FIELDS)
+
+    @property
+    def pur_amt(self) -> float:
+        return self.api_pur_amt or self.avg_price * self.qty
+
+    @property
+    def eval_amt(self) -> float:
+        return self.api_eval_amt or self.cur_price * self.qty
+
+    def apply_price(self, price) -> bool:
+        """
+        실시간 현재가 반영 (cur_prc / pl_rt / evlu_amt 갱신)
+        매입단가를 모르면 수익률을 계산할 수 없으므로 반영하지 않고 False
+        """
+        if price <= 0 or self.avg_price <= 0:
+            return False
+        self['cur_prc'] = price
+        self['pl_rt'] = f"{(price - self.avg_price) / self.avg_price * 100:.2f}"
+        self['evlu_amt'] = price * self.qty
+        return True
+
+
+class OrderRecord(_Record):
+    """ka10075 미체결 주문 1건 (parse_outstanding_orders / Mock 주문 형식)"""
+    __slots__ = ('code', 'qty', 'price', 'side', 'ord_no')
+    _FIELDS = {
+        'code': (('stk_cd', 'code'), _code),
+        'qty': (('qty',), to_int),
+        'price': (('price',), to_int),
+        'side': (('type', 'ord_tp'), lambda v: 'sell' if v in ('sell', '02') else ('buy' if v in ('buy', '01') else '')),
+        'ord_no': (('ord_no',), lambda v: str(v or '')),
+    }
+    _KEY_TO_ATTRS = _index_keys(_FIELDS)
+
+    @property
+    def is_buy(self) -> bool:
+        return self.side == 'buy'
+
+    @property
+    def is_sell(self) -> bool:
+        return self.side == 'sell'
+
+
+class _RecordList(list):
+    """종목코드 색인이 붙은 레코드 목록 (목록이 바뀌면 다음 조회 시 색인 재생성)"""
+    __slots__ = ('_index',)
+    _RECORD = _Record
+
+    def __init__(self, rows: Iterable = ()):
+        record = self._RECORD
+        list.__init__(self, (r if isinstance(r, record) else record(r) for r in rows))
+        self._index = None
+
+    def _build_index(self) -> Dict:
+        """종목코드 → 레코드 색인 (하위 클래스에서 구성, 기본은 빈 색인)"""
+        return {}
+
+    def _get_index(self) -> Dict:
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index
+
+    def _reset(self):
+        self._index = None
+
+    def append(self, row):
+        list.append(self, row if isinstance(row, self._RECORD) else self._RECORD(row))
+        self._reset()
+
+    def extend(self, rows):
+        list.extend(self, (r if isinstance(r, self._RECORD) else self._RECORD(r) for r in rows))
+        self._reset()
+
+    def insert(self, i, row):
+        list.insert(self, i, row if isinstance(row, self._RECORD) else self._RECORD(row))
+        self._reset()
+
+    def remove(self, row):
+        list.remove(self, row)
+        self._reset()
+
+    def pop(self, *args):
+        row = list.pop(self, *args)
+        self._reset()
+        return row
+
+    def clear(self):
+        list.clear(self)
+        self._reset()
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._reset()
+
+    def __setitem__(self, i, value):
+        list.__setitem__(self, i, value)
+        self._reset()
+
+    def __delitem__(self, i):
+        list.__delitem__(self, i)
+        self._reset()
+
+    def __iadd__(self, rows):
+        self.extend(rows)
+        return self
+
+    def copy(self):
+        return type(self)(r.copy() for r in self)
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __reduce__(self):
+        return type(self), ([dict(r) for r in self],)
+
+    def codes(self) -> List[str]:
+        return list(self._get_index())
+
+
+class HoldingList(_RecordList):
+    """보유 종목 목록 + 종목코드 색인"""
+    __slots__ = ()
+    _RECORD = Holding
+
+    def _build_index(self):
+        index = {}
+        for holding in self:
+            # 같은 종목이 여러 행이면 기존 선형 탐색과 같게 첫 행 사용
+            index.setdefault(holding.code, holding)
+        return index
+
+    def get(self, code: str) -> Optional[Holding]:
+        return self._get_index().get(_code(code))
+
+    def has(self, code: str) -> bool:
+        """수량이 남아 있는 보유 종목 여부"""
+        holding = self.get(code)
+        return holding is not None and holding.qty > 0
+
+    def held(self) -> 'HoldingList':
+        """보유수량 > 0 인 종목만"""
+        return HoldingList(h for h in self if h.qty > 0)
+
+    def total_pur_amt(self) -> float:
+        return sum(h.pur_amt for h in self)
+
+    def total_eval_amt(self) -> float:
+        return sum(h.eval_amt for h in self)
+
+
+class OrderList(_RecordList):
+    """미체결 주문 목록 + 종목코드별 주문 색인"""
+    __slots__ = ()
+    _RECORD = OrderRecord
+
+    def _build_index(self):
+        index = {}
+        for order in self:
+            index.setdefault(order.code, []).append(order)
+        return index
+
+    def for_code(self, code: str) -> List[OrderRecord]:
+        return self._get_index().get(_code(code), [])
+
+    def has_sell(self, code: str) -> bool:
+        return any(o.is_sell for o in self.for_code(code))
+
+    def sell_codes(self) -> set:
+        return {o.code for o in self if o.is_sell}
+
+
+def as_holdings(rows) -> Optional[HoldingList]:
+    """보유 종목 목록을 HoldingList로 (이미 HoldingList면 그대로, None은 None)"""
+    if rows is None or isinstance(rows, HoldingList):
+        return rows
+    return HoldingList(rows)
+
+
+def as_orders(rows) -> Optional[OrderList]:
+    """미체결 목록을 OrderList로 (None은 조회 실패 의미이므로 그대로)"""
+    if rows is None or isinstance(rows, OrderList):
+        return rows
+    return OrderList(rows)
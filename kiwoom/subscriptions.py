@@ -0,0 +1,154 @@
+"""
+실시간 시세 구독 관리 (REG / REMOVE 차분 전송)
+
+보유 종목이 바뀔 때마다 전체 코드 목록을 다시 등록하고 매도된 종목은 해지하지 않던 것을
+서버에 등록된 집합을 기억해 바뀐 부분만 보내는 방식으로 바꿉니다.
+- 그룹(보유 / 매수 진행 등)별로 원하는 종목과 우선순위를 set_group()으로 지정
+- sync(): 원하는 집합 중 우선순위 상위 max_codes개를 목표로, 추가분은 REG / 빠진 종목은 REMOVE (batch개씩)
+  REG는 refresh '1'(기존 등록 유지)로 보내 추가분만 전송
+- 재접속 시 reset() → sync()로 같은 집합을 그대로 다시 등록
+- 계좌 실시간(00 주문체결 / 04 잔고)은 종목이 아닌 계좌 단위라 build_account_message()로 별도 그룹에 등록
+"""
+
+import asyncio
+import itertools
+from typing import Awaitable, Callable, Dict, Iterable, List, Set
+
+# 동시에 구독할 최대 종목 수 (넘으면 우선순위 낮은 종목부터 제외)
+REALTIME_MAX_CODES = 100
+
+# REG / REMOVE 한 번에 보내는 최대 종목 수
+REALTIME_REG_BATCH = 50
+
+# 실시간 항목 (0B: 주식체결)
+REALTIME_TYPES = ('0B',)
+
+# 계좌 실시간 항목 (00: 주문체결, 04: 잔고) - 종목 시세와 다른 그룹 번호로 등록
+ACCOUNT_REAL_TYPES = ('00', '04')
+ACCOUNT_GRP_NO = '9'
+
+# 그룹 우선순위 (클수록 끝까지 유지)
+PRIORITY_HOLDING = 100
+PRIORITY_ORDER = 90
+PRIORITY_CANDIDATE = 10
+
+
+def build_message(trnm, codes, grp_no='1', types=REALTIME_TYPES):
+    """REG / REMOVE 요청 메시지 (키움 실시간 등록 형식)"""
+    message = {
+        'trnm': trnm,
+        'grp_no': grp_no,
+        'data': [{'item': list(codes), 'type': list(types)}],
+    }
+    if trnm == 'REG':
+        message['refresh'] = '1'  # 기존 등록 유지하고 추가
+    return message
+
+
+def build_account_message(grp_no=ACCOUNT_GRP_NO, types=ACCOUNT_REAL_TYPES):
+    """계좌 실시간(주문체결 / 잔고) 등록 요청 - 종목코드 자리는 빈 문자열"""
+    return build_message('REG', [''], grp_no, types)
+
+
+class SubscriptionManager:
+    """
+    서버 등록 상태를 기억하는 실시간 구독 관리자 (asyncio 단일 스레드 사용 전제)
+    - send: 메시지(dict)를 보내는 코루틴 함수 (RealTimeSearch.send_message)
+    - registered: 서버에 등록했다고 보는 종목 집합
+    """
+
+    def __init__(self, send: Callable[[Dict], Awaitable], max_codes=REALTIME_MAX_CODES,
+                 batch=REALTIME_REG_BATCH, grp_no='1', types=REALTIME_TYPES):
+        self._send = send
+        self.max_codes = max_codes
+        self.batch = batch
+        self.grp_no = grp_no
+        self.types = tuple(types)
+        self._groups: Dict[str, Dict[str, int]] = {}
+        self._order: Dict[str, int] = {}  # 처음 원한 순서 (같은 우선순위면 먼저 들어온 종목 유지)
+        self._seq = itertools.count()
+        self.registered: Set[str] = set()
+        self._lock = asyncio.Lock()
+        self.excluded = 0  # 원하지만 한도 때문에 구독하지 못한 종목 수 (마지막 sync 기준)
+        self.counters = {'messages': 0, 'added': 0, 'removed': 0, 'evicted': 0, 'resubscribed': 0}
+
+    # ==================== 원하는 집합 ====================
+
+    def set_group(self, name, codes: Iterable[str], priority=PRIORITY_HOLDING):
+        """그룹의 종목 목록을 통째로 교체 ('A' 접두어 제거)"""
+        group = {}
+        for code in codes or ():
+            code = str(code)
+            if code.startswith('A'):
+                code = code[1:]
+            if code:
+                group[code] = priority
+                if code not in self._order:
+                    self._order[code] = next(self._seq)
+        self._groups[name] = group
+
+    def desired(self) -> Dict[str, int]:
+        """종목별 최고 우선순위"""
+        merged = {}
+        for group in self._groups.values():
+            for code, priority in group.items():
+                if merged.get(code, -1) < priority:
+                    merged[code] = priority
+        return merged
+
+    def target(self) -> List[str]:
+        """구독할 종목 (우선순위 → 이미 등록 여부 → 먼저 원한 순서, 상위 max_codes개)"""
+        desired = self.desired()
+        registered, order = self.registered, self._order
+        ranked = sorted(desired, key=lambda c: (-desired[c], c not in registered, order.get(c, 0)))
+        return ranked[:self.max_codes]
+
+    # ==================== 전송 ====================
+
+    async def sync(self):
+        """목표 집합과 등록 집합의 차이만 REMOVE / REG로 전송, (추가 수, 해지 수) 반환"""
+        async with self._lock:
+            desired = self.desired()
+            target = set(self.target())
+            adds = sorted(target - self.registered, key=lambda c: self._order.get(c, 0))
+            removes = sorted(self.registered - target)
+            self.excluded = len(desired) - len(target)
+            # 등록돼 있었지만 우선순위에 밀려 해지되는 종목
+            self.counters['evicted'] += sum(1 for code in removes if code in desired)
+
+            for chunk in self._chunks(removes):
+                await self._send(build_message('REMOVE', chunk, self.grp_no, self.types))
+                self.registered.difference_update(chunk)
+                self.counters['messages'] += 1
+                self.counters['removed'] += len(chunk)
+            for chunk in self._chunks(adds):
+                await self._send(build_message('REG', chunk, self.grp_no, self.types))
+                self.registered.update(chunk)
+                self.counters['messages'] += 1
+                self.counters['added'] += len(chunk)
+
+            # 원하는 종목이 하나도 없으면 등록 정보도 남기지 않음
+            for code in list(self._order):
+                if code not in desired:
+                    del self._order[code]
+            return len(adds), len(removes)
+
+    def reset(self):
+        """연결이 끊겨 서버 등록 상태가 사라졌을 때 호출 (다음 sync에서 목표 전체를 다시 등록)"""
+        if self.registered:
+            self.counters['resubscribed'] += 1
+        self.registered = set()
+
+    async def resubscribe(self):
+        """재접속 후 같은 집합 재등록"""
+        self.reset()
+        return await self.sync()
+
+    def _chunks(self, codes):
+        for i in range(0, len(codes), self.batch):
+            yield codes[i:i + self.batch]
+
+    def format_stats(self) -> str:
+        c = self.counters
+        return (f"등록 {len(self.registered)}/{self.max_codes} / 전송 {c['messages']}회 "
+                f"(추가 {c['added']}, 해지 {c['removed']}, 밀려난 종목 {c['evicted']}, 재등록 {c['resubscribed']}) / 한도 제외 {self.excluded}")
@@ -7,92 +7,152 @@
 from typing import List, Dict, Tuple, Optional
 import json
 import os
+import time
 from kiwoom.factory import create_kiwoom_api
 from logger import logger
 import config
 
 from config import socket_url
-from logger import logger
 
 # ========== 전역 상태 및 API 인스턴스 관리 ==========
 
-# 전역 설정 추적
+# 비동기 경로에서 발급한 접근토큰 재사용 시간(초) - 지나면 다시 발급
+ASYNC_TOKEN_TTL_SEC = 3600.0
+
+# 설정 재확인 최대 주기(초)
+# 같은 프로세스의 설정 저장은 즉시 반영되고, 다른 프로세스(web_server 등)의 변경은 이 주기 안에 반영됨
+API_SETTINGS_CHECK_INTERVAL = 1.0
+
+# API 인스턴스를 결정하는 설정 키 (하나라도 바뀌면 config 리로드 후 인스턴스 재생성)
+API_SETTING_KEYS = (
+    ('use_mock_server', False),
+    ('is_paper_trading', True),
+    ('my_account', None),
+    ('real_app_key', None),
+    ('real_app_secret', None),
+    ('paper_app_key', None),
+    ('paper_app_secret', None),
+)
+
+# 활성 API 상태 (설정 지문 기준으로 유지)
 _api_instance = None
-_last_mock_setting = None
-_last_paper_setting = None
-_last_account = None
-_last_real_key = None
-_last_real_secret = None
-_last_paper_key = None
-_last_paper_secret = None
+_api_fingerprint = None       # API_SETTING_KEYS 값 튜플
+_api_settings_version = None  # 마지막으로 확인한 settings_version
+_api_checked_at = 0.0         # 마지막 확인 시각 (monotonic)
+_api_mode = None              # get_current_api_mode() 결과 ('Mock' / 'Paper' / 'Real')
+_buy_accepts_source = False   # buy_stock(source=...) 지원 여부
+_async_api = None             # get_active_async_api() 인스턴스
+_async_api_source = None      # _async_api를 만들 때 기준이 된 동기 인스턴스 (바뀌면 재생성)
+_async_token_cache = None     # (발급한 비동기 인스턴스, 토큰, 발급 시각 monotonic)
+
+
+def _on_settings_changed():
+    """같은 프로세스에서 설정 저장 시 다음 호출에서 즉시 재확인"""
+    global _api_checked_at
+    _api_checked_at = 0.0
+
+
+def _read_api_settings():
+    """설정 지문 생성 ([Fix] 타입 차이(bool vs str)로 인한 무한 리부트 방지를 위해 str 대문자로 정규화)"""
+    from database_helpers import get_setting
+    return tuple(str(get_setting(key, default)).upper() for key, default in API_SETTING_KEYS)
+
+
+def _build_api(fingerprint):
+    """지문에 맞는 API 인스턴스 생성 및 파생 정보(모드, 매수 파라미터) 캐시"""
+    global _api_instance, _api_fingerprint, _api_mode, _buy_accepts_source
+    from database_helpers import get_setting
+
+    use_mock = get_setting('use_mock_server', False)
+    api = create_kiwoom_api(use_mock)
+
+    # 클래스 이름으로 모드 판별 (Kiwoom API인 경우 PaperTrading 여부 확인)
+    if "Mock" in api.__class__.__name__:
+        mode = "Mock"
+    elif get_setting('is_paper_trading', True):
+        mode = "Paper"
+    else:
+        mode = "Real"
+
+    # buy_stock 메서드가 source를 지원하는지 확인 (안전장치, 인스턴스당 1회)
+    import inspect
+    try:
+        accepts_source = 'source' in inspect.signature(api.buy_stock).parameters
+    except (TypeError, ValueError):
+        accepts_source = False
+
+    _api_instance = api
+    _api_fingerprint = fingerprint
+    _api_mode = mode
+    _buy_accepts_source = accepts_source
+    return api
+
 
 def get_api():
     """API 인스턴스 가져오기 (설정 변경 감지 및 자동 스위칭)"""
     return get_active_api()
 
 def get_active_api():
-    """API 인스턴스 가져오기 (실제 동작 로직)"""
-    global _api_instance, _last_mock_setting, _last_paper_setting, _last_account, \
-           _last_real_key, _last_real_secret, _last_paper_key, _last_paper_secret
-    
-    # 1. DB에서 실시간 상태 확인
+    """
+    API 인스턴스 가져오기 (실제 동작 로직)
+    - 평소에는 캐시된 인스턴스를 그대로 반환 (DB 조회 없음)
+    - API_SETTINGS_CHECK_INTERVAL마다 settings_version만 확인하고, 바뀐 경우에만 설정 지문 재계산
+    """
+    global _api_settings_version, _api_checked_at
+
+    now = time.monotonic()
+    if _api_instance is not None and now - _api_checked_at < API_SETTINGS_CHECK_INTERVAL:
+        return _api_instance
+
+    # 1. 설정 버전 확인 (변경 없으면 인스턴스 유지)
     try:
-        from database_helpers import get_setting
-        current_mock_setting = get_setting('use_mock_server', False)
-        current_paper_setting = get_setting('is_paper_trading', True)
-        current_account = get_setting('my_account', None)
-        
-        # [NEW] 키 변경 감지 추가
-        current_real_key = get_setting('real_app_key', None)
-        current_real_secret = get_setting('real_app_secret', None)
-        current_paper_key = get_setting('paper_app_key', None)
-        current_paper_secret = get_setting('paper_app_secret', None)
-    except:
-        current_mock_setting = True
-        current_paper_setting = True
-        current_account = None
-        current_real_key = current_real_secret = current_paper_key = current_paper_secret = None
-        
-    # 2. 설정이 하나라도 바뀌었으면 기존 인스턴스 파기 및 config 리로드
-    # [Fix] 타입 차이(bool vs str)로 인한 무한 리부트 방지를 위해 str() 변환 후 비교
-    has_changed = False
-    if _last_mock_setting is not None and str(_last_mock_setting).upper() != str(current_mock_setting).upper(): has_changed = True
-    if _last_paper_setting is not None and str(_last_paper_setting).upper() != str(current_paper_setting).upper(): has_changed = True
-    if _last_account is not None and str(_last_account) != str(current_account): has_changed = True
-    
-    # 키 변경 감지
-    if _last_real_key is not None and str(_last_real_key) != str(current_real_key): has_changed = True
-    if _last_real_secret is not None and str(_last_real_secret) != str(current_real_secret): has_changed = True
-    
-    if has_changed:
-        mode_str = "MOCK" if current_mock_setting else "REAL"
-        acc_str = "모의" if current_paper_setting else "실전"
+        from database_helpers import get_settings_version, add_settings_listener
+        add_settings_listener(_on_settings_changed)
+        version = get_settings_version()
+    except Exception:
+        version = None
+
+    if _api_instance is not None and version is not None and version == _api_settings_version:
+        _api_checked_at = now
+        return _api_instance
+
+    # 2. DB에서 실시간 설정 지문 계산
+    try:
+        fingerprint = _read_api_settings()
+    except Exception:
+        fingerprint = None
+
+    if _api_instance is not None:
+        if fingerprint is None or fingerprint == _api_fingerprint:
+            _api_settings_version = version
+            _api_checked_at = now
+            return _api_instance
+
+        # 3. 설정이 하나라도 바뀌었으면 기존 인스턴스 파기 및 config 리로드
+        current = dict(zip((key for key, _ in API_SETTING_KEYS), fingerprint))
+        mode_str = "MOCK" if current['use_mock_server'] == 'TRUE' else "REAL"
+        acc_str = "모의" if current['is_paper_trading'] == 'TRUE' else "실전"
         logger.warning(f"🔄 환경/키 변경 감지: [{acc_str} 계좌 + {mode_str} API] 설정을 리로드합니다.")
-        
+
         # 키값 및 URL도 바뀌어야 하므로 config 모듈 강제 리로드
         import importlib
         importlib.reload(config)
-        
+
         reset_api()
-    
-    # 3. 인스턴스 생성 또는 반환
-    if _api_instance is None:
-        _last_mock_setting = current_mock_setting
-        _last_paper_setting = current_paper_setting
-        _last_account = current_account
-        _last_real_key = current_real_key
-        _last_real_secret = current_real_secret
-        _last_paper_key = current_paper_key
-        _last_paper_secret = current_paper_secret
-        _api_instance = create_kiwoom_api(current_mock_setting)
-        
+
+    # 4. 인스턴스 생성
+    _build_api(fingerprint)
+    _api_settings_version = version
+    _api_checked_at = now
     return _api_instance
 
 
 def reset_api():
     """API 인스턴스 재설정 (설정 변경 시 사용)"""
-    global _api_instance
+    global _api_instance, _api_checked_at, _async_token_cache
     _api_instance = None
+    _api_checked_at = 0.0
+    _async_token_cache = None
     logger.info("API 인스턴스가 재설정되었습니다")
 
 
@@ -138,10 +198,8 @@ def fn_kt10000(stk_cd, ord_qty, ord_uv, cont_yn='N', next_key='', token=None, so
     
     api = get_api()
     # [Single Logic] Mock/Real 모두 source 정보를 전달하도록 통일
-    # buy_stock 메서드가 source를 지원하는지 확인 (안전장치)
-    import inspect
-    sig = inspect.signature(api.buy_stock)
-    if 'source' in sig.parameters:
+    # buy_stock의 source 지원 여부는 인스턴스 생성 시 1회 확인 (_build_api)
+    if _buy_accepts_source:
         return api.buy_stock(stk_cd, ord_qty, ord_uv, token, source=source)
             
     return api.buy_stock(stk_cd, ord_qty, ord_uv, token)
@@ -180,18 +238,9 @@ def get_current_price(stk_cd: str, token=None) -> Optional[int]:
 
 
 def get_current_api_mode() -> str:
-    """현재 API 모드 반환 ('Mock', 'Paper', 또는 'Real')"""
-    api = get_api()
-    # 클래스 이름으로 확인
-    class_name = api.__class__.__name__
-    if "Mock" in class_name:
-        return "Mock"
-    else:
-        # Kiwoom API인 경우 PaperTrading 여부 확인
-        from database_helpers import get_setting
-        if get_setting('is_paper_trading', True):
-            return "Paper"
-        return "Real"
+    """현재 API 모드 반환 ('Mock', 'Paper', 또는 'Real', 인스턴스 생성 시 결정된 값)"""
+    get_active_api()
+    return _api_mode
 
 
 def fn_opw00007(token=None) -> List[Dict]:
@@ -221,6 +270,74 @@ def fn_kt00007(token=None) -> List[Dict]:
         return []
 
 
+# ========== 비동기 API (이벤트 루프 전용) ==========
+
+def get_active_async_api():
+    """
+    AsyncKiwoomAPI 인스턴스 가져오기
+    - 설정 변경 감지는 get_active_api()와 공유 (동기 인스턴스가 바뀌면 함께 재생성)
+    - Mock은 같은 Mock 인스턴스를 스레드 풀에서 실행, Real/Paper는 aiohttp 기반 구현
+    """
+    global _async_api, _async_api_source
+    api = get_active_api()
+    if _async_api is None or _async_api_source is not api:
+        from kiwoom.base_api import ExecutorAsyncKiwoomAPI
+        if _api_mode == "Mock":
+            _async_api = ExecutorAsyncKiwoomAPI(api)
+        else:
+            _async_api = create_kiwoom_api(False, use_async=True)
+        _async_api_source = api
+    return _async_api
+
+
+async def _async_token(api, token):
+    """토큰을 넘기지 않은 호출은 ASYNC_TOKEN_TTL_SEC 동안 같은 인스턴스에서 발급한 토큰 재사용 (호출마다 발급하지 않음)"""
+    global _async_token_cache
+    if token is not None:
+        return token
+    cached = _async_token_cache
+    now = time.monotonic()
+    if cached is not None and cached[0] is api and now - cached[2] < ASYNC_TOKEN_TTL_SEC:
+        return cached[1]
+    token = await api.get_token()
+    if token:
+        _async_token_cache = (api, token, now)
+    return token
+
+
+async def async_get_balance(token=None) -> Tuple[int, int, int]:
+    """예수금상세현황 (await 버전, fn_kt00001과 동일한 반환)"""
+    api = get_active_async_api()
+    return await api.get_balance(await _async_token(api, token))
+
+
+async def async_get_account_data(token=None) -> Tuple[List[Dict], Dict]:
+    """계좌평가현황 (await 버전, get_account_data와 동일한 반환)"""
+    api = get_active_async_api()
+    return await api.get_account_data(await _async_token(api, token))
+
+
+async def async_get_outstanding_orders(token=None) -> List[Dict]:
+    """미체결 조회 (await 버전)"""
+    api = get_active_async_api()
+    return await api.get_outstanding_orders(await _async_token(api, token))
+
+
+async def async_buy_stock(stk_cd, ord_qty, ord_uv, token=None, source='Search') -> Tuple[str, str]:
+    """주식 매수주문 (await 버전, fn_kt10000과 동일한 반환)"""
+    api = get_active_async_api()
+    token = await _async_token(api, token)
+    if _buy_accepts_source:
+        return await api.buy_stock(stk_cd, ord_qty, ord_uv, token, source=source)
+    return await api.buy_stock(stk_cd, ord_qty, ord_uv, token)
+
+
+async def async_sell_stock(stk_cd, ord_qty, token=None) -> Tuple[str, str]:
+    """주식 매도주문 (await 버전, fn_kt10001과 동일한 반환)"""
+    api = get_active_async_api()
+    return await api.sell_stock(stk_cd, ord_qty, await _async_token(api, token))
+
+
 # ========== Mock 전용 테스트 함수 ==========
 
 def mock_reset_account(initial_cash: int = 10000000):
@@ -0,0 +1,417 @@
+"""
+키움 REST 로컬 대역 서버 (녹화 / 재생)
+
+MockKiwoomAPI는 HTTP 계층을 거치지 않으므로 연결 재사용, 재시도, 타임아웃, 호출 제한(1700) 처리는
+실서버에서만 확인할 수 있었습니다. 이 서버는 키움 REST 엔드포인트를 로컬에서 흉내 내어
+RealKiwoomAPI / AsyncRealKiwoomAPI를 네트워크 없이 그대로 호출하고 부하/지연 측정을 할 수 있게 합니다.
+- 재생: 녹화된 응답(fixtures 디렉터리의 <api-id>.json)을 돌려주고, 없으면 내장 기본 응답 사용
+- 지연: 요청마다 latency ± jitter(ms) 만큼 늦게 응답
+- 호출 제한: 초당 요청 수(max_rps) 초과 또는 확률(throttle)로 1700 응답 주입
+- 연속조회: 여러 페이지 응답은 cont-yn / next-key 헤더로 나눠서 전달
+- 녹화: upstream(실서버)으로 요청을 전달하고 요청/응답 쌍을 fixtures에 저장 (appkey/secretkey는 저장하지 않음)
+
+사용법:
+  python kiwoom_standin_server.py                                  # 내장 기본 응답 (127.0.0.1:8089)
+  python kiwoom_standin_server.py --latency 30 --jitter 10 --max-rps 5 --throttle 0.02
+  python kiwoom_standin_server.py --record https://mockapi.kiwoom.com --fixtures standin_fixtures
+  봇/스크립트를 대역 서버로 보내려면 설정 api_host_override = http://127.0.0.1:8089
+  통계: GET /_standin/stats
+"""
+import os
+import json
+import time
+import random
+import argparse
+import datetime
+import itertools
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8089
+
+# 경로 → 토큰 요청 / api-id 헤더로 TR 구분
+TOKEN_PATH = '/oauth2/token'
+TOKEN_API_ID = 'au10001'
+STATS_PATH = '/_standin/stats'
+
+# 녹화 시 저장하지 않는 요청 필드 (인증 정보)
+SECRET_FIELDS = ('appkey', 'secretkey')
+
+# 연속조회 기본 응답의 페이지당 행 수
+PAGE_ROWS = 300
+
+THROTTLE_BODY = {'return_code': 5, 'return_msg': '허용된 요청 개수를 초과하였습니다[1700:standin]'}
+
+
+def _ok(**fields):
+    body = {'return_code': 0, 'return_msg': '정상적으로 처리되었습니다'}
+    body.update(fields)
+    return body
+
+
+def _amt(value, width=15):
+    """키움 형식 0 채움 숫자 문자열"""
+    return f"{int(value):0{width}d}"
+
+
+# ========== 내장 기본 응답 (fixture가 없을 때) ==========
+
+DEFAULT_HOLDINGS = (
+    # 종목코드, 종목명, 수량, 매입단가, 현재가
+    ('005930', '삼성전자', 10, 70000, 71200),
+    ('000660', 'SK하이닉스', 3, 180000, 176500),
+)
+
+
+def _default_token(body, seq):
+    expires = (datetime.datetime.now() + datetime.timedelta(hours=24)).strftime('%Y%m%d%H%M%S')
+    return [_ok(token=f'STANDIN-TOKEN-{seq:06d}', token_type='bearer', expires_dt=expires)]
+
+
+def _default_balance(body, seq):
+    return [_ok(entr=_amt(10000000), dnca_tot_amt=_amt(10000000), d2_entra=_amt(10000000),
+                ord_alow_amt=_amt(10000000), pymn_alow_amt=_amt(10000000),
+                tot_evlu_amt=_amt(sum(q * c for _, _, q, _, c in DEFAULT_HOLDINGS)))]
+
+
+def _default_account(body, seq):
+    rows = []
+    for code, name, qty, avg, cur in DEFAULT_HOLDINGS:
+        pur, evlu = qty * avg, qty * cur
+        rows.append({
+            'stk_cd': f'A{code}', 'stk_nm': name, 'rmnd_qty': _amt(qty, 12),
+            'pchs_avg_pric': _amt(avg, 12), 'cur_prc': _amt(cur, 12),
+            'pchs_amt': _amt(pur), 'evlu_amt': _amt(evlu), 'pl_amt': str(evlu - pur),
+            'pl_rt': f"{(evlu - pur) / pur * 100:.2f}",
+        })
+    total_pur = sum(q * a for _, _, q, a, _ in DEFAULT_HOLDINGS)
+    total_eval = sum(q * c for _, _, q, _, c in DEFAULT_HOLDINGS)
+    return [_ok(acnt_nm='STANDIN', entr=_amt(10000000), d2_entra=_amt(10000000),
+                tot_est_amt=_amt(total_eval), aset_evlt_amt=_amt(total_eval + 10000000),
+                tot_pur_amt=_amt(total_pur), prsm_dpst_aset_amt=_amt(total_eval + 10000000),
+                tdy_lspft_amt=_amt(0), stk_acnt_evlt_prst=rows)]
+
+
+def _default_outstanding(body, seq):
+    return [_ok(oso=[])]
+
+
+def _default_quote(body, seq):
+    return [_ok(sel_fpr_bid='+71300', buy_fpr_bid='+71200', bid_req_base_tm=time.strftime('%H%M%S'))]
+
+
+def _default_stock_info(body, seq):
+    names = {code: name for code, name, _, _, _ in DEFAULT_HOLDINGS}
+    code = str(body.get('stk_cd', ''))
+    return [_ok(stk_cd=code, stk_nm=names.get(code, f'STANDIN{code}'), cur_prc='+71200')]
+
+
+def _default_order(body, seq):
+    return [_ok(ord_no=_amt(seq, 7), dmst_stex_tp=body.get('dmst_stex_tp', 'KRX'))]
+
+
+def _default_minute_chart(body, seq, pages=3):
+    """최신 → 과거 순 1분봉 (PAGE_ROWS 행씩 pages 페이지)"""
+    now = datetime.datetime.now().replace(second=0, microsecond=0)
+    price = 71200
+    result = []
+    for page in range(pages):
+        rows = []
+        for i in range(PAGE_ROWS):
+            ts = now - datetime.timedelta(minutes=page * PAGE_ROWS + i)
+            rows.append({
+                'cntr_tm': ts.strftime('%Y%m%d%H%M%S'), 'cur_prc': f'+{price}',
+                'open_pric': f'+{price - 100}', 'high_pric': f'+{price + 100}',
+                'low_pric': f'+{price - 200}', 'trde_qty': str(1000 + i),
+            })
+        result.append(_ok(stk_cd=body.get('stk_cd', ''), stk_min_pole_chart_qry=rows))
+    return result
+
+
+DEFAULT_RESPONSES = {
+    TOKEN_API_ID: _default_token,
+    'kt00001': _default_balance,
+    'kt00004': _default_account,
+    'ka10075': _default_outstanding,
+    'ka10004': _default_quote,
+    'ka10001': _default_stock_info,
+    'kt10000': _default_order,
+    'kt10001': _default_order,
+    'kt10002': _default_order,
+    'kt10003': _default_order,
+    'ka10080': _default_minute_chart,
+}
+
+
+# ========== 녹화 응답 저장소 ==========
+
+def _strip_secrets(body):
+    return {k: v for k, v in (body or {}).items() if k not in SECRET_FIELDS}
+
+
+class FixtureStore:
+    """
+    <directory>/<api-id>.json 파일 형식:
+      {"responses": [{"match": {요청 필드 부분집합}, "pages": [{"headers": {...}, "body": {...}}, ...]}, ...]}
+    요청 본문이 match를 모두 포함하는 첫 항목을 사용 (match가 비어 있으면 모든 요청에 해당)
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._cache = {}   # api_id -> (mtime, entries)
+
+    def _path(self, api_id):
+        return os.path.join(self.directory, f'{api_id}.json')
+
+    def _load(self, api_id):
+        path = self._path(api_id)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return []
+        cached = self._cache.get(api_id)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('responses', [])
+        self._cache[api_id] = (mtime, entries)
+        return entries
+
+    def find(self, api_id, body):
+        """요청에 맞는 페이지 목록 (없으면 None)"""
+        if not self.directory:
+            return None
+        with self._lock:
+            entries = self._load(api_id)
+        for entry in entries:
+            match = entry.get('match') or {}
+            if all(body.get(k) == v for k, v in match.items()):
+                return entry.get('pages') or None
+        return None
+
+    def record(self, api_id, body, headers, response_body, continued):
+        """
+        녹화 (continued=False면 같은 match 항목을 새 첫 페이지로 교체, True면 마지막 페이지 뒤에 추가)
+        """
+        match = _strip_secrets(body)
+        page = {'headers': headers, 'body': response_body}
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = [dict(e) for e in self._load(api_id)]
+            for entry in entries:
+                if entry.get('match') == match:
+                    entry['pages'] = entry.get('pages', []) + [page] if continued else [page]
+                    break
+            else:
+                entries.append({'match': match, 'pages': [page]})
+            path = self._path(api_id)
+            tmp = path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'responses': entries}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, path)
+            self._cache.pop(api_id, None)
+
+
+# ========== 서버 ==========
+
+class KiwoomStandin:
+    """
+    대역 서버 본체 (스레드 서버)
+    - start(): 백그라운드 스레드로 실행 후 self 반환 (url 속성으로 접속 주소 확인)
+    - configure(): 실행 중 지연 / 호출 제한 조건 변경
+    """
+
+    def __init__(self, fixtures_dir=None, latency_ms=0.0, jitter_ms=0.0, throttle=0.0, max_rps=0,
+                 record_upstream=None, host='127.0.0.1', port=DEFAULT_PORT, seed=None):
+        self.fixtures = FixtureStore(fixtures_dir)
+        self.record_upstream = record_upstream.rstrip('/') if record_upstream else None
+        if self.record_upstream and not fixtures_dir:
+            raise ValueError('녹화 모드에는 fixtures 디렉터리가 필요합니다')
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle = throttle
+        self.max_rps = max_rps
+        self._random = random.Random(seed)
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._recent = deque()   # max_rps 판정용 최근 1초 요청 시각
+        self.stats = {'requests': 0, 'throttled': 0, 'by_api': {}}
+        self._server = ThreadingHTTPServer((host, port), _StandinHandler)
+        self._server.daemon_threads = True
+        self._server.standin = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def configure(self, latency_ms=None, jitter_ms=None, throttle=None, max_rps=None):
+        if latency_ms is not None: self.latency_ms = latency_ms
+        if jitter_ms is not None: self.jitter_ms = jitter_ms
+        if throttle is not None: self.throttle = throttle
+        if max_rps is not None: self.max_rps = max_rps
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _delay(self):
+        delay = self.latency_ms
+        if self.jitter_ms:
+            delay += self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _should_throttle(self):
+        """초당 요청 한도 초과 또는 확률 주입 여부 (한도 초과 요청은 카운트하지 않음, 실서버와 동일)"""
+        with self._lock:
+            now = time.monotonic()
+            if self.max_rps:
+                while self._recent and now - self._recent[0] >= 1.0:
+                    self._recent.popleft()
+                if len(self._recent) >= self.max_rps:
+                    return True
+            if self.throttle and self._random.random() < self.throttle:
+                return True
+            self._recent.append(now)
+            return False
+
+    def _count(self, api_id, throttled):
+        with self._lock:
+            self.stats['requests'] += 1
+            api = self.stats['by_api'].setdefault(api_id, {'requests': 0, 'throttled': 0})
+            api['requests'] += 1
+            if throttled:
+                self.stats['throttled'] += 1
+                api['throttled'] += 1
+
+    def handle(self, path, headers, body):
+        """요청 1건 처리 → (HTTP 상태, 응답 헤더 dict, 응답 JSON)"""
+        api_id = TOKEN_API_ID if path == TOKEN_PATH else headers.get('api-id', '')
+        self._delay()
+
+        if api_id != TOKEN_API_ID and self._should_throttle():
+            self._count(api_id, True)
+            return 200, {'api-id': api_id}, dict(THROTTLE_BODY)
+        self._count(api_id, False)
+
+        if self.record_upstream:
+            return self._forward(path, headers, body, api_id)
+
+        pages = self.fixtures.find(api_id, body)
+        if pages is not None:
+            pages = [p.get('body', {}) for p in pages]
+        elif api_id in DEFAULT_RESPONSES:
+            pages = DEFAULT_RESPONSES[api_id](body, next(self._seq))
+        else:
+            return 200, {'api-id': api_id}, {'return_code': 2, 'return_msg': f'[standin] {api_id or path} 응답 없음'}
+
+        # 재생 시 next-key는 페이지 번호
+        try:
+            index = int(headers.get('next-key') or 0) if headers.get('cont-yn') == 'Y' else 0
+        except ValueError:
+            index = 0
+        index = min(index, len(pages) - 1)
+        more = index + 1 < len(pages)
+        response_headers = {'api-id': api_id, 'cont-yn': 'Y' if more else 'N', 'next-key': str(index + 1) if more else ''}
+        return 200, response_headers, pages[index]
+
+    def _forward(self, path, headers, body, api_id):
+        """녹화 모드: upstream으로 전달 후 응답 저장"""
+        # 호출 제한기/재시도 정책을 그대로 적용하기 위해 공용 세션 사용
+        from kiwoom.http_session import post as http_post
+        from kiwoom.rate_limiter import is_rate_limited
+
+        forward_headers = {k: v for k, v in headers.items() if k.lower() in ('content-type', 'authorization', 'api-id', 'cont-yn', 'next-key', 'cano')}
+        response = http_post(self.record_upstream + path, headers=forward_headers, json=body)
+        try:
+            data = response.json()
+        except ValueError:
+            return response.status_code, {}, {'return_code': -1, 'return_msg': response.text[:200]}
+        page_headers = {k: response.headers[k] for k in ('api-id', 'cont-yn', 'next-key') if k in response.headers}
+        if response.status_code == 200 and not is_rate_limited(data):
+            continued = headers.get('cont-yn') == 'Y'
+            # 발급된 실제 토큰은 파일에 남기지 않음
+            saved = dict(data, token='STANDIN-RECORDED-TOKEN') if api_id == TOKEN_API_ID else data
+            self.fixtures.record(api_id, body, page_headers, saved, continued)
+        return response.status_code, page_headers, data
+
+
+class _StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive 지원 (연결 재사용 경로 검증)
+    disable_nagle_algorithm = True
+
+    def _send(self, status, headers, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length) if length else b''
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        try:
+            status, response_headers, payload = self.server.standin.handle(self.path, headers, body)
+        except Exception as e:
+            status, response_headers, payload = 500, {}, {'return_code': -1, 'return_msg': f'[standin] {e}'}
+        self._send(status, response_headers, payload)
+
+    def do_GET(self):
+        if self.path == STATS_PATH:
+            self._send(200, {}, self.server.standin.stats)
+        else:
+            self._send(404, {}, {'return_code': -1, 'return_msg': 'not found'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='키움 REST 로컬 대역 서버 (녹화/재생)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--fixtures', default=None, help='녹화 응답 디렉터리 (<api-id>.json)')
+    parser.add_argument('--latency', type=float, default=0.0, help='응답 지연 (ms)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='지연 편차 ± (ms)')
+    parser.add_argument('--throttle', type=float, default=0.0, help='1700 응답 주입 확률 (0~1)')
+    parser.add_argument('--max-rps', type=int, default=0, help='초당 요청 한도 (초과 시 1700, 0이면 무제한)')
+    parser.add_argument('--record', default=None, help='녹화 모드: 요청을 전달할 실서버 주소')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    standin = KiwoomStandin(fixtures_dir=args.fixtures, latency_ms=args.latency, jitter_ms=args.jitter,
+                            throttle=args.throttle, max_rps=args.max_rps, record_upstream=args.record,
+                            host=args.host, port=args.port, seed=args.seed)
+    mode = f"녹화 → {args.record}" if args.record else f"재생 ({args.fixtures or '내장 기본 응답'})"
+    print(f"🧪 키움 대역 서버 {standin.url} | {mode} | 지연 {args.latency}±{args.jitter}ms | "
+          f"한도 {args.max_rps or '-'}rps | 1700 주입 {args.throttle:.0%}")
+    try:
+        standin.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"📊 {json.dumps(standin.stats, ensure_ascii=False)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,7 +11,7 @@ import os
 import json
 from datetime import datetime
 from logger import logger
-from database_helpers import add_web_command
+from database_helpers import add_web_command, get_day_range
 from tel_send import tel_send
 
 DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trading.db')
@@ -23,16 +23,16 @@ def learn_from_today_data():
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        today = datetime.now().strftime('%Y-%m-%d')
+        today, tomorrow = get_day_range()
         logger.info(f"🤖 LASTTRADE AI 학습 시작 (학습 데이터: {today})")
         logger.info("📡 [대원칙] WATER 전략 및 1:1:2:4:8 수열 기반 가중치 분석")
         
         # 1. 당일 거래 데이터 수집
         cursor.execute("""
             SELECT * FROM trades 
-            WHERE DATE(timestamp) = ?
+            WHERE timestamp >= ? AND timestamp < ?
             ORDER BY timestamp
-        """, (today,))
+        """, (today, tomorrow))
         trades = cursor.fetchall()
         logger.info(f"  📊 당일 거래: {len(trades)}건")
         
@@ -49,8 +49,8 @@ def learn_from_today_data():
             SELECT s.*, r.* 
             FROM signal_snapshots s
             LEFT JOIN response_metrics r ON s.id = r.signal_id
-            WHERE DATE(s.timestamp) = ?
-        """, (today,))
+            WHERE s.timestamp >= ? AND s.timestamp < ?
+        """, (today, tomorrow))
         signals = cursor.fetchall()
         logger.info(f"  📊 당일 시그널: {len(signals)}건")
         
@@ -58,9 +58,9 @@ def learn_from_today_data():
         cursor.execute("""
             SELECT code, COUNT(*) as candle_count
             FROM candle_history
-            WHERE DATE(timestamp) = ?
+            WHERE timestamp >= ? AND timestamp < ?
             GROUP BY code
-        """, (today,))
+        """, (today, tomorrow))
         candles = cursor.fetchall()
         logger.info(f"  📊 당일 분봉: {len(candles)}개 종목")
         
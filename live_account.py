@@ -0,0 +1,263 @@
+"""
+실시간 계좌 상태 (웹소켓 주문체결 / 잔고 이벤트로 갱신하는 보유 종목 + 미체결 주문)
+
+체결 여부는 메인 루프가 매 주기 kt00004 / kt00001 / 미체결을 다시 조회해 직전 잔고와 비교하는 방식으로만 알 수 있었습니다.
+웹소켓 계좌 실시간(00 주문체결 / 04 잔고)을 받으면 체결 즉시 메모리 잔고를 고치고,
+REST 조회는 reconcile_sec마다 한 번 맞춰 보는 용도로만 사용합니다.
+- reconcile(): REST 조회 결과를 기준 상태로 저장 (최근 실시간 이벤트가 있던 종목 / 주문은 REST 반영 지연으로 보고 실시간 값 유지)
+- apply(): 계좌 이벤트 반영, 새로 체결된 Fill 목록 반환 (주문번호별 누적 체결량 차이로 계산해 같은 체결을 두 번 세지 않음)
+- view(): 마지막 REST 결과에 실시간 수량 / 평단 / 미체결 / 체결 대금을 덮어쓴 (보유 종목, 요약, 잔고, 미체결)
+- needs_rest(): 실시간 연결이 끊겼거나, 맞춘 지 reconcile_sec가 지났거나, 응답 받은 주문의 체결 이벤트가 오지 않으면 True
+"""
+import time
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional
+
+from kiwoom.realtime import OrderExecution, BalanceUpdate
+from kiwoom.records import Holding, HoldingList, OrderRecord, OrderList
+
+# 실시간 체결이 살아 있을 때 REST 잔고 조회로 맞춰 보는 간격(초)
+ACCOUNT_RECONCILE_SEC = 30.0
+
+# 이 시간 안에 실시간 이벤트가 있던 종목 / 주문은 REST 결과보다 실시간 값을 믿음 (REST 반영 지연)
+LIVE_EVENT_GRACE_SEC = 5.0
+
+# 주문 응답 후 이 시간 안에 해당 종목 체결 이벤트가 없으면 실시간 체결을 믿지 않고 REST 조회
+LIVE_ORDER_CONFIRM_SEC = 3.0
+
+# 미체결 목록에서 제외하는 주문 상태
+CLOSED_ORDER_STATUSES = ('취소', '거부')
+
+Fill = namedtuple('Fill', ('code', 'side', 'qty', 'price', 'order_no', 'held_qty'))
+
+
+class LiveAccount:
+    """
+    실시간 계좌 상태 (asyncio 단일 스레드 사용 전제, 시각은 time.monotonic)
+    - positions: 종목코드 → {'qty', 'avg_price', 'name', 'updated'}
+    - orders: 주문번호 → OrderRecord (미체결 수량 qty)
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self.positions: Dict[str, Dict] = {}
+        self.orders: Dict[str, OrderRecord] = {}
+        self._order_updated: Dict[str, float] = {}
+        self._filled: Dict[str, int] = {}      # 주문번호별 누적 체결량 (이미 반영한 양)
+        self._base = None                      # 마지막 REST 결과 (보유 종목, 요약, 잔고)
+        self.cash_delta = 0                    # 마지막 REST 이후 체결 대금 (매수 -, 매도 +)
+        self.feed_since: Optional[float] = None
+        self.reconciled_at: Optional[float] = None
+        self.last_event_time = 0.0
+        self.counters = {'executions': 0, 'fills': 0, 'balances': 0, 'reconciles': 0, 'mismatches': 0, 'rest_skipped': 0}
+
+    # ==================== 연결 상태 ====================
+
+    def feed_up(self, at=None):
+        """계좌 실시간 등록 완료 (이 시점 이후 REST로 한 번 맞춘 뒤부터 REST 조회를 줄임)"""
+        self.feed_since = self._clock() if at is None else at
+
+    def feed_down(self):
+        self.feed_since = None
+
+    @property
+    def live(self) -> bool:
+        """실시간 연결 중이고, 그 연결 이후 REST로 한 번 이상 맞췄으면 True"""
+        return (self.feed_since is not None and self.reconciled_at is not None
+                and self.reconciled_at >= self.feed_since and self._base is not None)
+
+    def needs_rest(self, reconcile_sec=ACCOUNT_RECONCILE_SEC, awaiting=()) -> bool:
+        """
+        이번 주기에 REST 잔고 조회가 필요하면 True
+        awaiting: 체결 확인 대기 주문 티켓 (OrderDispatcher.awaiting()) - 응답 후 LIVE_ORDER_CONFIRM_SEC 동안
+        해당 종목 이벤트가 없으면 실시간 체결이 오지 않는 것으로 보고 REST 조회
+        """
+        if not self.live:
+            return True
+        now = self._clock()
+        if now - self.reconciled_at >= reconcile_sec:
+            return True
+        for ticket in awaiting:
+            t_ack = ticket.t_ack
+            if t_ack is None or now - t_ack < LIVE_ORDER_CONFIRM_SEC or t_ack < self.reconciled_at:
+                continue
+            pos = self.positions.get(ticket.code)
+            if pos is None or pos['updated'] < t_ack:
+                return True
+        self.counters['rest_skipped'] += 1
+        return False
+
+    # ==================== REST 기준 맞추기 ====================
+
+    def reconcile(self, holdings: Iterable[Holding], summary, balance, outstanding=None) -> List[str]:
+        """
+        REST 조회 결과를 기준으로 저장, 실시간 수량과 달랐던 종목코드 목록 반환
+        최근 LIVE_EVENT_GRACE_SEC 안에 실시간 이벤트가 있던 종목 / 주문은 실시간 값 유지
+        """
+        now = self._clock()
+        holdings = HoldingList(holdings or ())
+        compare = self.live
+        mismatched = []
+        positions = {}
+        for h in holdings:
+            if h.code in positions:
+                continue
+            live = self.positions.get(h.code)
+            if live is not None and now - live['updated'] < LIVE_EVENT_GRACE_SEC:
+                positions[h.code] = live
+                continue
+            if compare and (live['qty'] if live else 0) != h.qty:
+                mismatched.append(h.code)
+            positions[h.code] = {'qty': h.qty, 'avg_price': h.avg_price, 'name': h.name, 'updated': 0.0}
+        for code, live in self.positions.items():
+            if code in positions:
+                continue
+            if now - live['updated'] < LIVE_EVENT_GRACE_SEC:
+                positions[code] = live
+            elif compare and live['qty'] > 0:
+                mismatched.append(code)
+        self.positions = positions
+
+        if outstanding is not None:
+            orders = {o.ord_no: o for o in OrderList(outstanding) if o.ord_no}
+            for ord_no, updated in self._order_updated.items():
+                if now - updated < LIVE_EVENT_GRACE_SEC:
+                    if ord_no in self.orders:
+                        orders[ord_no] = self.orders[ord_no]
+                    else:
+                        orders.pop(ord_no, None)
+            self.orders = orders
+            self._order_updated = {k: v for k, v in self._order_updated.items() if now - v < LIVE_EVENT_GRACE_SEC}
+            self._filled = {k: v for k, v in self._filled.items() if k in orders}
+
+        self._base = (holdings, dict(summary or {}), tuple(balance))
+        self.cash_delta = 0
+        self.reconciled_at = now
+        self.counters['reconciles'] += 1
+        self.counters['mismatches'] += len(mismatched)
+        return mismatched
+
+    # ==================== 실시간 이벤트 ====================
+
+    def apply(self, records) -> List[Fill]:
+        """계좌 이벤트 목록 반영 (받은 순서대로), 이번에 새로 체결된 Fill 목록 반환"""
+        fills = []
+        for record in records:
+            if isinstance(record, OrderExecution):
+                fill = self.on_execution(record)
+                if fill is not None:
+                    fills.append(fill)
+            elif isinstance(record, BalanceUpdate):
+                self.on_balance(record)
+        return fills
+
+    def on_execution(self, ex: OrderExecution) -> Optional[Fill]:
+        """주문체결 1건: 미체결 목록 갱신 + 누적 체결량이 늘었으면 보유 수량 / 평단 / 체결 대금 반영"""
+        now = self._clock()
+        self.last_event_time = now
+        self.counters['executions'] += 1
+        self._order_updated[ex.order_no] = now
+
+        closed = any(s in ex.status for s in CLOSED_ORDER_STATUSES)
+        if ex.unfilled_qty > 0 and not closed:
+            self.orders[ex.order_no] = OrderRecord({
+                'stk_cd': ex.code, 'qty': ex.unfilled_qty, 'price': ex.order_price,
+                'type': ex.side, 'ord_no': ex.order_no})
+        else:
+            self.orders.pop(ex.order_no, None)
+
+        qty = ex.filled_qty - self._filled.get(ex.order_no, 0)
+        if qty <= 0 or ex.side not in ('buy', 'sell'):
+            return None
+        self._filled[ex.order_no] = ex.filled_qty
+        price = ex.fill_price or ex.order_price
+
+        pos = self.positions.get(ex.code)
+        if pos is None:
+            pos = self.positions[ex.code] = {'qty': 0, 'avg_price': 0.0, 'name': ex.name, 'updated': now}
+        if ex.side == 'buy':
+            total = pos['qty'] + qty
+            if price and total:
+                pos['avg_price'] = (pos['avg_price'] * pos['qty'] + price * qty) / total
+            pos['qty'] = total
+            self.cash_delta -= price * qty
+        else:
+            pos['qty'] = max(0, pos['qty'] - qty)
+            self.cash_delta += price * qty
+        pos['updated'] = now
+        if ex.name:
+            pos['name'] = ex.name
+        self.counters['fills'] += 1
+        return Fill(ex.code, ex.side, qty, price, ex.order_no, pos['qty'])
+
+    def on_balance(self, bu: BalanceUpdate):
+        """잔고 1건: 증권사가 계산한 보유 수량 / 매입단가로 덮어씀 (체결 이벤트 누적 오차 보정)"""
+        now = self._clock()
+        self.last_event_time = now
+        self.counters['balances'] += 1
+        pos = self.positions.setdefault(bu.code, {'qty': 0, 'avg_price': 0.0, 'name': bu.name, 'updated': now})
+        pos['qty'] = bu.qty
+        if bu.avg_price:
+            pos['avg_price'] = float(bu.avg_price)
+        if bu.name:
+            pos['name'] = bu.name
+        pos['updated'] = now
+
+    def qty(self, code) -> int:
+        pos = self.positions.get(code)
+        return pos['qty'] if pos else 0
+
+    # ==================== 조회 ====================
+
+    def view(self):
+        """
+        마지막 REST 결과 + 실시간 반영 → (HoldingList, 요약, 잔고, 미체결 OrderList)
+        - 수량 / 평단이 바뀐 종목은 매입금액 / 평가금액 / 손익을 다시 계산, 수량 0은 제외, REST에 없던 새 종목은 추가
+        - 잔고 (주문가능금액, 총평가금액, 예수금)에는 REST 이후 체결 대금만 반영 (수수료 / 세금은 다음 REST 조회에서 맞춤)
+        """
+        holdings, summary, balance = self._base
+        result = HoldingList()
+        seen = set()
+        for h in holdings:
+            pos = self.positions.get(h.code)
+            seen.add(h.code)
+            if pos is None or pos['qty'] <= 0:
+                continue
+            stock = h.copy()
+            if pos['qty'] != h.qty or (pos['avg_price'] and int(pos['avg_price']) != int(h.avg_price)):
+                _set_position(stock, pos['qty'], pos['avg_price'] or h.avg_price)
+            result.append(stock)
+        for code, pos in self.positions.items():
+            if code in seen or pos['qty'] <= 0:
+                continue
+            stock = Holding({'stk_cd': code, 'stk_nm': pos['name'], 'rmnd_qty': str(pos['qty']),
+                             'cur_prc': str(int(pos['avg_price'])), 'pchs_avg_pric': str(int(pos['avg_price']))})
+            _set_position(stock, pos['qty'], pos['avg_price'])
+            result.append(stock)
+
+        delta = self.cash_delta
+        balance = (balance[0] + delta, balance[1] - delta, balance[2] + delta) if delta else balance
+        return result, summary, balance, OrderList(o.copy() for o in self.orders.values())
+
+    def format_stats(self) -> str:
+        c = self.counters
+        if self.feed_since is None:
+            state = "실시간 체결 미연결 (REST 매 주기 조회)"
+        elif not self.live:
+            state = "실시간 체결 연결 (REST 맞추기 대기)"
+        else:
+            state = f"실시간 체결 연결 (REST {self._clock() - self.reconciled_at:.0f}초 전)"
+        return (f"{state} / 체결 {c['fills']} (이벤트 {c['executions']}) / 잔고 {c['balances']} / "
+                f"REST 맞춤 {c['reconciles']} (불일치 {c['mismatches']}) / REST 생략 {c['rest_skipped']}")
+
+
+def _set_position(stock, qty, avg_price):
+    """수량 / 평단 변경 후 매입금액 / 평가금액 / 손익 재계산"""
+    cur = stock.cur_price or avg_price
+    stock['rmnd_qty'] = str(qty)
+    stock['pchs_avg_pric'] = str(int(avg_price))
+    stock['pchs_amt'] = str(int(avg_price * qty))
+    stock['evlu_amt'] = str(int(cur * qty))
+    stock['pl_amt'] = str(int((cur - avg_price) * qty))
+    if avg_price > 0:
+        stock['pl_rt'] = f"{(cur - avg_price) / avg_price * 100:.2f}"
@@ -0,0 +1,364 @@
+"""
+주문 디스패처 (매수/매도 주문 큐 + 종목·방향별 중복 제거 + 주문 지연 측정)
+
+매수 판단(_chk_n_buy_core), 매도 판단(chk_n_sell), 전량 매도(sell_all_stocks)가 주문 API를 직접 호출하면
+판단 스레드가 주문 응답을 기다리는 동안 다음 종목 판단이 멈추고, 같은 종목·같은 방향의 주문이
+여러 경로에서 겹쳐 나갈 수 있었습니다.
+- submit_buy / submit_sell은 주문 의도를 큐에 넣고 OrderTicket을 바로 반환 (필요할 때 ticket.wait())
+- 같은 종목·같은 방향 주문이 전송 대기 / 응답 대기 / 체결 확인 대기 중이면 새로 보내지 않음
+  (전송 전이면 수량을 큰 쪽으로 합치고 기존 티켓 반환 또는 None, 이미 전송돼 수량을 못 늘리면 거절 티켓(INFLIGHT) 또는 None)
+- 전송은 ORDER_DISPATCH_WORKERS개 워커 스레드가 수행 (호출 간격은 http_session의 kiwoom.rate_limiter)
+- 티켓마다 의도/전송/응답/체결 시각(time.monotonic)을 기록하고 stats()로 구간별 지연 백분위 제공
+  체결은 계좌 스냅샷 보유 수량 변화(observe_holdings) 또는 실시간 체결 이벤트(observe_position)로 판정, Mock 모드는 응답 즉시 체결
+"""
+import time
+import queue
+import threading
+import itertools
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+from logger import logger
+from utils import percentile
+
+# 동시에 전송 중일 수 있는 주문 수 (워커 스레드 수)
+ORDER_DISPATCH_WORKERS = 2
+
+# 응답 후 체결 확인을 기다리는 최대 시간(초) - 넘으면 미체결로 보고 추적 종료
+ORDER_FILL_TRACK_TIMEOUT = 600.0
+
+# 지연 통계에 보관할 최근 티켓 수
+ORDER_LATENCY_HISTORY = 500
+
+# 이 건수만큼 체결될 때마다 지연 요약 로그
+ORDER_LATENCY_LOG_EVERY = 20
+
+SUCCESS_CODES = ('0', 'SUCCESS')
+
+# 같은 종목·방향 주문이 이미 전송돼 더 큰 수량으로 합칠 수 없을 때의 결과 코드
+INFLIGHT_CODE = 'INFLIGHT'
+
+class OrderTicket:
+    """
+    주문 1건의 진행 상태
+    - t_intent / t_send / t_ack / t_fill: 의도 등록 / 전송 시작 / 응답 수신 / 체결 확인 시각 (monotonic, 없으면 None)
+    - return_code / return_msg: 주문 API 응답 (전송 전 실패 시 'ERROR')
+    """
+    def __init__(self, ticket_id, side, code, qty, price=None, token=None, source='', held_before=None):
+        self.id = ticket_id
+        self.side = side
+        self.code = code
+        self.qty = int(qty)
+        self.price = price
+        self.token = token
+        self.source = source
+        self.held_before = held_before
+        self.t_intent = time.monotonic()
+        self.t_send = None
+        self.t_ack = None
+        self.t_fill = None
+        self.return_code = None
+        self.return_msg = None
+        self.merged = 0
+        self._acked = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"OrderTicket#{self.id}({self.side} {self.code} x{self.qty}, code={self.return_code})"
+
+    @property
+    def done(self) -> bool:
+        return self._acked.is_set()
+
+    @property
+    def ok(self) -> bool:
+        return str(self.return_code) in SUCCESS_CODES
+
+    @property
+    def filled(self) -> bool:
+        return self.t_fill is not None
+
+    def wait(self, timeout: Optional[float] = None) -> Tuple[str, str]:
+        """주문 응답까지 대기 후 (return_code, return_msg) - 기존 buy_stock / sell_stock 반환 형식"""
+        if not self._acked.wait(timeout):
+            return 'TIMEOUT', '주문 응답 대기 시간 초과'
+        return self.return_code, self.return_msg
+
+    def add_done_callback(self, fn: Callable[['OrderTicket'], None]):
+        """응답 수신 시 fn(ticket) 호출 (이미 응답을 받았으면 즉시 호출)"""
+        with self._lock:
+            if not self._acked.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _set_result(self, return_code, return_msg):
+        self.return_code, self.return_msg = return_code, return_msg
+        self.t_ack = time.monotonic()
+        with self._lock:
+            self._acked.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception as e:
+                logger.error(f"[OrderDispatcher] {self} 콜백 오류: {e}")
+
+    def latencies(self) -> Dict[str, Optional[float]]:
+        """구간별 지연(ms)"""
+        def ms(a, b):
+            return (b - a) * 1000 if a is not None and b is not None else None
+        return {
+            'queue': ms(self.t_intent, self.t_send),
+            'ack': ms(self.t_send, self.t_ack),
+            'fill': ms(self.t_ack, self.t_fill),
+            'total': ms(self.t_intent, self.t_fill),
+        }
+
+class OrderDispatcher:
+    """
+    주문 큐 + 워커 스레드
+    - _pending: (종목, 방향) → 전송 / 응답 / 체결 확인 대기 티켓 (중복 제거 기준, 체결 확인 / 취소·거부(release) / 추적 종료 시 해제)
+    - _awaiting_fill: 성공 응답 후 체결 확인 대기 티켓
+    - 주문 함수는 kiwoom_adapter.fn_kt10000 / fn_kt10001 (Mock/Real 전환, 토큰 발급 포함)
+    """
+    def __init__(self, workers=ORDER_DISPATCH_WORKERS, send_buy=None, send_sell=None):
+        self.workers = workers
+        self._send_buy = send_buy
+        self._send_sell = send_sell
+        self._queue = queue.Queue()
+        self._pending: Dict[Tuple[str, str], OrderTicket] = {}
+        self._awaiting_fill: Dict[int, OrderTicket] = {}
+        self._history = deque(maxlen=ORDER_LATENCY_HISTORY)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._threads = []
+        self.counters = {'submitted': 0, 'deduped': 0, 'inflight': 0, 'sent': 0, 'failed': 0, 'filled': 0, 'fill_timeout': 0, 'released': 0}
+
+    # ==================== 등록 ====================
+
+    def _ensure_workers(self):
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"order-dispatch-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, side, code, qty, price=None, token=None, source='', held_before=None, join=True) -> Optional[OrderTicket]:
+        """
+        주문 의도 등록 (즉시 반환)
+        같은 종목·방향 주문이 체결 확인 전이면 새로 보내지 않음 (아직 전송 전이면 수량을 큰 쪽으로 갱신)
+        - join=True: 기존 티켓 반환 / join=False: None 반환 (체결 후처리를 직접 하는 호출자가 중복 기록하지 않도록)
+        - 이미 전송돼 요청 수량을 채울 수 없으면 join=True는 전송하지 않은 거절 티켓(return_code INFLIGHT) 반환
+        held_before: 주문 직전 보유 수량 (체결 판정 기준, 모르면 None → 체결 추적 안 함)
+        """
+        code = str(code)
+        code = code[1:] if code.startswith('A') else code
+        key = (code, side)
+        with self._lock:
+            self.counters['submitted'] += 1
+            existing = self._pending.get(key)
+            if existing is not None:
+                self.counters['deduped'] += 1
+                if int(qty) > existing.qty and existing.t_send is not None:
+                    # 이미 전송돼 수량을 늘릴 수 없음 → 작은 주문을 요청 수량인 것처럼 돌려주지 않음
+                    self.counters['inflight'] += 1
+                    logger.warning(f"[OrderDispatcher] {side} {code} {int(qty)}주: 전송된 {existing}보다 많아 합칠 수 없음 -> 전송 안 함")
+                    if not join:
+                        return None
+                    rejected = OrderTicket(next(self._ids), side, code, qty, price, token, source, held_before)
+                    rejected._set_result(INFLIGHT_CODE, f"같은 종목·방향 주문 {existing.qty}주 체결 대기 중 (수량 증가 불가)")
+                    return rejected
+                existing.merged += 1
+                if existing.t_send is None and int(qty) > existing.qty:
+                    existing.qty = int(qty)
+                    if price is not None:
+                        existing.price = price
+                logger.info(f"[OrderDispatcher] 중복 주문 합침: {side} {code} (대기 중 {existing})")
+                return existing if join else None
+            ticket = OrderTicket(next(self._ids), side, code, qty, price, token, source, held_before)
+            self._pending[key] = ticket
+            self._ensure_workers()
+        self._queue.put(ticket)
+        return ticket
+
+    def submit_buy(self, code, qty, price, token=None, source='검색식', held_before=None, join=True) -> Optional[OrderTicket]:
+        return self.submit('buy', code, qty, price, token, source, held_before, join)
+
+    def submit_sell(self, code, qty, token=None, source='', held_before=None, join=True) -> Optional[OrderTicket]:
+        return self.submit('sell', code, qty, None, token, source, held_before, join)
+
+    # ==================== 전송 ====================
+
+    def _send(self, ticket):
+        if ticket.side == 'buy':
+            send = self._send_buy
+            if send is None:
+                from kiwoom_adapter import fn_kt10000 as send
+            return send(ticket.code, ticket.qty, ticket.price, token=ticket.token, source=ticket.source)
+        send = self._send_sell
+        if send is None:
+            from kiwoom_adapter import fn_kt10001 as send
+        return send(ticket.code, ticket.qty, token=ticket.token)
+
+    def _worker(self):
+        while True:
+            ticket = self._queue.get()
+            try:
+                # 전송 시각은 잠금 안에서 기록 (submit의 수량 합침과 경합 방지)
+                with self._lock:
+                    ticket.t_send = time.monotonic()
+                try:
+                    return_code, return_msg = self._send(ticket)
+                except Exception as e:
+                    logger.error(f"[OrderDispatcher] {ticket.side} {ticket.code} 주문 오류: {e}")
+                    return_code, return_msg = 'ERROR', str(e)
+                self._on_ack(ticket, return_code, return_msg)
+            finally:
+                self._queue.task_done()
+
+    def _on_ack(self, ticket, return_code, return_msg):
+        with self._lock:
+            self.counters['sent'] += 1
+            if str(return_code) not in SUCCESS_CODES:
+                self.counters['failed'] += 1
+        ticket._set_result(return_code, return_msg)
+        if not ticket.ok:
+            self._release(ticket)
+            self._history.append(ticket)
+            return
+        if self._fills_on_ack():
+            self._mark_filled(ticket)
+        elif ticket.held_before is not None:
+            # 체결 확인 전까지 (종목, 방향) 키 유지 → 같은 주문이 다시 나가지 않음
+            with self._lock:
+                self._awaiting_fill[ticket.id] = ticket
+        else:
+            self._release(ticket)
+            self._history.append(ticket)
+
+    def _release(self, ticket):
+        """중복 제거 키 해제 (다음 같은 종목·방향 주문부터 새로 전송)"""
+        with self._lock:
+            if self._pending.get((ticket.code, ticket.side)) is ticket:
+                del self._pending[(ticket.code, ticket.side)]
+
+    def release(self, code, side, reason='') -> bool:
+        """
+        주문이 취소 / 거부돼 더 체결되지 않을 때 호출 (자동 취소, 실시간 주문체결 '취소'/'거부')
+        체결 확인 대기를 끝내고 중복 제거 키를 풀어 같은 종목·방향 주문을 바로 다시 보낼 수 있게 함
+        Returns: 해제한 티켓이 있었는지
+        """
+        code = str(code)
+        code = code[1:] if code.startswith('A') else code
+        with self._lock:
+            ticket = self._pending.get((code, side))
+            if ticket is None or ticket.t_ack is None:
+                # 아직 응답 전인 티켓은 이번 취소와 무관한 새 주문
+                return False
+            del self._pending[(code, side)]
+            self._awaiting_fill.pop(ticket.id, None)
+            self.counters['released'] += 1
+        self._history.append(ticket)
+        logger.info(f"[OrderDispatcher] {side} {code} 체결 대기 해제 ({reason or '취소'}): {ticket}")
+        return True
+
+    def _fills_on_ack(self) -> bool:
+        """Mock 서버는 주문 응답 시점에 체결까지 끝남"""
+        try:
+            from kiwoom_adapter import get_current_api_mode
+            return get_current_api_mode() == 'Mock'
+        except Exception:
+            return False
+
+    # ==================== 체결 판정 ====================
+
+    def _mark_filled(self, ticket):
+        ticket.t_fill = time.monotonic()
+        self._history.append(ticket)
+        self._release(ticket)
+        with self._lock:
+            self._awaiting_fill.pop(ticket.id, None)
+            self.counters['filled'] += 1
+            log_summary = self.counters['filled'] % ORDER_LATENCY_LOG_EVERY == 0
+        if log_summary:
+            logger.info(f"[OrderDispatcher] 주문 지연 요약: {self.format_stats()}")
+
+    def observe_holdings(self, holdings):
+        """
+        계좌 스냅샷의 보유 수량으로 체결 판정
+        매수: 보유 수량 ≥ 주문 전 수량 + 주문 수량 / 매도: 보유 수량 ≤ 주문 전 수량 - 주문 수량
+        """
+        with self._lock:
+            if not self._awaiting_fill:
+                return
+            waiting = list(self._awaiting_fill.values())
+        held = {}
+        for h in holdings or ():
+            held.setdefault(h.code, h.qty)
+        self._check_fills(waiting, held)
+
+    def observe_position(self, code, qty):
+        """실시간 체결/잔고 이벤트로 바뀐 종목 1개의 보유 수량으로 체결 판정 (스냅샷을 기다리지 않음)"""
+        with self._lock:
+            waiting = [t for t in self._awaiting_fill.values() if t.code == code]
+        if waiting:
+            self._check_fills(waiting, {code: qty})
+
+    def awaiting(self):
+        """체결 확인 대기 티켓 목록 (복사본)"""
+        with self._lock:
+            return list(self._awaiting_fill.values())
+
+    def _check_fills(self, waiting, held):
+        now = time.monotonic()
+        for ticket in waiting:
+            qty = held.get(ticket.code, 0)
+            if ticket.side == 'buy':
+                filled = qty >= ticket.held_before + ticket.qty
+            else:
+                filled = qty <= max(0, ticket.held_before - ticket.qty)
+            if filled:
+                self._mark_filled(ticket)
+            elif now - ticket.t_ack > ORDER_FILL_TRACK_TIMEOUT:
+                self._release(ticket)
+                with self._lock:
+                    self._awaiting_fill.pop(ticket.id, None)
+                    self.counters['fill_timeout'] += 1
+                self._history.append(ticket)
+
+    # ==================== 통계 ====================
+
+    def stats(self) -> Dict:
+        """구간별 지연 백분위(ms) + 건수 {'queue': {'count', 'p50', 'p95', 'p99'}, ..., 'counters': {...}}"""
+        samples = {'queue': [], 'ack': [], 'fill': [], 'total': []}
+        for ticket in list(self._history):
+            for name, value in ticket.latencies().items():
+                if value is not None:
+                    samples[name].append(value)
+        result = {}
+        for name, values in samples.items():
+            values.sort()
+            if values:
+                result[name] = {'count': len(values), 'p50': percentile(values, 50), 'p95': percentile(values, 95), 'p99': percentile(values, 99)}
+            else:
+                result[name] = {'count': 0, 'p50': None, 'p95': None, 'p99': None}
+        with self._lock:
+            result['counters'] = dict(self.counters)
+            result['pending'] = len(self._pending)
+            result['awaiting_fill'] = len(self._awaiting_fill)
+        return result
+
+    def format_stats(self) -> str:
+        stats = self.stats()
+        parts = []
+        for name in ('queue', 'ack', 'fill', 'total'):
+            s = stats[name]
+            if s['count']:
+                parts.append(f"{name} p50 {s['p50']:.0f}/p95 {s['p95']:.0f}/p99 {s['p99']:.0f}ms (n={s['count']})")
+        c = stats['counters']
+        parts.append(f"전송 {c['sent']} / 실패 {c['failed']} / 중복합침 {c['deduped']} (수량 증가 불가 {c['inflight']}) / 취소 해제 {c['released']}")
+        return ', '.join(parts)
+
+order_dispatcher = OrderDispatcher()
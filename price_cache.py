@@ -0,0 +1,73 @@
+"""
+실시간 현재가 캐시 (종목별 수신 시각 기록)
+
+rt_search.current_prices는 {code: price} dict로 여러 곳(매도 판단, 잔고 가격 패치, 대응 추적)에서 그대로 읽습니다.
+웹소켓이 끊긴 동안에는 값이 갱신되지 않는데도 최신 가격처럼 쓰일 수 있어, dict를 유지한 채 수신 시각을 함께 기록합니다.
+- 값을 넣을 때마다 stamps[code] = 수신 시각(time.time)
+- feed_up() / feed_down(): 실시간 시세가 들어오는 연결 구간 표시
+- fresh(max_age, subscribed): 믿을 수 있는 가격만 담은 dict
+  · 받은 지 max_age초 이내이거나
+  · 시세 연결이 살아 있고, 현재 연결 이후에 받았고, 지금도 구독 중인 종목 (체결이 뜸해도 바뀌면 바로 들어옴)
+    단, 연결에서 max_age초 이내에 메시지(PING 포함)를 받은 경우만 - 소켓은 열려 있는데 아무것도 오지 않는 좀비 연결 제외
+"""
+import time
+from typing import Dict, Iterable, Optional
+
+# 연결 상태와 무관하게 믿을 수 있는 가격 유효 시간(초)
+PRICE_MAX_AGE_SEC = 10.0
+
+class PriceCache(dict):
+    def __init__(self, clock=time.time):
+        super().__init__()
+        self._clock = clock
+        self.stamps: Dict[str, float] = {}
+        self.feed_since: Optional[float] = None   # 현재 시세 연결 시작 시각 (끊겨 있으면 None)
+
+    def __setitem__(self, code, price):
+        dict.__setitem__(self, code, price)
+        self.stamps[code] = self._clock()
+
+    def put(self, code, price, received):
+        """수신 시각을 지정해 저장 (틱 배치 반영용)"""
+        dict.__setitem__(self, code, price)
+        self.stamps[code] = received
+
+    def __delitem__(self, code):
+        dict.__delitem__(self, code)
+        self.stamps.pop(code, None)
+
+    def clear(self):
+        dict.clear(self)
+        self.stamps.clear()
+
+    def age(self, code, now=None) -> Optional[float]:
+        stamp = self.stamps.get(code)
+        if stamp is None:
+            return None
+        return (self._clock() if now is None else now) - stamp
+
+    def feed_up(self, at=None):
+        self.feed_since = self._clock() if at is None else at
+
+    def feed_down(self):
+        self.feed_since = None
+
+    def fresh(self, max_age=PRICE_MAX_AGE_SEC, subscribed: Iterable[str] = (), now=None, last_msg=None) -> Dict[str, int]:
+        """
+        믿을 수 있는 가격만 {code: price}로 반환
+        last_msg: 시세 연결의 마지막 메시지 수신 시각 (None이면 연결 구간 신뢰를 적용하지 않음)
+        """
+        now = self._clock() if now is None else now
+        stamps = self.stamps
+        since = self.feed_since
+        silent = last_msg is None or now - last_msg > max_age
+        live = subscribed if since is not None and not silent else ()
+        result = {}
+        for code, price in self.items():
+            stamp = stamps.get(code, 0.0)
+            if now - stamp <= max_age or (code in live and stamp >= since):
+                result[code] = price
+        return result
+
+    def stale_count(self, max_age=PRICE_MAX_AGE_SEC, subscribed: Iterable[str] = (), last_msg=None) -> int:
+        return len(self) - len(self.fresh(max_age, subscribed, last_msg=last_msg))
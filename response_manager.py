@@ -1,8 +1,10 @@
 import asyncio
 import time
 import datetime
+from concurrent.futures import Future
 from logger import logger
 from database import get_db_connection
+from db_writer import db_writer
 
 class ResponseManager:
     """시그널 발생 후 가격 변화(대응 데이터)를 수학적으로 추적하는 매니저"""
@@ -57,15 +59,18 @@ class ResponseManager:
             
     async def _save_response(self, sig):
         try:
-            from database import DB_FILE
-            import aiosqlite
-            async with aiosqlite.connect(DB_FILE) as db:
-                await db.execute('''
-                    INSERT INTO response_metrics (signal_id, code, interval_1m_change, interval_5m_change, max_drawdown, max_profit)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (sig['id'], sig['code'], sig.get('capture_1m', 0), sig.get('capture_5m', 0), sig['max_drawdown'], sig['max_profit']))
-                await db.commit()
-            logger.info(f"📊 [Math Response] ID:{sig['id']} 대응 데이터 저장 완료 (1m:{sig.get('capture_1m', 0):.2f}%, 5m:{sig.get('capture_5m', 0):.2f}%)")
+            # 시그널 스냅샷은 쓰기 큐로 저장되므로 ID가 Future일 수 있음 (5분 뒤라 이미 확정된 상태)
+            signal_id = sig['id']
+            if isinstance(signal_id, Future):
+                signal_id = await asyncio.wrap_future(signal_id)
+            sig['id'] = signal_id
+            
+            # [Write-Behind] 행마다 연결을 열지 않고 쓰기 큐에 넣음
+            db_writer.submit('''
+                INSERT INTO response_metrics (signal_id, code, interval_1m_change, interval_5m_change, max_drawdown, max_profit)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (signal_id, sig['code'], sig.get('capture_1m', 0), sig.get('capture_5m', 0), sig['max_drawdown'], sig['max_profit']))
+            logger.info(f"📊 [Math Response] ID:{sig['id']} 대응 데이터 저장 요청 (1m:{sig.get('capture_1m', 0):.2f}%, 5m:{sig.get('capture_5m', 0):.2f}%)")
         except Exception as e:
             logger.error(f"대응 데이터 저장 실패: {e}")
 
@@ -2,6 +2,7 @@
 import websockets
 import json
 import time
+import logging
 from config import socket_url
 from check_n_buy import chk_n_buy, reset_accumulation
 from get_setting import get_setting
@@ -9,6 +10,32 @@ from get_setting import get_setting
 from kiwoom_adapter import fn_au10001 as get_token
 from kiwoom_adapter import fn_kt00004 as get_my_stocks
 from logger import logger
+from kiwoom.realtime import decode_items, split_real_items, OrderExecution
+from kiwoom.subscriptions import SubscriptionManager, REALTIME_MAX_CODES, PRIORITY_HOLDING, PRIORITY_CANDIDATE, ACCOUNT_GRP_NO, build_account_message
+from condition_set import ConditionSet, parse_condition_weights
+from kiwoom.reconnect import Backoff, GapMeter
+from price_cache import PriceCache, PRICE_MAX_AGE_SEC
+from live_account import LiveAccount, CLOSED_ORDER_STATUSES
+from order_dispatcher import order_dispatcher
+from database_helpers import invalidate_positions
+from candidate_queue import CandidateQueue, CANDIDATE_TTL_SEC, CANDIDATE_SCORE_DECAY, CANDIDATE_QUEUE_MAX
+from tick_buffer import TickBuffer, TICK_BUFFER_MAX
+from candle_manager import candle_manager
+
+# 메시지 단위 수신 로그 전용 로거 (trading_bot 핸들러로 전달)
+# 기본 INFO라 메시지마다 DEBUG 문자열을 만들지 않음, realtime_debug_log 설정 시 DEBUG
+rt_logger = logging.getLogger('trading_bot.realtime')
+
+# 틱 버퍼 수신→소비 지연이 이 시간(초)을 넘으면 경고 (TICK_LAG_WARN_INTERVAL초에 한 번)
+TICK_LAG_WARN_SEC = 1.0
+TICK_LAG_WARN_INTERVAL = 30.0
+
+# 재접속 후 로그인 응답 대기(초) / 이 횟수만큼 연속 실패하면 전체 재시작(on_connection_closed)으로 넘김
+RECONNECT_LOGIN_TIMEOUT = 10.0
+RECONNECT_MAX_ATTEMPTS = 10
+
+# 데이터 수신이 이 시간(초) 없으면 좀비 연결로 보고 재접속
+ZOMBIE_TIMEOUT_SEC = 30.0
 
 # chk_n_buy를 비동기로 실행하기 위한 wrapper 함수
 async def async_chk_n_buy(stock_code, token):
@@ -33,11 +60,23 @@ class RealTimeSearch:
 		self.buy_lock = asyncio.Lock() # 매수 실행 동기화를 위한 락 (동시 체결 방지)
 		self.recv_lock = asyncio.Lock() # WebSocket recv 동기화 락 (ConcurrencyError 방지)
 		self.target_cnt_cache = None # [추가] 목표 종목 수 캐싱 (파일 읽기 경합 방지)
-		self.candidate_queue = {} # [추가] 매수 대기열 {code: rate} (Priority Queue)
+		self.candidate_queue = CandidateQueue() # [Priority] 매수 대기열 (종목코드 키 우선순위 큐, 점수 감쇠 + TTL)
 		self.recently_sold = {}        # [New] 최근 매도된 종목 (code: timestamp) - Ghost Stock 방지
 		self.sold_time_log = {}        # [Fix] Legacy attribute for backward compatibility
 		self.is_processing_candidates = False # [Priority] 후보군 처리 중 플래그
-		self.current_prices = {} # [Cache] 실시간 현재가 캐시 {code: price}
+		self.current_prices = PriceCache() # [Cache] 실시간 현재가 캐시 {code: price} (종목별 수신 시각 기록, fresh_prices()로 오래된 값 제외)
+		self.tick_buffer = TickBuffer() # [Backpressure] 수신 루프 → 소비 태스크 틱 버퍼 (종목별 최신 값만 유지)
+		self.consume_task = None # [Backpressure] 틱 소비 태스크
+		self.subscriptions = SubscriptionManager(self.send_message) # [SetRealReg] 실시간 시세 구독 관리 (등록 집합 기억, 차분 전송)
+		self.conditions = ConditionSet(self._load_condition_weights()) # [Multi-Condition] 조건식별 가중치 / 편입 종목
+		self.backoff = Backoff() # [Reconnect] 재접속 간격 (지터 지수 백오프)
+		self.gaps = GapMeter() # [Reconnect] 끊김 구간 측정
+		self.logged_in = asyncio.Event() # [Reconnect] 현재 연결 로그인 성공 여부
+		self._supervisor_wake = asyncio.Event() # [Reconnect] 끊김 즉시 연결 관리 루프 깨우기
+		self.reconnecting = False
+		self.live_account = LiveAccount() # [Live Fill] 주문체결 / 잔고 실시간으로 갱신하는 메모리 잔고
+		self._account_reg_sent = False # [Live Fill] 계좌 실시간 등록 응답 대기 중
+		self._lag_warned_at = 0.0
 		self.refresh_task = None # [New] 자동 갱신 태스크
 		self.held_since_ref = None # [Time-Cut Fix] bot.py의 held_since 참조 (즉시 타이머 등록용)
 		self.time_cut_cooldown = {} # [Time-Cut Fix] Time-Cut 매도 후 재매수 방지 {code: timestamp}
@@ -49,34 +88,75 @@ class RealTimeSearch:
 		self.candidates_lock = asyncio.Lock()
 		self.processing_tasks = [] # [LifeCycle] 현재 실행 중인 매수 프로세스 트래킹
 
+		self._configure_candidate_queue()
+		try:
+			self.subscriptions.max_codes = max(1, int(float(get_setting('realtime_max_codes', REALTIME_MAX_CODES))))
+		except Exception:
+			pass
+		try:
+			self.tick_buffer.maxsize = max(1, int(float(get_setting('tick_buffer_max', TICK_BUFFER_MAX))))
+		except Exception:
+			pass
+		debug_on = str(get_setting('realtime_debug_log', False)).lower() in ['1', 'true', 'on']
+		rt_logger.setLevel(logging.DEBUG if debug_on else logging.INFO)
+
+		# [Fast Path] 수신 메시지 trnm별 핸들러 (수신 루프에서 dict 조회 한 번으로 분기)
+		self._handlers = {
+			'LOGIN': self._on_login,
+			'PING': self._on_ping,
+			'CNSRLST': self._on_condition_list,
+			'CNSRREQ': self._on_ticks,
+			'REAL': self._on_ticks,
+			'REG': self._on_realreg,
+			'REMOVE': self._on_realreg,
+			'REALREG': self._on_realreg,
+		}
+
+	def fresh_prices(self):
+		"""
+		[Stale Guard] 믿을 수 있는 실시간 가격만 {code: price}로 반환
+		받은 지 realtime_price_max_age초 이내이거나, 시세 연결이 살아 있고 (max_age초 이내 메시지 수신) 그 연결에서 구독 중인 종목
+		(끊김 중 멈춘 가격으로 매도 판단하지 않도록 current_prices 대신 사용)
+		"""
+		try:
+			max_age = float(get_setting('realtime_price_max_age', PRICE_MAX_AGE_SEC))
+		except Exception:
+			max_age = PRICE_MAX_AGE_SEC
+		return self.current_prices.fresh(max_age, self.subscriptions.registered, last_msg=self.last_msg_time)
+
+	@staticmethod
+	def _load_condition_weights():
+		"""search_seqs("0:1.0, 3:0.5") 설정, 없으면 search_seq 한 개"""
+		return parse_condition_weights(get_setting('search_seqs', ''), get_setting('search_seq', '0'))
+
+	def _configure_candidate_queue(self):
+		"""대기열 설정 반영 (후보 유효 시간 / 초당 점수 감쇠 / 최대 종목 수)"""
+		try:
+			self.candidate_queue.configure(
+				ttl=float(get_setting('candidate_ttl_sec', CANDIDATE_TTL_SEC)),
+				decay=float(get_setting('candidate_score_decay', CANDIDATE_SCORE_DECAY)),
+				maxsize=int(float(get_setting('candidate_queue_max', CANDIDATE_QUEUE_MAX))))
+		except Exception as e:
+			logger.warning(f"[Queue] 대기열 설정 반영 실패 (기본값 사용): {e}")
+
 	def register_sold_stock(self, code):
 		"""매도 완료된 종목을 등록하여, API 지연으로 인한 재진입(Ghost Check)을 방지합니다."""
 		self.recently_sold[code] = time.time()
 		logger.info(f"[Sold Register] {code} 매도 처리 등록 (Ghost 방지 시작)")
 
-	async def register_stocks_realtime(self, codes):
-		"""보유 종목(또는 특정 종목)을 서버에 실시간 시세 등록(SetRealReg) 요청합니다."""
+	async def register_stocks_realtime(self, codes, group='holdings', priority=PRIORITY_HOLDING):
+		"""
+		보유 종목(또는 특정 그룹 종목)의 실시간 시세 구독을 codes로 맞춥니다.
+		서버에 이미 등록된 종목은 다시 보내지 않고, 추가분은 REG / 빠진 종목(매도 등)은 REMOVE로 전송
+		"""
+		self.subscriptions.set_group(group, codes, priority)
 		if not self.connected or not self.websocket:
 			return
-		
-		if not codes:
-			logger.info("📡 [SetRealReg] 등록할 종목 코드가 비어 있습니다.")
-			return
-
-		# 종목 코드가 리스트나 집합이면 세미콜론(;)으로 연결
-		if isinstance(codes, (list, set)):
-			codes_str = ";".join([str(c).replace('A', '') for c in codes])
-		else:
-			codes_str = str(codes).replace('A', '')
 
-		param = {
-			'trnm': 'REALREG', # 많은 Kiwoom Bridge에서 사용하는 SetRealReg 맵핑명
-			'codes': codes_str
-		}
-		
 		try:
-			await self.send_message(message=param)
-			logger.info(f"📡 [SetRealReg] 보유 종목 실시간 등록 요청 전송: {codes_str}")
+			added, removed = await self.subscriptions.sync()
+			if added or removed:
+				logger.info(f"📡 [SetRealReg] 실시간 구독 갱신: 추가 {added} / 해지 {removed} ({self.subscriptions.format_stats()})")
 		except Exception as e:
 			logger.error(f"[SetRealReg] 요청 중 오류 발생: {e}")
 
@@ -87,6 +167,11 @@ class RealTimeSearch:
 			logger.info(f"🌐 [RT_SEARCH] connect() 시도 중... URL: {self.socket_url}")
 			self.websocket = await websockets.connect(self.socket_url)
 			self.connected = True
+			self.logged_in.clear()
+			# 새 연결에는 이전 실시간 등록이 없음 (다음 sync에서 같은 집합 재등록)
+			self.subscriptions.reset()
+			self.conditions.reset_connection()
+			self.live_account.feed_down()
 			logger.info("✅ [RT_SEARCH] WebSocket 연결 성공")
 
 			# 로그인 패킷
@@ -117,171 +202,310 @@ class RealTimeSearch:
 			await self.websocket.send(message)
 			logger.debug(f'Message sent: {message}')
 
+	# ==================== 수신 메시지 처리 (trnm별 핸들러) ====================
+
+	async def _on_login(self, response):
+		"""LOGIN 응답: 성공 시 조건검색 목록(CNSRLST) 요청"""
+		if response.get('return_code') != 0:
+			logger.error(f"로그인 실패하였습니다. : {response.get('return_msg')}")
+			if self.reconnecting:
+				# 재접속 중이면 소켓만 닫고 supervisor가 토큰 갱신 후 재시도
+				await self._close_socket()
+				return
+			await self.disconnect()
+			return
+		logger.info('로그인 성공하였습니다.')
+		self.logged_in.set()
+		# [Reconnect] 끊김 구간 종료 + 이 연결부터 들어오는 시세를 최신으로 인정
+		gap = self.gaps.end()
+		self.current_prices.feed_up()
+		if gap is not None:
+			logger.warning(f"[Reconnect] 실시간 시세 복구 - 끊김 {gap:.1f}초 ({self.gaps.format_stats()})")
+		await self.subscribe_account()
+		logger.info('조건검색 목록조회 패킷을 전송합니다.')
+		await self.send_message(message={'trnm': 'CNSRLST'})
+
+	async def subscribe_account(self):
+		"""[Live Fill] 계좌 실시간(00 주문체결 / 04 잔고) 등록 - 등록 응답을 받으면 REST 잔고 조회를 느린 맞추기로 전환"""
+		self._account_reg_sent = True
+		await self.send_message(build_account_message())
+		logger.info("📡 [Live Fill] 주문체결 / 잔고 실시간 등록 요청 전송")
+
+	async def _on_ping(self, response):
+		"""PING: 받은 그대로 회신 (연결 유지)"""
+		await self.send_message(response)
+
+	async def _on_condition_list(self, response):
+		"""[Core Fix] 조건검색 목록(CNSRLST) 수신 시 -> 설정된 조건식 전부 실시간 등록(CNSRREQ)"""
+		cond_list = response.get('data', [])
+		logger.info(f"📋 조건검색 목록 수신: {len(cond_list)}개")
+
+		# 데이터 형식: [["0","오늘폭등"],["1","불기둥"]]
+		for cond in cond_list or ():
+			if len(cond) > 1:
+				self.conditions.names[str(cond[0]).strip()] = cond[1]
+
+		missing = [seq for seq in self.conditions.weights if cond_list and seq not in self.conditions.names]
+		if missing:
+			logger.warning(f"⚠️ 조건식 목록에 없는 번호: {missing} (목록 개수: {len(cond_list)})")
+		await self.subscribe_conditions()
+
+	async def subscribe_conditions(self):
+		"""
+		[Multi-Condition] 설정된 조건식을 실시간 등록 (현재 연결에서 이미 등록한 조건식은 건너뜀)
+		설정에서 빠진 조건식은 실시간 해제(CNSRCLR)
+		"""
+		weights = self._load_condition_weights()
+		removed = [seq for seq in self.conditions.weights if seq not in weights and seq in self.conditions.subscribed]
+		self.conditions.configure(weights)
+		if not self.connected or not self.websocket:
+			return
+
+		for seq in removed:
+			await self.send_message({'trnm': 'CNSRCLR', 'seq': seq}, self.token)
+			logger.info(f"🧹 조건검색 실시간 해제 (CNSRCLR): seq={seq}")
+		for seq, weight in weights.items():
+			if seq in self.conditions.subscribed:
+				continue
+			# 실시간 등록 요청 (CNSRREQ) - Git 히스토리 기반 수정 (seq, stex_tp 사용)
+			await self.send_message({
+				'trnm': 'CNSRREQ',
+				'seq': seq,           # 조건식 번호
+				'search_type': '1',   # 1: 초기조회 + 실시간 편입/이탈
+				'stex_tp': 'K'        # 0: 전체, 1: 코스피, 2: 코스닥 (K가 성공했음)
+			}, self.token)
+			self.conditions.subscribed.add(seq)
+			logger.info(f"✅ 조건검색 실시간 등록 요청 전송 (CNSRREQ): {self.conditions.label(seq)} (가중치 {weight:g})")
+
+	async def _on_ticks(self, response):
+		"""
+		REAL(실시간) / CNSRREQ(초기조회) 항목 처리
+		항목은 kiwoom.realtime에서 한 번 순회로 RealTick(code, price, rate, volume, strength)으로 해석
+		- REAL: 틱 버퍼에 넣기만 함 (반영은 _consume_ticks, 같은 종목은 최신 값으로 합침)
+		- CNSRREQ: 초기조회 1회이므로 바로 반영
+		"""
+		trnm = response.get('trnm')
+		items = response.get('data')
+		if trnm == 'REAL':
+			if not items:
+				return
+			ticks, events, account = split_real_items(items)
+			if account:
+				self._on_account_events(account)
+			if events:
+				self._on_condition_events(events)
+			if ticks:
+				self._ensure_consumer()
+				put = self.tick_buffer.put
+				for tick in ticks:
+					put(tick)
+			return
+
+		ticks = decode_items(trnm, items or ())
+		# [Multi-Condition] 초기조회 결과로 조건식 편입 종목 교체 (빠진 종목은 대기열에서도 제거)
+		seq = str(response.get('seq') or '').strip()
+		if seq:
+			_, left = self.conditions.on_snapshot(seq, [tick.code for tick in ticks])
+			self._drop_condition_candidates(left)
+			self._sync_condition_subscriptions()
+		if ticks:
+			await self._apply_ticks(trnm, ticks, len(items))
+
+	def _on_account_events(self, records):
+		"""
+		[Live Fill] 주문체결 / 잔고 실시간 (REAL type 00 / 04) - 메모리 잔고 즉시 갱신
+		체결분은 주문 디스패처 체결 판정, 매수 체결 확인 대기(pending_orders) 해제, 포지션 원장 재확인까지 바로 처리
+		(보유 목록에서 빠지는 매도 후처리는 다음 주기 update_held_stocks가 실시간 잔고로 수행)
+		"""
+		fills = self.live_account.apply(records)
+		for record in records:
+			# 취소 / 거부된 주문은 더 체결되지 않으므로 디스패처 체결 대기 해제
+			if isinstance(record, OrderExecution) and any(s in record.status for s in CLOSED_ORDER_STATUSES):
+				order_dispatcher.release(record.code, record.side, record.status)
+		if not fills:
+			return
+		added = False
+		for fill in fills:
+			order_dispatcher.observe_position(fill.code, fill.held_qty)
+			logger.info(f"[Live Fill] {'매수' if fill.side == 'buy' else '매도'} 체결 {fill.code} {fill.qty}주 @ {fill.price:,} -> 보유 {fill.held_qty}주")
+			if fill.side != 'buy':
+				continue
+			started = self.pending_orders.pop(fill.code, None)
+			if started is not None:
+				logger.info(f"[체결 확인] {fill.code}: 실시간 체결 확인 ({time.time() - started:.1f}초 소요)")
+			if fill.code not in self.purchased_stocks and fill.code not in self.recently_sold:
+				self.purchased_stocks.add(fill.code)
+				added = True
+		invalidate_positions()
+		if added:
+			asyncio.create_task(self.register_stocks_realtime(list(self.purchased_stocks)))
+
+	def _on_condition_events(self, events):
+		"""[Multi-Condition] 실시간 편입/이탈 (REAL type 02) - 편입은 대기열 등록, 이탈은 다른 조건식에도 없으면 제거"""
+		conditions = self.conditions
+		inserted = 0
+		left = []
+		for event in events:
+			if not conditions.on_event(event.seq, event.code, event.inserted):
+				continue
+			if not event.inserted:
+				left.append(event.code)
+			elif event.code not in self.purchased_stocks:
+				# 시세는 0B 체결 틱이 들어오면 갱신 (그 전까지 등락률 0으로 대기)
+				weight = conditions.weights.get(event.seq, 1.0)
+				self.candidate_queue.push(event.code, 0.0, {'condition': event.seq}, weight=weight)
+				inserted += 1
+		self._drop_condition_candidates(left)
+		logger.info(f"[Condition] 실시간 편입 {inserted} / 이탈 {len(left)} (대기열 {len(self.candidate_queue)}개)")
+		self._sync_condition_subscriptions()
+
+		if inserted:
+			target_cnt = self.target_cnt_cache or 5.0
+			current_cnt = len(self.purchased_stocks)
+			if current_cnt < target_cnt:
+				asyncio.create_task(self.process_candidates(current_cnt, target_cnt))
+
+	def _drop_condition_candidates(self, codes):
+		for code in codes:
+			if self.conditions.best(code) is None:
+				self.candidate_queue.discard(code)
+
+	def _sync_condition_subscriptions(self):
+		"""조건식 편입 종목을 낮은 우선순위로 체결(0B) 구독 - 등락률/체결강도를 받아 후보 점수 갱신"""
+		if self.connected and self.websocket:
+			asyncio.create_task(self.register_stocks_realtime(self.conditions.all_members(), group='conditions', priority=PRIORITY_CANDIDATE))
+		else:
+			self.subscriptions.set_group('conditions', self.conditions.all_members(), PRIORITY_CANDIDATE)
+
+	async def _apply_ticks(self, trnm, ticks, received, ages=None):
+		"""
+		해석된 틱을 현재가 캐시 / 캔들 / 매수 대기열에 반영하고, 빈 자리가 있으면 프로세서 가동
+		ages: 틱별 수신 후 경과 초 (틱 버퍼에서 꺼낸 경우, 가격 수신 시각을 소비 시각이 아닌 실제 수신 시각으로 기록)
+		"""
+		put_price = self.current_prices.put
+		received_at = time.time()
+		purchased = self.purchased_stocks
+		candidate_queue = self.candidate_queue
+		add_tick = candle_manager.add_tick
+		conditions = self.conditions
+		# 조건식 편입 종목을 알고 있으면 편입 종목만 후보 (보유 등 다른 구독 종목은 시세만 갱신)
+		tracking = conditions.tracking
+		added = 0
+		for i, tick in enumerate(ticks):
+			code = tick.code
+			if tick.price:
+				put_price(code, tick.price, received_at - ages[i] if ages else received_at)
+				# [Candle] 틱 데이터 추가
+				add_tick(code, tick.price)
+
+			# [Filter] 이미 보유 중인 종목은 대기열에 넣지 않음
+			if code in purchased:
+				continue
+			weight = 1.0
+			real_data = {}
+			if tracking:
+				source = conditions.best(code)
+				if source is None:
+					continue
+				real_data['condition'], weight = source
+			if tick.volume is not None: real_data['vol'] = tick.volume
+			if tick.strength is not None: real_data['strength'] = tick.strength
+			# 대기열에 등락률 + 추가데이터 등록 (같은 종목은 점수/수신 시각 갱신, 출처 조건식 가중치 반영)
+			candidate_queue.push(code, tick.rate, real_data, weight=weight)
+			added += 1
+
+		# 초기조회는 한 번이므로 INFO, 실시간(REAL)은 메시지마다 오므로 DEBUG 레벨일 때만
+		if trnm == 'CNSRREQ':
+			logger.info(f'[{trnm}] 조건식 성립 {received}개 수신 (대기열 추가 {added}개, 현재 총 대기: {len(candidate_queue)}개)')
+		elif self._debug_enabled():
+			rt_logger.debug(f'[{trnm}] 항목 {received}개 반영, 대기열 추가 {added}개 (현재 총 대기: {len(candidate_queue)}개)')
+
+		if added:
+			# [Trigger] 빈 자리가 있으면 프로세서 가동
+			target_cnt = self.target_cnt_cache or 5.0
+			current_cnt = len(purchased)
+			if current_cnt < target_cnt:
+				asyncio.create_task(self.process_candidates(current_cnt, target_cnt))
+
+	def _ensure_consumer(self):
+		if self.consume_task is None or self.consume_task.done():
+			self.consume_task = asyncio.create_task(self._consume_ticks())
+
+	async def _consume_ticks(self):
+		"""[Backpressure] 틱 버퍼 소비 루프 - 쌓인 만큼 한 번에 꺼내 반영 (배치 사이에 수신 루프에 양보)"""
+		buffer = self.tick_buffer
+		while True:
+			await buffer.wait()
+			drained = buffer.drain(with_age=True)
+			if not drained:
+				continue
+			ticks, ages = zip(*drained)
+			try:
+				await self._apply_ticks('REAL', ticks, len(ticks), ages)
+			except Exception as e:
+				logger.error(f'[TickBuffer] 틱 반영 중 오류: {type(e).__name__}: {e}')
+
+			if buffer.last_lag > TICK_LAG_WARN_SEC:
+				now = time.time()
+				if now - self._lag_warned_at > TICK_LAG_WARN_INTERVAL:
+					self._lag_warned_at = now
+					logger.warning(f'[TickBuffer] 실시간 처리 지연 {buffer.last_lag:.1f}초 - {buffer.format_stats()}')
+			await asyncio.sleep(0)
+
+	async def flush_ticks(self):
+		"""버퍼에 남은 틱을 즉시 모두 반영 (수신 루프 종료 시)"""
+		while len(self.tick_buffer):
+			ticks, ages = zip(*self.tick_buffer.drain(with_age=True))
+			await self._apply_ticks('REAL', ticks, len(ticks), ages)
+
+	async def _on_realreg(self, response):
+		"""REG / REMOVE 응답 (계좌 실시간 등록 응답이면 실시간 체결 연결 상태 반영)"""
+		ok = response.get('return_code') in (None, 0, '0')
+		grp_no = str(response.get('grp_no') or '')
+		if self._account_reg_sent and response.get('trnm') == 'REG' and grp_no in ('', ACCOUNT_GRP_NO):
+			self._account_reg_sent = False
+			if ok:
+				self.live_account.feed_up()
+				logger.info("[Live Fill] 주문체결 / 잔고 실시간 연결 -> REST 잔고 조회는 주기적 맞추기로 전환")
+			else:
+				self.live_account.feed_down()
+				logger.warning(f"[Live Fill] 계좌 실시간 등록 실패 -> REST 잔고 조회 유지: {response.get('return_msg')}")
+			return
+		if not ok:
+			logger.warning(f"[SetRealReg] {response.get('trnm')} 실패: {response.get('return_msg')}")
+
+	@staticmethod
+	def _debug_enabled():
+		return rt_logger.isEnabledFor(logging.DEBUG)
+
 	async def receive_messages(self):
-		"""서버에서 오는 메시지를 수신하여 출력합니다."""
+		"""서버에서 오는 메시지를 수신하여 trnm별 핸들러(self._handlers)로 전달합니다."""
 		logger.info("🚀 [RT_SEARCH] 메시지 수신 루프 시작")
+		handlers = self._handlers
+		loads = json.loads
 		while self.keep_running and self.connected and self.websocket:
 			raw_message = None
 			try:
 				# 서버로부터 수신한 메시지를 받음 (Lock으로 동시 접근 방지)
 				async with self.recv_lock:
 					raw_message = await self.websocket.recv()
-				# JSON 형식으로 파싱
-				if raw_message:
-					print(f"DEBUG: WebSocket Msg Received: {raw_message[:100]}...")
-					response = json.loads(raw_message)
+				if not raw_message:
+					continue
+				response = loads(raw_message)
 				self.last_msg_time = time.time()
-				
-				# [Debug] 서버 수신 데이터 확인
-				tr_code = response.get('trnm')
-				if tr_code not in ['PING', 'PONG']:
-					# 로그 과다 방지를 위해 너무 긴 데이터는 앞부분만 출력
-					msg_preview = str(response)
-					if len(msg_preview) > 300: msg_preview = msg_preview[:300] + "..."
-					logger.info(f"📩 [Recv] {tr_code}: {msg_preview}")
-
-				# 메시지 유형이 LOGIN일 경우 로그인 시도 결과 체크
-				if response.get('trnm') == 'LOGIN':
-					if response.get('return_code') != 0:
-						logger.error(f"로그인 실패하였습니다. : {response.get('return_msg')}")
-						await self.disconnect()
-					else:
-						logger.info('로그인 성공하였습니다.')
-						logger.info('조건검색 목록조회 패킷을 전송합니다.')
-						# 로그인 패킷
-						param = {
-							'trnm': 'CNSRLST'
-						}
-						await self.send_message(message=param)
-
-				elif response.get('trnm') == 'PING':
-					logger.debug(f'PING 메시지 수신: {response}')
-					await self.send_message(response)
-
-				# [Core Fix] 조건검색 목록(CNSRLST) 수신 시 -> 실시간 등록(CNSRREQ) 자동 수행
-				elif response.get('trnm') == 'CNSRLST':
-					logger.info(f"📋 조건검색 목록 수신: {len(response.get('data', []))}개")
-					
-					# 설정된 타겟 인덱스 (기본 0번)
-					target_idx = 0
-					try:
-						# from get_setting (이미 상단 import됨)
-						target_str = get_setting('target_condition_index', '0')
-						target_idx = int(target_str)
-					except: pass
-					
-					# 목록에서 타겟 인덱스 찾기
-					cond_list = response.get('data', [])
-					if cond_list and len(cond_list) > target_idx:
-						target_cond = cond_list[target_idx]
-						# 데이터 형식: ["0", "오늘폭등"] or ["0^오늘폭등"] (API에 따라 다름, 리스트로 가정)
-						# 아까 로그: [["0","오늘폭등"],["1","불기둥"]]
-						
-						cond_idx = target_cond[0]
-						cond_name = target_cond[1]
-						
-						logger.info(f"🎯 타겟 조건식 선택: [{cond_idx}] {cond_name}")
-						
-						# 실시간 등록 요청 (CNSRREQ)
-						# Git 히스토리 기반 수정 (seq, stex_tp 사용)
-						req_param = {
-							'trnm': 'CNSRREQ',
-							'seq': str(cond_idx), # 조건식 인덱스
-							'search_type': '1',   # 1: 실시간
-							'stex_tp': 'K'        # 0: 전체, 1: 코스피, 2: 코스닥 (K가 성공했음)
-						}
-						await self.send_message(message=req_param)
-						logger.info(f"✅ 조건검색 실시간 등록 요청 전송 (CNSRREQ): {cond_name} (seq={cond_idx})")
-					else:
-						logger.warning(f"⚠️ 타겟 조건식(Index {target_idx})을 찾을 수 없습니다. (목록 개수: {len(cond_list)})")
+				trnm = response.get('trnm')
 
-				if response.get('trnm') != 'PING':
-					# logger.debug(f'실시간 시세 서버 응답 수신: {response}')
+				# [Debug] 서버 수신 데이터 확인 (DEBUG 레벨일 때만 문자열 생성)
+				if trnm != 'PING' and self._debug_enabled():
+					rt_logger.debug(f"📩 [Recv] {trnm}: {raw_message[:300]}")
 
-						# [수정] REAL(실시간) 및 CNSRREQ(초기조회) 모두 처리
-						if response.get('trnm') in ['REAL', 'CNSRREQ'] and response.get('data'):
-							items = response['data']
-							trnm = response.get('trnm')
-							
-							if items:
-								logger.info(f'[{trnm}] 조건식 성립 {len(items)}개 수신')
-								
-								parsed_items = []
-								for item in items:
-									try:
-										jmcode = None
-										rate = 0.0
-										real_data = {}
-										
-										# 1. 종목 코드 추출
-										if trnm == 'REAL' and 'values' in item:
-											v = item['values']
-											jmcode = v.get('9001', v.get('stk_cd'))
-											# 등락률 (FID 12 또는 11)
-											rate = float(v.get('12', v.get('11', v.get('pl_rt', 0.0))))
-											# 현재가 저장 (FID 10)
-											raw_price = v.get('10')
-											if raw_price:
-												price = abs(int(str(raw_price).replace(',','')))
-												if jmcode: self.current_prices[jmcode.replace('A','')] = price
-											
-											# 추가 실시간 팩터 추출 (거래량 FID 13, 체결강도 FID 15 등)
-											try:
-												if v.get('13'): real_data['vol'] = int(str(v.get('13')).replace(',',''))
-												if v.get('15'): real_data['strength'] = float(str(v.get('15')).replace(',',''))
-											except: pass
-										else:
-											jmcode = item.get('stk_cd', item.get('jmcode', item.get('9001')))
-											rate = float(item.get('12', item.get('11', item.get('pl_rt', 0.0))))
-											# 초기조회(CNSRREQ) 시에도 데이터가 있으면 추출
-											try:
-												if item.get('13'): real_data['vol'] = int(str(item.get('13')).replace(',',''))
-												if item.get('15'): real_data['strength'] = float(str(item.get('15')).replace(',',''))
-											except: pass
-
-										if jmcode:
-											jmcode = str(jmcode).replace('A', '')
-											
-											# [Realtime Update] 보유 종목이면 현재가/수익률 즉시 갱신 (반응 속도 향상)
-											if jmcode in self.purchased_stocks and price > 0:
-												# 현재가 갱신 (봇 전역 공유용 current_prices는 위에서 갱신됨)
-												# 추가로 check_n_sell 등에서 참조하는 메모리 객체가 있다면 갱신 필요
-												pass
-
-											# [Filter] 이미 보유 중인 종목은 대기열에 넣지 않음
-											if jmcode not in self.purchased_stocks:
-												parsed_items.append({'code': jmcode, 'rate': rate})
-												# 대기열에 [등락률, 추가데이터] 형태로 저장
-												self.candidate_queue[jmcode] = (rate, real_data)
-									except: continue
-								
-								if parsed_items:
-									logger.info(f"[Queue] {len(parsed_items)}개 신규 대기열 추가 (현재 총 대기: {len(self.candidate_queue)}개)")
-									
-									# [Trigger] 빈 자리가 있으면 프로세서 가동
-									target_cnt = self.target_cnt_cache or 5.0
-									current_cnt = len(self.purchased_stocks)
-									if current_cnt < target_cnt:
-										asyncio.create_task(self.process_candidates(current_cnt, target_cnt))
-							else:
-								logger.warning(f'[{trnm}] 수신된 데이터(items)가 비어있습니다.')
-								logger.error(f"대기열 프로세서 트리거 실패: {e}")
+				handler = handlers.get(trnm)
+				if handler is not None:
+					await handler(response)
 
 			except websockets.ConnectionClosed:
 				logger.warning('Connection closed by the server')
-				self.connected = False
-				if self.websocket:
-					try:
-						await self.websocket.close()
-					except:
-						pass
-				
-				# 연결 종료 콜백 호출
-				if self.on_connection_closed:
-					try:
-						await self.on_connection_closed()
-					except Exception as e:
-						logger.error(f'콜백 실행 중 오류: {e}')
+				await self._connection_lost('closed')
 				break  # 루프 종료
 			
 			except json.JSONDecodeError as e:
@@ -313,26 +537,53 @@ class RealTimeSearch:
 							break
 						else:
 							logger.error(f'연결 확인 실패: {e}')
-							self.connected = False
-							if self.on_connection_closed:
-								try:
-									await self.on_connection_closed()
-								except Exception as callback_e:
-									logger.error(f'콜백 실행 중 오류: {callback_e}')
+							await self._connection_lost('ping')
 							break
 					except Exception as ping_e:
 						logger.error(f'연결 확인 실패: {ping_e}')
-						self.connected = False
-						if self.on_connection_closed:
-							try:
-								await self.on_connection_closed()
-							except Exception as callback_e:
-								logger.error(f'콜백 실행 중 오류: {callback_e}')
+						await self._connection_lost('ping')
 						break  # 루프 종료
 				else:
 					logger.error('websocket이 None입니다. 루프 종료')
 					break  # 루프 종료
+
+		# 수신 루프가 끝나도 이미 받은 틱은 반영 (재접속 전까지 최신 가격 유지)
+		try:
+			await self.flush_ticks()
+		except Exception as e:
+			logger.error(f'[TickBuffer] 잔여 틱 반영 실패: {e}')
 					
+	async def _close_socket(self):
+		self.connected = False
+		self.live_account.feed_down() # 계좌 실시간이 끊기면 REST 잔고 조회를 매 주기로 되돌림
+		self._account_reg_sent = False
+		if self.websocket:
+			try:
+				await self.websocket.close()
+			except:
+				pass
+
+	async def _connection_lost(self, reason, since=None):
+		"""
+		[Reconnect] 연결 끊김 처리 - 끊김 구간 시작 기록, 가격 캐시의 연결 구간 종료
+		자동 갱신 루프(supervisor)가 돌고 있으면 재접속은 그쪽에 맡기고, 아니면 기존처럼 종료 콜백(전체 재시작) 호출
+		"""
+		self.gaps.start(reason, since)
+		self.current_prices.feed_down()
+		self.logged_in.clear()
+		await self._close_socket()
+
+		if self.refresh_task and not self.refresh_task.done() and self.keep_running:
+			self._supervisor_wake.set()
+			logger.warning(f"[Reconnect] 연결 끊김({reason}) -> 재접속 대기 (현재가 {len(self.current_prices)}종목은 재연결 전까지 오래된 값으로 취급)")
+			return
+		# 연결 종료 콜백 호출
+		if self.on_connection_closed:
+			try:
+				await self.on_connection_closed()
+			except Exception as e:
+				logger.error(f'콜백 실행 중 오류: {e}')
+
 	def update_held_stocks(self, current_stocks_list):
 		"""
 		외부(bot.py 등)에서 주기적으로 조회한 잔고 리스트를 받아
@@ -471,6 +722,7 @@ class RealTimeSearch:
 		# 락 획득
 		await self.candidates_lock.acquire()
 		self.is_processing_candidates = True
+		start_version = self.candidate_queue.version
 		
 		try:
 			# [Priority] 2.0초 -> 0.1초 단축 (빠른 매수 전환)
@@ -490,6 +742,7 @@ class RealTimeSearch:
 				self.target_cnt_cache = float(get_setting('target_stock_count', 5.0))
 			except:
 				pass
+			self._configure_candidate_queue()
 			target_cnt = self.target_cnt_cache
 			if target_cnt < 1: target_cnt = 1
 
@@ -524,38 +777,37 @@ class RealTimeSearch:
 				logger.error(f"매수 전 잔고 체크 실패 (안전 위해 중단): {e}")
 				return
 			
+			# [TTL] 오래된 신호 제거
+			expired = self.candidate_queue.expire()
+			if expired:
+				logger.info(f"[Queue] 유효 시간이 지난 후보 {expired}개 제거")
+
 			if not self.candidate_queue:
 				logger.warning("[Buffering] 대기열이 비어있어 매수 진행 불가 (조건검색 결과 없음 or 수신 대기 중)")
 				return 
 
 			if needed <= 0:
-				logger.info(f"[Buffering] 목표 수량 달성 완료 ({current_cnt}/{int(target_cnt)}) - 대기열({len(self.candidate_queue)}개) 초기화")
-				self.candidate_queue.clear() # 꽉 찼으면 대기열 비우고 종료 (다음 신호 대기)
+				# 대기열은 유지 (자리가 나면 유효 시간 안의 후보부터 사용, 오래된 후보는 TTL로 만료)
+				logger.info(f"[Buffering] 목표 수량 달성 완료 ({current_cnt}/{int(target_cnt)}) - 대기열({len(self.candidate_queue)}개) 유지")
 				return
 
 			logger.info(f"[Selection] 현재 {current_cnt}개 / 목표 {int(target_cnt)}개 -> 대기열({len(self.candidate_queue)}개) 중 상위 {needed}개 선별")
 			
-			# Priority Sort (Rate Descending)
-			sorted_items = []
-			if isinstance(self.candidate_queue, dict):
-				# [Priority Logic] 등락률(rate) + 체결강도(strength/100) 복합 점수로 정렬
-				# 가장 '쎈' 종목(힘과 상승폭의 결합)을 우선 선정합니다.
-				def get_score(item):
-					rate, data = item[1] if isinstance(item[1], tuple) else (item[1], {})
-					strength = data.get('strength', 100.0) # 없으면 기본 100%
-					return rate + (strength / 100.0)
-				
-				sorted_items = sorted(self.candidate_queue.items(), key=get_score, reverse=True)
-			else:
-				sorted_items = [(x, (0, {})) for x in self.candidate_queue]
-			
-			# Select All
-			candidates_info = [(x[0], x[1][1] if isinstance(x[1], tuple) else {}) for x in sorted_items]
-			
-			# Remove Selected & Clear Queue
-			self.candidate_queue.clear()
-			
-			for code, r_data in candidates_info:
+			# [Priority] 감쇠 점수(등락률 + 체결강도/100) 상위부터 하나씩 꺼냄 (전체 정렬 없음)
+			while True:
+				# [중요] 루프 도중에도 다른 스레드/비동기 작업에 의해 목표 수량이 채워졌는지 확인 (매수 진행 중인 종목 포함)
+				current_total_cnt = len(self.purchased_stocks) + len(self.buying_stocks)
+				if current_total_cnt >= target_cnt:
+					logger.info(f"[Selection 중단] 목표 수량 달성 ({len(self.purchased_stocks)} 보유 + {len(self.buying_stocks)} 진행 / {target_cnt} 목표) - 추가 매수 중단")
+					break
+
+				picked = self.candidate_queue.pop()
+				if picked is None:
+					break
+				code, _, r_data = picked
+				if r_data.get('condition') is not None:
+					logger.info(f"[Selection] {code}: 출처 조건식 {self.conditions.label(r_data['condition'])}")
+
 				# [Fix] 이미 보유 중인 종목은 신규 진입 대상에서 제외
 				# 단, 물타기(Watering)를 위해 check_n_buy로 진입은 허용해야 함
 				if code in self.purchased_stocks:
@@ -565,12 +817,6 @@ class RealTimeSearch:
 				# 매수 진행 중 체크
 				if code in self.buying_stocks: continue
 				
-				# [중요] 루프 도중에도 다른 스레드/비동기 작업에 의해 목표 수량이 채워졌는지 확인 (매수 진행 중인 종목 포함)
-				current_total_cnt = len(self.purchased_stocks) + len(self.buying_stocks)
-				if current_total_cnt >= target_cnt:
-					logger.info(f"[Selection 중단] 목표 수량 달성 ({len(self.purchased_stocks)} 보유 + {len(self.buying_stocks)} 진행 / {target_cnt} 목표) - 추가 매수 중단")
-					break
-				
 				# [Pending Check] 검증 대기 중인 종목도 보유 수량으로 간주하여 중복 매수 방지
 				if code in self.pending_orders:
 					logger.info(f"[Selection Skip] {code}: 체결 검증 대기 중이므로 매수 스킵")
@@ -591,22 +837,18 @@ class RealTimeSearch:
 							
 						# [Fix] API 호출 최적화
 						try:
-							from kiwoom_adapter import get_api, get_account_data, get_balance
-							api = get_api()
-							loop = asyncio.get_event_loop()
+							from kiwoom_adapter import async_get_account_data, async_get_balance, async_get_outstanding_orders
 							
-							c_stocks_data = await loop.run_in_executor(None, get_account_data, 'N', '', self.token)
+							# 세 조회는 서로 독립적이므로 동시에 요청 (호출 간격은 kiwoom.rate_limiter가 조절)
+							c_stocks_data, c_balance_raw, out_orders = await asyncio.gather(
+								async_get_account_data(self.token),
+								async_get_balance(self.token),
+								async_get_outstanding_orders(self.token))
 							c_stocks = c_stocks_data[0] if c_stocks_data else []
-							await asyncio.sleep(0.5)
-							
-							c_balance_raw = await loop.run_in_executor(None, get_balance, 'N', '', self.token)
 							c_balance_data = {
 								'deposit': c_balance_raw[2],
 								'net_asset': c_balance_raw[1]
 							} if c_balance_raw else None
-							await asyncio.sleep(0.5)
-							
-							out_orders = await loop.run_in_executor(None, api.get_outstanding_orders, self.token)
 						except Exception as api_err:
 							logger.error(f"[API Error] 매수 전 데이터 조회 실패: {api_err}")
 							c_stocks, c_balance_data, out_orders = None, None, None
@@ -638,8 +880,8 @@ class RealTimeSearch:
 			self.is_processing_candidates = False
 			if self.candidates_lock.locked():
 				self.candidates_lock.release()
-			# 처리 후에도 대기열에 남은게 있다면? (위에서 clear 했으므로 없음)
-			if self.candidate_queue:
+			# 처리 중 새 신호가 들어왔으면 재가동 (남아 있는 기존 후보만으로는 재가동하지 않음)
+			if self.candidate_queue and self.candidate_queue.version != start_version:
 				logger.info(f"[Residual] 처리 중 유입된 대기열({len(self.candidate_queue)}개) 존재 -> 프로세서 재가동")
 				# 재귀적으로 호출하지 않고 Task 생성 (Stack overflow 방지)
 				asyncio.create_task(self.process_candidates(len(self.purchased_stocks), target_cnt))
@@ -656,6 +898,7 @@ class RealTimeSearch:
 			finally:
 				self.connected = False
 				self.websocket = None
+				self.live_account.feed_down()
 				logger.info('Disconnected from WebSocket server')
 
 	async def start(self, token):
@@ -731,18 +974,11 @@ class RealTimeSearch:
 				logger.error(f"목표 종목 수 로드 실패(기본값 5 사용): {e}")
 				self.target_cnt_cache = 5.0
 				
-			seq = get_setting('search_seq', '0')
-			
-			# 실시간 항목 등록
+			# 실시간 항목 등록 (설정된 조건식 전부, CNSRLST 응답에서 이미 등록했으면 건너뜀)
 			await asyncio.sleep(1)
-			await self.send_message({ 
-				'trnm': 'CNSRREQ', # 서비스명
-				'seq': seq, # 조건검색식 일련번호
-				'search_type': '1', # 조회타입
-				'stex_tp': 'K', # 거래소구분
-			}, token)
+			await self.subscribe_conditions()
 			
-			logger.info(f'실시간 검색이 시작되었습니다. seq: {seq}')
+			logger.info(f'실시간 검색이 시작되었습니다. 조건식: {list(self.conditions.weights)}')
 			
 			# [New] 자동 갱신 태스크 시작
 			self.refresh_task = asyncio.create_task(self._auto_refresh_loop())
@@ -755,8 +991,8 @@ class RealTimeSearch:
 			logger.error(f'실시간 검색 시작 실패: {e}')
 			return False
 
-	async def request_condition_search(self):
-		"""조건검색 목록을 즉시 재요청합니다."""
+	async def request_condition_search(self, seqs=None):
+		"""조건검색 결과를 즉시 다시 조회합니다 (실시간 미등록 조건식은 등록, 이후 초기조회 search_type 0)."""
 		# [Rate Limit] 너무 잦은 요청 방지 (2초)
 		if not hasattr(self, 'last_cnsrreq_time'):
 			self.last_cnsrreq_time = 0
@@ -770,25 +1006,18 @@ class RealTimeSearch:
 
 		try:
 			self.last_cnsrreq_time = time.time()
-			seq = get_setting('search_seq', '0')
-			logger.info(f"🔍 [Condition Search Request] 조건식({seq}) 재요청 전송...")
-			
-			# 1. 실시간 검색 요청 (기존)
-			await self.send_message({ 
-				'trnm': 'CNSRREQ', 
-				'seq': seq, 
-				'search_type': '1', 
-				'stex_tp': 'K', 
-			}, self.token)
-			
+			# 1. 실시간 등록 (이미 등록된 조건식은 건너뜀)
+			await self.subscribe_conditions()
+
 			# 2. 일반 조건검색 요청 (보완용 - 종목 리스트 즉시 수신 목적)
-			await asyncio.sleep(0.5)
-			await self.send_message({ 
-				'trnm': 'CNSRREQ', 
-				'seq': seq, 
-				'search_type': '0', 
-				'stex_tp': 'K', 
-			}, self.token)
+			for seq in (seqs or list(self.conditions.weights)):
+				logger.info(f"🔍 [Condition Search Request] 조건식 {self.conditions.label(seq)} 재조회 전송...")
+				await self.send_message({ 
+					'trnm': 'CNSRREQ', 
+					'seq': seq, 
+					'search_type': '0', 
+					'stex_tp': 'K', 
+				}, self.token)
 			
 		except Exception as e:
 			logger.error(f"조건검색 요청 실패: {e}")
@@ -827,6 +1056,14 @@ class RealTimeSearch:
 				except asyncio.CancelledError:
 					pass
 			self.receive_task = None
+
+			if self.consume_task and not self.consume_task.done():
+				self.consume_task.cancel()
+				try:
+					await self.consume_task
+				except asyncio.CancelledError:
+					pass
+			self.consume_task = None
 			
 			await self.disconnect()
 			
@@ -893,7 +1130,7 @@ class RealTimeSearch:
 					if code not in self.purchased_stocks and code not in self.buying_stocks:
 						# 무조건 높은 등락률로 매수 유도
 						rate = random.uniform(3.0, 7.0)
-						self.candidate_queue[code] = rate
+						self.candidate_queue.push(code, rate)
 						logger.info(f'🎮 {code} ({rate:.1f}%) -> Mock 매수 대기열 등록')
 
 				# [Test] 보유 종목도 매 루프마다 검사 (물타기 테스트용)
@@ -902,7 +1139,7 @@ class RealTimeSearch:
 					p_rate = random.uniform(-5.0, 5.0)
 					# 등락률보다는, 그냥 큐에 넣어주면 check_n_buy가 알아서 판단함
 					if p_code not in self.candidate_queue:
-						self.candidate_queue[p_code] = p_rate
+						self.candidate_queue.push(p_code, p_rate)
 						# logger.info(f"🎮 [Self-Check] 보유종목 {p_code} 검증 큐 투입")
 				
 				if self.candidate_queue:
@@ -918,10 +1155,76 @@ class RealTimeSearch:
 				await asyncio.sleep(10)
 		logger.info('🎮 Mock 루프 종료')
 
+	async def _reconnect(self):
+		"""
+		[Reconnect] 재접속 supervisor - 지터 지수 백오프로 재연결 → 로그인 확인 → 구독 복구
+		1) 연결 + 수신 태스크 재시작 후 LOGIN 응답 대기 (실패 2회부터 토큰 재발급)
+		2) 실시간 시세(REG) / 조건식(CNSRREQ) 재등록 - 끊기기 전과 같은 집합
+		3) 잔고 동기화
+		RECONNECT_MAX_ATTEMPTS번 연속 실패하면 종료 콜백(전체 재시작)으로 넘김
+		"""
+		self.reconnecting = True
+		try:
+			while self.keep_running:
+				if self.backoff.attempts >= RECONNECT_MAX_ATTEMPTS:
+					logger.error(f"[Reconnect] {self.backoff.attempts}회 연속 재접속 실패 -> 전체 재시작으로 전환")
+					self.backoff.reset()
+					if self.on_connection_closed:
+						asyncio.create_task(self.on_connection_closed())
+					return False
+
+				delay = self.backoff.next()
+				logger.warning(f"[Auto Reconnect] {delay:.1f}초 후 소켓 연결 복구 시도 ({self.backoff.attempts}회차, 끊김 {self.gaps.current():.1f}초째)")
+				await asyncio.sleep(delay)
+
+				if self.backoff.attempts > 2:
+					try:
+						token = await asyncio.get_event_loop().run_in_executor(None, get_token)
+						if token:
+							self.token = token
+					except Exception as e:
+						logger.error(f"[Reconnect] 토큰 재발급 실패: {e}")
+
+				if self.receive_task and not self.receive_task.done():
+					self.receive_task.cancel()
+				await self.connect(self.token)
+				if not self.connected:
+					continue
+
+				# 로그인 응답은 수신 루프가 받으므로 먼저 재시작
+				self.receive_task = asyncio.create_task(self.receive_messages())
+				try:
+					await asyncio.wait_for(self.logged_in.wait(), timeout=RECONNECT_LOGIN_TIMEOUT)
+				except asyncio.TimeoutError:
+					logger.error("[Reconnect] 로그인 응답 없음 -> 재시도")
+					await self._close_socket()
+					continue
+				if not self.connected:
+					continue
+
+				logger.info("[Auto Reconnect] 소켓 재연결 성공 -> 실시간 시세 / 조건식 구독 복구")
+				self.backoff.reset()
+				self.last_msg_time = time.time()
+
+				# 실시간 시세 / 조건식 재등록 (connect()에서 등록 상태를 비웠으므로 같은 집합 전체 재등록)
+				await self.register_stocks_realtime(list(self.purchased_stocks))
+				self._sync_condition_subscriptions()
+				await self.subscribe_conditions()
+
+				# 잔고 동기화 (선택적)
+				try:
+					raw_stocks = await asyncio.get_event_loop().run_in_executor(None, get_my_stocks, self.token)
+					if raw_stocks: self.update_held_stocks(raw_stocks)
+				except: pass
+				return True
+			return False
+		finally:
+			self.reconnecting = False
+
 	async def _auto_refresh_loop(self):
 		"""
 		[New] 실시간 조건검색 재요청 및 연결 관리 루프 (Connection Manager)
-		Websocket 연결이 끊기거나 좀비 상태(데이터 수신 없음)가 되면 자동으로 복구합니다.
+		Websocket 연결이 끊기거나 좀비 상태(데이터 수신 없음)가 되면 _reconnect()로 복구합니다.
 		"""
 		logger.info("[Auto Refresh] 연결 관리 및 자동 갱신 루프 시작")
 		while self.keep_running:
@@ -929,59 +1232,36 @@ class RealTimeSearch:
 				# 1. 연결 상태 점검 및 복구
 				is_alive = self.connected and self.websocket and not getattr(self.websocket, 'closed', False)
 
-				
-				# [Zombie Check] 연결은 되어있으나 데이터가 30초 이상 안 들어오면 강제 재접속
+				# [Zombie Check] 연결은 되어있으나 데이터가 ZOMBIE_TIMEOUT_SEC 이상 안 들어오면 강제 재접속
 				last_time = getattr(self, 'last_msg_time', 0)
-				# last_msg_time이 0이면(시작 직후) 패스, 값이 있는데 30초 지났으면 좀비
-				if is_alive and last_time > 0 and (time.time() - last_time > 30):
-					logger.warning(f"[Zombie Socket] 30초간 데이터 수신 없음 (Last: {time.time()-last_time:.1f}s ago) -> 강제 재접속")
-					await self.websocket.close()
+				# last_msg_time이 0이면(시작 직후) 패스, 값이 있는데 시간이 지났으면 좀비 (끊김 시작은 마지막 수신 시각)
+				if is_alive and last_time > 0 and (time.time() - last_time > ZOMBIE_TIMEOUT_SEC):
+					logger.warning(f"[Zombie Socket] {ZOMBIE_TIMEOUT_SEC:.0f}초간 데이터 수신 없음 (Last: {time.time()-last_time:.1f}s ago) -> 강제 재접속")
+					await self._connection_lost('zombie', since=last_time)
 					is_alive = False # 아래 재접속 로직 진입
-				
+
 				if not is_alive:
-					logger.warning("[Auto Reconnect] 소켓 연결 복구 시도...")
-					self.connected = False
-					
-					# 재연결
-					await self.connect(self.token)
-					
-					if self.connected:
-						logger.info("[Auto Reconnect] 소켓 재연결 성공 -> 수신 태스크 및 조건식 복구")
-						
-						# 1) 수신 태스크 재시작
-						if self.receive_task: self.receive_task.cancel()
-						self.receive_task = asyncio.create_task(self.receive_messages())
-						
-						# 2) 조건식 재등록 (CNSRREQ)
-						await asyncio.sleep(1)
-						seq = get_setting('search_seq', '0')
-						await self.send_message({ 
-							'trnm': 'CNSRREQ', 
-							'seq': seq, 
-							'search_type': '1', 
-							'stex_tp': 'K', 
-						}, self.token)
-						
-						# 3) 잔고 동기화 (선택적)
-						from kiwoom_adapter import fn_kt00004 as get_my_stocks
-						try:
-							raw_stocks = await asyncio.get_event_loop().run_in_executor(None, get_my_stocks, self.token)
-							if raw_stocks: self.update_held_stocks(raw_stocks)
-						except: pass
-						
-						# 4) 통신 시간 갱신 (좀비 방지)
-						self.last_msg_time = time.time()
-					else:
-						logger.error("[Auto Reconnect] 재연결 실패. 5초 후 재시도")
-						await asyncio.sleep(5)
-						continue
+					self.gaps.start('closed')
+					self.current_prices.feed_down()
+					await self._reconnect()
+					continue
 
-				# 2. 정상 연결 상태 -> 갱신 요청 (Keep-Alive 성격)
+				# 2. 정상 연결 상태 -> 조건식 구성 반영 (편입/이탈은 실시간 알림으로 받음)
 				if self.connected:
-					# 5초마다 조건검색 재요청 (서버가 잊지 않게)
-					await self.request_condition_search()
+					await self.subscribe_conditions()
+					# 실시간 편입/이탈 알림이 한동안 없는 조건식만 초기조회로 다시 맞춤 (예전 5초 주기 재요청 대체)
+					stale = [seq for seq in self.conditions.weights if self.conditions.needs_refresh(seq)]
+					if stale:
+						await self.request_condition_search(stale)
 				
-				await asyncio.sleep(5) 
+				# 5초 대기 (끊김이 감지되면 바로 깨어나 재접속)
+				try:
+					await asyncio.wait_for(self._supervisor_wake.wait(), timeout=5)
+				except asyncio.TimeoutError:
+					pass
+				self._supervisor_wake.clear()
+			except asyncio.CancelledError:
+				raise
 			except Exception as e:
 				logger.error(f"[Auto Refresh] 루프 오류: {e}")
 				await asyncio.sleep(5)
@@ -1,6 +1,7 @@
 from logger import logger
 from utils import log_trading_event
-from kiwoom_adapter import get_my_stocks, sell_stock
+from kiwoom_adapter import get_my_stocks
+from order_dispatcher import order_dispatcher
 
 def sell_all_stocks(token=None):
 	"""보유 중인 모든 종목을 시장가로 매도하며, 완벽하게 매도될 때까지 재시도합니다."""
@@ -33,8 +34,9 @@ def sell_all_stocks(token=None):
 			else:
 				tel_send(f"🔄 전량 매도 재시도 ({retry_count}/{max_retries}) - 남은 종목: {len(my_stocks)}개")
 
-			# 3. 각 종목 매도 주문
+			# 3. 각 종목 매도 주문 (주문 큐에 한꺼번에 넣고 응답은 모아서 확인)
 			current_round_sold = False
+			tickets = []
 			for stock in my_stocks:
 				stock_code = stock['stk_cd'].replace('A', '')
 				stock_name = stock['stk_nm']
@@ -45,8 +47,16 @@ def sell_all_stocks(token=None):
 
 				logger.info(f"{stock_name}({stock_code}) {qty}주 매도 시도...")
 				
-				# 시장가 매도 주문
-				return_code, return_msg = sell_stock(stock_code, str(qty), token=token)
+				# 시장가 매도 주문 (같은 종목 매도가 이미 전송 중이면 그 주문에 맡김)
+				ticket = order_dispatcher.submit_sell(stock_code, qty, token=token, source='전체매도', held_before=qty, join=False)
+				if ticket is None:
+					logger.info(f"{stock_name}({stock_code}) 매도 주문이 이미 전송 중 - 건너뜀")
+					continue
+				tickets.append((stock, stock_code, stock_name, qty, ticket))
+				# 호출 간격은 kiwoom.rate_limiter가 조절
+
+			for stock, stock_code, stock_name, qty, ticket in tickets:
+				return_code, return_msg = ticket.wait()
 				
 				# [Fix] SUCCESS 또는 0 모두 성공으로 간주
 				if str(return_code) in ['0', 'SUCCESS', '0000', 'OK']:
@@ -71,8 +81,6 @@ def sell_all_stocks(token=None):
 				else:
 					msg = f"❌ {stock_name} 매도 실패: {return_msg}"
 					logger.error(msg)
-					
-				time.sleep(0.2) # 과도한 API 호출 방지
 
 			# 매도 주문 후 체결 대기 (2초)
 			time.sleep(2)
@@ -1,35 +1,22 @@
-import requests
-import json
 from config import host_url
 from login import fn_au10001 as get_token
 from get_setting import get_setting
 from logger import logger
+from kiwoom.http_session import post as http_post
+from stock_master import stock_master, get_stock_name
 
 # 주식기본정보요청
 def fn_ka10001(stk_cd, cont_yn='N', next_key='', token=None):
-	# [Mock Server Support] Mock 모드 체크
+	# [Stock Master] 종목 마스터(메모리) 우선 조회 - 마스터에 있으면 I/O 없음
+	name = get_stock_name(stk_cd, default='')
+	if name:
+		return name
+
+	# [Mock Server Support] Mock 모드는 마스터(mock_stocks / stocks.json)가 전부이므로 코드를 이름 대신 반환
 	use_mock = get_setting('use_mock_server', False)
-	
 	if use_mock:
-		try:
-			# Mock 데이터 로드 (stocks.json)
-			import os
-			base_dir = os.path.dirname(os.path.abspath(__file__))
-			stocks_file = os.path.join(base_dir, 'kiwoom', 'mock_data', 'stocks.json')
-			
-			if os.path.exists(stocks_file):
-				with open(stocks_file, 'r', encoding='utf-8') as f:
-					stocks = json.load(f)
-					if stk_cd in stocks:
-						name = stocks[stk_cd]['name']
-						# logger.info(f"🎮 Mock 종목정보 조회: {name}({stk_cd})")
-						return name
-			
-			logger.warning(f"🎮 Mock 종목정보 없음: {stk_cd}")
-			return stk_cd # 검색 실패 시 코드를 이름 대신 반환
-		except Exception as e:
-			logger.error(f"🎮 Mock 종목정보 조회 오류: {e}")
-			return stk_cd
+		logger.warning(f"🎮 Mock 종목정보 없음: {stk_cd}")
+		return stk_cd
 
 	# 실제 모드: 기존 API 호출
 	endpoint = '/api/dostk/stkinfo'
@@ -48,8 +35,11 @@ def fn_ka10001(stk_cd, cont_yn='N', next_key='', token=None):
 	}
 
 	try:
-		response = requests.post(url, headers=headers, json=params)
-		return response.json()['stk_nm']
+		response = http_post(url, headers=headers, json=params)
+		name = response.json()['stk_nm']
+		# 마스터에 없던 종목(신규 상장 등)은 다음 조회부터 메모리에서 응답
+		stock_master.put(stk_cd, name)
+		return name
 	except Exception as e:
 		logger.error(f"주식정보 조회 실패: {e}")
 		return stk_cd
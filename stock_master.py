@@ -0,0 +1,279 @@
+"""
+종목 마스터 (전 종목 코드 / 종목명 / 시장 / 호가단위 / 상하한가)
+
+종목명 조회(fn_ka10001)가 실전 모드에서는 종목마다 REST 호출, Mock 모드에서는 매번 JSON 파일을 다시 읽던 것을
+SQLite 테이블(stock_master) + 프로세스 메모리 dict로 대체합니다.
+- 시작 시 한 번 테이블에서 일괄 로드, 거래일이 바뀌면 키움 종목정보 리스트(ka10099)로 다시 채움
+  (Mock 모드는 mock_stocks 테이블 / mock_data/stocks.json)
+- 조회는 dict 조회 (I/O 없음), 거래일 확인은 STOCK_MASTER_CHECK_INTERVAL초마다 한 번
+- 호가단위 / 상하한가는 KRX 규칙으로 전일 종가(base_price)에서 계산하여 주문 가격 보정의 기준으로 사용
+"""
+import os
+import json
+import time
+import datetime
+import threading
+from collections import namedtuple
+from logger import logger
+from database_helpers import get_db_connection, get_setting
+
+# 거래일 변경 확인 주기(초)
+STOCK_MASTER_CHECK_INTERVAL = 60.0
+
+# ka10099 시장구분 (0: 코스피, 10: 코스닥)
+STOCK_MASTER_MARKETS = (('0', 'KOSPI'), ('10', 'KOSDAQ'))
+
+# 가격제한폭 (전일 종가 대비)
+PRICE_LIMIT_RATE = 0.30
+
+# KRX 호가단위 (주식, 가격 상한 미만 → 호가단위), ETF/ETN은 2,000원 미만 1원 / 이상 ETF_TICK_SIZE
+TICK_TABLE = ((2000, 1), (5000, 5), (20000, 10), (50000, 50), (200000, 100), (500000, 500))
+MAX_TICK_SIZE = 1000
+ETF_TICK_TABLE = ((2000, 1),)
+ETF_TICK_SIZE = 5
+
+StockInfo = namedtuple('StockInfo', ('code', 'name', 'market', 'is_etf', 'base_price', 'upper_limit', 'lower_limit'))
+
+def tick_size_for(price, is_etf=False):
+	"""가격대별 호가단위"""
+	for limit, tick in (ETF_TICK_TABLE if is_etf else TICK_TABLE):
+		if price < limit:
+			return tick
+	return ETF_TICK_SIZE if is_etf else MAX_TICK_SIZE
+
+def round_price(price, is_etf=False, direction='down'):
+	"""호가단위로 가격 맞춤 (direction: 'down' 내림 / 'up' 올림 / 'nearest' 반올림)"""
+	price = int(price)
+	if price <= 0:
+		return 0
+	tick = tick_size_for(price, is_etf)
+	if direction == 'up':
+		rounded = -(-price // tick) * tick
+		# 올림으로 다음 가격대에 들어가면 그 가격대 호가단위로 다시 맞춤
+		return rounded if rounded % tick_size_for(rounded, is_etf) == 0 else round_price(rounded, is_etf, 'up')
+	if direction == 'nearest':
+		return int(round(price / tick)) * tick
+	return (price // tick) * tick
+
+def price_limits(base_price, is_etf=False):
+	"""전일 종가 기준 (상한가, 하한가)"""
+	if base_price <= 0:
+		return 0, 0
+	upper = round_price(base_price * (1 + PRICE_LIMIT_RATE), is_etf, 'down')
+	lower = round_price(base_price * (1 - PRICE_LIMIT_RATE), is_etf, 'up')
+	return upper, lower
+
+def _make_info(code, name, market='', base_price=0, is_etf=False):
+	base_price = abs(int(float(str(base_price or 0).replace(',', '') or 0)))
+	upper, lower = price_limits(base_price, is_etf)
+	return StockInfo(str(code), name or str(code), market, bool(is_etf), base_price, upper, lower)
+
+def _ensure_table(conn):
+	conn.execute('''
+		CREATE TABLE IF NOT EXISTS stock_master (
+			code TEXT PRIMARY KEY,
+			name TEXT NOT NULL,
+			market TEXT,
+			is_etf INTEGER NOT NULL DEFAULT 0,
+			base_price INTEGER NOT NULL DEFAULT 0,
+			upper_limit INTEGER NOT NULL DEFAULT 0,
+			lower_limit INTEGER NOT NULL DEFAULT 0,
+			trade_date TEXT NOT NULL
+		)
+	''')
+	conn.commit()
+
+# ==================== 원천 데이터 ====================
+
+def _fetch_real_master(token):
+	"""
+	ka10099 종목정보 리스트 (시장별 연속조회)
+	전 시장을 다 받아야 반환, 오류 페이지(호출 제한 지속 포함)나 빈 시장이 있으면 예외 (일부만 받은 목록으로 테이블을 바꾸지 않도록)
+	"""
+	import config
+	from kiwoom.paginator import iter_pages
+
+	url = f"{config.host_url}/api/dostk/stkinfo"
+	headers = {
+		'Content-Type': 'application/json;charset=UTF-8',
+		'authorization': f'Bearer {token}',
+		'api-id': 'ka10099',
+	}
+	infos = []
+	for mrkt_tp, market in STOCK_MASTER_MARKETS:
+		count = 0
+		for page, _ in iter_pages(url, headers, {'mrkt_tp': mrkt_tp}):
+			if str(page.get('return_code', 0)) not in ('0', ''):
+				raise RuntimeError(f"{market} 조회 실패: {page.get('return_msg', '')} (return_code {page.get('return_code')})")
+			for row in page.get('list') or []:
+				code = str(row.get('code', '')).strip()
+				if not code:
+					continue
+				kind = f"{row.get('marketName', '')} {row.get('upName', '')}".upper()
+				is_etf = 'ETF' in kind or 'ETN' in kind
+				infos.append(_make_info(code, row.get('name', '').strip(), market, row.get('lastPrice', 0), is_etf))
+				count += 1
+		if not count:
+			raise RuntimeError(f"{market} 종목 없음")
+	return infos
+
+def _fetch_mock_master():
+	"""Mock 종목 (mock_stocks 테이블 + mock_data/stocks.json)"""
+	infos = {}
+	stocks_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kiwoom', 'mock_data', 'stocks.json')
+	if os.path.exists(stocks_file):
+		with open(stocks_file, 'r', encoding='utf-8') as f:
+			for code, data in json.load(f).items():
+				infos[code] = _make_info(code, data.get('name'), data.get('market', 'MOCK'), data.get('base_price', data.get('price', 0)))
+	with get_db_connection() as conn:
+		if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='mock_stocks'").fetchone():
+			for row in conn.execute('SELECT code, name, base_price FROM mock_stocks').fetchall():
+				infos[row['code']] = _make_info(row['code'], row['name'], 'MOCK', row['base_price'])
+	return list(infos.values())
+
+# ==================== 마스터 ====================
+
+class StockMaster:
+	"""
+	stock_master 테이블의 프로세스 메모리 사본
+	- get(): dict 조회, 거래일이 바뀌었으면 백그라운드 스레드로 재적재 (조회는 기존 데이터로 계속 응답)
+	- refresh(): 원천(키움/Mock)에서 다시 받아 테이블과 메모리 교체
+	"""
+	def __init__(self, check_interval=STOCK_MASTER_CHECK_INTERVAL):
+		self.check_interval = check_interval
+		self.trade_date = None
+		self._stocks = {}
+		self._loaded = False
+		self._last_check = 0.0
+		self._refreshing = False
+		self._lock = threading.Lock()
+
+	def __len__(self):
+		return len(self._stocks)
+
+	def _load_table(self):
+		with get_db_connection() as conn:
+			_ensure_table(conn)
+			rows = conn.execute('SELECT * FROM stock_master').fetchall()
+		self._stocks = {r['code']: StockInfo(r['code'], r['name'], r['market'], bool(r['is_etf']), r['base_price'], r['upper_limit'], r['lower_limit']) for r in rows}
+		# put()으로 추가된 행은 적재일이 비어 있어 거래일 판단에서 제외
+		self.trade_date = max((r['trade_date'] for r in rows if r['trade_date']), default=None)
+		self._loaded = True
+
+	def refresh(self, token=None, force=False):
+		"""
+		거래일이 바뀌었거나 force면 원천에서 다시 받아 저장
+		Returns: 적재된 종목 수
+		"""
+		with self._lock:
+			if not self._loaded:
+				self._load_table()
+			today = datetime.date.today().isoformat()
+			if self.trade_date == today and self._stocks and not force:
+				return len(self._stocks)
+
+			use_mock = get_setting('use_mock_server', False)
+			try:
+				if use_mock:
+					infos = _fetch_mock_master()
+				else:
+					if token is None:
+						from kiwoom_adapter import fn_au10001
+						token = fn_au10001()
+					infos = _fetch_real_master(token) if token else []
+			except Exception as e:
+				logger.warning(f"[StockMaster] 종목 마스터 갱신 실패 (기존 {len(self._stocks)}종목 유지): {e}")
+				return len(self._stocks)
+
+			if not infos:
+				logger.warning(f"[StockMaster] 받은 종목이 없어 기존 {len(self._stocks)}종목 유지")
+				return len(self._stocks)
+
+			with get_db_connection() as conn:
+				_ensure_table(conn)
+				with conn:
+					conn.execute('DELETE FROM stock_master')
+					conn.executemany(
+						'INSERT OR REPLACE INTO stock_master VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+						[(s.code, s.name, s.market, int(s.is_etf), s.base_price, s.upper_limit, s.lower_limit, today) for s in infos])
+			self._stocks = {s.code: s for s in infos}
+			self.trade_date = today
+			logger.info(f"[StockMaster] {len(self._stocks)}종목 적재 ({today}, {'MOCK' if use_mock else 'REAL'})")
+			return len(self._stocks)
+
+	def _refresh_in_background(self):
+		try:
+			self.refresh()
+		finally:
+			self._refreshing = False
+
+	def _check(self):
+		"""첫 조회 시 테이블 로드, 이후 check_interval마다 거래일 변경 확인"""
+		if not self._loaded:
+			with self._lock:
+				if not self._loaded:
+					try:
+						self._load_table()
+					except Exception as e:
+						logger.warning(f"[StockMaster] 테이블 로드 실패: {e}")
+						self._loaded = True
+		now = time.monotonic()
+		if now - self._last_check < self.check_interval:
+			return
+		self._last_check = now
+		if self.trade_date != datetime.date.today().isoformat() and not self._refreshing:
+			self._refreshing = True
+			threading.Thread(target=self._refresh_in_background, daemon=True).start()
+
+	def get(self, code):
+		self._check()
+		code = str(code or '')
+		return self._stocks.get(code[1:] if code.startswith('A') else code)
+
+	def put(self, code, name):
+		"""마스터에 없던 종목을 개별 조회로 알게 된 경우 메모리/테이블에 추가"""
+		info = _make_info(code, name)
+		self._stocks[info.code] = info
+		try:
+			with get_db_connection() as conn:
+				_ensure_table(conn)
+				# 적재일은 비워 둠: 오늘 날짜를 쓰면 재시작 후 _load_table이 오늘 적재된 것으로 보고 refresh()를 건너뜀
+				conn.execute("INSERT OR IGNORE INTO stock_master (code, name, trade_date) VALUES (?, ?, '')",
+							 (info.code, info.name))
+				conn.commit()
+		except Exception as e:
+			logger.debug(f"[StockMaster] {code} 저장 실패: {e}")
+		return info
+
+stock_master = StockMaster()
+
+def load_stock_master(token=None, force=False):
+	"""시작 시 호출: 테이블 로드 + 거래일이 바뀌었으면 원천에서 갱신"""
+	return stock_master.refresh(token=token, force=force)
+
+def get_stock_info(code):
+	"""StockInfo (없으면 None)"""
+	return stock_master.get(code)
+
+def get_stock_name(code, default=None):
+	"""종목명 (마스터에 없으면 default, default가 None이면 코드)"""
+	info = stock_master.get(code)
+	if info is not None:
+		return info.name
+	return str(code) if default is None else default
+
+def get_tick_size(code, price):
+	info = stock_master.get(code)
+	return tick_size_for(price, info.is_etf if info else False)
+
+def normalize_order_price(code, price, direction='down'):
+	"""
+	주문 가격을 호가단위에 맞추고 상하한가 범위로 제한
+	(마스터에 없는 종목은 일반 주식 호가단위만 적용)
+	"""
+	info = stock_master.get(code)
+	is_etf = info.is_etf if info else False
+	price = round_price(price, is_etf, direction)
+	if info and info.upper_limit > 0:
+		price = max(info.lower_limit, min(info.upper_limit, price))
+	return price
@@ -1,8 +1,8 @@
-import requests
 import json
 import threading
 from get_setting import get_setting
 from logger import logger
+from kiwoom.http_session import post as http_post
 
 def _send_thread(message):
     """실제 전송을 담당하는 스레드 함수"""
@@ -22,8 +22,8 @@ def _send_thread(message):
             "text": f"[{process_name}] {message}" 
         }
 
-        # 타임아웃 3초 (빠른 실패)
-        response = requests.post(url, json=data, timeout=3)
+        # 타임아웃 3초 (빠른 실패), 공용 세션으로 keep-alive 연결 재사용
+        response = http_post(url, json=data)
         result = response.json()
         
         if not result.get('ok'):
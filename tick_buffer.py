@@ -0,0 +1,118 @@
+"""
+실시간 틱 버퍼 (종목코드 키, 최신 값 우선, 크기 제한)
+
+웹소켓 수신 루프가 REAL 메시지마다 current_prices / candidate_queue / candle_manager를 직접 갱신하면
+메시지가 몰릴 때 처리 작업이 그대로 쌓여 수신이 밀리고, 처리가 얼마나 뒤처졌는지 알 방법이 없었습니다.
+- 수신 루프는 해석한 RealTick을 put()으로 넣기만 하고, 소비 태스크가 drain()으로 꺼내 반영
+- 같은 종목이 아직 소비 전이면 새 틱으로 덮어씀 (합침, 순서는 처음 들어온 자리 유지)
+- 종목 수가 maxsize를 넘으면 가장 오래 기다린 종목부터 버림 (폭주 시 지연 대신 오래된 틱 손실로 열화)
+- drain(with_age=True): 틱마다 마지막 수신 후 경과 시간도 반환 (소비 시각이 아닌 수신 시각으로 가격을 기록하도록)
+- stats(): 대기 깊이 / 최대 깊이 / 합침·버림 건수 / 수신→소비 지연 백분위(ms)
+"""
+import time
+import asyncio
+import itertools
+from collections import deque
+from typing import Dict, List, Tuple
+
+from utils import percentile
+
+# 버퍼에 동시에 대기할 수 있는 최대 종목 수
+TICK_BUFFER_MAX = 2000
+
+# 소비 태스크가 한 번에 꺼내는 최대 틱 수 (넘으면 수신 루프에 양보 후 계속)
+TICK_DRAIN_BATCH = 500
+
+# 지연 통계에 보관할 최근 표본 수
+TICK_LAG_HISTORY = 2000
+
+class TickBuffer:
+    """
+    종목코드 → (RealTick, 처음 수신 시각, 마지막 수신 시각) 대기열 (asyncio 단일 스레드 사용 전제)
+    - dict 삽입 순서를 FIFO로 사용, 덮어쓰기는 자리 유지
+    - 수신 시각은 time.monotonic()
+    """
+    def __init__(self, maxsize=TICK_BUFFER_MAX, clock=time.monotonic):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._pending: Dict[str, Tuple] = {}
+        self._event = asyncio.Event()
+        self._lags = deque(maxlen=TICK_LAG_HISTORY)
+        self.max_depth = 0
+        self.last_lag = 0.0    # 마지막 drain의 최대 지연(초)
+        self.counters = {'received': 0, 'delivered': 0, 'coalesced': 0, 'dropped': 0}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def put(self, tick, now=None):
+        """틱 1건 등록 (같은 종목이 대기 중이면 덮어씀)"""
+        now = self._clock() if now is None else now
+        pending = self._pending
+        code = tick.code
+        self.counters['received'] += 1
+        if code in pending:
+            # 처음 들어온 시각을 유지해야 지연이 실제 대기 시간을 반영 (마지막 수신 시각은 덮어쓴 틱 기준)
+            pending[code] = (tick, pending[code][1], now)
+            self.counters['coalesced'] += 1
+        else:
+            if len(pending) >= self.maxsize:
+                del pending[next(iter(pending))]
+                self.counters['dropped'] += 1
+            pending[code] = (tick, now, now)
+            if len(pending) > self.max_depth:
+                self.max_depth = len(pending)
+        self._event.set()
+
+    def drain(self, limit=TICK_DRAIN_BATCH, now=None, with_age=False) -> List:
+        """
+        대기 중인 틱을 먼저 들어온 종목 순으로 최대 limit건 꺼냄
+        with_age=True면 [(RealTick, 마지막 수신 후 경과 초)]
+        """
+        pending = self._pending
+        if not pending:
+            self._event.clear()
+            return []
+        now = self._clock() if now is None else now
+        if len(pending) <= limit:
+            items = list(pending.values())
+            pending.clear()
+        else:
+            items = []
+            for code in list(itertools.islice(pending, limit)):
+                items.append(pending.pop(code))
+        if not pending:
+            self._event.clear()
+        lags = self._lags
+        ticks = []
+        oldest = now
+        for tick, received, latest in items:
+            lags.append(now - received)
+            ticks.append((tick, now - latest) if with_age else tick)
+            if received < oldest:
+                oldest = received
+        self.last_lag = now - oldest
+        self.counters['delivered'] += len(ticks)
+        return ticks
+
+    async def wait(self):
+        """대기 중인 틱이 생길 때까지 대기"""
+        await self._event.wait()
+
+    def stats(self) -> Dict:
+        """{'depth', 'max_depth', 'received', 'delivered', 'coalesced', 'dropped', 'lag': {'count', 'p50', 'p95', 'max'}} (지연 ms)"""
+        lags = sorted(self._lags)
+        if lags:
+            lag = {'count': len(lags), 'p50': percentile(lags, 50) * 1000, 'p95': percentile(lags, 95) * 1000, 'max': lags[-1] * 1000}
+        else:
+            lag = {'count': 0, 'p50': None, 'p95': None, 'max': None}
+        result = dict(self.counters)
+        result.update(depth=len(self._pending), max_depth=self.max_depth, lag=lag)
+        return result
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        text = f"대기 {s['depth']} (최대 {s['max_depth']}) / 수신 {s['received']} / 합침 {s['coalesced']} / 버림 {s['dropped']}"
+        if s['lag']['count']:
+            text += f" / 지연 p50 {s['lag']['p50']:.1f}, p95 {s['lag']['p95']:.1f}, max {s['lag']['max']:.1f}ms"
+        return text
@@ -107,3 +107,14 @@ def validate_api_response(data, required_fields=None, allow_zero=False):
             return False, "All numeric fields are zero (possible API error)"
     
     return True, None
+
+
+def percentile(sorted_samples, pct):
+    """
+    정렬된 표본의 pct 백분위 값 (지연 / 끊김 통계 공용)
+
+    Args:
+        sorted_samples: 오름차순 정렬된 비어 있지 않은 목록
+        pct: 0~100
+    """
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * pct / 100))]